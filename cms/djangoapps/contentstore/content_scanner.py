@@ -0,0 +1,77 @@
+"""
+Streams the content of a course's blocks straight from its split modulestore
+structure and definition documents.
+
+Scanning a whole course through ``get_items`` and ``get_children`` builds an
+XBlock, with its runtime and field data, for every block in the course, only to
+read one field of each.  The scanner reads the course structure once, then
+fetches the definitions of the blocks it scans in bulk, a chunk at a time, so
+that scanning a course takes a handful of queries and little memory however
+large the course is.
+"""
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+
+# Number of definitions fetched from the modulestore at once.
+DEFINITION_CHUNK_SIZE = 500
+
+
+def _get_split_store(store, course_key):
+    """
+    Return the split modulestore holding the course in the mixed ``store``, or None
+    if the course isn't in one.
+    """
+    store = store._get_modulestore_for_courselike(course_key)  # pylint: disable=protected-access
+    if isinstance(store, SplitMongoModuleStore):
+        return store
+    return None
+
+
+def can_scan_course(store, course_key):
+    """
+    Return whether the course can be scanned, that is whether it is stored in split.
+    """
+    return _get_split_store(store, course_key) is not None
+
+
+def iter_children_content(store, course_key, parent_category, field_name='data', exclude_categories=()):
+    """
+    Yield the ``field_name`` content field of the children of every ``parent_category``
+    block in the published version of the course, as ``(usage_key, value)`` pairs.
+
+    Children whose category is in ``exclude_categories`` are skipped. Children which
+    don't have a value for the field yield an empty string, which is what their
+    XBlock would return for a field it doesn't define.
+
+    Arguments:
+        store (MixedModuleStore): The modulestore, usually ``modulestore()``.
+        course_key (CourseLocator): The course to scan, which must be stored in split
+            (see :func:`can_scan_course`).
+        parent_category (str): The category of the blocks whose children are scanned.
+        field_name (str): The name of the content-scoped field to read.
+        exclude_categories (iterable): The categories of the children to skip.
+    """
+    store = _get_split_store(store, course_key)
+    published_key = course_key.for_branch(ModuleStoreEnum.BranchName.published)
+    blocks = store._lookup_course(published_key).structure['blocks']  # pylint: disable=protected-access
+
+    # Only the blocks which are read get decoded, see LazyBlockMap.
+    exclude_categories = set(exclude_categories)
+    children = [
+        child_key
+        for block_key in blocks if block_key.type == parent_category
+        for child_key in blocks[block_key].fields.get('children', [])
+        if child_key.type not in exclude_categories and child_key in blocks
+    ]
+
+    for start in range(0, len(children), DEFINITION_CHUNK_SIZE):
+        chunk = children[start:start + DEFINITION_CHUNK_SIZE]
+        definition_ids = [blocks[child_key].definition for child_key in chunk]
+        definitions = {
+            definition['_id']: definition
+            for definition in store.get_definitions(published_key, definition_ids)
+        }
+        for child_key in chunk:
+            definition = definitions.get(blocks[child_key].definition) or {}
+            value = definition.get('fields', {}).get(field_name, '')
+            yield course_key.make_usage_key(child_key.type, child_key.id), value
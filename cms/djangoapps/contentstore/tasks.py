@@ -4,11 +4,14 @@ This file contains celery tasks for contentstore views
 
 import asyncio
 import base64
+import hashlib
 import json
 import os
 import re
 import shutil
 import tarfile
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from importlib.metadata import entry_points
 from tempfile import NamedTemporaryFile, mkdtemp
@@ -21,6 +24,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import SuspiciousOperation
 from django.core.files import File
 from django.test import RequestFactory
@@ -47,6 +51,7 @@ from user_tasks.models import UserTaskArtifact, UserTaskStatus
 from user_tasks.tasks import UserTask
 
 import cms.djangoapps.contentstore.errors as UserErrors
+from cms.djangoapps.contentstore import content_scanner
 from cms.djangoapps.contentstore.courseware_index import (
     CoursewareSearchIndexer,
     LibrarySearchIndexer,
@@ -93,6 +98,11 @@ from xmodule.modulestore.xml_exporter import export_course_to_xml, export_librar
 from xmodule.modulestore.xml_importer import CourseImportException, import_course_from_xml, import_library_from_xml
 from xmodule.tabs import StaticTab
 from xmodule.util.keys import BlockKey
+from xmodule.video_block.transcripts_utils import (
+    TranscriptsGenerationException,
+    get_video_transcript_content,
+    precompute_converted_transcripts
+)
 
 from .models import ComponentLink, ContainerLink, LearningContextLinksStatus, LearningContextLinksStatusChoices
 from .outlines import update_outline_from_modulestore
@@ -130,6 +140,22 @@ DOMAIN_HEADERS = {
     "doi.org": DOI_HEADERS,
 }
 
+# Maximum number of concurrent requests made by a link check, in total and to any one host.
+LINK_CHECK_MAX_CONNECTIONS = 100
+LINK_CHECK_MAX_CONNECTIONS_PER_HOST = 8
+
+# Number of seconds for which the status of an external URL is reused by the link checks of all courses.
+LINK_CHECK_STATUS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Statuses of external URLs, other than 2xx statuses, which are definitive enough to be cached.
+LINK_CHECK_CACHED_STATUSES = (404, 410)
+
+# Longest wait honored from the Retry-After header of a "429 Too Many Requests" response, in seconds.
+LINK_CHECK_MAX_RETRY_AFTER = 5
+
+# The session of the link check being run, see _link_check_session.
+_current_link_check_session = ContextVar('_current_link_check_session', default=None)
+
 
 class LinkState:
     """
@@ -297,6 +323,25 @@ def update_library_index(library_id, triggered_time_isoformat):
         LOGGER.debug('Search indexing successful for library %s', library_id)
 
 
+@shared_task
+@set_code_owner_attribute
+def precompute_video_transcript_conversions(edx_video_id, language_code):
+    """
+    Converts the transcript of a video in a language to every format, so that requests for it
+    find it in the converted transcripts cache.
+    """
+    transcript = get_video_transcript_content(edx_video_id, language_code)
+    if not transcript:
+        LOGGER.info('No %s transcript to convert for video %s', language_code, edx_video_id)
+        return
+
+    input_format = os.path.splitext(transcript['file_name'])[1][1:]
+    try:
+        precompute_converted_transcripts(transcript['content'], input_format)
+    except TranscriptsGenerationException:
+        LOGGER.exception('Failed to convert the %s transcript of video %s', language_code, edx_video_id)
+
+
 @shared_task
 @set_code_owner_attribute
 def update_special_exams_and_publish(course_key_str):
@@ -1251,26 +1296,10 @@ def _scan_course_for_links(course_key):
         ...
     ]
     """
-    verticals = modulestore().get_items(
-        course_key,
-        qualifiers={'category': 'vertical'},
-        revision=ModuleStoreEnum.RevisionOption.published_only
-    )
-    blocks = []
     urls_to_validate = []
     course = modulestore().get_course(course_key)
 
-    for vertical in verticals:
-        blocks.extend(vertical.get_children())
-
-    for block in blocks:
-        # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
-        # and it doesn't contain user-facing links to scan.
-        if block.category == 'drag-and-drop-v2':
-            continue
-        block_id = str(block.location)
-        block_info = get_block_info(block)
-        block_data = block_info['data']
+    for block_id, block_data in _iter_vertical_children_data(course_key):
         url_list = extract_content_URLs_from_course(block_data)
         urls_to_validate += [[block_id, url] for url in url_list]
 
@@ -1293,6 +1322,40 @@ def _scan_course_for_links(course_key):
     return urls_to_validate
 
 
+def _iter_vertical_children_data(course_key):
+    """
+    Yields the block id and static-URL-rewritten data of the children of every
+    published vertical of the course.
+
+    Courses stored in split are streamed from their structure and definitions
+    by the content scanner, without loading any XBlock.
+    """
+    # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
+    # and it doesn't contain user-facing links to scan.
+    excluded_categories = ['drag-and-drop-v2']
+
+    store = modulestore()
+    if content_scanner.can_scan_course(store, course_key):
+        for usage_key, data in content_scanner.iter_children_content(
+            store, course_key, 'vertical', exclude_categories=excluded_categories
+        ):
+            if not isinstance(data, str):
+                continue
+            yield str(usage_key), replace_static_urls(data, None, course_id=course_key)
+        return
+
+    verticals = store.get_items(
+        course_key,
+        qualifiers={'category': 'vertical'},
+        revision=ModuleStoreEnum.RevisionOption.published_only
+    )
+    for vertical in verticals:
+        for block in vertical.get_children():
+            if block.category in excluded_categories:
+                continue
+            yield str(block.location), get_block_info(block)['data']
+
+
 def extract_content_URLs_from_course(content):
     """
     Finds and returns a list of URLs in the given content.
@@ -1434,6 +1497,8 @@ async def _validate_urls_access_in_batches(url_list, course_key, batch_size=100)
     """
     Returns the statuses of a list of URL requests.
 
+    All of the requests are made with the same session, see _LinkCheckSession.
+
     Arguments:
         url_list (list): block id and URL pairs
 
@@ -1443,21 +1508,128 @@ async def _validate_urls_access_in_batches(url_list, course_key, batch_size=100)
     responses = []
     url_count = len(url_list)
 
-    for i in range(0, url_count, batch_size):
-        batch = url_list[i:i + batch_size]
-        batch_results = await _validate_batch(batch, course_key)
-        responses.extend(batch_results)
-        LOGGER.debug(f'[Link Check] request batch {i // batch_size + 1} of {url_count // batch_size + 1}')
+    async with _link_check_session():
+        for i in range(0, url_count, batch_size):
+            batch = url_list[i:i + batch_size]
+            batch_results = await _validate_batch(batch, course_key)
+            responses.extend(batch_results)
+            LOGGER.debug(f'[Link Check] request batch {i // batch_size + 1} of {url_count // batch_size + 1}')
 
     return responses
 
 
 async def _validate_batch(batch, course_key):
     """Validate a batch of URLs"""
-    async with aiohttp.ClientSession() as session:
-        tasks = [_validate_url_access(session, url_data, course_key) for url_data in batch]
-        batch_results = await asyncio.gather(*tasks)
-        return batch_results
+    session = _current_link_check_session.get()
+    if session is None:
+        async with _link_check_session() as session:
+            return await _validate_batch(batch, course_key)
+
+    tasks = [_validate_url_access(session, url_data, course_key) for url_data in batch]
+    batch_results = await asyncio.gather(*tasks)
+    return batch_results
+
+
+@asynccontextmanager
+async def _link_check_session():
+    """
+    Opens a _LinkCheckSession, which is used by _validate_batch until this exits.
+    """
+    session = _LinkCheckSession()
+    token = _current_link_check_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_link_check_session.reset(token)
+        await session.close()
+
+
+class _LinkCheckSession:
+    """
+    The HTTP session shared by the requests of a link check.
+
+    Connections are kept alive between requests, and there are at most
+    LINK_CHECK_MAX_CONNECTIONS_PER_HOST concurrent requests to any one host.
+    Each distinct URL is only requested once, however many blocks link to it,
+    and the definitive statuses of external URLs (see LINK_CHECK_CACHED_STATUSES)
+    are cached for the link checks of all courses (including reruns) for
+    LINK_CHECK_STATUS_CACHE_TIMEOUT seconds. The statuses of studio and LMS URLs
+    depend on the course content and the user, and are never cached.
+    """
+    def __init__(self):
+        self._client_session = None
+        self._statuses = {}
+
+    @property
+    def client_session(self):
+        """
+        The aiohttp session, created when first used from the event loop.
+        """
+        if self._client_session is None:
+            self._client_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=LINK_CHECK_MAX_CONNECTIONS,
+                limit_per_host=LINK_CHECK_MAX_CONNECTIONS_PER_HOST,
+            ))
+        return self._client_session
+
+    async def close(self):
+        """
+        Close the connections of the session.
+        """
+        if self._client_session is not None:
+            await self._client_session.close()
+
+    async def get_status(self, url, headers):
+        """
+        Returns the HTTP status of the given URL, or None if it couldn't be requested.
+        """
+        if url not in self._statuses:
+            self._statuses[url] = asyncio.ensure_future(self._get_status(url, headers))
+        return await self._statuses[url]
+
+    async def _get_status(self, url, headers):
+        """
+        Returns the status of the given URL from the cache, or else requests it.
+        """
+        cache_key = None
+        if not _is_studio_url(url) and not _is_lms_url(url):
+            cache_key = 'course_link_check.status.' + hashlib.md5(url.encode('utf-8')).hexdigest()
+            status = await cache.aget(cache_key)
+            if status is not None:
+                return status
+
+        status = await self._request_status(url, headers)
+        if cache_key and _is_cached_link_status(status):
+            await cache.aset(cache_key, status, LINK_CHECK_STATUS_CACHE_TIMEOUT)
+        return status
+
+    async def _request_status(self, url, headers):
+        """
+        Requests the given URL and returns the HTTP status of the response.
+
+        Tries a HEAD request first, which doesn't transfer the page, and a GET
+        request if it isn't successful, since not all servers support HEAD
+        requests.  A GET request throttled with a 429 status is retried once.
+        """
+        try:
+            async with self.client_session.head(url, headers=headers, timeout=5, allow_redirects=True) as response:
+                if response.status == 200:
+                    return response.status
+        except Exception as e:  # lint-amnesty, pylint: disable=broad-except
+            LOGGER.debug(f'[Link Check] HEAD request error when validating {url}: {str(e)}')
+
+        try:
+            for attempt in range(2):
+                async with self.client_session.get(url, headers=headers, timeout=5) as response:
+                    if response.status != 429 or attempt:
+                        return response.status
+                    retry_after = response.headers.get('Retry-After', '')
+                await asyncio.sleep(
+                    min(int(retry_after), LINK_CHECK_MAX_RETRY_AFTER) if retry_after.isdigit() else 1
+                )
+        except Exception as e:  # lint-amnesty, pylint: disable=broad-except
+            LOGGER.debug(f'[Link Check] Request error when validating {url}: {str(e)}')
+        return None
 
 
 async def _validate_url_access(session, url_data, course_key):
@@ -1465,6 +1637,7 @@ async def _validate_url_access(session, url_data, course_key):
     Validates a URL.
 
     Arguments:
+        session (_LinkCheckSession): session of the link check
         url_data (list): block id and URL pairs
         course_key (str): locator id for a course
 
@@ -1491,12 +1664,7 @@ async def _validate_url_access(session, url_data, course_key):
         LOGGER.debug(f'[Link Check] Error parsing URL {url}: {str(e)}')
         headers = DEFAULT_HEADERS
 
-    try:
-        async with session.get(standardized_url, headers=headers, timeout=5) as response:
-            result.update({'status': response.status})
-    except Exception as e:  # lint-amnesty, pylint: disable=broad-except
-        result.update({'status': None})
-        LOGGER.debug(f'[Link Check] Request error when validating {url}: {str(e)}')
+    result.update({'status': await session.get_status(standardized_url, headers)})
     return result
 
 
@@ -1540,6 +1708,16 @@ def _is_studio_url_without_base(url):
     return not url.startswith('http://') and not url.startswith('https://')
 
 
+def _is_lms_url(url):
+    """Returns True if url is a url with lms base."""
+    return url.startswith('http://' + settings.LMS_BASE) or url.startswith('https://' + settings.LMS_BASE)
+
+
+def _is_cached_link_status(status):
+    """Returns True if status is definitive enough for the status of an external url to be cached."""
+    return status is not None and (200 <= status < 300 or status in LINK_CHECK_CACHED_STATUSES)
+
+
 def _filter_by_status(results):
     """
     Filter results by status.
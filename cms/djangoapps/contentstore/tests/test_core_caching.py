@@ -6,7 +6,16 @@ Tests core caching facilities.
 from django.test import TestCase
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
 
-from openedx.core.djangoapps.contentserver.caching import del_cached_content, get_cached_content, set_cached_content
+from openedx.core.djangoapps.contentserver.caching import (
+    ContentMetadata,
+    del_cached_content,
+    get_cached_content,
+    get_cached_content_metadata,
+    get_course_assets_version,
+    set_cached_content,
+    set_cached_content_metadata
+)
+from xmodule.contentstore.content import StaticContent
 
 
 class Content:
@@ -44,3 +53,30 @@ class CachingTestCase(TestCase):
                          'should not be stored in cache with unicodeLocation')
         self.assertEqual(None, get_cached_content(self.nonUnicodeLocation),
                          'should not be stored in cache with nonUnicodeLocation')
+
+    def test_metadata_put_get_and_delete(self):
+        content = StaticContent(
+            self.unicodeLocation, 'monsters.jpg', 'image/jpeg', b'monsters', length=8, content_digest='f' * 32
+        )
+        set_cached_content_metadata(content)
+        metadata = get_cached_content_metadata(self.nonUnicodeLocation)
+        self.assertIsInstance(metadata, ContentMetadata)
+        self.assertIsNone(metadata.data)
+        self.assertEqual((metadata.length, metadata.content_digest), (8, 'f' * 32))
+
+        del_cached_content(self.nonUnicodeLocation)
+        self.assertIsNone(get_cached_content_metadata(self.unicodeLocation),
+                          'metadata should be deleted with the content')
+
+    def test_course_assets_version(self):
+        course_key = self.unicodeLocation.course_key
+        other_course_key = CourseLocator('c4x', 'mitX', '801')
+        assets_version = get_course_assets_version(course_key)
+        other_assets_version = get_course_assets_version(other_course_key)
+        self.assertIsNotNone(assets_version)
+        self.assertEqual(get_course_assets_version(course_key), assets_version)
+
+        # Deleting any asset of the course changes the version of its assets.
+        del_cached_content(AssetLocator(course_key, 'asset', 'other.jpg'))
+        self.assertNotIn(get_course_assets_version(course_key), (assets_version, None))
+        self.assertEqual(get_course_assets_version(other_course_key), other_assets_version)
@@ -12,6 +12,7 @@ from celery import Task
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.test import TestCase
 from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import CourseKey
@@ -33,8 +34,10 @@ from xmodule.modulestore.tests.factories import CourseFactory, BlockFactory  # l
 from ..tasks import (
     LinkState,
     export_olx,
+    precompute_video_transcript_conversions,
     update_special_exams_and_publish,
     rerun_course,
+    _LinkCheckSession,
     _validate_urls_access_in_batches,
     _filter_by_status,
     _check_broken_links,
@@ -240,6 +243,29 @@ class RegisterExamsTaskTestCase(CourseTestCase):  # pylint: disable=missing-clas
             course_publish.assert_called()
 
 
+class PrecomputeVideoTranscriptConversionsTestCase(TestCase):
+    """
+    Tests for the precomputation of the conversions of uploaded transcripts.
+    """
+
+    @mock.patch('cms.djangoapps.contentstore.tasks.precompute_converted_transcripts')
+    @mock.patch('cms.djangoapps.contentstore.tasks.get_video_transcript_content')
+    def test_precompute(self, mock_get_content, mock_precompute):
+        mock_get_content.return_value = {'file_name': 'video-en.sjson', 'content': b'{"start": [1]}'}
+
+        precompute_video_transcript_conversions('video', 'en')
+
+        mock_get_content.assert_called_once_with('video', 'en')
+        mock_precompute.assert_called_once_with(b'{"start": [1]}', 'sjson')
+
+    @mock.patch('cms.djangoapps.contentstore.tasks.precompute_converted_transcripts')
+    @mock.patch('cms.djangoapps.contentstore.tasks.get_video_transcript_content', return_value=None)
+    def test_no_transcript(self, _mock_get_content, mock_precompute):
+        precompute_video_transcript_conversions('video', 'en')
+
+        mock_precompute.assert_not_called()
+
+
 class MockCourseLinkCheckTask(Task):
     def __init__(self):
         self.status = mock.Mock()
@@ -443,6 +469,45 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
             "Text block should be included"
         )
 
+    def _create_vertical_with_links(self):
+        """
+        Create a published vertical holding an HTML block with links and a drag-and-drop block.
+        """
+        vertical = BlockFactory.create(category='vertical', parent_location=self.test_course.location)
+        BlockFactory.create(category='drag-and-drop-v2', parent_location=vertical.location)
+        return BlockFactory.create(
+            category='html',
+            parent_location=vertical.location,
+            data='<a href="http://example.com">Example</a> <img src="/static/image.png"/>',
+        )
+
+    @mock.patch('cms.djangoapps.contentstore.tasks.get_block_info', autospec=True)
+    def test_scan_split_course_without_loading_blocks(self, mock_get_block_info):
+        """
+        Test that `_scan_course_for_links` reads split courses from their structure and definitions.
+        """
+        html_block = self._create_vertical_with_links()
+
+        urls = _scan_course_for_links(self.test_course.id)
+
+        mock_get_block_info.assert_not_called()
+        self.assertIn([str(html_block.location), 'http://example.com'], urls)
+        self.assertFalse(any('drag-and-drop-v2' in block_id for block_id, _ in urls))
+
+    def test_scanned_links_match_loaded_blocks(self):
+        """
+        Test that scanning the split structure finds the same links as loading the blocks.
+        """
+        self._create_vertical_with_links()
+
+        urls = _scan_course_for_links(self.test_course.id)
+        with mock.patch(
+            'cms.djangoapps.contentstore.tasks.content_scanner.can_scan_course', return_value=False
+        ):
+            expected_urls = _scan_course_for_links(self.test_course.id)
+
+        self.assertEqual(sorted(urls), sorted(expected_urls))
+
     @pytest.mark.asyncio
     async def test_every_detected_link_is_validated(self):
         '''
@@ -483,6 +548,88 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
             for i in range(1, len(url_list) + 1):
                 assert str(i) in urls, f'{i} not supplied as a url for validation in batches function'
 
+    @pytest.mark.asyncio
+    async def test_duplicate_links_are_requested_once(self):
+        """
+        Links to the same URL from several blocks, in different batches, are only requested once.
+        """
+        url_list = [
+            ['block_1', 'https://example.com/a'],
+            ['block_2', 'https://example.com/a '],
+            ['block_3', 'https://example.com/b'],
+            ['block_4', 'https://example.com/a'],
+        ]
+        course_key = 'course-v1:edX+DemoX+Demo_Course'
+        with patch.object(_LinkCheckSession, '_get_status', new_callable=AsyncMock) as mock_get_status:
+            mock_get_status.side_effect = lambda url, headers: 404 if url.endswith('b') else 200
+            results = await _validate_urls_access_in_batches(url_list, course_key, batch_size=2)
+
+        assert sorted(call_args.args[0] for call_args in mock_get_status.call_args_list) == [
+            'https://example.com/a', 'https://example.com/b'
+        ]
+        assert [result['status'] for result in results] == [200, 200, 404, 200]
+
+    @pytest.mark.asyncio
+    async def test_external_link_statuses_are_cached(self):
+        """
+        The statuses of external URLs are reused by later link checks, those of studio URLs aren't.
+        """
+        url_list = [['block_1', f'https://example.com/{uuid4().hex}'], ['block_2', '/static/image.png']]
+        course_key = CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        with patch.object(_LinkCheckSession, '_request_status', new_callable=AsyncMock) as mock_request_status:
+            mock_request_status.return_value = 404
+            await _validate_urls_access_in_batches(url_list, course_key)
+            assert mock_request_status.call_count == 2
+
+            results = await _validate_urls_access_in_batches(url_list, course_key)
+            assert mock_request_status.call_count == 3
+            assert mock_request_status.call_args.args[0] == _convert_to_standard_url('/static/image.png', course_key)
+
+        assert [result['status'] for result in results] == [404, 404]
+
+    @pytest.mark.asyncio
+    async def test_lms_and_indefinite_link_statuses_are_not_cached(self):
+        """
+        The statuses of LMS URLs, and statuses which may change, such as server errors, aren't cached.
+        """
+        url_list = [
+            ['block_1', '/jump_to_id/2152d4a4aadc4cb0af5256394a3d1fc7'],
+            ['block_2', f'https://example.com/{uuid4().hex}'],
+            ['block_3', f'https://example.com/{uuid4().hex}'],
+        ]
+        course_key = CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        lms_url = _convert_to_standard_url(url_list[0][1], course_key)
+        statuses = {lms_url: 200, url_list[1][1]: 503, url_list[2][1]: 410}
+        with patch.object(_LinkCheckSession, '_request_status', new_callable=AsyncMock) as mock_request_status:
+            mock_request_status.side_effect = lambda url, headers: statuses[url]
+            await _validate_urls_access_in_batches(url_list, course_key)
+            await _validate_urls_access_in_batches(url_list, course_key)
+
+        requested_urls = [call_args.args[0] for call_args in mock_request_status.call_args_list]
+        assert requested_urls.count(lms_url) == 2
+        assert requested_urls.count(url_list[1][1]) == 2
+        assert requested_urls.count(url_list[2][1]) == 1
+
+    @pytest.mark.asyncio
+    async def test_head_request_first(self):
+        """
+        A GET request is only made if the HEAD request isn't successful.
+        """
+        def response(status):
+            mock_response = MagicMock(status=status)
+            mock_response.__aenter__.return_value = mock_response
+            return mock_response
+
+        session = _LinkCheckSession()
+        session._client_session = MagicMock()  # pylint: disable=protected-access
+        session.client_session.head.side_effect = [response(200), response(405)]
+        session.client_session.get.return_value = response(404)
+
+        assert await session.get_status('/ok', {}) == 200
+        session.client_session.get.assert_not_called()
+        assert await session.get_status('/missing', {}) == 404
+        session.client_session.get.assert_called_once_with('/missing', headers={}, timeout=5)
+
     def test_no_retries_on_403_access_denied_links(self):
         '''
         No mocking required here. Will populate "filtering_input" with simulated results for link checks where
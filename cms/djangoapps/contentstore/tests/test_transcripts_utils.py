@@ -13,6 +13,7 @@ from uuid import uuid4
 import ddt
 import pytest
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
 from django.test.utils import override_settings
 from django.utils import translation
 
@@ -1114,3 +1115,67 @@ class TestGetEndonymOrLabel(unittest.TestCase):
                 with override_settings(ALL_LANGUAGES=all_languages):
                     with self.assertRaises(NotFoundError):
                         transcripts_utils.get_endonym_or_label(self.LANG_CODE)
+
+
+class TestConvertTranscript(unittest.TestCase):
+    """
+    Tests for the cached conversion of transcripts.
+    """
+    SRT = textwrap.dedent("""\
+        0
+        00:00:10,500 --> 00:00:13,000
+        Elephant&#39;s Dream
+
+        1
+        00:00:15,000 --> 00:00:18,000
+        At the left we can see...
+
+    """)
+
+    def setUp(self):
+        super().setUp()
+        self.cache = LocMemCache('video_transcripts', {})
+        patcher = patch.object(transcripts_utils, 'get_converted_transcripts_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_conversion_cached(self):
+        convert_transcript = transcripts_utils.Transcript.convert
+        with patch.object(transcripts_utils.Transcript, 'convert', wraps=convert_transcript) as convert:
+            first = transcripts_utils.convert_transcript(self.SRT, 'srt', 'txt')
+            second = transcripts_utils.convert_transcript(self.SRT.encode('utf-8'), 'srt', 'txt')
+
+        assert first == second == "Elephant's Dream\nAt the left we can see..."
+        assert convert.call_count == 1
+
+    def test_cached_by_format_and_speed(self):
+        sjson = transcripts_utils.convert_transcript(self.SRT, 'srt', 'sjson')
+        scaled = transcripts_utils.convert_transcript(self.SRT, 'srt', 'sjson', speed=2)
+
+        assert json.loads(sjson)['start'] == [10500, 15000]
+        assert json.loads(scaled)['start'] == [21000, 30000]
+        assert transcripts_utils.convert_transcript(self.SRT, 'srt', 'sjson', speed=2) == scaled
+
+    def test_not_cached_without_cache(self):
+        with patch.object(transcripts_utils, 'get_converted_transcripts_cache', return_value=None):
+            with patch.object(
+                transcripts_utils.Transcript, 'convert', wraps=transcripts_utils.Transcript.convert
+            ) as convert:
+                transcripts_utils.convert_transcript(self.SRT, 'srt', 'txt')
+                transcripts_utils.convert_transcript(self.SRT, 'srt', 'txt')
+
+        assert convert.call_count == 2
+
+    def test_invalid_transcript_not_cached(self):
+        with self.assertRaises(transcripts_utils.TranscriptsGenerationException):
+            transcripts_utils.convert_transcript('invalid SubRip file content', 'srt', 'sjson')
+
+    def test_precompute(self):
+        transcripts_utils.precompute_converted_transcripts(self.SRT, 'srt', speeds=[0.75])
+
+        with patch.object(transcripts_utils.Transcript, 'convert') as convert:
+            for output_format in ('sjson', 'srt', 'txt'):
+                assert transcripts_utils.convert_transcript(self.SRT, 'srt', output_format)
+            assert transcripts_utils.convert_transcript(self.SRT, 'srt', 'sjson', speed=0.75)
+
+        assert not convert.called
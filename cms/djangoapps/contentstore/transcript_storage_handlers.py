@@ -6,7 +6,9 @@ Business logic for video transcripts.
 import logging
 import os
 
+from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import transaction
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.translation import gettext as _
 from edxval.api import (
@@ -167,6 +169,19 @@ def _create_or_update_video_transcript(**kwargs):
     return create_or_update_video_transcript(**kwargs)
 
 
+def precompute_transcript_conversions(edx_video_id, language_code):
+    """
+    Schedules the conversion of the newly uploaded transcript of a video to every format, when
+    enabled, so that learners requesting it don't wait for it to be converted.
+    """
+    if not settings.PRECOMPUTE_VIDEO_TRANSCRIPT_CONVERSIONS:
+        return
+
+    # Import here, since the tasks import most of contentstore.
+    from .tasks import precompute_video_transcript_conversions
+    transaction.on_commit(lambda: precompute_video_transcript_conversions.delay(edx_video_id, language_code))
+
+
 def upload_transcript(request):
     """
     Upload a transcript file
@@ -198,6 +213,7 @@ def upload_transcript(request):
             },
             file_data=ContentFile(sjson_subs),
         )
+        precompute_transcript_conversions(edx_video_id, new_language_code)
         response = JsonResponse(status=201)
     except (TranscriptsGenerationException, UnicodeDecodeError):
         LOGGER.error("Unable to update transcript on edX video %s for language %s", edx_video_id, new_language_code)
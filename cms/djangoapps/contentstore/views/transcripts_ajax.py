@@ -22,6 +22,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import UsageKey, UsageKeyV2
 from opaque_keys.edx.locator import LibraryLocatorV2
 
+from cms.djangoapps.contentstore.transcript_storage_handlers import precompute_transcript_conversions
 from cms.djangoapps.contentstore.video_storage_handlers import TranscriptProvider
 from common.djangoapps.student.auth import has_course_author_access
 from common.djangoapps.util.json_request import JsonResponse
@@ -165,6 +166,7 @@ def save_video_transcript(edx_video_id, input_format, transcript_content, langua
             },
             file_data=ContentFile(sjson_subs),
         )
+        precompute_transcript_conversions(edx_video_id, language_code)
 
         result = True
     except (TranscriptsGenerationException, UnicodeDecodeError):
@@ -285,6 +287,8 @@ def upload_transcripts(request):
             video.save_with_metadata(request.user)
             if transcript_created is None:
                 response = JsonResponse({'status': 'Invalid Video ID'}, status=400)
+            else:
+                precompute_transcript_conversions(edx_video_id, 'en')
 
         except (TranscriptsGenerationException, UnicodeDecodeError):
 
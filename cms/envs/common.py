@@ -1536,6 +1536,16 @@ VIDEO_IMAGE_MAX_AGE = 31536000
 ########################## VIDEO TRANSCRIPTS STORAGE ############################
 TRANSCRIPT_LANG_CACHE_TIMEOUT = 60 * 60 * 24
 
+# .. toggle_name: settings.PRECOMPUTE_VIDEO_TRANSCRIPT_CONVERSIONS
+# .. toggle_implementation: DjangoSetting
+# .. toggle_default: False
+# .. toggle_description: When enabled, transcripts uploaded in Studio are converted to every format (sjson, srt
+#   and txt) by a celery task, so that they are in the 'video_transcripts' cache of converted transcripts before
+#   learners request them. Has no effect if that cache isn't configured.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-17
+PRECOMPUTE_VIDEO_TRANSCRIPT_CONVERSIONS = False
+
 
 ##### shoppingcart Payment #####
 PAYMENT_SUPPORT_EMAIL = 'billing@example.com'
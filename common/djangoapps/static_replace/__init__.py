@@ -1,5 +1,6 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
+import functools
 import logging
 import re
 
@@ -8,6 +9,7 @@ from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
 from opaque_keys.edx.locator import AssetLocator
 
+from common.djangoapps.static_replace.url_cache import asset_url_cache
 from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
@@ -29,6 +31,37 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+@functools.lru_cache(maxsize=64)
+def _compile_url_replace_regex(prefix):
+    """
+    Return the compiled _url_replace_regex for ``prefix``, compiled once per process.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_url_prefix(static_url, data_dir):
+    """
+    Return the prefix of static urls, which aren't already prefixed with the data directory.
+    """
+    return '(?:{static_url}|/static/)(?!{data_dir})'.format(static_url=static_url, data_dir=data_dir)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_urls_replace_regex(static_url, data_dir, course_urls, jump_to_id_urls):
+    """
+    Return the compiled pattern matching static urls and, optionally, /course/ and /jump_to_id/
+    urls, so that all of them are replaced in a single scan of the text.
+
+    Static urls are matched by the ``static`` group, the others by their ``prefix``.
+    """
+    prefixes = ['(?P<static>{})'.format(_static_url_prefix(static_url, data_dir))]
+    if course_urls:
+        prefixes.append('/course/')
+    if jump_to_id_urls:
+        prefixes.append('/jump_to_id/')
+    return re.compile(_url_replace_regex('|'.join(prefixes)))
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +103,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # lint-amnes
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compile_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,14 +123,16 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compile_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
-def process_static_urls(text, replacement_function, data_dir=None):
+def _wrap_static_url_replacement(replacement_function):
     """
-    Run an arbitrary replacement function on any urls matching the static file
-    directory
+    Return the function replacing a match of a static url with ``replacement_function``, which
+    leaves XBlock resource urls alone.
     """
+    static_url = str(settings.STATIC_URL)
+
     def wrap_part_extraction(match):
         """
         Unwraps a match group for the captures specified in _url_replace_regex
@@ -112,7 +147,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
         # works for actual static assets and for magical course asset URLs....
         full_url = prefix + rest
 
-        starts_with_static_url = full_url.startswith(str(settings.STATIC_URL))
+        starts_with_static_url = full_url.startswith(static_url)
         starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
         contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
         if starts_with_prefix or (starts_with_static_url and contains_prefix):
@@ -120,12 +155,16 @@ def process_static_urls(text, replacement_function, data_dir=None):
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
+    return wrap_part_extraction
+
+
+def process_static_urls(text, replacement_function, data_dir=None):
+    """
+    Run an arbitrary replacement function on any urls matching the static file
+    directory
+    """
+    return _compile_url_replace_regex(_static_url_prefix(settings.STATIC_URL, data_dir)).sub(
+        _wrap_static_url_replacement(replacement_function),
         text
     )
 
@@ -147,8 +186,47 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(
-    text,
+def _resolve_course_asset_url(course_id, rest):
+    """
+    Return the url of the static url ``rest`` of a course in the modulestore: its url in the static
+    file pipeline if it is there, or else its url in the contentstore.
+
+    Urls are kept in the process-local asset_url_cache, when it is enabled.
+    """
+    cache_key = (str(course_id), rest)
+    url = asset_url_cache.get(cache_key)
+    if url is not None:
+        return url
+
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+    except Exception as err:  # lint-amnesty, pylint: disable=broad-except
+        log.warning("staticfiles_storage couldn't find path {}: {}".format(
+            rest, str(err)))
+
+    if exists_in_staticfiles_storage:
+        url = staticfiles_storage.url(rest)
+    else:
+        # if not, then assume it's courseware specific content and then look in the
+        # Mongo-backed database
+        # Import is placed here to avoid model import at project startup.
+        from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+        base_url = AssetBaseUrlConfig.get_base_url()
+        excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+        url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+        if AssetLocator.CANONICAL_NAMESPACE in url:
+            url = url.replace('block@', 'block/', 1)
+
+    asset_url_cache.set(cache_key, url)
+    return url
+
+
+def _make_static_url_replacer(
     data_directory=None,
     course_id=None,
     static_asset_path='',
@@ -157,22 +235,8 @@ def replace_static_urls(
     lookup_asset_url=None
 ):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
-
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
-    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
-      * the original unmodified static URI
-      * the updated static URI (will match the original if unchanged)
-    xblock: xblock where the static assets are stored
-    lookup_url_func: Lookup function which returns the correct path of the asset
+    Return the function replacing a single static url, for replace_static_urls.
     """
-
     if static_paths_out is None:
         static_paths_out = []
 
@@ -197,29 +261,7 @@ def replace_static_urls(
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # lint-amnesty, pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = _resolve_course_asset_url(course_id, rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -239,4 +281,84 @@ def replace_static_urls(
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
+    return replace_static_url
+
+
+def replace_static_urls(
+    text,
+    data_directory=None,
+    course_id=None,
+    static_asset_path='',
+    static_paths_out=None,
+    xblock=None,
+    lookup_asset_url=None
+):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
+      * the original unmodified static URI
+      * the updated static URI (will match the original if unchanged)
+    xblock: xblock where the static assets are stored
+    lookup_url_func: Lookup function which returns the correct path of the asset
+    """
+    replace_static_url = _make_static_url_replacer(
+        data_directory, course_id, static_asset_path, static_paths_out, xblock, lookup_asset_url
+    )
     return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def replace_all_urls(
+    text,
+    course_id,
+    data_directory=None,
+    static_asset_path='',
+    static_paths_out=None,
+    jump_to_id_base_url=None,
+    static_replace_only=False
+):
+    """
+    Replace static, /course/ and /jump_to_id/ urls in a single scan of the text.
+
+    The result is the same as that of replace_static_urls, replace_course_urls and, if
+    jump_to_id_base_url is given, replace_jump_to_id_urls applied in turn, but the text is
+    only scanned once, with a pattern compiled once per static url and data directory.
+
+    text: The source text to do the substitution in
+    course_id: The course in which this rewrite happens
+    data_directory, static_asset_path, static_paths_out: As for replace_static_urls
+    jump_to_id_base_url: (optional) As for replace_jump_to_id_urls
+    static_replace_only: If True, only static urls are replaced
+    """
+    replace_static_url = _wrap_static_url_replacement(
+        _make_static_url_replacer(data_directory, course_id, static_asset_path, static_paths_out)
+    )
+    course_url_base = '/courses/' + str(course_id) + '/'
+    pattern = _compile_urls_replace_regex(
+        str(settings.STATIC_URL),
+        static_asset_path or data_directory,
+        not static_replace_only,
+        bool(jump_to_id_base_url) and not static_replace_only,
+    )
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to its prefix.
+        """
+        if match.group('static') is not None:
+            return replace_static_url(match)
+
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('prefix') == '/course/':
+            return "".join([quote, course_url_base, rest, quote])
+        return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    return pattern.sub(replace_url, text)
@@ -1,14 +1,31 @@
 """
 Supports replacement of static/course/jump-to-id URLs to absolute URLs in XBlocks.
 """
+import hashlib
 
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from edx_django_utils import monitoring
 from xblock.reference.plugins import Service
 
-from common.djangoapps.static_replace import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
-)
+from common.djangoapps.static_replace import replace_all_urls, replace_static_urls
+from openedx.core.djangoapps.contentserver.caching import get_course_assets_version
+
+REPLACED_URLS_CACHE_NAME = 'replaced_urls'
+
+# Text shorter than this is always replaced, since looking it up in the cache would take about as long.
+REPLACED_URLS_CACHE_MIN_LENGTH = 1024
+
+
+def get_replaced_urls_cache():
+    """
+    Return the cache of content with its urls replaced, or None if it isn't configured.
+    """
+    try:
+        return caches[REPLACED_URLS_CACHE_NAME]
+    except InvalidCacheBackendError:
+        return None
 
 
 class ReplaceURLService(Service):
@@ -52,18 +69,60 @@ class ReplaceURLService(Service):
         """
         block = self.xblock()
         if self.lookup_asset_url:
-            text = replace_static_urls(text, xblock=block, lookup_asset_url=self.lookup_asset_url)
-        else:
-            text = replace_static_urls(
-                text,
-                data_directory=getattr(block, 'data_dir', None),
-                course_id=block.scope_ids.usage_id.context_key,
-                static_asset_path=self.static_asset_path or block.static_asset_path,
-                static_paths_out=self.static_paths_out
+            return replace_static_urls(text, xblock=block, lookup_asset_url=self.lookup_asset_url)
+
+        course_id = block.scope_ids.usage_id.context_key
+        data_directory = getattr(block, 'data_dir', None)
+        static_asset_path = self.static_asset_path or block.static_asset_path
+        cache = get_replaced_urls_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = self._get_cache_key(block, text, data_directory, static_asset_path, static_replace_only)
+        if cache_key:
+            # The version of the assets is read before replacing the urls, so that the replaced text
+            # isn't used if an asset changes while they are replaced.
+            assets_version = get_course_assets_version(course_id)
+            entry = cache.get(cache_key)
+            hit = entry is not None and entry[0] == assets_version and entry[1] == text
+            monitoring.increment(f'static_replace.replaced_urls_cache.{"hit" if hit else "miss"}')
+            if hit:
+                return entry[2]
+
+        replaced = replace_all_urls(
+            text,
+            course_id=course_id,
+            data_directory=data_directory,
+            static_asset_path=static_asset_path,
+            static_paths_out=self.static_paths_out,
+            jump_to_id_base_url=self.jump_to_id_base_url,
+            static_replace_only=static_replace_only
+        )
+        if cache_key and assets_version is not None:
+            cache.set(
+                cache_key, (assets_version, text, replaced), settings.STATIC_REPLACE_REPLACED_URLS_CACHE_TIMEOUT
             )
-            if not static_replace_only:
-                text = replace_course_urls(text, block.scope_ids.usage_id.context_key)
-                if self.jump_to_id_base_url:
-                    text = replace_jump_to_id_urls(text, block.scope_ids.usage_id.context_key, self.jump_to_id_base_url)
+        return replaced
+
+    def _get_cache_key(self, block, text, data_directory, static_asset_path, static_replace_only):
+        """
+        Returns the key under which the content of ``block`` with its urls replaced is cached, or None if it isn't.
+
+        Only the content of blocks which render the same for every learner is cached, keyed by the version of
+        their definition, and by everything else the replaced urls depend on but the assets of the course, which
+        are versioned separately. The text is stored along with the replaced text, and must match for it to be
+        used. Text isn't cached when the static urls found in it are collected, since they are only collected
+        while replacing them.
+        """
+        if (
+            not getattr(settings, 'STATIC_REPLACE_REPLACED_URLS_CACHE_TIMEOUT', 0) or
+            self.static_paths_out is not None or
+            len(text) < REPLACED_URLS_CACHE_MIN_LENGTH or
+            not getattr(block, 'has_learner_invariant_content', False)
+        ):
+            return None
 
-        return text
+        options = hashlib.md5()
+        for part in (settings.STATIC_URL, data_directory, static_asset_path, self.jump_to_id_base_url):
+            options.update(b'\0' + str(part).encode('utf-8'))
+        mode = 'static' if static_replace_only else 'all'
+        return f"replaced_urls:{block.scope_ids.def_id}:{block.scope_ids.usage_id}:{mode}:{options.hexdigest()}"
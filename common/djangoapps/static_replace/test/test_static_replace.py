@@ -8,6 +8,7 @@ from urllib.parse import parse_qsl, quote, urlparse, urlunparse, urlencode
 
 import ddt
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import override_settings
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
@@ -17,12 +18,15 @@ from common.djangoapps.static_replace import (
     _url_replace_regex,
     make_static_urls_absolute,
     process_static_urls,
+    replace_all_urls,
     replace_course_urls,
     replace_static_urls,
     replace_jump_to_id_urls,
 )
 from common.djangoapps.static_replace.services import ReplaceURLService
+from common.djangoapps.static_replace.url_cache import AssetUrlCache, asset_url_cache
 from common.djangoapps.static_replace.wrapper import replace_urls_wrapper
+from openedx.core.djangoapps.contentserver.caching import del_cached_content
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.contentstore.content import StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.contentstore.django import contentstore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -31,7 +35,7 @@ from xmodule.modulestore import ModuleStoreEnum  # lint-amnesty, pylint: disable
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.mongo import MongoModuleStore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
-from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory, check_mongo_calls  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.xml import XMLModuleStore  # lint-amnesty, pylint: disable=wrong-import-order
 
 DATA_DIRECTORY = 'data_dir'
@@ -264,6 +268,103 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+ALL_URLS_SOURCE = (
+    '<img src="/static/a.png"/><a href="/course/about">About</a>'
+    '<a href=\'/jump_to_id/abc\'>Jump</a><script src="/static/b.js?raw"></script>'
+)
+
+
+@pytest.mark.parametrize('jump_to_id_base_url', [None, '/jump_to/'])
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_all_urls(mock_storage, jump_to_id_base_url):
+    """
+    Replacing all urls in a single scan gives the same result as replacing them in turn.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    expected_paths = []
+    expected = replace_course_urls(
+        replace_static_urls(ALL_URLS_SOURCE, course_id=COURSE_KEY, static_paths_out=expected_paths), COURSE_KEY
+    )
+    if jump_to_id_base_url:
+        expected = replace_jump_to_id_urls(expected, COURSE_KEY, jump_to_id_base_url)
+
+    static_paths = []
+    assert replace_all_urls(
+        ALL_URLS_SOURCE, COURSE_KEY, static_paths_out=static_paths, jump_to_id_base_url=jump_to_id_base_url
+    ) == expected
+    assert static_paths == expected_paths
+    assert '"/static/hashed/a.png"' in expected
+    assert '"/courses/org/course/run/about"' in expected
+    assert ("'/jump_to/abc'" in expected) == bool(jump_to_id_base_url)
+
+
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_all_urls_static_only(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    assert replace_all_urls(
+        ALL_URLS_SOURCE, COURSE_KEY, jump_to_id_base_url='/jump_to/', static_replace_only=True
+    ) == replace_static_urls(ALL_URLS_SOURCE, course_id=COURSE_KEY)
+
+
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_all_urls_data_dir(mock_storage):
+    mock_storage.exists.return_value = False
+    mock_storage.url.side_effect = lambda path: '/static/' + path
+    text = '"/static/file.png" "/static/data_dir/file.png" "/course/about"'
+
+    assert replace_all_urls(text, COURSE_KEY, data_directory=DATA_DIRECTORY, static_asset_path=DATA_DIRECTORY) == \
+        '"/static/data_dir/file.png" "/static/data_dir/file.png" "/courses/org/course/run/about"'
+
+
+@override_settings(STATIC_REPLACE_ASSET_URL_CACHE_SIZE=10)
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_resolved_asset_urls_cached(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.abc123.png'
+    asset_url_cache.clear()
+    try:
+        for __ in range(2):
+            assert replace_static_urls(STATIC_SOURCE, course_id=COURSE_KEY) == '"/static/file.abc123.png"'
+    finally:
+        asset_url_cache.clear()
+
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+def test_asset_url_cache_eviction():
+    cache = AssetUrlCache(max_size=2, timeout=60)
+    cache.set('a', '/a')
+    cache.set('b', '/b')
+    assert cache.get('a') == '/a'
+
+    # b is the least recently used url.
+    cache.set('c', '/c')
+    assert cache.get('b') is None
+    assert cache.get('a') == '/a'
+    assert cache.get('c') == '/c'
+
+
+def test_asset_url_cache_expiry():
+    cache = AssetUrlCache(max_size=2, timeout=60)
+    with patch('common.djangoapps.static_replace.url_cache.monotonic', return_value=100):
+        cache.set('a', '/a')
+    with patch('common.djangoapps.static_replace.url_cache.monotonic', return_value=159):
+        assert cache.get('a') == '/a'
+    with patch('common.djangoapps.static_replace.url_cache.monotonic', return_value=160):
+        assert cache.get('a') is None
+
+
+def test_asset_url_cache_disabled():
+    cache = AssetUrlCache(max_size=0)
+    cache.set('a', '/a')
+    assert cache.get('a') is None
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -617,11 +718,8 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         self.mock_replace_static_urls = self.create_patch(
             'common.djangoapps.static_replace.services.replace_static_urls'
         )
-        self.mock_replace_course_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_course_urls'
-        )
-        self.mock_replace_jump_to_id_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_jump_to_id_urls'
+        self.mock_replace_all_urls = self.create_patch(
+            'common.djangoapps.static_replace.services.replace_all_urls'
         )
 
     def create_patch(self, name):
@@ -632,45 +730,164 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
 
     def test_replace_static_url_only(self):
         """
-        Test only replace_static_urls method called when static_replace_only is passed as True.
+        Test only static urls are replaced when static_replace_only is passed as True.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['static_replace_only']
 
     def test_service_block_argument(self):
         """This service accepts either `block` or `xblock` keyword argument."""
         replace_url_service = ReplaceURLService(block=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['course_id'] == self.course.id
 
     def test_replace_course_urls_called(self):
         """
-        Test replace_course_urls method called static_replace_only is passed as False.
+        Test course urls are replaced when static_replace_only is passed as False.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_course_urls.called
+        assert not self.mock_replace_all_urls.call_args.kwargs['static_replace_only']
 
     def test_replace_jump_to_id_urls_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is provided.
+        Test jump-to-id urls are replaced when jump_to_id_base_url is provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course, jump_to_id_base_url="/course/course_id")
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['jump_to_id_base_url'] == "/course/course_id"
 
     def test_replace_jump_to_id_urls_not_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is not provided.
+        Test jump-to-id urls are not replaced when jump_to_id_base_url is not provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['jump_to_id_base_url'] is None
+
+    def test_lookup_asset_url(self):
+        """
+        Test only static urls are replaced, with lookup_asset_url, when it is provided.
+        """
+        lookup_asset_url = Mock()
+        replace_url_service = ReplaceURLService(xblock=self.course, lookup_asset_url=lookup_asset_url)
+        replace_url_service.replace_urls("text")
+        self.mock_replace_static_urls.assert_called_once_with(
+            "text", xblock=self.course, lookup_asset_url=lookup_asset_url
+        )
+        assert not self.mock_replace_all_urls.called
+
+
+@override_settings(STATIC_REPLACE_REPLACED_URLS_CACHE_TIMEOUT=60)
+@patch('openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE', LocMemCache('course-assets', {}))
+@ddt.ddt
+class ReplaceURLServiceCacheTest(SharedModuleStoreTestCase):
+    """
+    Test the cache of the content of blocks with its urls replaced by ReplaceURLService.
+    """
+    TEXT = '<img src="/static/image.png"/>' * 100
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.course = CourseFactory.create(org='TestX', number='TS03', run='2015')
+        cls.html_block = BlockFactory.create(parent=cls.course, category='html', data=cls.TEXT)
+        cls.user_html_block = BlockFactory.create(parent=cls.course, category='html', data='%%USER_ID%%' + cls.TEXT)
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch('common.djangoapps.static_replace.services.replace_all_urls', side_effect=replace_all_urls)
+        self.mock_replace_all_urls = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            'common.djangoapps.static_replace.services.get_replaced_urls_cache',
+            return_value=LocMemCache('replaced-urls', {}),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(del_cached_content, self.course.id.make_asset_key('asset', 'image.png'))
+
+    def test_cached(self):
+        replaced = ReplaceURLService(xblock=self.html_block).replace_urls(self.TEXT)
+
+        assert ReplaceURLService(xblock=self.html_block).replace_urls(self.TEXT) == replaced
+        assert self.mock_replace_all_urls.call_count == 1
+        assert '/asset-v1:TestX+TS03+2015+type@asset+block/image.png' in replaced
+
+    def test_cached_by_mode(self):
+        service = ReplaceURLService(xblock=self.html_block)
+        service.replace_urls(self.TEXT)
+        service.replace_urls(self.TEXT, static_replace_only=True)
+        ReplaceURLService(xblock=self.html_block, jump_to_id_base_url='/jump_to/').replace_urls(self.TEXT)
+
+        assert self.mock_replace_all_urls.call_count == 3
+
+    def test_other_text_not_used(self):
+        service = ReplaceURLService(xblock=self.html_block)
+        service.replace_urls(self.TEXT)
+        replaced = service.replace_urls(self.TEXT + '<a href="/course/info">')
+
+        assert self.mock_replace_all_urls.call_count == 2
+        assert replaced.endswith(f'<a href="/courses/{self.course.id}/info">')
+
+    def test_invalidated_when_assets_change(self):
+        service = ReplaceURLService(xblock=self.html_block)
+        service.replace_urls(self.TEXT)
+        del_cached_content(self.course.id.make_asset_key('asset', 'other.png'))
+        service.replace_urls(self.TEXT)
+
+        assert self.mock_replace_all_urls.call_count == 2
+
+    def test_assets_changed_while_replacing(self):
+        """
+        Text replaced while an asset of the course changes isn't used once it has changed.
+        """
+        def replace_while_asset_changes(*args, **kwargs):
+            del_cached_content(self.course.id.make_asset_key('asset', 'other.png'))
+            return replace_all_urls(*args, **kwargs)
+
+        service = ReplaceURLService(xblock=self.html_block)
+        self.mock_replace_all_urls.side_effect = replace_while_asset_changes
+        service.replace_urls(self.TEXT)
+        self.mock_replace_all_urls.side_effect = replace_all_urls
+        service.replace_urls(self.TEXT)
+        service.replace_urls(self.TEXT)
+
+        assert self.mock_replace_all_urls.call_count == 2
+
+    @ddt.data(
+        ('html_block', {'static_paths_out': []}, TEXT),
+        ('html_block', {}, '<img src="/static/image.png"/>'),
+        ('user_html_block', {}, TEXT),
+        ('course', {}, TEXT),
+    )
+    @ddt.unpack
+    def test_not_cached(self, block_name, service_kwargs, text):
+        service = ReplaceURLService(xblock=getattr(self, block_name), **service_kwargs)
+        service.replace_urls(text)
+        service.replace_urls(text)
+
+        assert self.mock_replace_all_urls.call_count == 2
+
+    def test_request_token_left_out(self):
+        """
+        The replaced content of a fragment is cached regardless of the request it is rendered for.
+        """
+        for request_token in ('abc123', 'def456'):
+            fragment = Fragment(f'<div data-request-token="{request_token}">{self.TEXT}</div>')
+            with patch.object(self.html_block.runtime, 'request_token', request_token, create=True):
+                replaced = replace_urls_wrapper(
+                    block=self.html_block,
+                    view='student_view',
+                    frag=fragment,
+                    context=None,
+                    replace_url_service=ReplaceURLService,
+                )
+            assert replaced.content.startswith(f'<div data-request-token="{request_token}">')
+            assert '/static/image.png' not in replaced.content
+
+        assert self.mock_replace_all_urls.call_count == 1
 
 
 @ddt.ddt
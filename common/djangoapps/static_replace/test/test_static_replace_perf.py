@@ -0,0 +1,100 @@
+"""
+Performance test for replacing the static, /course/ and /jump_to_id/ urls of course content.
+
+This compares replacing each kind of url in turn, as ReplaceURLService used to, with replacing
+all of them in a single scan, with and without the cache of resolved asset urls. The content is
+the HTML of the test courses in common/test/data. Run with::
+
+    pytest common/djangoapps/static_replace/test/test_static_replace_perf.py -s -p no:randomly
+
+after removing the ``unittest.skip`` decorator.
+"""
+
+
+import timeit
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+from opaque_keys.edx.keys import CourseKey
+
+from common.djangoapps.static_replace import (
+    replace_all_urls,
+    replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_static_urls
+)
+from common.djangoapps.static_replace.url_cache import asset_url_cache
+
+COURSE_KEY = CourseKey.from_string('course-v1:edX+Perf+2024')
+JUMP_TO_ID_BASE_URL = '/courses/course-v1:edX+Perf+2024/jump_to_id/'
+
+# Number of times the content is rendered.
+NUM_RENDERS = 200
+
+
+def load_course_html():
+    """
+    Return the HTML of the test courses, as a single page.
+    """
+    paths = sorted(Path(settings.COMMON_TEST_DATA_ROOT).glob('*/html/*.html'))
+    return '\n'.join(path.read_text(encoding='utf-8', errors='replace') for path in paths)
+
+
+@unittest.skip("Performance test, run manually")
+class ReplaceUrlsPerfTest(unittest.TestCase):
+    """
+    Compares the latency of replacing the urls of course content in turn and in a single scan.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.html = load_course_html()
+        patcher = patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+        mock_storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_storage.exists.return_value = True
+        mock_storage.url.side_effect = lambda path: '/static/' + path
+
+    def _replace_in_turn(self):
+        """
+        Replace each kind of url in turn.
+        """
+        text = replace_static_urls(self.html, course_id=COURSE_KEY)
+        text = replace_course_urls(text, COURSE_KEY)
+        return replace_jump_to_id_urls(text, COURSE_KEY, JUMP_TO_ID_BASE_URL)
+
+    def _replace_all(self):
+        """
+        Replace all urls in a single scan.
+        """
+        return replace_all_urls(self.html, COURSE_KEY, jump_to_id_base_url=JUMP_TO_ID_BASE_URL)
+
+    def _time(self, func):
+        """
+        Return the time taken per render by ``func``, in milliseconds.
+        """
+        return timeit.timeit(func, number=NUM_RENDERS) * 1000 / NUM_RENDERS
+
+    def test_replace_urls_timings(self):
+        assert self._replace_all() == self._replace_in_turn()
+
+        timings = {
+            'in turn': self._time(self._replace_in_turn),
+            'single scan': self._time(self._replace_all),
+        }
+        asset_url_cache.clear()
+        with override_settings(STATIC_REPLACE_ASSET_URL_CACHE_SIZE=1000):
+            timings['single scan, cached urls'] = self._time(self._replace_all)
+        asset_url_cache.clear()
+
+        print(f"\nPer render, for {len(self.html)} characters of course HTML:")
+        for name, millis in timings.items():
+            print(f"  {name:<25} {millis:10.3f} ms")
+
+        assert timings['single scan'] < timings['in turn']
@@ -0,0 +1,88 @@
+"""
+A process-local cache of the urls static urls of courses resolve to.
+"""
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from django.conf import settings
+
+
+class AssetUrlCache:
+    """
+    A process-local, bounded LRU cache of resolved asset urls, keyed by course and static url.
+
+    Resolving a ``/static/`` url of a course looks it up in the static files storage, and then
+    in the contentstore, for every url of every rendered block. The same few urls are resolved
+    over and over on each worker, so their results are kept here for a short while.
+
+    Entries expire after ``STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT`` seconds, since the url of an
+    asset changes when it is locked or unlocked, or when the asset base url changes. The cache
+    holds at most ``STATIC_REPLACE_ASSET_URL_CACHE_SIZE`` urls. A size of 0 disables it.
+    """
+
+    def __init__(self, max_size=None, timeout=None):
+        self._max_size = max_size
+        self._timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        """
+        The maximum number of cached urls.
+        """
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'STATIC_REPLACE_ASSET_URL_CACHE_SIZE', 0)
+
+    @property
+    def timeout(self):
+        """
+        The number of seconds urls are cached for.
+        """
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT', 60)
+
+    def get(self, key):
+        """
+        Return the url stored under ``key``, or None if it isn't cached or has expired.
+        """
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return url
+
+    def set(self, key, url):
+        """
+        Store ``url`` under ``key``, evicting the least recently used urls if the cache is full.
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+
+        with self._lock:
+            self._entries[key] = (url, monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every url from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+asset_url_cache = AssetUrlCache()
@@ -4,9 +4,24 @@ Wrapper function to replace static/course/jump-to-id URLs in XBlock to absolute
 
 from openedx.core.lib.xblock_utils import wrap_fragment
 
+# Stands for the request token in the content of fragments while their urls are replaced.
+REQUEST_TOKEN_PLACEHOLDER = '{{request-token}}'
+
 
 def replace_urls_wrapper(block, view, frag, context, replace_url_service, static_replace_only=False):  # pylint: disable=unused-argument
     """
     Replace any static/course/jump-to-id URLs in XBlock to absolute URLs.
+
+    The token of the request, which fragments are wrapped with, is taken out of their content while
+    their urls are replaced, so that the replaced content of blocks which render the same for every
+    learner can be cached across requests.
     """
-    return wrap_fragment(frag, replace_url_service(xblock=block).replace_urls(frag.content, static_replace_only))
+    content = frag.content
+    request_token = getattr(block.runtime, 'request_token', None)
+    if isinstance(request_token, str) and request_token and request_token in content:
+        content = replace_url_service(xblock=block).replace_urls(
+            content.replace(request_token, REQUEST_TOKEN_PLACEHOLDER), static_replace_only
+        ).replace(REQUEST_TOKEN_PLACEHOLDER, request_token)
+    else:
+        content = replace_url_service(xblock=block).replace_urls(content, static_replace_only)
+    return wrap_fragment(frag, content)
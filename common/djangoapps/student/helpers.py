@@ -10,14 +10,15 @@ import urllib.parse
 from collections import OrderedDict
 from datetime import datetime
 
-from completion.exceptions import UnavailableCompletionData
-from completion.utilities import get_key_to_last_completed_block
+from completion.models import BlockCompletion
 from django.conf import settings
 from django.contrib.auth import load_backend
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.core.validators import ValidationError
 from django.db import IntegrityError, ProgrammingError, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.urls import NoReverseMatch, reverse
 from django.utils.translation import gettext as _
 from pytz import UTC, timezone
@@ -767,27 +768,57 @@ def get_resume_urls_for_enrollments(user, enrollments):
                 if the value is '', then the user has not completed any blocks in the course run
     '''
     resume_course_urls = OrderedDict()
+    last_completed_block_keys = get_keys_to_last_completed_blocks(
+        user, [enrollment.course_id for enrollment in enrollments]
+    )
     for enrollment in enrollments:
-        try:
-            block_key = get_key_to_last_completed_block(user, enrollment.course_id)
+        block_key = last_completed_block_keys.get(enrollment.course_id)
+        url_to_block = ''
+        if block_key:
             try:
                 block_data = get_course_blocks(user, block_key)
             except UsageKeyNotInBlockStructure:
-                url_to_block = ''
+                pass
             else:
                 if block_key in block_data:
                     url_to_block = reverse(
                         'jump_to',
                         kwargs={'course_id': enrollment.course_id, 'location': block_key}
                     )
-                else:
-                    url_to_block = ''
-        except UnavailableCompletionData:
-            url_to_block = ''
         resume_course_urls[enrollment.course_id] = url_to_block
     return resume_course_urls
 
 
+def get_keys_to_last_completed_blocks(user, course_keys):
+    """
+    For a given user, return the key to the last completed block of each of the given course runs.
+
+    This is the bulk version of ``completion.utilities.get_key_to_last_completed_block``, which
+    takes one query per course run, whereas this takes a single query however many course runs
+    are given.
+
+    Arguments:
+        user: the user object for which we want the last completed blocks
+        course_keys (list): a list of CourseKeys
+
+    Returns:
+        last_completed_block_keys (dict): a dict of UsageKeys
+            key: CourseKey
+            value: key to the last completed block in the course run
+                course runs in which the user has not completed any blocks are left out
+    """
+    if not course_keys:
+        return {}
+    # The completions are numbered from the latest in each course run, in a single pass over them.
+    completions = BlockCompletion.objects.filter(
+        user=user,
+        context_key__in=course_keys,
+    ).annotate(
+        recency=Window(RowNumber(), partition_by=F('context_key'), order_by=(F('modified').desc(), F('id').desc())),
+    ).filter(recency=1)
+    return {completion.context_key: completion.full_block_key for completion in completions}
+
+
 def does_user_profile_exist(user):
     """
     Check if user has an associated profile.
@@ -782,6 +782,19 @@ def administrative_accesses_to_course_for_user(user, course_key):
     return global_staff, staff_access, instructor_access
 
 
+def administrative_accesses_to_courses_for_user(user, course_keys):
+    """
+    Returns types of access a user have for each of the given courses, by course key.
+
+    The roles of the user are loaded in a single query, and kept on the user, for all
+    the courses.
+    """
+    return {
+        course_key: administrative_accesses_to_course_for_user(user, course_key)
+        for course_key in course_keys
+    }
+
+
 @function_trace('_has_instructor_access_to_block')
 def _has_instructor_access_to_block(user, block, course_key):
     """Helper method that checks whether the user has staff access to
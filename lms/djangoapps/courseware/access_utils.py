@@ -131,30 +131,35 @@ def check_start_date(user, days_early_for_beta, start, course_key, display_error
     Returns:
         AccessResponse: Either ACCESS_GRANTED or StartDateError.
     """
-    start_dates_disabled = settings.FEATURES["DISABLE_START_DATES"]
-    masquerading_as_student = is_masquerading_as_student(user, course_key)
-
-    if start_dates_disabled and not masquerading_as_student:
+    if _has_start_date_passed(user, days_early_for_beta, start, course_key, now=now):
         return ACCESS_GRANTED
-    else:
-        if start is None or get_course_masquerade(user, course_key):
-            return ACCESS_GRANTED
 
-        if now is None:
-            now = datetime.now(UTC)
-        effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
+    # Before returning a StartDateError, determine if the learner should be redirected to the enterprise learner
+    # portal by returning StartDateEnterpriseLearnerError instead.
+    request = get_current_request()
+    if request and enterprise_learner_enrolled(request, user, course_key):
+        return StartDateEnterpriseLearnerError(start, display_error_to_user=display_error_to_user)
 
-        should_grant_access = now > effective_start
-        if should_grant_access:
-            return ACCESS_GRANTED
+    return StartDateError(start, display_error_to_user=display_error_to_user)
 
-        # Before returning a StartDateError, determine if the learner should be redirected to the enterprise learner
-        # portal by returning StartDateEnterpriseLearnerError instead.
-        request = get_current_request()
-        if request and enterprise_learner_enrolled(request, user, course_key):
-            return StartDateEnterpriseLearnerError(start, display_error_to_user=display_error_to_user)
 
-        return StartDateError(start, display_error_to_user=display_error_to_user)
+def _has_start_date_passed(user, days_early_for_beta, start, course_key, now=None):
+    """
+    Returns whether the given user is allowed access given the start date and the Beta
+    offset for the given course, see check_start_date.
+    """
+    start_dates_disabled = settings.FEATURES["DISABLE_START_DATES"]
+    masquerading_as_student = is_masquerading_as_student(user, course_key)
+
+    if start_dates_disabled and not masquerading_as_student:
+        return True
+    if start is None or get_course_masquerade(user, course_key):
+        return True
+
+    if now is None:
+        now = datetime.now(UTC)
+    effective_start = adjust_start_date(user, days_early_for_beta, start, course_key)
+    return now > effective_start
 
 
 def check_course_open_for_learner(user, course):
@@ -169,6 +174,25 @@ def check_course_open_for_learner(user, course):
     return check_start_date(user, course.days_early_for_beta, course.start, course.id)
 
 
+def are_courses_open_for_learner(user, courses):
+    """
+    Check which of the given courses are open for learners based on their start date.
+
+    Unlike check_course_open_for_learner, this doesn't look into why a course isn't open,
+    so that it doesn't take any queries beyond the one loading the roles of the user.
+
+    Returns:
+        dict: Whether each course is open for the learner, by course key.
+    """
+    if COURSE_PRE_START_ACCESS_FLAG.is_enabled():
+        return {course.id: True for course in courses}
+    now = datetime.now(UTC)
+    return {
+        course.id: _has_start_date_passed(user, course.days_early_for_beta, course.start, course.id, now=now)
+        for course in courses
+    }
+
+
 def check_enrollment(user, course):
     """
     Check if the course requires a learner to be enrolled for access.
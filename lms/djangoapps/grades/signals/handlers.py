@@ -5,6 +5,7 @@ Grades related signals.
 
 from contextlib import contextmanager
 from logging import getLogger
+from threading import local
 
 from django.dispatch import receiver
 from opaque_keys.edx.keys import LearningContextKey
@@ -20,7 +21,8 @@ from lms.djangoapps.courseware.model_data import get_score, set_score
 from lms.djangoapps.grades.tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
     recalculate_course_and_subsection_grades_for_user,
-    recalculate_subsection_grade_v3
+    recalculate_subsection_grade_v3,
+    recalculate_subsection_grades_v3_batch
 )
 from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
@@ -44,6 +46,11 @@ from openedx.core.djangoapps.signals.signals import (  # lint-amnesty, pylint: d
 
 log = getLogger(__name__)
 
+# Maximum number of subsection updates enqueued as a single task by bulk_subsection_updates.
+SUBSECTION_UPDATES_PER_TASK = 50
+
+_bulk_subsection_updates = local()
+
 
 @receiver(score_set, dispatch_uid='submissions_score_set_handler')
 def submissions_score_set_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -144,6 +151,33 @@ def disconnect_submissions_signal_receiver(signal):
         signal.connect(handler, dispatch_uid=dispatch_uid)
 
 
+@contextmanager
+def bulk_subsection_updates():
+    """
+    Context manager collecting the subsection updates enqueued by
+    enqueue_subsection_update in the current thread, which are enqueued
+    in batches of SUBSECTION_UPDATES_PER_TASK when exiting it, rather
+    than as a task each.
+
+    This is meant for updating the scores of many learners at once, e.g.
+    when rescoring a problem.  Nested uses are part of the outermost one.
+    """
+    if getattr(_bulk_subsection_updates, 'updates', None) is not None:
+        yield
+        return
+
+    _bulk_subsection_updates.updates = []
+    try:
+        yield
+    finally:
+        updates, _bulk_subsection_updates.updates = _bulk_subsection_updates.updates, None
+        for start in range(0, len(updates), SUBSECTION_UPDATES_PER_TASK):
+            recalculate_subsection_grades_v3_batch.apply_async(
+                kwargs=dict(updates=updates[start:start + SUBSECTION_UPDATES_PER_TASK]),
+                countdown=RECALCULATE_GRADE_DELAY_SECONDS,
+            )
+
+
 @receiver(SCORE_PUBLISHED)
 def score_published_handler(sender, block, user, raw_earned, raw_possible, only_if_higher, **kwargs):  # pylint: disable=unused-argument
     """
@@ -228,25 +262,32 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     """
     Handles the PROBLEM_WEIGHTED_SCORE_CHANGED or SUBSECTION_OVERRIDE_CHANGED signals by
     enqueueing a subsection update operation to occur asynchronously.
+
+    Within bulk_subsection_updates, the operation is enqueued along with others instead.
     """
     events.grade_updated(**kwargs)
     context_key = LearningContextKey.from_string(kwargs['course_id'])
     if not context_key.is_course:
         return  # If it's not a course, it has no subsections, so skip the subsection grading update
+    update_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=str(get_event_transaction_id()),
+        event_transaction_type=str(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
+        force_update_subsections=kwargs.get('force_update_subsections', False),
+    )
+    bulk_updates = getattr(_bulk_subsection_updates, 'updates', None)
+    if bulk_updates is not None:
+        bulk_updates.append(update_kwargs)
+        return
     recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=str(get_event_transaction_id()),
-            event_transaction_type=str(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-            force_update_subsections=kwargs.get('force_update_subsections', False),
-        ),
+        kwargs=update_kwargs,
         countdown=RECALCULATE_GRADE_DELAY_SECONDS,
     )
 
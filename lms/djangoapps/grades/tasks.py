@@ -190,6 +190,31 @@ def recalculate_subsection_grade_v3(self, **kwargs):
     _recalculate_subsection_grade(self, **kwargs)
 
 
+@shared_task(
+    bind=True,
+    base=LoggedPersistOnFailureTask,
+    time_limit=COURSE_GRADE_TIMEOUT_SECONDS,
+)
+@set_code_owner_attribute
+def recalculate_subsection_grades_v3_batch(self, updates):
+    """
+    Performs the subsection grade updates of a batch of recalculate_subsection_grade_v3
+    tasks, each given as the dict of its keyword arguments.  See bulk_subsection_updates.
+
+    Updates that fail are enqueued as recalculate_subsection_grade_v3 tasks, to be
+    retried individually.
+    """
+    for kwargs in updates:
+        try:
+            _update_subsection_grades_for_score(self, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.info("Grades: batched subsection update failed: {}. Retrying it individually. kwargs={}".format(
+                repr(exc),
+                kwargs,
+            ))
+            recalculate_subsection_grade_v3.apply_async(kwargs=kwargs, countdown=RETRY_DELAY_SECONDS)
+
+
 def _recalculate_subsection_grade(self, **kwargs):
     """
     Updates a saved subsection grade.
@@ -214,41 +239,7 @@ def _recalculate_subsection_grade(self, **kwargs):
             the changed score. Used in conjunction with expected_modified_time.
     """
     try:
-        course_key = CourseLocator.from_string(kwargs['course_id'])
-        if are_grades_frozen(course_key):
-            log.info("Attempted _recalculate_subsection_grade for course '%s', but grades are frozen.", course_key)
-            return
-
-        scored_block_usage_key = UsageKey.from_string(kwargs['usage_id']).replace(course_key=course_key)
-
-        set_custom_attributes_for_course_key(course_key)
-        set_custom_attribute('usage_id', str(scored_block_usage_key))
-
-        # The request cache is not maintained on celery workers,
-        # where this code runs. So we take the values from the
-        # main request cache and store them in the local request
-        # cache. This correlates model-level grading events with
-        # higher-level ones.
-        set_event_transaction_id(kwargs.get('event_transaction_id'))
-        set_event_transaction_type(kwargs.get('event_transaction_type'))
-
-        # Verify the database has been updated with the scores when the task was
-        # created. This race condition occurs if the transaction in the task
-        # creator's process hasn't committed before the task initiates in the worker
-        # process.
-        has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
-
-        if not has_database_updated:
-            raise ScoreNotFoundError
-
-        _update_subsection_grades(
-            course_key,
-            scored_block_usage_key,
-            kwargs['only_if_higher'],
-            kwargs['user_id'],
-            kwargs['score_deleted'],
-            kwargs.get('force_update_subsections', False),
-        )
+        _update_subsection_grades_for_score(self, **kwargs)
     except Exception as exc:
         if not isinstance(exc, KNOWN_RETRY_ERRORS):
             log.info("tnl-6244 grades unexpected failure: {}. task id: {}. kwargs={}".format(
@@ -259,6 +250,48 @@ def _recalculate_subsection_grade(self, **kwargs):
         raise self.retry(kwargs=kwargs, exc=exc)
 
 
+def _update_subsection_grades_for_score(self, **kwargs):
+    """
+    Updates the saved subsection grades affected by a changed score, as
+    described by the keyword arguments of _recalculate_subsection_grade.
+    """
+    course_key = CourseLocator.from_string(kwargs['course_id'])
+    if are_grades_frozen(course_key):
+        log.info("Attempted _recalculate_subsection_grade for course '%s', but grades are frozen.", course_key)
+        return
+
+    scored_block_usage_key = UsageKey.from_string(kwargs['usage_id']).replace(course_key=course_key)
+
+    set_custom_attributes_for_course_key(course_key)
+    set_custom_attribute('usage_id', str(scored_block_usage_key))
+
+    # The request cache is not maintained on celery workers,
+    # where this code runs. So we take the values from the
+    # main request cache and store them in the local request
+    # cache. This correlates model-level grading events with
+    # higher-level ones.
+    set_event_transaction_id(kwargs.get('event_transaction_id'))
+    set_event_transaction_type(kwargs.get('event_transaction_type'))
+
+    # Verify the database has been updated with the scores when the task was
+    # created. This race condition occurs if the transaction in the task
+    # creator's process hasn't committed before the task initiates in the worker
+    # process.
+    has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
+
+    if not has_database_updated:
+        raise ScoreNotFoundError
+
+    _update_subsection_grades(
+        course_key,
+        scored_block_usage_key,
+        kwargs['only_if_higher'],
+        kwargs['user_id'],
+        kwargs['score_deleted'],
+        kwargs.get('force_update_subsections', False),
+    )
+
+
 def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
     """
     Returns whether the database has been updated with the
@@ -24,7 +24,10 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from ..constants import ScoreDatabaseTableEnum
 from ..signals.handlers import (
+    SUBSECTION_UPDATES_PER_TASK,
+    bulk_subsection_updates,
     disconnect_submissions_signal_receiver,
+    enqueue_subsection_update,
     listen_for_course_grade_passed_first_time,
     listen_for_failing_grade,
     listen_for_passing_grade,
@@ -271,6 +274,76 @@ class ScoreChangedSignalRelayTest(TestCase):
                 pass
 
 
+@patch('lms.djangoapps.grades.signals.handlers.events', MagicMock())
+class BulkSubsectionUpdatesTest(TestCase):
+    """
+    Tests that bulk_subsection_updates enqueues the subsection updates in batches.
+    """
+    def setUp(self):
+        super().setUp()
+        self.single_task_mock = self.setup_patch('recalculate_subsection_grade_v3')
+        self.batch_task_mock = self.setup_patch('recalculate_subsection_grades_v3_batch')
+
+    def setup_patch(self, task_name):
+        """
+        Patches the given task in the handlers module and returns the mock.
+        """
+        patcher = patch(f'lms.djangoapps.grades.signals.handlers.{task_name}')
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def enqueue_subsection_update(self, user_id):
+        """
+        Handles a weighted score change of the given user.
+        """
+        enqueue_subsection_update(
+            **dict(PROBLEM_WEIGHTED_SCORE_CHANGED_KWARGS, user_id=user_id, course_id='course-v1:edX+TestX+Test')
+        )
+
+    def batched_user_ids(self):
+        """
+        Returns the lists of the user ids of the updates enqueued by each batch task.
+        """
+        return [
+            [update['user_id'] for update in call_args[1]['kwargs']['updates']]
+            for call_args in self.batch_task_mock.apply_async.call_args_list
+        ]
+
+    def test_bulk_updates(self):
+        num_updates = SUBSECTION_UPDATES_PER_TASK + 1
+        with bulk_subsection_updates():
+            for user_id in range(num_updates):
+                self.enqueue_subsection_update(user_id)
+            self.batch_task_mock.apply_async.assert_not_called()
+
+        assert self.batched_user_ids() == [list(range(SUBSECTION_UPDATES_PER_TASK)), [SUBSECTION_UPDATES_PER_TASK]]
+        self.single_task_mock.apply_async.assert_not_called()
+
+        self.enqueue_subsection_update(num_updates)
+        self.single_task_mock.apply_async.assert_called_once()
+        assert self.single_task_mock.apply_async.call_args[1]['kwargs']['user_id'] == num_updates
+
+    def test_nested(self):
+        with bulk_subsection_updates():
+            self.enqueue_subsection_update(1)
+            with bulk_subsection_updates():
+                self.enqueue_subsection_update(2)
+            self.batch_task_mock.apply_async.assert_not_called()
+        assert self.batched_user_ids() == [[1, 2]]
+
+    def test_enqueued_on_error(self):
+        with pytest.raises(ValueError):
+            with bulk_subsection_updates():
+                self.enqueue_subsection_update(1)
+                raise ValueError
+        assert self.batched_user_ids() == [[1]]
+
+    def test_no_updates(self):
+        with bulk_subsection_updates():
+            pass
+        self.batch_task_mock.apply_async.assert_not_called()
+
+
 class CourseEventsSignalsTest(ModuleStoreTestCase):
     """
     Tests to ensure that the courseware module correctly catches
@@ -32,7 +32,8 @@ from lms.djangoapps.grades.tasks import (
     compute_all_grades_for_course,
     compute_grades_for_course,
     compute_grades_for_course_v2,
-    recalculate_subsection_grade_v3
+    recalculate_subsection_grade_v3,
+    recalculate_subsection_grades_v3_batch
 )
 from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
 from xmodule.modulestore import ModuleStoreEnum
@@ -381,6 +382,55 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         assert not mock_log.info.called
         self._assert_retry_called(mock_retry)
 
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_batch(self, mock_subsection_signal):
+        """
+        Ensures that a batch of subsection grade recalculations is performed at once.
+        """
+        self.set_up_course()
+        other_user = UserFactory()
+        updates = [
+            self.recalculate_subsection_grade_kwargs,
+            dict(self.recalculate_subsection_grade_kwargs, user_id=other_user.id),
+        ]
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async') as mock_task_apply:
+            self._apply_recalculate_subsection_grades_batch(updates)
+        mock_task_apply.assert_not_called()
+        assert [call_args[1]['user'] for call_args in mock_subsection_signal.call_args_list] == [
+            self.user, other_user,
+        ]
+
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    @patch('lms.djangoapps.grades.subsection_grade_factory.SubsectionGradeFactory.update')
+    def test_batch_retries_individually(self, mock_update, mock_subsection_signal):
+        """
+        Ensures that recalculations failing in a batch are enqueued to be retried individually.
+        """
+        self.set_up_course()
+        mock_update.side_effect = [IntegrityError("WHAMMY"), None]
+        updates = [
+            self.recalculate_subsection_grade_kwargs,
+            dict(self.recalculate_subsection_grade_kwargs, user_id=UserFactory().id),
+        ]
+        with patch('lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async') as mock_task_apply:
+            self._apply_recalculate_subsection_grades_batch(updates)
+        mock_task_apply.assert_called_once_with(kwargs=updates[0], countdown=tasks.RETRY_DELAY_SECONDS)
+        assert mock_subsection_signal.call_count == 1
+
+    def _apply_recalculate_subsection_grades_batch(self, updates):
+        """
+        Calls the recalculate_subsection_grades_v3_batch task with necessary
+        mocking in place.
+        """
+        mock_score = MagicMock(
+            modified=datetime.utcnow().replace(tzinfo=pytz.UTC) + timedelta(days=1),
+            grade=1.0,
+            max_grade=2.0,
+        )
+        with self.mock_csm_get_score(mock_score):
+            with mock_get_score(1, 2):
+                recalculate_subsection_grades_v3_batch.apply(kwargs=dict(updates=updates))
+
     def _apply_recalculate_subsection_grade(
             self,
             mock_score=MagicMock(
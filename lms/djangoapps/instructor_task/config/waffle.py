@@ -29,6 +29,34 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.sharded_course_grade_reports
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, split the enrolled learners into shards of learner
+#   ids that are graded by parallel subtasks, each writing its own CSV part, which are then merged into the report.
+#   See ShardedCourseGradeReport.
+# .. toggle_use_cases: temporary, open_edx
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+SHARDED_COURSE_GRADE_REPORTS = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.sharded_course_grade_reports', __name__
+)
+
+# .. toggle_name: instructor_task.sharded_rescoring
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When rescoring a problem for all learners, split the learners' StudentModules into shards
+#   of ids that are rescored by parallel subtasks, which checkpoint their progress so that they resume where they
+#   left off if their worker is lost, and enqueue the resulting subsection grade updates in batches.
+#   See queue_module_state_shards.
+# .. toggle_use_cases: temporary, open_edx
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+SHARDED_RESCORING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.sharded_rescoring', __name__
+)
+
+
 
 def problem_grade_report_verified_only(course_id):
     """
@@ -55,3 +83,21 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_course_grade_reports(course_id):
+    """
+    Returns True if course grade reports should be generated
+    by parallel subtasks for shards of learners,
+    False otherwise.
+    """
+    return SHARDED_COURSE_GRADE_REPORTS.is_enabled(course_id)
+
+
+def use_sharded_rescoring(course_id):
+    """
+    Returns True if problems should be rescored by parallel
+    subtasks for shards of StudentModules in the given course,
+    False otherwise.
+    """
+    return SHARDED_RESCORING.is_enabled(course_id)
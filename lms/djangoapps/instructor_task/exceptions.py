@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+
+class SubtaskLockedException(DuplicateTaskException):
+    """Exception indicating that a subtask is already being executed, possibly by a lost worker."""
+    pass  # lint-amnesty, pylint: disable=unnecessary-pass
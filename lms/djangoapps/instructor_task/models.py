@@ -318,6 +318,19 @@ class DjangoStorageReportStore(ReportStore):
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer, parent_dir)
 
+    def open(self, course_id, filename, parent_dir=''):
+        """
+        Return a file-like object, opened in binary mode, for reading the file
+        named `filename` stored for the given `course_id`.
+        """
+        return self.storage.open(self.path_to(course_id, filename, parent_dir), 'rb')
+
+    def delete(self, course_id, filename, parent_dir=''):
+        """
+        Delete the file named `filename` stored for the given `course_id`, if any.
+        """
+        self.storage.delete(self.path_to(course_id, filename, parent_dir))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
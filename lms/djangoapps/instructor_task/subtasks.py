@@ -18,7 +18,7 @@ from django.db import DatabaseError, transaction
 
 from common.djangoapps.util.db import outer_atomic
 
-from .exceptions import DuplicateTaskException
+from .exceptions import DuplicateTaskException, SubtaskLockedException
 from .models import PROGRESS, QUEUING, InstructorTask
 
 TASK_LOG = logging.getLogger('edx.celery.task')
@@ -352,6 +352,59 @@ def queue_subtasks_for_query(
     return progress
 
 
+def queue_subtasks_for_shards(
+    entry,
+    action_name,
+    create_subtask_fcn,
+    shards,
+    total_num_items,
+    with_final_subtask=False,
+):
+    """
+    Queues a subtask for each of the given "shards" of the work to be done.
+
+    This is an alternative to queue_subtasks_for_query, for work that is split up front into
+    shards, such as ranges of ids, which the subtasks query themselves.
+
+    Arguments:
+        `entry` : the InstructorTask object for which subtasks are being queued.
+        `action_name` : a past-tense verb that can be used for constructing readable status messages.
+        `create_subtask_fcn` : a function of three arguments that constructs the desired kind of subtask object.
+            Arguments are the shard to be processed by this subtask, a SubtaskStatus object reflecting
+            initial status (and containing the subtask's id), and the id of the final subtask, if any.
+        `shards` : a list of JSON-serializable values defining the work of each subtask.
+        `total_num_items` : total amount of items that will be processed by the subtasks.
+        `with_final_subtask` : whether to also define a final subtask, which is not queued here.
+            It should be queued by the subtask that completes last among the shards' subtasks,
+            for which update_subtask_status returns 1, e.g. to combine their results.  The
+            InstructorTask is only done once the final subtask is done too.
+
+    Returns:  the task progress as stored in the InstructorTask object.
+    """
+    task_id = entry.task_id
+    subtask_id_list = [str(uuid4()) for _ in shards]
+    final_subtask_id = str(uuid4()) if with_final_subtask else None
+    all_subtask_ids = subtask_id_list + ([final_subtask_id] if with_final_subtask else [])
+
+    TASK_LOG.info(
+        "Task %s: updating InstructorTask %s with subtask info for %s subtasks to process %s items.",
+        task_id,
+        entry.id,
+        len(all_subtask_ids),
+        total_num_items,
+    )
+    # Make sure this is committed to database before handing off subtasks to celery.
+    with outer_atomic():
+        progress = initialize_subtask_info(entry, action_name, total_num_items, all_subtask_ids)
+
+    for shard, subtask_id in zip(shards, subtask_id_list):
+        new_subtask = create_subtask_fcn(shard, SubtaskStatus.create(subtask_id), final_subtask_id)
+        TASK_LOG.info("Task %s: queueing subtask %s for shard %s", task_id, subtask_id, shard)
+        new_subtask.apply_async()
+
+    return progress
+
+
 def _acquire_subtask_lock(task_id):
     """
     Mark the specified task_id as being in progress.
@@ -371,6 +424,17 @@ def _acquire_subtask_lock(task_id):
     return succeeded
 
 
+def _refresh_subtask_lock(task_id):
+    """
+    Extend the lock on the specified task_id, taken by _acquire_subtask_lock.
+
+    Subtasks running for longer than SUBTASK_LOCK_EXPIRE do this periodically, so that
+    their lock only expires if their worker is lost.
+    """
+    key = f"subtask-{task_id}"
+    cache.set(key, 'true', SUBTASK_LOCK_EXPIRE)
+
+
 def _release_subtask_lock(task_id):
     """
     Unmark the specified task_id as being no longer in progress.
@@ -453,7 +517,42 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
         format_str = "Unexpected task_id '{}': already being executed - for subtask of instructor task '{}'"
         msg = format_str.format(current_task_id, entry)
         TASK_LOG.warning(msg)
-        raise DuplicateTaskException(msg)
+        raise SubtaskLockedException(msg)
+
+
+def checkpoint_subtask_status(entry_id, current_task_id, new_subtask_status, checkpoint):
+    """
+    Record the progress of a subtask that is still running, so that it can be resumed from there.
+
+    `new_subtask_status` is the SubtaskStatus of the subtask so far, and `checkpoint` is a
+    JSON-serializable value describing the work it has done, both of which are returned by
+    get_subtask_checkpoint() when the subtask is run again, e.g. after its worker was lost.
+    Unlike update_subtask_status(), this doesn't count the subtask's results in the
+    InstructorTask's progress, and keeps the lock acquired in check_subtask_is_valid().
+    """
+    TASK_LOG.info("Checkpointing subtask %s of instructor task %d with status %s at %s",
+                  current_task_id, entry_id, new_subtask_status, checkpoint)
+    with outer_atomic():
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        subtask_dict['status'][current_task_id] = new_subtask_status.to_dict()
+        subtask_dict.setdefault('checkpoints', {})[current_task_id] = checkpoint
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.save()
+    _refresh_subtask_lock(current_task_id)
+
+
+def get_subtask_checkpoint(entry_id, current_task_id):
+    """
+    Return the SubtaskStatus and checkpoint last recorded by checkpoint_subtask_status()
+    for the subtask, or (None, None) if there are none.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    subtask_dict = json.loads(entry.subtasks)
+    checkpoint = subtask_dict.get('checkpoints', {}).get(current_task_id)
+    if checkpoint is None:
+        return None, None
+    return SubtaskStatus.from_dict(subtask_dict['status'][current_task_id]), checkpoint
 
 
 def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
@@ -467,16 +566,19 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns the number of subtasks of the InstructorTask that are not done yet, which
+    only the last subtask to complete sees reach zero.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
         if retry_count < MAX_DATABASE_LOCK_RETRIES:
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",  # lint-amnesty, pylint: disable=line-too-long
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -515,6 +617,8 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns the number of subtasks that are not done yet.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -577,3 +681,4 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         raise
+    return num_remaining
@@ -24,10 +24,18 @@ import logging
 from functools import partial
 
 from celery import shared_task
+from celery.states import FAILURE, SUCCESS
 from django.utils.translation import gettext_noop
 from edx_django_utils.monitoring import set_code_owner_attribute
 
 from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.exceptions import SubtaskLockedException
+from lms.djangoapps.instructor_task.subtasks import (
+    SUBTASK_LOCK_EXPIRE,
+    SubtaskStatus,
+    check_subtask_is_valid,
+    update_subtask_status
+)
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -35,7 +43,12 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    ShardedCourseGradeReport
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -50,6 +63,7 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     delete_problem_module_state,
     override_score_module_state,
     perform_module_state_update,
+    perform_module_state_update_for_shard,
     rescore_problem_module_state,
     reset_attempts_module_state
 )
@@ -81,11 +95,53 @@ def rescore_problem(entry_id, xblock_instance_args):
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = gettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xblock_instance_args)
+    create_shard_subtask = partial(_create_rescore_problem_shard_subtask, entry_id, xblock_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, create_shard_subtask=create_shard_subtask)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+def _create_rescore_problem_shard_subtask(entry_id, xblock_instance_args, shard, subtask_status, _final_subtask_id):
+    """
+    Returns the subtask rescoring the given shard of StudentModules.
+    """
+    return rescore_problem_shard.subtask(
+        (entry_id, xblock_instance_args, shard, subtask_status.to_dict()),
+        task_id=subtask_status.task_id,
+    )
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True)
+@set_code_owner_attribute
+def rescore_problem_shard(self, entry_id, xblock_instance_args, shard, subtask_status_dict):
+    """
+    Rescores the StudentModules of a shard of a problem's rescoring.  See queue_module_state_shards.
+
+    The task is acknowledged once done, so that it is run again if its worker is lost, in which
+    case it resumes from its last checkpoint.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    try:
+        check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+    except SubtaskLockedException as exc:
+        # If the worker running the subtask was lost, its lock expires
+        # since it isn't extended by checkpoints anymore, so try again then.
+        raise self.retry(exc=exc, countdown=SUBTASK_LOCK_EXPIRE)
+
+    update_fcn = partial(rescore_problem_module_state, xblock_instance_args)
+    try:
+        perform_module_state_update_for_shard(update_fcn, None, entry_id, shard, subtask_status)
+    except Exception:
+        TASK_LOG.exception("InstructorTask ID: %s, Failed to rescore shard %s", entry_id, shard['id_range'])
+        subtask_status.state = FAILURE
+        update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+        raise
+
+    subtask_status.state = SUCCESS
+    update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def override_problem_score(entry_id, xblock_instance_args):
@@ -197,10 +253,84 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
         xblock_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xblock_instance_args)
+    create_shard_subtask = partial(_create_course_grade_report_shard_subtask, entry_id, xblock_instance_args)
+    task_fn = partial(CourseGradeReport.generate, xblock_instance_args, create_shard_subtask=create_shard_subtask)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+def _create_course_grade_report_shard_subtask(entry_id, xblock_instance_args, shard, subtask_status, merge_subtask_id):
+    """
+    Returns the subtask generating the given shard of a ShardedCourseGradeReport.
+    """
+    return generate_course_grade_report_shard.subtask(
+        (entry_id, xblock_instance_args, shard, merge_subtask_id, subtask_status.to_dict()),
+        task_id=subtask_status.task_id,
+    )
+
+
+@shared_task
+@set_code_owner_attribute
+def generate_course_grade_report_shard(entry_id, xblock_instance_args, shard, merge_subtask_id, subtask_status_dict):
+    """
+    Grade the learners of a shard of a ShardedCourseGradeReport and store their rows.
+
+    The subtask that completes last queues the subtask merging the shards into the report.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+    try:
+        report = ShardedCourseGradeReport.from_entry(xblock_instance_args, entry_id)
+        succeeded, failed = report.generate_shard(shard)
+    except Exception:
+        TASK_LOG.exception(
+            "InstructorTask ID: %s, Failed to generate grade report shard %s", entry_id, shard['index']
+        )
+        subtask_status.increment(failed=shard['num_learners'], state=FAILURE)
+        _update_course_grade_report_shard_status(
+            entry_id, xblock_instance_args, shard, merge_subtask_id, subtask_status
+        )
+        raise
+
+    subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+    _update_course_grade_report_shard_status(entry_id, xblock_instance_args, shard, merge_subtask_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _update_course_grade_report_shard_status(entry_id, xblock_instance_args, shard, merge_subtask_id, subtask_status):
+    """
+    Updates the status of a shard's subtask, queueing the merge subtask if it was the last one.
+    """
+    if update_subtask_status(entry_id, subtask_status.task_id, subtask_status) == 1:
+        merge_course_grade_report.apply_async(
+            (entry_id, xblock_instance_args, shard['num_shards'], SubtaskStatus.create(merge_subtask_id).to_dict()),
+            task_id=merge_subtask_id,
+        )
+
+
+@shared_task(base=BaseInstructorTask)
+@set_code_owner_attribute
+def merge_course_grade_report(entry_id, xblock_instance_args, num_shards, subtask_status_dict):
+    """
+    Merge the rows stored by the shards of a ShardedCourseGradeReport into the report.
+
+    Fails, without uploading a report, if any of the shards failed. The failure is recorded in
+    the status of this subtask, then BaseInstructorTask.on_failure sets the InstructorTask's state
+    to FAILURE, with the exception as its output.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+    try:
+        ShardedCourseGradeReport.from_entry(xblock_instance_args, entry_id).merge_shards(num_shards)
+    except Exception:
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
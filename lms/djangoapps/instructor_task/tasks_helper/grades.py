@@ -2,8 +2,11 @@
 Functionality for generating grade reports.
 """
 
+import codecs
 import csv
+import json
 import logging
+import os
 import re
 from collections import OrderedDict, defaultdict
 from datetime import datetime
@@ -35,7 +38,10 @@ from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_course_grade_reports,
 )
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_shards
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -92,6 +98,7 @@ class _CourseGradeReportContext:
             course_id=course_id,
             task_input=_task_input,
         )
+        self.entry_id = _entry_id
         self.action_name = action_name
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
@@ -443,27 +450,44 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_learners_filter(self):
+        """
+        Returns the filter arguments of the query for the users enrolled in the course.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return filter_kwargs
+
+    def _enrolled_learner_ids(self, user_id_range=None):
         """
-        Returns a generator of batches of users.
+        Returns the ordered ids of the users enrolled in the course, limited
+        to the given (first id, last id) range, if any.
+        """
+        user_ids = get_user_model().objects.filter(**self._enrolled_learners_filter())
+        if user_id_range is not None:
+            user_ids = user_ids.filter(id__range=user_id_range)
+        return user_ids.values_list('id', flat=True).order_by('id')
+
+    def _batch_users(self, user_id_range=None):
+        """
+        Returns a generator of batches of users, limited to the given
+        (first id, last id) range, if any.
         """
         def grouper(iterable, chunk_size=100, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course():
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
-            user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            filter_kwargs = self._enrolled_learners_filter()
+            user_ids_list = self._enrolled_learner_ids(user_id_range)
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
@@ -477,10 +501,7 @@ class GradeReportBase:
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
-        )
+        return get_enrolled_learners_for_course()
 
     def log_additional_info_for_testing(self, message):
         """
@@ -496,11 +517,12 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, user_id_range=None):
         """
-        A generator of batches of (success_rows, error_rows) for this report.
+        A generator of batches of (success_rows, error_rows) for this report,
+        limited to the users in the given (first id, last id) range, if any.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(user_id_range):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -513,12 +535,18 @@ class CourseGradeReport(GradeReportBase):
     USER_BATCH_SIZE = 100
 
     @classmethod
-    def generate(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name):
+    def generate(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name, create_shard_subtask=None):  # lint-amnesty, pylint: disable=line-too-long
         """
         Public method to generate a grade report.
+
+        If `create_shard_subtask` is given and sharded course grade reports
+        are enabled for the course, queues subtasks to generate the report
+        instead.  See ShardedCourseGradeReport.queue_shards.
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            if create_shard_subtask and use_sharded_course_grade_reports(course_id):
+                return ShardedCourseGradeReport(context).queue_shards(create_shard_subtask)
             if use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
@@ -706,6 +734,185 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course Grade Report generated by parallel subtasks.  The enrolled learners are
+    split into shards of consecutive learner ids, and a subtask for each shard writes
+    the rows for its learners to CSV parts in the report store.  Once all of them are
+    done, a final subtask streams the parts into the report and uploads it.
+    """
+    # Maximum number of learners graded by each subtask.
+    LEARNERS_PER_SHARD = 5000
+
+    # Size of the chunks in which CSV parts are read when merged.
+    MERGE_CHUNK_SIZE = 1024 * 1024
+
+    @classmethod
+    def from_entry(cls, _xblock_instance_args, _entry_id):
+        """
+        Returns the report for the given InstructorTask, for use by its subtasks.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        return cls(_CourseGradeReportContext(
+            _xblock_instance_args,
+            _entry_id,
+            entry.course_id,
+            json.loads(entry.task_input),
+            json.loads(entry.task_output)['action_name'],
+        ))
+
+    def queue_shards(self, create_shard_subtask):
+        """
+        Queues a subtask for each shard of learners, created by calling
+        `create_shard_subtask` with the shard, the initial SubtaskStatus of the
+        subtask and the id of the final subtask that merges the shards' parts.
+        A shard is a dict with the following keys:
+
+            'index': position of the shard in the report
+            'num_shards': total number of shards
+            'user_id_range': (first id, last id) of the shard's learners
+            'num_learners': number of learners in the shard
+
+        Returns the task progress as stored in the InstructorTask object.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        if len(entry.subtasks) > 0:
+            # The task was requeued after its subtasks were queued, which
+            # may still be running, so don't queue them again.
+            TASK_LOG.warning('%s, Subtasks are already queued for the grade report', self.context.task_info_string)
+            return json.loads(entry.task_output)
+
+        learner_ids = list(self._enrolled_learner_ids())
+        if not learner_ids:
+            return self._generate()
+
+        learner_id_chunks = [
+            learner_ids[start:start + self.LEARNERS_PER_SHARD]
+            for start in range(0, len(learner_ids), self.LEARNERS_PER_SHARD)
+        ]
+        shards = [
+            {
+                'index': index,
+                'num_shards': len(learner_id_chunks),
+                'user_id_range': (learner_id_chunk[0], learner_id_chunk[-1]),
+                'num_learners': len(learner_id_chunk),
+            }
+            for index, learner_id_chunk in enumerate(learner_id_chunks)
+        ]
+        self.context.update_status(f'ShardedCourseGradeReport - Queueing {len(shards)} shards')
+        return queue_subtasks_for_shards(
+            entry,
+            self.context.action_name,
+            create_shard_subtask,
+            shards,
+            len(learner_ids),
+            with_final_subtask=True,
+        )
+
+    def generate_shard(self, shard):
+        """
+        Writes the rows for the learners of the given shard to its CSV parts.
+        Returns the number of learners that succeeded and failed.
+        """
+        succeeded, failed = 0, 0
+        with modulestore().bulk_operations(self.context.course_id):
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                success_writer = csv.writer(success_file)
+                error_writer = csv.writer(error_file)
+                for success_rows, error_rows in self._batched_rows(shard['user_id_range']):
+                    success_writer.writerows(success_rows)
+                    error_writer.writerows(error_rows)
+                    succeeded += len(success_rows)
+                    failed += len(error_rows)
+
+                report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+                for part_file, is_error_part in ((success_file, False), (error_file, True)):
+                    part_filename = self._part_filename(shard['index'], is_error_part)
+                    # Replace the part stored by a previous attempt, which
+                    # the storage would otherwise store under another name.
+                    report_store.delete(self.context.course_id, part_filename, self.context.upload_parent_dir)
+                    part_file.seek(0)
+                    report_store.store(
+                        self.context.course_id, part_filename, part_file, self.context.upload_parent_dir
+                    )
+
+        TASK_LOG.info(
+            '%s, Task type: %s, Wrote grade report shard %s of %s: %s succeeded, %s failed',
+            self.context.task_info_string, self.context.action_name,
+            shard['index'] + 1, shard['num_shards'], succeeded, failed,
+        )
+        return succeeded, failed
+
+    def merge_shards(self, num_shards):
+        """
+        Streams the CSV parts of the given number of shards into the report
+        and uploads it, then deletes the parts.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        try:
+            subtasks = json.loads(InstructorTask.objects.get(pk=self.context.entry_id).subtasks)
+            if subtasks['failed'] > 0:
+                raise ValueError(f"{subtasks['failed']} of the grade report's shards failed")
+
+            with modulestore().bulk_operations(self.context.course_id):
+                with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                    csv.writer(success_file).writerow(self._success_headers())
+                    csv.writer(error_file).writerow(self._error_headers())
+
+                    has_errors = False
+                    for index in range(num_shards):
+                        self._append_part(report_store, index, False, success_file)
+                        has_errors |= self._append_part(report_store, index, True, error_file)
+                        self.context.update_status(
+                            f'ShardedCourseGradeReport - Merged {index + 1} of {num_shards} shards'
+                        )
+
+                    self.upload_temp_files(success_file, error_file, has_errors)
+        finally:
+            for index in range(num_shards):
+                for is_error_part in (False, True):
+                    report_store.delete(
+                        self.context.course_id,
+                        self._part_filename(index, is_error_part),
+                        self.context.upload_parent_dir,
+                    )
+
+        return self.context.update_status('ShardedCourseGradeReport - Completed grades')
+
+    def _append_part(self, report_store, index, is_error_part, target_file):
+        """
+        Appends the contents of the given CSV part to target_file.
+        Returns whether the part had any rows.
+        """
+        has_rows = False
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        part_file = report_store.open(
+            self.context.course_id,
+            self._part_filename(index, is_error_part),
+            self.context.upload_parent_dir,
+        )
+        with part_file:
+            for chunk in iter(lambda: part_file.read(self.MERGE_CHUNK_SIZE), b''):
+                target_file.write(decoder.decode(chunk))
+                has_rows = True
+        target_file.write(decoder.decode(b'', final=True))
+        return has_rows
+
+    def _part_filename(self, index, is_error_part):
+        """
+        Returns the name of the given CSV part of the report.
+        """
+        return os.path.join(
+            'grade_report_parts',
+            str(self.context.entry_id),
+            '{filename}{suffix}_{index:05d}.csv'.format(
+                filename=self.context.upload_filename,
+                suffix='_err' if is_error_part else '',
+                index=index,
+            ),
+        )
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -20,18 +20,29 @@ from lms.djangoapps.courseware.courses import get_problems_in_section
 from lms.djangoapps.courseware.model_data import FieldDataCache
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
+from lms.djangoapps.grades.api import bulk_subsection_updates
 from lms.djangoapps.grades.api import events as grades_events
 from openedx.core.lib.courses import get_course_by_id
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
+from ..config.waffle import use_sharded_rescoring
 from ..exceptions import UpdateProblemModuleStateError
+from ..models import PROGRESS, InstructorTask
+from ..subtasks import checkpoint_subtask_status, get_subtask_checkpoint, queue_subtasks_for_shards
 from .runner import TaskProgress
 from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED, UPDATE_STATUS_SUCCEEDED
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Maximum number of StudentModules updated by each subtask of a sharded update.
+MODULES_PER_SHARD = 1000
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+# Number of StudentModules updated by the subtask of a shard between checkpoints of its progress.
+MODULES_PER_CHECKPOINT = 100
+
+
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                create_shard_subtask=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -58,33 +69,28 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     next level, so that it can set the failure modes and capture the error trace in the InstructorTask and the
     result object.
 
+    If `create_shard_subtask` is given and sharded rescoring is enabled for the course, the student modules of
+    all students are updated by subtasks instead, see queue_module_state_shards.  The return value is then the
+    task progress as stored in the InstructorTask object.
+
     """
     start_time = time()
-    usage_keys = []
-    problem_url = task_input.get('problem_url')
-    entrance_exam_url = task_input.get('entrance_exam_url')
     student_identifier = task_input.get('student')
     override_score_task = action_name == gettext_noop('overridden')
-    problems = {}
-
-    # if problem_url is present make a usage key from it
-    if problem_url:
-        usage_key = UsageKey.from_string(problem_url).map_into_course(course_id)
-        usage_keys.append(usage_key)
-
-        # find the problem block:
-        problem_block = modulestore().get_item(usage_key)
-        problems[str(usage_key)] = problem_block
-
-    # if entrance_exam is present grab all problems in it
-    if entrance_exam_url:
-        problems = get_problems_in_section(entrance_exam_url)
-        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
 
     modules_to_update = _get_modules_to_update(
         course_id, usage_keys, student_identifier, filter_fcn, override_score_task
     )
 
+    if (
+        create_shard_subtask is not None and
+        student_identifier is None and
+        use_sharded_rescoring(course_id) and
+        modules_to_update.exists()
+    ):
+        return queue_module_state_shards(_entry_id, action_name, create_shard_subtask, modules_to_update)
+
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
@@ -108,6 +114,92 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     return task_progress.update_task_state()
 
 
+def queue_module_state_shards(entry_id, action_name, create_shard_subtask, modules_to_update):
+    """
+    Queues a subtask for each shard of up to MODULES_PER_SHARD of the given StudentModules, by
+    consecutive ids, created by calling `create_shard_subtask` like the `create_subtask_fcn` of
+    queue_subtasks_for_shards.  Each subtask should update its shard with
+    perform_module_state_update_for_shard.  A shard is a dict with the following keys:
+
+        'id_range': [first id, last id] of the shard's StudentModules
+        'num_modules': number of StudentModules in the shard
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    if len(entry.subtasks) > 0:
+        # The task was requeued after its subtasks were queued, which
+        # may still be running, so don't queue them again.
+        TASK_LOG.warning('InstructorTask ID: %s, Subtasks are already queued for the update', entry_id)
+        return json.loads(entry.task_output)
+
+    shards = []
+    for module_id in modules_to_update.order_by('id').values_list('id', flat=True).iterator():
+        if not shards or shards[-1]['num_modules'] == MODULES_PER_SHARD:
+            shards.append({'id_range': [module_id, module_id], 'num_modules': 0})
+        shards[-1]['id_range'][1] = module_id
+        shards[-1]['num_modules'] += 1
+
+    return queue_subtasks_for_shards(
+        entry,
+        action_name,
+        create_shard_subtask,
+        shards,
+        sum(shard['num_modules'] for shard in shards),
+    )
+
+
+def perform_module_state_update_for_shard(update_fcn, filter_fcn, entry_id, shard, subtask_status):
+    """
+    Performs the update of perform_module_state_update on the StudentModules of a shard queued by
+    queue_module_state_shards, in order of id, counting the results in the given SubtaskStatus.
+
+    The progress is checkpointed every MODULES_PER_CHECKPOINT StudentModules, and resumed from the
+    last checkpoint if the subtask is run again, e.g. after its worker was lost.  The subsection grade
+    updates resulting from the new scores of the StudentModules are enqueued in bulk at each checkpoint.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_input = json.loads(entry.task_input)
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
+
+    first_id, last_id = shard['id_range']
+    checkpoint_status, checkpoint = get_subtask_checkpoint(entry_id, subtask_status.task_id)
+    if checkpoint is not None:
+        TASK_LOG.info(
+            'InstructorTask ID: %s, Resuming subtask %s after StudentModule %s',
+            entry_id, subtask_status.task_id, checkpoint['last_id'],
+        )
+        for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
+            setattr(subtask_status, statname, getattr(checkpoint_status, statname))
+        first_id = checkpoint['last_id'] + 1
+    subtask_status.state = PROGRESS
+
+    modules_to_update = _get_modules_to_update(course_id, usage_keys, None, filter_fcn).order_by('id')
+    while True:
+        modules_page = list(modules_to_update.filter(id__range=(first_id, last_id))[:MODULES_PER_CHECKPOINT])
+        if not modules_page:
+            break
+
+        with bulk_subsection_updates():
+            for module_to_update in modules_page:
+                block = problems[str(module_to_update.module_state_key)]
+                update_status = update_fcn(block, module_to_update, task_input)
+                if update_status == UPDATE_STATUS_SUCCEEDED:
+                    subtask_status.increment(succeeded=1)
+                elif update_status == UPDATE_STATUS_FAILED:
+                    subtask_status.increment(failed=1)
+                elif update_status == UPDATE_STATUS_SKIPPED:
+                    # Like in perform_module_state_update, skipped modules count as attempted.
+                    subtask_status.increment(skipped=1)
+                    subtask_status.attempted += 1
+                else:
+                    raise UpdateProblemModuleStateError(f"Unexpected update_status returned: {update_status}")
+
+        first_id = modules_page[-1].id + 1
+        checkpoint_subtask_status(entry_id, subtask_status.task_id, subtask_status, {'last_id': modules_page[-1].id})
+
+
 @outer_atomic
 def rescore_problem_module_state(xblock_instance_args, block, student_module, task_input):
     '''
@@ -389,6 +481,33 @@ def _get_task_id_from_xblock_args(xblock_instance_args):
         return xblock_instance_args.get('task_id', UNKNOWN_TASK_ID)
 
 
+def _get_problems_to_update(course_id, task_input):
+    """
+    Returns the usage keys of the problems to update for the given task input,
+    and a dict of their blocks by the string of their usage key.
+    """
+    usage_keys = []
+    problem_url = task_input.get('problem_url')
+    entrance_exam_url = task_input.get('entrance_exam_url')
+    problems = {}
+
+    # if problem_url is present make a usage key from it
+    if problem_url:
+        usage_key = UsageKey.from_string(problem_url).map_into_course(course_id)
+        usage_keys.append(usage_key)
+
+        # find the problem block:
+        problem_block = modulestore().get_item(usage_key)
+        problems[str(usage_key)] = problem_block
+
+    # if entrance_exam is present grab all problems in it
+    if entrance_exam_url:
+        problems = get_problems_in_section(entrance_exam_url)
+        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+
+    return usage_keys, problems
+
+
 def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn, override_score_task=False):
     """
     Fetches a StudentModule instances for a given `course_id`, `student` object, and `usage_keys`.
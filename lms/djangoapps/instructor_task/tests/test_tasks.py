@@ -12,27 +12,43 @@ from uuid import uuid4
 import pytest
 import ddt
 from celery.states import FAILURE, SUCCESS
+from django.core.cache import cache
 from django.utils.translation import gettext_noop
+from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import i4xEncoder
 
 from common.djangoapps.course_modes.models import CourseMode
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
+from lms.djangoapps.instructor_task.config.waffle import SHARDED_COURSE_GRADE_REPORTS, SHARDED_RESCORING
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
-from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, checkpoint_subtask_status
 from lms.djangoapps.instructor_task.tasks import (
+    calculate_grades_csv,
     delete_problem_state,
     export_ora2_data,
     export_ora2_submission_files,
     export_ora2_summary,
     generate_certificates,
+    generate_course_grade_report_shard,
+    merge_course_grade_report,
     override_problem_score,
     rescore_problem,
+    rescore_problem_shard,
     reset_problem_attempts
 )
+from lms.djangoapps.instructor_task.tasks_helper.grades import ShardedCourseGradeReport
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
-from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
+from lms.djangoapps.instructor_task.tests.test_base import (
+    InstructorTaskCourseTestCase,
+    InstructorTaskModuleTestCase,
+    TestReportMixin
+)
+from common.test.utils import assert_dict_contains_subset
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
 PROBLEM_URL_NAME = "test_urlname"
 
@@ -490,6 +506,182 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         )
 
 
+@patch('lms.djangoapps.instructor_task.tasks_helper.module_state.MODULES_PER_CHECKPOINT', 2)
+@patch('lms.djangoapps.instructor_task.tasks_helper.module_state.MODULES_PER_SHARD', 3)
+@override_waffle_flag(SHARDED_RESCORING, active=True)
+class TestShardedRescoreInstructorTask(TestInstructorTasks):
+    """Tests problem-rescoring instructor task, rescoring shards of StudentModules in subtasks."""
+
+    def setUp(self):
+        super().setUp()
+        self.mock_instance = MagicMock()
+        self.mock_instance.rescore.return_value = None
+        self.mock_instance.has_submitted_answer.return_value = True
+        patcher = patch(
+            'lms.djangoapps.instructor_task.tasks_helper.module_state.get_block_for_descriptor',
+            return_value=self.mock_instance,
+        )
+        self.mock_get_block = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _queue_shards(self, task_entry):
+        """
+        Runs the rescoring task, returning the arguments of the queued subtasks.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks.rescore_problem_shard.subtask') as mock_subtask:
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        return [call_args[0][0] for call_args in mock_subtask.call_args_list]
+
+    def _run_shard(self, subtask_args):
+        """
+        Runs the subtask with the given arguments.
+        """
+        return rescore_problem_shard.apply(subtask_args, task_id=subtask_args[3]['task_id']).get()
+
+    def test_sharded_rescoring_success(self):
+        num_students = 7
+        self._create_students_with_state(num_students)
+        task_entry = self._create_input_entry()
+        subtasks_args = self._queue_shards(task_entry)
+        assert [args[2]['num_modules'] for args in subtasks_args] == [3, 3, 1]
+        self.mock_instance.rescore.assert_not_called()
+        assert InstructorTask.objects.get(id=task_entry.id).task_state != SUCCESS
+
+        with patch('lms.djangoapps.grades.signals.handlers.recalculate_subsection_grades_v3_batch'):
+            for subtask_args in subtasks_args:
+                subtask_status = self._run_shard(subtask_args)
+                assert subtask_status['state'] == SUCCESS
+
+        assert self.mock_instance.rescore.call_count == num_students
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        assert_dict_contains_subset(
+            self,
+            {'total': num_students, 'attempted': num_students, 'succeeded': num_students, 'failed': 0},
+            json.loads(entry.task_output),
+        )
+        assert entry.task_state == SUCCESS
+
+    def test_sharded_rescoring_resumes(self):
+        students = self._create_students_with_state(3)
+        task_entry = self._create_input_entry()
+        [subtask_args] = self._queue_shards(task_entry)
+
+        # Checkpoint the progress after the first StudentModule, then lose the worker,
+        # whose lock expires since the checkpoints don't extend it anymore.
+        first_module = StudentModule.objects.filter(student=students[0]).get()
+        subtask_status = SubtaskStatus.from_dict(subtask_args[3])
+        subtask_status.increment(succeeded=1)
+        checkpoint_subtask_status(task_entry.id, subtask_status.task_id, subtask_status, {'last_id': first_module.id})
+        cache.delete(f'subtask-{subtask_status.task_id}')
+
+        subtask_status = self._run_shard(subtask_args)
+        assert subtask_status['state'] == SUCCESS
+        assert self.mock_instance.rescore.call_count == 2
+        assert [call_args.kwargs['user'] for call_args in self.mock_get_block.call_args_list] == students[1:]
+        assert_dict_contains_subset(
+            self,
+            {'attempted': 3, 'succeeded': 3},
+            json.loads(InstructorTask.objects.get(id=task_entry.id).task_output),
+        )
+
+    def test_sharded_rescoring_locked(self):
+        self._create_students_with_state(1)
+        task_entry = self._create_input_entry()
+        [subtask_args] = self._queue_shards(task_entry)
+        lock_key = f"subtask-{subtask_args[3]['task_id']}"
+        cache.add(lock_key, 'true')
+        self.addCleanup(cache.delete, lock_key)
+
+        with patch('lms.djangoapps.instructor_task.tasks.rescore_problem_shard.retry') as mock_retry:
+            mock_retry.return_value = TestTaskFailure()
+            with pytest.raises(TestTaskFailure):
+                self._run_shard(subtask_args)
+        mock_retry.assert_called_once()
+        self.mock_instance.rescore.assert_not_called()
+
+
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+@patch.object(ShardedCourseGradeReport, 'LEARNERS_PER_SHARD', 2)
+@override_waffle_flag(SHARDED_COURSE_GRADE_REPORTS, active=True)
+class TestShardedCourseGradeReportInstructorTask(TestReportMixin, InstructorTaskCourseTestCase):
+    """Tests the course grade report instructor task, grading shards of learners in subtasks."""
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{index}', f'student{index}@example.com') for index in range(3)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+        )
+
+    def _queue_shards(self):
+        """
+        Runs the grade report task, returning the arguments of the queued subtasks.
+        """
+        current_task = Mock()
+        current_task.request.id = self.entry.task_id
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', return_value=current_task):
+            with patch(
+                'lms.djangoapps.instructor_task.tasks.generate_course_grade_report_shard.subtask'
+            ) as mock_subtask:
+                calculate_grades_csv.apply([self.entry.id, {}], task_id=self.entry.task_id).get()
+        return [call_args[0][0] for call_args in mock_subtask.call_args_list]
+
+    def _run_shards(self, subtasks_args):
+        """
+        Runs the subtasks with the given arguments, returning the arguments of the queued merge subtasks.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks.merge_course_grade_report.apply_async') as mock_merge:
+            for subtask_args in subtasks_args:
+                generate_course_grade_report_shard.apply(subtask_args, task_id=subtask_args[4]['task_id']).get()
+        return mock_merge.call_args_list
+
+    def _run_merge(self, merge_call):
+        """
+        Runs the merge subtask queued with the given call.
+        """
+        return merge_course_grade_report.apply(*merge_call.args, **merge_call.kwargs).get()
+
+    def test_merge_queued_by_last_shard(self):
+        subtasks_args = self._queue_shards()
+        assert [args[2]['num_learners'] for args in subtasks_args] == [2, 1]
+
+        assert not self._run_shards(subtasks_args[:1])
+        [merge_call] = self._run_shards(subtasks_args[1:])
+        assert InstructorTask.objects.get(id=self.entry.id).task_state != SUCCESS
+
+        subtask_status = self._run_merge(merge_call)
+        assert subtask_status['state'] == SUCCESS
+        self.verify_rows_in_csv(
+            [
+                {'Student ID': str(student.id), 'Email': student.email, 'Username': student.username}
+                for student in self.students
+            ],
+            ignore_other_columns=True,
+        )
+        entry = InstructorTask.objects.get(id=self.entry.id)
+        assert entry.task_state == SUCCESS
+        assert_dict_contains_subset(self, {'total': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+
+    def test_failed_shard(self):
+        subtasks_args = self._queue_shards()
+
+        with patch.object(ShardedCourseGradeReport, 'generate_shard', side_effect=TestTaskFailure('shard failed')):
+            with pytest.raises(TestTaskFailure):
+                self._run_shards(subtasks_args[:1])
+        [merge_call] = self._run_shards(subtasks_args[1:])
+
+        with pytest.raises(ValueError):
+            self._run_merge(merge_call)
+        entry = InstructorTask.objects.get(id=self.entry.id)
+        assert entry.task_state == FAILURE
+        assert "1 of the grade report's shards failed" in json.loads(entry.task_output)['message']
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert not report_store.links_for(self.course.id)
+
+
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
     """Tests instructor task that resets problem attempts."""
 
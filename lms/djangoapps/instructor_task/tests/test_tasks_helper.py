@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,6 +15,7 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
@@ -21,6 +23,7 @@ import unicodecsv
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
+from edx_toggles.toggles.testutils import override_waffle_flag
 from freezegun import freeze_time
 from pytz import UTC
 
@@ -39,6 +42,9 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.config.waffle import SHARDED_COURSE_GRADE_REPORTS
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -47,6 +53,7 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -55,6 +62,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -438,6 +446,90 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+@patch.object(ShardedCourseGradeReport, 'LEARNERS_PER_SHARD', 2)
+@override_waffle_flag(SHARDED_COURSE_GRADE_REPORTS, active=True)
+class TestShardedCourseGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that course grade reports are generated by shards of learners.
+    """
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{index}', f'student{index}@example.com') for index in range(5)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+        )
+
+    def _queue_shards(self):
+        """
+        Generates the report, returning the task progress and the shards whose subtasks were queued.
+        """
+        create_shard_subtask = Mock()
+        result = CourseGradeReport.generate(
+            None, self.entry.id, self.course.id, {}, 'graded', create_shard_subtask=create_shard_subtask
+        )
+        return result, [call_args[0][0] for call_args in create_shard_subtask.call_args_list]
+
+    def _generate_shards(self, shards):
+        """
+        Runs the work of the given shards' subtasks.
+        """
+        for shard in shards:
+            report = ShardedCourseGradeReport.from_entry(None, self.entry.id)
+            assert report.generate_shard(shard) == (shard['num_learners'], 0)
+
+    def _part_filenames(self):
+        """
+        Returns the names of the stored CSV parts of the report.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        parts_dir = report_store.path_to(self.course.id, os.path.join('grade_report_parts', str(self.entry.id)))
+        _, filenames = report_store.storage.listdir(parts_dir)
+        return filenames
+
+    def test_sharded_report(self):
+        result, shards = self._queue_shards()
+        assert_dict_contains_subset(self, {'action_name': 'graded', 'total': 5}, result)
+        assert [shard['num_learners'] for shard in shards] == [2, 2, 1]
+        assert [shard['index'] for shard in shards] == [0, 1, 2]
+        assert json.loads(InstructorTask.objects.get(pk=self.entry.id).subtasks)['total'] == 4
+
+        self._generate_shards(shards)
+        ShardedCourseGradeReport.from_entry(None, self.entry.id).merge_shards(len(shards))
+
+        self.verify_rows_in_csv(
+            [
+                {'Student ID': str(student.id), 'Email': student.email, 'Username': student.username}
+                for student in self.students
+            ],
+            ignore_other_columns=True,
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert not any('grade_report_err' in link[0] for link in report_store.links_for(self.course.id))
+        assert not self._part_filenames()
+
+    def test_already_queued(self):
+        result, shards = self._queue_shards()
+        assert self._queue_shards() == (result, [])
+        assert len(shards) == 3
+
+    def test_failed_shard(self):
+        _, shards = self._queue_shards()
+        self._generate_shards(shards[1:])
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        entry.subtasks = json.dumps(dict(json.loads(entry.subtasks), failed=1))
+        entry.save()
+
+        with pytest.raises(ValueError):
+            ShardedCourseGradeReport.from_entry(None, self.entry.id).merge_shards(len(shards))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert not report_store.links_for(self.course.id)
+        assert not self._part_filenames()
+
+
 @ddt.ddt
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
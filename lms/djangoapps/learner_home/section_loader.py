@@ -0,0 +1,210 @@
+"""
+Loading of the sections of the learner home, concurrently when enabled.
+
+The learner home is assembled from the results of many independent loaders, several of
+which make remote calls to the catalog or ecommerce services. Run one after another, the
+time to load the dashboard is the sum of their times. The SectionLoader runs each loader
+as soon as the sections it depends on are loaded, so that it is bound by the slowest chain
+of dependent loaders instead.
+
+Sections which the dashboard can be rendered without are given a default, which is used
+when their loader fails or takes longer than the timeout. Those are loaded on a shared,
+bounded thread pool, while the sections the dashboard can't be rendered without are loaded
+on the thread of the request, so that they never wait for a worker held by a slow section.
+A section which times out keeps its worker until its loader returns, so the remote calls
+made by loaders must have timeouts of their own.
+"""
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import monotonic
+
+from crum import get_current_request, set_current_request
+from django.conf import settings
+from django.db import close_old_connections
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
+
+logger = logging.getLogger(__name__)
+
+# Default of sections which can't be left out of the learner home.
+REQUIRED = object()
+
+_SECTION_EXECUTOR = None
+_SECTION_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_section_executor():
+    """
+    Return the thread pool used to load sections with a default concurrently.
+
+    It is shared by every request in the process, so the number of concurrently running
+    loaders per process is bounded by the ``LEARNER_HOME_SECTION_LOADER_WORKERS`` setting.
+    """
+    global _SECTION_EXECUTOR  # pylint: disable=global-statement
+    if _SECTION_EXECUTOR is None:
+        with _SECTION_EXECUTOR_LOCK:
+            if _SECTION_EXECUTOR is None:
+                _SECTION_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'LEARNER_HOME_SECTION_LOADER_WORKERS', 8),
+                    thread_name_prefix='learner-home',
+                )
+    return _SECTION_EXECUTOR
+
+
+class SectionLoader:
+    """
+    Loads named sections, each from a loader called with the results of the sections it requires.
+
+    Usage::
+
+        loader = SectionLoader(concurrent=True)
+        loader.add("enrollments", lambda: get_enrollments(user))
+        loader.add("programs", lambda enrollments: get_programs(user, enrollments),
+                   requires=["enrollments"], default={})
+        sections = loader.run()
+
+    Sections are loaded in the order they are added unless ``concurrent`` is set, so they
+    must be added after the sections they require. When it is, sections with a default are
+    loaded on the thread pool and the others on the calling thread. The time taken by each
+    section is kept in ``timings`` and reported as a custom attribute.
+    """
+
+    def __init__(self, concurrent=False, timeout=None):
+        """
+        Arguments:
+            concurrent (bool): Whether to load independent sections concurrently.
+            timeout (float): The number of seconds after which a section with a default is
+                no longer waited for, when loaded concurrently. Defaults to the
+                ``LEARNER_HOME_SECTION_TIMEOUT`` setting.
+        """
+        self.concurrent = concurrent
+        self.timeout = timeout if timeout is not None else getattr(settings, 'LEARNER_HOME_SECTION_TIMEOUT', None)
+        self.sections = {}
+        self.timings = {}
+
+    def add(self, name, loader, requires=(), default=REQUIRED):
+        """
+        Add the section ``name``, loaded by calling ``loader`` with the results of the
+        sections named in ``requires``, in order.
+
+        If a ``default`` is given, it is used as the result of the section when its loader
+        fails, or times out, instead of failing the whole request.
+        """
+        for required in requires:
+            if required not in self.sections:
+                raise ValueError(f"Section {name} requires unknown section {required}")
+        self.sections[name] = (loader, tuple(requires), default)
+
+    def run(self):
+        """
+        Load every section and return their results by name.
+        """
+        if self.concurrent:
+            results = self._run_concurrently()
+        else:
+            results = {}
+            for name in self.sections:
+                results[name] = self._load(name, self._args(name, results))
+
+        for name, duration in self.timings.items():
+            # .. custom_attribute_name: learner_home.section.<name>_ms
+            # .. custom_attribute_description: The time taken to load each section of the learner
+            #   home, in milliseconds, e.g. learner_home.section.programs_ms.
+            monitoring_utils.set_custom_attribute(f'learner_home.section.{name}_ms', round(duration * 1000, 1))
+        return results
+
+    def _load(self, name, args):
+        """
+        Call the loader of the section with ``args``, falling back to the default of the section
+        if it fails and has one.
+        """
+        loader, __, default = self.sections[name]
+        start = monotonic()
+        try:
+            return loader(*args)
+        except Exception:  # pylint: disable=broad-except
+            if default is REQUIRED:
+                raise
+            logger.exception("Failed to load learner home section %s, leaving it out", name)
+            monitoring_utils.increment('learner_home.section.failures')
+            return default
+        finally:
+            self.timings[name] = monotonic() - start
+
+    def _load_in_worker(self, request, name, args):
+        """
+        Load the section on a thread of the pool, in the context of ``request``.
+
+        The request cache of the thread is cleared before and after, since it is only
+        cleared at the end of requests on the threads serving them, and database
+        connections the thread is done with are closed.
+        """
+        set_current_request(request)
+        RequestCache.clear_all_namespaces()
+        try:
+            return self._load(name, args)
+        finally:
+            RequestCache.clear_all_namespaces()
+            set_current_request(None)
+            close_old_connections()
+
+    def _run_concurrently(self):
+        """
+        Load sections as soon as the sections they require are loaded: those with a default
+        on the thread pool, and the others one at a time on this thread in the meantime.
+        """
+        executor = get_section_executor()
+        request = get_current_request()
+        results = {}
+        pending = dict(self.sections)
+        running = {}
+
+        while pending or running:
+            ready = [
+                name for name, (__, requires, __) in pending.items()
+                if all(required in results for required in requires)
+            ]
+            for name in ready:
+                if self.sections[name][2] is not REQUIRED:
+                    future = executor.submit(self._load_in_worker, request, name, self._args(name, results))
+                    running[future] = (name, monotonic())
+                    del pending[name]
+
+            inline = next((name for name in ready if name in pending), None)
+            if inline is not None:
+                del pending[inline]
+                results[inline] = self._load(inline, self._args(inline, results))
+            elif running:
+                wait(running, timeout=self._time_to_next_deadline(running), return_when=FIRST_COMPLETED)
+            else:
+                raise ValueError(f"Sections {', '.join(pending)} can't be loaded")
+
+            for future, (name, started) in list(running.items()):
+                if future.done():
+                    del running[future]
+                    results[name] = future.result()
+                elif self.timeout and monotonic() - started >= self.timeout:
+                    logger.warning("Learner home section %s timed out, leaving it out", name)
+                    monitoring_utils.increment('learner_home.section.timeouts')
+                    # This only stops loaders which haven't started yet.
+                    future.cancel()
+                    del running[future]
+                    results[name] = self.sections[name][2]
+                    self.timings[name] = monotonic() - started
+
+        return results
+
+    def _args(self, name, results):
+        """
+        Return the results of the sections required by the section ``name``, in order.
+        """
+        return [results[required] for required in self.sections[name][1]]
+
+    def _time_to_next_deadline(self, running):
+        """
+        Return the time until the first running section times out, or None.
+        """
+        if not self.timeout:
+            return None
+        return max(min(started + self.timeout for __, started in running.values()) - monotonic(), 0)
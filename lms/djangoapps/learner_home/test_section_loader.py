@@ -0,0 +1,107 @@
+"""
+Tests for the loading of the sections of the learner home.
+"""
+
+import threading
+from unittest import TestCase
+from unittest.mock import ANY, patch
+
+import ddt
+
+from lms.djangoapps.learner_home.section_loader import SectionLoader
+
+
+def _fail():
+    """Loader which fails"""
+    raise ValueError("Unavailable")
+
+
+@ddt.ddt
+class TestSectionLoader(TestCase):
+    """
+    Tests for SectionLoader, sequential and concurrent.
+    """
+
+    @ddt.data(False, True)
+    def test_sections_loaded_with_required_sections(self, concurrent):
+        loader = SectionLoader(concurrent=concurrent)
+        loader.add("enrollments", lambda: ["course-1", "course-2"])
+        loader.add("programs", lambda enrollments: len(enrollments), requires=["enrollments"])
+        loader.add(
+            "both",
+            lambda programs, enrollments: (programs, enrollments[0]),
+            requires=["programs", "enrollments"],
+        )
+
+        sections = loader.run()
+
+        assert sections == {
+            "enrollments": ["course-1", "course-2"],
+            "programs": 2,
+            "both": (2, "course-1"),
+        }
+        assert set(loader.timings) == set(sections)
+
+    def test_unknown_required_section(self):
+        loader = SectionLoader()
+
+        with self.assertRaises(ValueError):
+            loader.add("programs", lambda enrollments: enrollments, requires=["enrollments"])
+
+    @ddt.data(False, True)
+    def test_failed_section_with_default(self, concurrent):
+        loader = SectionLoader(concurrent=concurrent)
+        loader.add("enrollments", lambda: [])
+        loader.add("programs", _fail, default={})
+
+        with patch("lms.djangoapps.learner_home.section_loader.monitoring_utils") as mock_monitoring:
+            sections = loader.run()
+
+        assert sections == {"enrollments": [], "programs": {}}
+        mock_monitoring.increment.assert_called_once_with("learner_home.section.failures")
+        mock_monitoring.set_custom_attribute.assert_any_call("learner_home.section.programs_ms", ANY)
+
+    @ddt.data(False, True)
+    def test_failed_required_section(self, concurrent):
+        loader = SectionLoader(concurrent=concurrent)
+        loader.add("enrollments", _fail)
+
+        with self.assertRaises(ValueError):
+            loader.run()
+
+    def test_independent_sections_loaded_concurrently(self):
+        # The loaders only get past the barrier if all of them run at the same time.
+        barrier = threading.Barrier(3, timeout=5)
+        loader = SectionLoader(concurrent=True)
+        loader.add("enrollments", lambda: barrier.wait() is not None)
+        loader.add("programs", lambda: barrier.wait() is not None, default={})
+        loader.add("credit_statuses", lambda: barrier.wait() is not None, default={})
+
+        assert loader.run() == {"enrollments": True, "programs": True, "credit_statuses": True}
+
+    def test_required_sections_loaded_on_calling_thread(self):
+        loader = SectionLoader(concurrent=True)
+        loader.add("enrollments", threading.current_thread)
+        loader.add("programs", threading.current_thread, default=None)
+        loader.add("email_confirmation", lambda enrollments: threading.current_thread(), requires=["enrollments"])
+
+        sections = loader.run()
+
+        assert sections["enrollments"] is threading.current_thread()
+        assert sections["email_confirmation"] is threading.current_thread()
+        assert sections["programs"] is not threading.current_thread()
+
+    def test_slow_section_times_out(self):
+        released = threading.Event()
+        loader = SectionLoader(concurrent=True, timeout=0.1)
+        loader.add("enrollments", lambda: [])
+        loader.add("programs", lambda: released.wait(5), default={})
+
+        try:
+            with patch("lms.djangoapps.learner_home.section_loader.monitoring_utils") as mock_monitoring:
+                sections = loader.run()
+        finally:
+            released.set()
+
+        assert sections == {"enrollments": [], "programs": {}}
+        mock_monitoring.increment.assert_called_once_with("learner_home.section.timeouts")
@@ -9,6 +9,7 @@ from urllib.parse import urlencode
 from uuid import uuid4
 
 import ddt
+from completion.test_utils import CompletionWaffleTestMixin, submit_completions_for_testing
 from django.conf import settings
 from django.urls import reverse
 from django.utils import timezone
@@ -22,6 +23,7 @@ from common.djangoapps.student.tests.factories import (
     CourseEnrollmentFactory,
     UserFactory,
 )
+from common.djangoapps.student.roles import CourseStaffRole
 from common.djangoapps.util.course import get_encoded_course_sharing_utm_params
 from lms.djangoapps.bulk_email.models import Optout
 from lms.djangoapps.learner_home.test_utils import (
@@ -30,6 +32,7 @@ from lms.djangoapps.learner_home.test_utils import (
     random_url,
 )
 from lms.djangoapps.learner_home.views import (
+    check_course_access,
     get_course_overviews_for_pseudo_sessions,
     get_course_programs,
     get_email_settings_info,
@@ -41,6 +44,7 @@ from lms.djangoapps.learner_home.views import (
     get_entitlements,
     get_social_share_settings,
     get_course_share_urls,
+    get_resume_urls_for_course_enrollments,
 )
 from openedx.core.djangoapps.catalog.tests.factories import (
     CourseFactory as CatalogCourseFactory,
@@ -196,6 +200,62 @@ class TestGetEnrollments(SharedModuleStoreTestCase):
         self.assertEqual(course_mode_info, {})
 
 
+class TestGetResumeUrlsForCourseEnrollments(CompletionWaffleTestMixin, SharedModuleStoreTestCase):
+    """Tests for get_resume_urls_for_course_enrollments"""
+
+    def setUp(self):
+        super().setUp()
+        self.override_waffle_switch(True)
+        self.user = UserFactory()
+
+    def test_resume_urls(self):
+        # Given enrollments in courses where blocks were completed in all but one
+        enrollments = [create_test_enrollment(self.user) for _ in range(3)]
+        for enrollment in enrollments[:2]:
+            submit_completions_for_testing(
+                self.user,
+                [enrollment.course_id.make_usage_key("video", f"video_{i}") for i in range(3)],
+            )
+
+        # When I get the resume urls, in a single query
+        with self.assertNumQueries(1):
+            resume_urls = get_resume_urls_for_course_enrollments(self.user, enrollments)
+
+        # Then they jump to the last completed block of the courses
+        for enrollment in enrollments[:2]:
+            assert resume_urls[enrollment.course_id] == reverse(
+                "jump_to",
+                kwargs={
+                    "course_id": enrollment.course_id,
+                    "location": enrollment.course_id.make_usage_key("video", "video_2"),
+                },
+            )
+
+        # ... and are blank for the course that wasn't started
+        assert resume_urls[enrollments[2].course_id] is None
+
+
+class TestCheckCourseAccess(SharedModuleStoreTestCase):
+    """Tests for check_course_access"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+
+    def test_staff_access(self):
+        # Given enrollments in courses where the user is staff in one
+        enrollments = [create_test_enrollment(self.user) for _ in range(3)]
+        CourseStaffRole(enrollments[0].course_id).add_users(self.user)
+
+        # When I check access to the courses
+        course_access = check_course_access(self.user, enrollments)
+
+        # Then the user only has staff access to that course
+        assert course_access[enrollments[0].course_id]["user_has_staff_access"]
+        for enrollment in enrollments[1:]:
+            assert not course_access[enrollment.course_id]["user_has_staff_access"]
+
+
 class TestGetEntitlements(SharedModuleStoreTestCase):
     """Tests for get_entitlements"""
 
@@ -5,8 +5,6 @@ Views for Learner Home
 import logging
 from collections import OrderedDict
 
-from completion.exceptions import UnavailableCompletionData
-from completion.utilities import get_key_to_last_completed_block
 from django.conf import settings
 from django.urls import reverse
 from edx_django_utils import monitoring as monitoring_utils
@@ -25,6 +23,7 @@ from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.edxmako.shortcuts import marketing_link
 from common.djangoapps.student.helpers import (
     cert_info,
+    get_keys_to_last_completed_blocks,
     user_has_passing_grade_in_course,
 )
 from common.djangoapps.student.views.dashboard import (
@@ -45,14 +44,16 @@ from lms.djangoapps.branding import toggles
 from lms.djangoapps.bulk_email.models import Optout
 from lms.djangoapps.bulk_email.models_api import is_bulk_email_feature_enabled
 from lms.djangoapps.commerce.utils import EcommerceService
-from lms.djangoapps.courseware.access import administrative_accesses_to_course_for_user
-from lms.djangoapps.courseware.access_utils import check_course_open_for_learner
+from lms.djangoapps.courseware.access import administrative_accesses_to_courses_for_user
+from lms.djangoapps.courseware.access_utils import are_courses_open_for_learner
+from lms.djangoapps.learner_home.section_loader import SectionLoader
 from lms.djangoapps.learner_home.serializers import (
     LearnerDashboardSerializer,
 )
 from lms.djangoapps.learner_home.utils import (
     get_masquerade_user,
 )
+from lms.djangoapps.learner_home.waffle import ENABLE_CONCURRENT_SECTION_LOADING
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.programs.utils import ProgramProgressMeter
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
@@ -268,18 +269,18 @@ def get_resume_urls_for_course_enrollments(user, course_enrollments):
     in course structure for better performance.
     """
     resume_course_urls = OrderedDict()
+    last_completed_block_keys = get_keys_to_last_completed_blocks(
+        user, [enrollment.course_id for enrollment in course_enrollments]
+    )
     for enrollment in course_enrollments:
+        # If the user hasn't started the course, the jump URL will be None
         url_to_block = None
-        try:
-            block_key = get_key_to_last_completed_block(user, enrollment.course_id)
-            if block_key:
-                url_to_block = reverse(
-                    "jump_to",
-                    kwargs={"course_id": enrollment.course_id, "location": block_key},
-                )
-        except UnavailableCompletionData:
-            # This is acceptable, the user hasn't started the course so jump URL will be None
-            pass
+        block_key = last_completed_block_keys.get(enrollment.course_id)
+        if block_key:
+            url_to_block = reverse(
+                "jump_to",
+                kwargs={"course_id": enrollment.course_id, "location": block_key},
+            )
         resume_course_urls[enrollment.course_id] = url_to_block
     return resume_course_urls
 
@@ -324,17 +325,22 @@ def check_course_access(user, course_enrollments):
         user, course_enrollments
     )
 
+    courses_open_for_learner = are_courses_open_for_learner(
+        user, [course_enrollment.course for course_enrollment in course_enrollments]
+    )
+    administrative_accesses = administrative_accesses_to_courses_for_user(
+        user, [course_enrollment.course_id for course_enrollment in course_enrollments]
+    )
+
     for course_enrollment in course_enrollments:
         course_access_dict[course_enrollment.course_id] = {
             "has_unmet_prerequisites": course_enrollment.course_id
             in courses_with_unmet_prerequisites,
-            "is_too_early_to_view": not check_course_open_for_learner(
-                user, course_enrollment.course
-            ),
+            "is_too_early_to_view": not courses_open_for_learner[
+                course_enrollment.course_id
+            ],
             "user_has_staff_access": any(
-                administrative_accesses_to_course_for_user(
-                    user, course_enrollment.course_id
-                )
+                administrative_accesses[course_enrollment.course_id]
             ),
         }
 
@@ -478,101 +484,119 @@ class InitializeView(APIView):  # pylint: disable=unused-argument
         """
         Load information required for displaying the learner home
         """
+        loader = SectionLoader(concurrent=ENABLE_CONCURRENT_SECTION_LOADING.is_enabled())
+
         # Determine if user needs to confirm email account
-        email_confirmation = get_user_account_confirmation_info(user)
+        loader.add("email_confirmation", lambda: get_user_account_confirmation_info(user))
 
         # Gather info for enterprise dashboard
-        enterprise_customer = get_enterprise_customer(user, self.request, is_masquerade)
+        loader.add(
+            "enterprise_customer",
+            lambda: get_enterprise_customer(user, self.request, is_masquerade),
+            default=None,
+        )
 
         # Get site-wide social sharing config
-        social_share_settings = get_social_share_settings()
+        loader.add("social_share_settings", get_social_share_settings)
 
         # Get platform-level settings
-        platform_settings = get_platform_settings()
+        loader.add("platform_settings", get_platform_settings)
 
         # Get the org whitelist or the org blacklist for the current site
-        site_org_whitelist, site_org_blacklist = get_org_block_and_allow_lists()
+        loader.add("org_lists", get_org_block_and_allow_lists)
 
         # Get entitlements and course overviews for serializing
-        (
-            fulfilled_entitlements_by_course_key,
-            unfulfilled_entitlements,
-            course_entitlement_available_sessions,
-            unfulfilled_entitlement_pseudo_sessions,
-        ) = get_entitlements(user, site_org_whitelist, site_org_blacklist)
-        pseudo_session_course_overviews = get_course_overviews_for_pseudo_sessions(
-            unfulfilled_entitlement_pseudo_sessions
+        loader.add(
+            "entitlements",
+            lambda org_lists: get_entitlements(user, *org_lists),
+            requires=["org_lists"],
         )
-
-        # Get enrollments
-        course_enrollments, course_mode_info = get_enrollments(
-            user, site_org_whitelist, site_org_blacklist
+        loader.add(
+            "pseudo_session_course_overviews",
+            lambda entitlements: get_course_overviews_for_pseudo_sessions(entitlements[3]),
+            requires=["entitlements"],
         )
 
-        # Get audit access deadlines
-        audit_access_deadlines = get_audit_access_deadlines(user, course_enrollments)
-
-        # Get email opt-outs for student
-        show_email_settings_for, course_optouts = get_email_settings_info(
-            user, course_enrollments
+        # Get enrollments
+        loader.add(
+            "enrollments",
+            lambda org_lists: get_enrollments(user, *org_lists),
+            requires=["org_lists"],
         )
 
-        # Get grade passing status by course
-        grade_statuses = get_user_grade_passing_statuses(course_enrollments)
-
-        # Get cert status by course
-        cert_statuses = get_cert_statuses(user, course_enrollments)
-
-        # Determine view access for course, (for showing courseware link) involves:
-        course_access_checks = check_course_access(user, course_enrollments)
-
-        # Get programs related to the courses the user is enrolled in
-        programs = get_course_programs(user, course_enrollments, self.request.site)
+        # The rest of the sections only depend on the enrollments, and the learner home
+        # can be rendered without them.
+        enrollment_sections = {
+            # Get audit access deadlines
+            "audit_access_deadlines": (lambda enrollments: get_audit_access_deadlines(user, enrollments), {}),
+            # Get email opt-outs for student
+            "email_settings": (lambda enrollments: get_email_settings_info(user, enrollments), ((), ())),
+            # Get grade passing status by course
+            "grade_statuses": (get_user_grade_passing_statuses, {}),
+            # Get cert status by course
+            "cert_statuses": (lambda enrollments: get_cert_statuses(user, enrollments), {}),
+            # Determine view access for course, (for showing courseware link)
+            "course_access_checks": (lambda enrollments: check_course_access(user, enrollments), {}),
+            # Get programs related to the courses the user is enrolled in
+            "programs": (lambda enrollments: get_course_programs(user, enrollments, self.request.site), {}),
+            # Gather urls for course card resume buttons.
+            "resume_button_urls": (lambda enrollments: get_resume_urls_for_course_enrollments(user, enrollments), {}),
+            # Get social media sharing config
+            "course_share_urls": (get_course_share_urls, {}),
+            # Get credit availability
+            "credit_statuses": (lambda enrollments: get_credit_statuses(user, enrollments), {}),
+        }
+        for name, (section_loader, default) in enrollment_sections.items():
+            loader.add(
+                name,
+                lambda enrollments, section_loader=section_loader: section_loader(enrollments[0]),
+                requires=["enrollments"],
+                default=default,
+            )
 
         # e-commerce info
-        ecommerce_payment_page = get_ecommerce_payment_page(user)
-
-        # Gather urls for course card resume buttons.
-        resume_button_urls = get_resume_urls_for_course_enrollments(
-            user, course_enrollments
-        )
+        loader.add("ecommerce_payment_page", lambda: get_ecommerce_payment_page(user), default=None)
 
         # Get suggested courses
-        suggested_courses = get_suggested_courses().get("courses", [])
-
-        # Get social media sharing config
-        course_share_urls = get_course_share_urls(course_enrollments)
+        loader.add("suggested_courses", lambda: get_suggested_courses().get("courses", []), default=[])
 
-        # Get credit availability
-        user_credit_statuses = get_credit_statuses(user, course_enrollments)
+        sections = loader.run()
+        (
+            fulfilled_entitlements_by_course_key,
+            unfulfilled_entitlements,
+            course_entitlement_available_sessions,
+            unfulfilled_entitlement_pseudo_sessions,
+        ) = sections["entitlements"]
+        course_enrollments, course_mode_info = sections["enrollments"]
+        show_email_settings_for, course_optouts = sections["email_settings"]
 
         learner_dash_data = {
-            "emailConfirmation": email_confirmation,
-            "enterpriseDashboard": enterprise_customer,
-            "platformSettings": platform_settings,
+            "emailConfirmation": sections["email_confirmation"],
+            "enterpriseDashboard": sections["enterprise_customer"],
+            "platformSettings": sections["platform_settings"],
             "enrollments": course_enrollments,
             "unfulfilledEntitlements": unfulfilled_entitlements,
-            "socialShareSettings": social_share_settings,
-            "suggestedCourses": suggested_courses,
+            "socialShareSettings": sections["social_share_settings"],
+            "suggestedCourses": sections["suggested_courses"],
         }
 
         context = {
-            "audit_access_deadlines": audit_access_deadlines,
-            "ecommerce_payment_page": ecommerce_payment_page,
-            "cert_statuses": cert_statuses,
+            "audit_access_deadlines": sections["audit_access_deadlines"],
+            "ecommerce_payment_page": sections["ecommerce_payment_page"],
+            "cert_statuses": sections["cert_statuses"],
             "course_mode_info": course_mode_info,
             "course_optouts": course_optouts,
-            "course_access_checks": course_access_checks,
-            "credit_statuses": user_credit_statuses,
-            "grade_statuses": grade_statuses,
-            "resume_course_urls": resume_button_urls,
-            "course_share_urls": course_share_urls,
+            "course_access_checks": sections["course_access_checks"],
+            "credit_statuses": sections["credit_statuses"],
+            "grade_statuses": sections["grade_statuses"],
+            "resume_course_urls": sections["resume_button_urls"],
+            "course_share_urls": sections["course_share_urls"],
             "show_email_settings_for": show_email_settings_for,
             "fulfilled_entitlements": fulfilled_entitlements_by_course_key,
             "course_entitlement_available_sessions": course_entitlement_available_sessions,
             "unfulfilled_entitlement_pseudo_sessions": unfulfilled_entitlement_pseudo_sessions,
-            "pseudo_session_course_overviews": pseudo_session_course_overviews,
-            "programs": programs,
+            "pseudo_session_course_overviews": sections["pseudo_session_course_overviews"],
+            "programs": sections["programs"],
         }
 
         response_data = serialize_learner_home_data(learner_dash_data, context)
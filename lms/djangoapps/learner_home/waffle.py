@@ -20,6 +20,21 @@ ENABLE_LEARNER_HOME_MFE = WaffleFlag(
     __name__,
 )
 
+# .. toggle_name: learner_home_mfe.concurrent_section_loading
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag to load the independent sections of the learner home concurrently,
+#   Sections the learner home can be rendered without are loaded on a thread pool of
+#   LEARNER_HOME_SECTION_LOADER_WORKERS threads, and left out if they aren't loaded within
+#   LEARNER_HOME_SECTION_TIMEOUT seconds. The other sections are loaded on the thread of the request.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+ENABLE_CONCURRENT_SECTION_LOADING = WaffleFlag(
+    f"{WAFFLE_FLAG_NAMESPACE}.concurrent_section_loading",
+    __name__,
+)
+
 
 def learner_home_mfe_enabled():
     """
@@ -3182,6 +3182,20 @@ RATELIMIT_RATE = '120/m'
 # Keeping this for back compatibility with learner dashboard api
 GENERAL_RECOMMENDATION = {}
 
+# .. setting_name: LEARNER_HOME_SECTION_LOADER_WORKERS
+# .. setting_default: 8
+# .. setting_description: The number of threads per process loading the sections of the learner home
+#   which it can be rendered without concurrently, when the learner_home_mfe.concurrent_section_loading
+#   waffle flag is enabled. The other sections are loaded on the threads of the requests.
+LEARNER_HOME_SECTION_LOADER_WORKERS = 8
+
+# .. setting_name: LEARNER_HOME_SECTION_TIMEOUT
+# .. setting_default: 5
+# .. setting_description: The number of seconds after which the learner home is returned without a section
+#   which it can be rendered without, such as programs or credit statuses, if the section isn't loaded yet.
+#   Only applies when the learner_home_mfe.concurrent_section_loading waffle flag is enabled.
+LEARNER_HOME_SECTION_TIMEOUT = 5
+
 ############## Settings for Microfrontends  #########################
 # If running a Gradebook container locally,
 # modify lms/envs/private.py to give it a non-null value
@@ -9,6 +9,7 @@ from zoneinfo import ZoneInfo
 
 import pycountry
 import requests
+from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from edx_rest_api_client.auth import SuppliedJwtAuth
@@ -30,7 +31,7 @@ from openedx.core.djangoapps.catalog.cache import (
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.oauth_dispatch.jwt import create_jwt_for_user
-from openedx.core.lib.edx_api_utils import get_api_data
+from openedx.core.lib.edx_api_utils import get_api_data, set_default_timeout
 
 if TYPE_CHECKING:
     from django.contrib.sites.models import Site
@@ -59,7 +60,7 @@ def get_catalog_api_client(user):
     client.headers.update({"User-Agent": USER_AGENT})
     client.auth = SuppliedJwtAuth(jwt)
 
-    return client
+    return set_default_timeout(client, settings.CATALOG_API_CLIENT_TIMEOUT)
 
 
 def check_catalog_integration_and_get_user(error_message_field):
@@ -860,3 +860,66 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         if hasattr(xblock, field_name):
             setattr(block_data, field_name, getattr(xblock, field_name))
+
+
+class LazyBlockStructureModulestoreData(BlockStructureModulestoreData):
+    """
+    Subclass of BlockStructureModulestoreData whose xBlocks are only
+    loaded from the modulestore when they are first accessed, so that
+    data can be collected for some of its blocks without loading the
+    others.  The version of each block's content is known without
+    loading its xBlock.
+
+    Created by BlockStructureFactory.create_from_modulestore_lazily.
+    """
+    def __init__(self, root_block_usage_key, modulestore):
+        super().__init__(root_block_usage_key)
+        self._modulestore = modulestore
+
+        # Map of a block's usage key to the version of its content,
+        # or None if unknown.
+        # dict {UsageKey: any}
+        self._content_versions = {}
+
+    def get_xblock(self, usage_key):
+        """
+        Returns the instantiated xBlock for the given usage key,
+        loading it from the modulestore if it wasn't yet.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block whose
+                xBlock object is to be returned.
+        """
+        if usage_key not in self._xblock_map:
+            if usage_key not in self:
+                raise KeyError(usage_key)
+            self._xblock_map[usage_key] = self._modulestore.get_item(usage_key)
+        return self._xblock_map[usage_key]
+
+    def get_content_version(self, usage_key):
+        """
+        Returns the version of the content of the given block, or None
+        if unknown.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block.
+        """
+        return self._content_versions.get(usage_key)
+
+    def _collect_requested_xblock_fields(self):
+        """
+        Collects the requested xBlock fields of all of the blocks,
+        loading the xBlocks that weren't loaded yet.
+        """
+        for usage_key in self:
+            self.get_xblock(usage_key)
+        super()._collect_requested_xblock_fields()
+
+    #--- Internal methods ---#
+    # To be used within the block_structure framework or by tests.
+
+    def _set_content_version(self, usage_key, version):
+        """
+        Records the version of the content of the given block.
+        """
+        self._content_versions[usage_key] = version
@@ -0,0 +1,627 @@
+"""
+Module with a columnar, array-backed alternative to BlockStructureBlockData.
+
+BlockStructureBlockData keeps a _BlockRelations object, a BlockData object and
+a TransformerData object (each with their own dicts) per block.  For courses
+with thousands of blocks, that's a lot of small objects to allocate, copy and
+unpickle on every request.
+
+ColumnarBlockStructureBlockData instead assigns each usage key an integer
+index and stores:
+    * parents and children as index-aligned lists, and
+    * every xBlock field and every transformer's block field as its own
+      index-aligned list of values ("column").
+
+The public BlockStructureBlockData API is unchanged.  Methods that return
+BlockData/TransformerData objects (e.g. __getitem__ and iteritems) return
+lightweight views whose reads and writes go through to the columns.
+
+The block-specific data of each transformer may also be loaded lazily, on
+first access (see segmented.py).
+
+The following internal data structures are implemented:
+    _FieldColumns - The per-field value lists for the xBlock fields or for a single transformer.
+    _UnloadedFieldColumns - A transformer's _FieldColumns that is yet to be loaded.
+    _FieldsView - A MutableMapping of one block's fields within a _FieldColumns.
+"""
+
+
+from collections.abc import MutableMapping
+from copy import deepcopy
+from datetime import datetime
+from types import SimpleNamespace
+
+from xmodule.block_metadata_utils import get_datetime_field
+
+from .block_structure import BlockData, BlockStructureBlockData, TransformerData, TransformerDataMap
+
+
+class _Missing:
+    """
+    Type of the marker stored in a column for blocks that don't have a value for that field.
+    """
+    def __repr__(self):
+        return '<missing>'
+
+    def __reduce__(self):
+        # Pickle (and copy) by reference, so the marker stays a singleton.
+        return '_MISSING'
+
+
+_MISSING = _Missing()
+
+
+def _transformer_name(transformer):
+    """
+    Returns the name of the given transformer class or instance, or
+    the given value itself if it is already a name.
+    """
+    try:
+        return transformer.name()
+    except AttributeError:
+        return transformer
+
+
+def _extend_to(values, index, filler):
+    """
+    Extends the given list with filler so that index is a valid position in it.
+    """
+    missing = index + 1 - len(values)
+    if missing > 0:
+        values.extend([filler] * missing)
+
+
+def _with_datetime_fix(field_name, value, default):
+    """
+    Applies get_datetime_field's datetime fix-ups to a value read from a column.
+    """
+    if isinstance(value, datetime):
+        return get_datetime_field(SimpleNamespace(**{field_name: value}), field_name, default)
+    return value
+
+
+class _FieldColumns:
+    """
+    Per-field value lists for one namespace of block data: either the
+    collected xBlock fields, or the block-specific data of one transformer.
+
+    Lists are indexed by block index and grow on demand, so that blocks
+    without a value for a field cost one list slot at most.
+    """
+    def __init__(self):
+        # Whether each block has data in this namespace, i.e. whether a
+        # BlockData (or TransformerData) would exist for it in
+        # BlockStructureBlockData.
+        # list [bool]
+        self.present = []
+
+        # Map of field name to the list of values for that field.
+        # dict {string: list [any picklable type or _MISSING]}
+        self.columns = {}
+
+    def is_present(self, index):
+        """
+        Returns whether the block at the given index has data in this namespace.
+        """
+        return index < len(self.present) and self.present[index]
+
+    def mark_present(self, index):
+        """
+        Records that the block at the given index has data in this namespace.
+        """
+        _extend_to(self.present, index, False)
+        self.present[index] = True
+
+    def get(self, index, field_name, default=None):
+        """
+        Returns the value of the given field for the block at the given
+        index; returns default if not set.
+        """
+        column = self.columns.get(field_name)
+        if column is None or index >= len(column):
+            return default
+        value = column[index]
+        return default if value is _MISSING else value
+
+    def set(self, index, field_name, value):
+        """
+        Sets the value of the given field for the block at the given index.
+        """
+        self.mark_present(index)
+        column = self.columns.setdefault(field_name, [])
+        _extend_to(column, index, _MISSING)
+        column[index] = value
+
+    def delete(self, index, field_name):
+        """
+        Removes the value of the given field for the block at the given index.
+
+        Raises KeyError if not set.
+        """
+        if self.get(index, field_name, _MISSING) is _MISSING:
+            raise KeyError(field_name)
+        self.columns[field_name][index] = _MISSING
+
+    def field_names(self, index):
+        """
+        Returns the names of the fields set for the block at the given index.
+        """
+        return [
+            field_name for field_name, column in self.columns.items()
+            if index < len(column) and column[index] is not _MISSING
+        ]
+
+    def clear(self, index):
+        """
+        Removes all data for the block at the given index.
+        """
+        if index < len(self.present):
+            self.present[index] = False
+        for column in self.columns.values():
+            if index < len(column):
+                column[index] = _MISSING
+
+
+class _UnloadedFieldColumns:
+    """
+    A transformer's _FieldColumns that is yet to be loaded, along with
+    the indices of the blocks whose data was removed in the meantime.
+    """
+    def __init__(self, load, cleared=None):
+        # Callable that returns the loaded _FieldColumns.
+        self._load = load
+
+        # Indices of the blocks whose data is to be removed once loaded.
+        # set(int)
+        self.cleared = cleared or set()
+
+    def load(self):
+        """
+        Returns the loaded _FieldColumns.
+        """
+        field_columns = self._load()
+        for index in self.cleared:
+            field_columns.clear(index)
+        return field_columns
+
+    def copy(self):
+        """
+        Returns a copy that loads its own _FieldColumns.
+        """
+        return _UnloadedFieldColumns(self._load, set(self.cleared))
+
+
+class _FieldsView(MutableMapping):
+    """
+    A dict-like view of one block's fields within a _FieldColumns.  Used as
+    the `fields` attribute of the BlockData and TransformerData views.
+    """
+    def __init__(self, field_columns, index):
+        self._field_columns = field_columns
+        self._index = index
+
+    def __getitem__(self, field_name):
+        value = self._field_columns.get(self._index, field_name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field_name)
+        return value
+
+    def __setitem__(self, field_name, value):
+        self._field_columns.set(self._index, field_name, value)
+
+    def __delitem__(self, field_name):
+        self._field_columns.delete(self._index, field_name)
+
+    def __iter__(self):
+        return iter(self._field_columns.field_names(self._index))
+
+    def __len__(self):
+        return len(self._field_columns.field_names(self._index))
+
+
+class _ColumnarTransformerData(TransformerData):
+    """
+    TransformerData view of one transformer's data for a single block.
+    """
+    def __init__(self, field_columns, index):
+        super().__init__()
+        self.fields = _FieldsView(field_columns, index)
+
+
+class _ColumnarTransformerDataMap(TransformerDataMap):
+    """
+    TransformerDataMap view of all transformers' data for a single block.
+    """
+    def __init__(self, block_structure, index):
+        super().__init__()
+        self._block_structure = block_structure
+        self._index = index
+
+    def _present_columns(self):
+        """
+        Returns the (name, _FieldColumns) pairs of the transformers with data for this block.
+        """
+        self._block_structure._load_transformer_columns()  # pylint: disable=protected-access
+        transformer_columns = self._block_structure._transformer_columns  # pylint: disable=protected-access
+        return [
+            (name, field_columns)
+            for name, field_columns in transformer_columns.items()
+            if field_columns.is_present(self._index)
+        ]
+
+    def __getitem__(self, key):
+        field_columns = self._block_structure._get_loaded_transformer_columns(key)  # pylint: disable=protected-access
+        if field_columns is None or not field_columns.is_present(self._index):
+            raise KeyError(key)
+        return _ColumnarTransformerData(field_columns, self._index)
+
+    def __setitem__(self, key, value):
+        field_columns = self._block_structure._get_transformer_columns(key)  # pylint: disable=protected-access
+        field_columns.clear(self._index)
+        field_columns.mark_present(self._index)
+        for field_name, field_value in value.fields.items():
+            field_columns.set(self._index, field_name, field_value)
+
+    def __delitem__(self, key):
+        self[key]  # pylint: disable=pointless-statement
+        transformer_columns = self._block_structure._transformer_columns  # pylint: disable=protected-access
+        transformer_columns[_transformer_name(key)].clear(self._index)
+
+    def __contains__(self, key):
+        try:
+            self[key]  # pylint: disable=pointless-statement
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._present_columns())
+
+    def keys(self):
+        return [name for name, _ in self._present_columns()]
+
+    def values(self):
+        return [_ColumnarTransformerData(field_columns, self._index) for _, field_columns in self._present_columns()]
+
+    def items(self):
+        return list(zip(self.keys(), self.values()))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_or_create(self, key):
+        field_columns = self._block_structure._get_transformer_columns(key)  # pylint: disable=protected-access
+        field_columns.mark_present(self._index)
+        return _ColumnarTransformerData(field_columns, self._index)
+
+
+class _ColumnarBlockData(BlockData):
+    """
+    BlockData view of a single block's collected data.
+    """
+    def __init__(self, block_structure, usage_key, index):
+        super().__init__(usage_key)
+        self.fields = _FieldsView(block_structure._xblock_columns, index)  # pylint: disable=protected-access
+        self.transformer_data = _ColumnarTransformerDataMap(block_structure, index)
+
+
+class ColumnarBlockStructureBlockData(BlockStructureBlockData):
+    """
+    Subclass of BlockStructureBlockData that stores block relations and
+    block and transformer data in index-aligned lists rather than in
+    per-block objects.  See the module docstring for details.
+    """
+    # Map of a transformer's name to its block-specific data that is
+    # yet to be loaded.  Set on instances only when needed.
+    # dict {string: _UnloadedFieldColumns}
+    _unloaded_transformer_columns = None
+
+    def __init__(self, root_block_usage_key):  # pylint: disable=super-init-not-called
+        # The usage key of the root block for this structure.
+        # UsageKey
+        self.root_block_usage_key = root_block_usage_key
+
+        # Map of a transformer's name to its non-block-specific data.
+        self.transformer_data = TransformerDataMap()
+
+        # Map of a block's usage key to its index, for every block that
+        # has relations or data (or had them, before being removed).
+        # dict {UsageKey: int}
+        self._index = {}
+
+        # Usage key of each block index.
+        # list [UsageKey]
+        self._keys = []
+
+        # Map of the usage keys of the blocks that exist in the structure
+        # to their index, in the same order as
+        # BlockStructure._block_relations.
+        # dict {UsageKey: int}
+        self._relations_index = {}
+
+        # Parents and children of each block index; None if the block
+        # doesn't exist in the structure.
+        # list [list [UsageKey] or None]
+        self._parents = []
+        self._children = []
+
+        # Collected xBlock fields of the blocks.
+        self._xblock_columns = _FieldColumns()
+
+        # Map of a transformer's name to its block-specific data.
+        # dict {string: _FieldColumns}
+        self._transformer_columns = {}
+
+        # Add the root block.
+        self._add_block(root_block_usage_key)
+
+    @classmethod
+    def from_block_structure(cls, block_structure):
+        """
+        Returns a ColumnarBlockStructureBlockData with the same
+        relations and data as the given BlockStructureBlockData.
+        """
+        columnar = cls(block_structure.root_block_usage_key)
+        columnar.transformer_data = block_structure.transformer_data
+
+        # The root block may have been pruned from the given structure.
+        columnar._relations_index.clear()
+        for usage_key in block_structure:
+            index = columnar._add_block(usage_key)
+            columnar._parents[index] = list(block_structure.get_parents(usage_key))
+            columnar._children[index] = list(block_structure.get_children(usage_key))
+
+        for usage_key, block_data in block_structure.iteritems():
+            index = columnar._allocate(usage_key)
+            columnar._xblock_columns.mark_present(index)
+            for field_name, value in block_data.fields.items():
+                columnar._xblock_columns.set(index, field_name, value)
+            for transformer_name, transformer_block_data in block_data.transformer_data.items():
+                field_columns = columnar._get_transformer_columns(transformer_name)
+                field_columns.mark_present(index)
+                for field_name, value in transformer_block_data.fields.items():
+                    field_columns.set(index, field_name, value)
+
+        return columnar
+
+    def __len__(self):
+        return len(self._relations_index)
+
+    def __getstate__(self):
+        # Unloaded data can't be pickled, so load it first.
+        self._load_transformer_columns()
+        state = self.__dict__.copy()
+        state.pop('_unloaded_transformer_columns', None)
+        return state
+
+    #--- Block structure relation methods ---#
+
+    def get_parents(self, usage_key):
+        index = self._relations_index.get(usage_key)
+        return self._parents[index] if index is not None else []
+
+    def get_children(self, usage_key):
+        index = self._relations_index.get(usage_key)
+        return self._children[index] if index is not None else []
+
+    def set_root_block(self, usage_key):
+        self.root_block_usage_key = usage_key
+        self._parents[self._relations_index[usage_key]] = []
+
+    def __contains__(self, usage_key):
+        return usage_key in self._relations_index
+
+    def get_block_keys(self):
+        return iter(self._relations_index.keys())
+
+    #--- Block data methods ---#
+
+    def copy(self):
+        """
+        Returns a new instance of ColumnarBlockStructureBlockData with a
+        deep-copy of this instance's contents.
+        """
+        new_copy = self.__class__.__new__(self.__class__)
+        new_copy.root_block_usage_key = self.root_block_usage_key
+        new_copy.transformer_data = deepcopy(self.transformer_data)
+        # Usage keys are immutable, so only the containers need copying.
+        new_copy._index = dict(self._index)
+        new_copy._keys = list(self._keys)
+        new_copy._relations_index = dict(self._relations_index)
+        new_copy._parents = [None if parents is None else list(parents) for parents in self._parents]
+        new_copy._children = [None if children is None else list(children) for children in self._children]
+        new_copy._xblock_columns = deepcopy(self._xblock_columns)
+        new_copy._transformer_columns = deepcopy(self._transformer_columns)
+        if self._unloaded_transformer_columns:
+            new_copy._unloaded_transformer_columns = {
+                name: unloaded.copy() for name, unloaded in self._unloaded_transformer_columns.items()
+            }
+        return new_copy
+
+    def iteritems(self):
+        return (
+            (usage_key, _ColumnarBlockData(self, usage_key, index))
+            for index, usage_key in enumerate(self._keys)
+            if self._xblock_columns.is_present(index)
+        )
+
+    def itervalues(self):
+        return (block_data for _, block_data in self.iteritems())
+
+    def __getitem__(self, usage_key):
+        index = self._index.get(usage_key)
+        if index is None or not self._xblock_columns.is_present(index):
+            raise KeyError(usage_key)
+        return _ColumnarBlockData(self, usage_key, index)
+
+    def get_xblock_field(self, usage_key, field_name, default=None):
+        index = self._index.get(usage_key)
+        if index is None or not self._xblock_columns.is_present(index):
+            return default
+        return _with_datetime_fix(field_name, self._xblock_columns.get(index, field_name, default), default)
+
+    def override_xblock_field(self, usage_key, field_name, override_data):
+        self._xblock_columns.set(self._allocate(usage_key), field_name, override_data)
+
+    def get_transformer_block_data(self, usage_key, transformer):
+        index = self._index.get(usage_key)
+        if index is None or not self._xblock_columns.is_present(index):
+            raise KeyError(usage_key)
+        return _ColumnarBlockData(self, usage_key, index).transformer_data[transformer]
+
+    def get_transformer_block_field(self, usage_key, transformer, key, default=None):
+        index = self._index.get(usage_key)
+        field_columns = self._get_loaded_transformer_columns(transformer)
+        if index is None or field_columns is None or not field_columns.is_present(index):
+            return default
+        return _with_datetime_fix(key, field_columns.get(index, key, default), default)
+
+    def set_transformer_block_field(self, usage_key, transformer, key, value):
+        index = self._allocate(usage_key)
+        self._xblock_columns.mark_present(index)
+        self._get_transformer_columns(transformer).set(index, key, value)
+
+    def remove_transformer_block_field(self, usage_key, transformer, key):
+        index = self._index.get(usage_key)
+        field_columns = self._get_loaded_transformer_columns(transformer)
+        if index is None or field_columns is None:
+            return
+        try:
+            field_columns.delete(index, key)
+        except KeyError:
+            pass
+
+    def remove_block(self, usage_key, keep_descendants):
+        index = self._relations_index[usage_key]
+        children = self._children[index]
+        parents = self._parents[index]
+
+        # Remove block from its children.
+        for child in children:
+            self._parents[self._relations_index[child]].remove(usage_key)
+
+        # Remove block from its parents.
+        for parent in parents:
+            self._children[self._relations_index[parent]].remove(usage_key)
+
+        # Remove block.
+        del self._relations_index[usage_key]
+        self._parents[index] = self._children[index] = None
+        self._clear_block_data(index)
+
+        # Recreate the graph connections if descendants are to be kept.
+        if keep_descendants:
+            for child in children:
+                for parent in parents:
+                    self._add_relation(parent, child)
+
+    #--- Internal methods ---#
+    # To be used within the block_structure framework or by tests.
+
+    def _prune_unreachable(self):
+        """
+        Mutates this block structure by removing any unreachable blocks.
+        """
+        # Rebuild the relations from the leaves up by doing a post-order
+        # traversal, thereby encountering only reachable blocks.
+        pruned_relations_index = {}
+        pruned_parents = {}
+        pruned_children = {}
+        for block_key in self.post_order_traversal():
+            index = self._relations_index.get(block_key)
+            if index is None:
+                continue
+            pruned_relations_index[block_key] = index
+            pruned_parents[index] = []
+            pruned_children[index] = []
+
+            # Add a relationship to only those old children that
+            # were also added to the new pruned structure.
+            for child in self._children[index]:
+                child_index = pruned_relations_index.get(child)
+                if child_index is not None:
+                    pruned_children[index].append(child)
+                    pruned_parents[child_index].append(block_key)
+
+        for index in self._relations_index.values():
+            self._parents[index] = pruned_parents.get(index)
+            self._children[index] = pruned_children.get(index)
+        self._relations_index = pruned_relations_index
+
+    def _add_relation(self, parent_key, child_key):
+        parent_index = self._add_block(parent_key)
+        child_index = self._add_block(child_key)
+        self._parents[child_index].append(parent_key)
+        self._children[parent_index].append(child_key)
+
+    def _allocate(self, usage_key):
+        """
+        Returns the index of the given usage_key, assigning it a new
+        index if it doesn't have one yet.
+        """
+        index = self._index.get(usage_key)
+        if index is None:
+            index = self._index[usage_key] = len(self._keys)
+            self._keys.append(usage_key)
+            self._parents.append(None)
+            self._children.append(None)
+        return index
+
+    def _add_block(self, usage_key):  # pylint: disable=arguments-differ
+        """
+        Adds the given usage_key to the structure's relations, and
+        returns its index.
+        """
+        index = self._allocate(usage_key)
+        if usage_key not in self._relations_index:
+            self._relations_index[usage_key] = index
+            self._parents[index] = []
+            self._children[index] = []
+        return index
+
+    def _clear_block_data(self, index):
+        """
+        Removes the xBlock and transformer data of the block at the given index.
+        """
+        self._xblock_columns.clear(index)
+        for field_columns in self._transformer_columns.values():
+            field_columns.clear(index)
+        for unloaded in (self._unloaded_transformer_columns or {}).values():
+            unloaded.cleared.add(index)
+
+    def _get_transformer_columns(self, transformer):
+        """
+        Returns the _FieldColumns for the given transformer, creating it if needed.
+        """
+        field_columns = self._get_loaded_transformer_columns(transformer)
+        if field_columns is None:
+            field_columns = self._transformer_columns[_transformer_name(transformer)] = _FieldColumns()
+        return field_columns
+
+    def _get_loaded_transformer_columns(self, transformer):
+        """
+        Returns the _FieldColumns for the given transformer, loading it
+        if needed; returns None if the transformer has no data.
+        """
+        name = _transformer_name(transformer)
+        if self._unloaded_transformer_columns and name in self._unloaded_transformer_columns:
+            self._transformer_columns[name] = self._unloaded_transformer_columns.pop(name).load()
+        return self._transformer_columns.get(name)
+
+    def _load_transformer_columns(self):
+        """
+        Loads the block-specific data of all transformers.
+        """
+        for name in list(self._unloaded_transformer_columns or ()):
+            self._get_loaded_transformer_columns(name)
+
+    def _get_or_create_block(self, usage_key):
+        index = self._allocate(usage_key)
+        self._xblock_columns.mark_present(index)
+        return _ColumnarBlockData(self, usage_key, index)
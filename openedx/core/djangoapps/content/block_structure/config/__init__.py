@@ -2,6 +2,7 @@
 This module contains various configuration settings via
 waffle switches for the Block Structure framework.
 """
+from django.conf import settings
 from edx_django_utils.cache import RequestCache
 from edx_toggles.toggles import WaffleSwitch
 
@@ -24,3 +25,56 @@ def cache_timeout_in_seconds():
     Returns and caches the current setting for cache_timeout_in_seconds.
     """
     return BlockStructureConfiguration.current().cache_timeout_in_seconds
+
+
+def incremental_collect_transformers():
+    """
+    Returns the names of the registered transformers that support
+    incremental collection without declaring it.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('INCREMENTAL_COLLECT_TRANSFORMERS', [])
+
+
+# .. toggle_name: block_structure.columnar_storage
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures are stored and cached in a columnar format
+#   (see ColumnarBlockStructureBlockData), which takes less memory and is faster to deserialize and copy
+#   for large courses. Block structures stored in either format can be read regardless of this switch.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+COLUMNAR_STORAGE = WaffleSwitch(
+    'block_structure.columnar_storage', __name__
+)
+
+
+# .. toggle_name: block_structure.segmented_storage
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures are stored and cached in a segmented
+#   format (see segmented.py), in which the data of each transformer is compressed separately and only
+#   decompressed when a request first accesses it. Block structures are read from the storage backend
+#   by memory-mapping the file when the storage backend is on the local filesystem. Takes precedence
+#   over block_structure.columnar_storage. Block structures stored in any format can be read regardless
+#   of this switch.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+SEGMENTED_STORAGE = WaffleSwitch(
+    'block_structure.segmented_storage', __name__
+)
+
+
+# .. toggle_name: block_structure.incremental_collect
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, updating a course's collected block structure after a publish
+#   re-collects transformer data only for the blocks whose content or position changed since the
+#   previously stored block structure, and their descendants, carrying over the data of all other blocks.
+#   The whole structure is still re-collected if the course block itself changed, the previous block
+#   structure is missing or outdated, or any registered transformer doesn't support incremental
+#   collection (see BlockStructureTransformer.INCREMENTAL_COLLECT).
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-17
+INCREMENTAL_COLLECT = WaffleSwitch(
+    'block_structure.incremental_collect', __name__
+)
@@ -1,7 +1,11 @@
 """
 Module for factory class for BlockStructure objects.
 """
-from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData
+from .block_structure import (
+    BlockStructureBlockData,
+    BlockStructureModulestoreData,
+    LazyBlockStructureModulestoreData
+)
 
 
 class BlockStructureFactory:
@@ -57,6 +61,59 @@ class BlockStructureFactory:
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_from_modulestore_lazily(cls, root_block_usage_key, modulestore):
+        """
+        Creates and returns a block structure from the modulestore
+        starting at the given root_block_usage_key, like
+        create_from_modulestore, but without loading any xBlock until
+        it's accessed.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks within the block
+                structure starting at root_block_usage_key.
+
+        Returns:
+            LazyBlockStructureModulestoreData - The created block
+                structure, or None if the modulestore can't provide the
+                blocks' children and content versions without loading
+                them (see SplitMongoModuleStore.get_block_tree).
+
+        Raises:
+            xmodule.modulestore.exceptions.ItemNotFoundError if a block for
+                root_block_usage_key is not found in the modulestore.
+        """
+        get_block_tree = getattr(modulestore, 'get_block_tree', None)
+        block_tree = get_block_tree(root_block_usage_key) if get_block_tree else None
+        if block_tree is None:
+            return None
+
+        block_structure = LazyBlockStructureModulestoreData(root_block_usage_key, modulestore)
+        blocks_visited = set()
+
+        # Add the blocks in the same order as create_from_modulestore.
+        def build_block_structure(usage_key):
+            """
+            Recursively update the block structure with the given block
+            and its descendants.
+            """
+            if usage_key in blocks_visited:
+                return
+
+            blocks_visited.add(usage_key)
+            children, version = block_tree[usage_key]
+            block_structure._set_content_version(usage_key, version)  # pylint: disable=protected-access
+            for child_key in children:
+                block_structure._add_relation(usage_key, child_key)  # pylint: disable=protected-access
+                build_block_structure(child_key)
+
+        build_block_structure(root_block_usage_key)
+        return block_structure
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -6,8 +6,11 @@ BlockStructures.
 
 from contextlib import contextmanager
 
+from edx_django_utils import monitoring
+
 from xmodule.modulestore import ModuleStoreEnum
 
+from . import config
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
@@ -134,20 +137,61 @@ class BlockStructureManager:
         the modulestore.
         """
         with self._bulk_operations():
-            # Always uses published-only branch regardless of CMS or LMS context.
-            with self.modulestore.branch_setting(
-                ModuleStoreEnum.Branch.published_only,
-                self.root_block_usage_key.course_key
-            ):
-                block_structure = BlockStructureFactory.create_from_modulestore(
-                    self.root_block_usage_key,
-                    self.modulestore,
-                )
-
-            BlockStructureTransformers.collect(block_structure)
+            previous_block_structure = self._get_previous_collected()
+
+            collected_incrementally = False
+            if previous_block_structure is not None:
+                # The xBlocks are loaded while collecting, so the branch
+                # setting must cover the collection.
+                with self._published_only_branch():
+                    block_structure = BlockStructureFactory.create_from_modulestore_lazily(
+                        self.root_block_usage_key,
+                        self.modulestore,
+                    )
+                    collected_incrementally = block_structure is not None and (
+                        BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+                    )
+            # .. custom_attribute_name: block_structure_collected_incrementally
+            # .. custom_attribute_description: Whether only the changed blocks of the block structure were
+            #   re-collected, with the data of the other blocks carried over from the previously stored
+            #   block structure. Only set when incremental collection is enabled and a previously stored
+            #   block structure was found.
+            if previous_block_structure is not None:
+                monitoring.set_custom_attribute('block_structure_collected_incrementally', collected_incrementally)
+            if not collected_incrementally:
+                with self._published_only_branch():
+                    block_structure = BlockStructureFactory.create_from_modulestore(
+                        self.root_block_usage_key,
+                        self.modulestore,
+                    )
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _published_only_branch(self):
+        """
+        Returns a context manager for using the published-only branch
+        of the modulestore, regardless of CMS or LMS context.
+        """
+        return self.modulestore.branch_setting(
+            ModuleStoreEnum.Branch.published_only,
+            self.root_block_usage_key.course_key
+        )
+
+    def _get_previous_collected(self):
+        """
+        Returns the block structure previously collected for the
+        root_block_usage_key, for re-collecting it incrementally, if
+        incremental collection is enabled and the block structure is
+        found in the store; otherwise None.
+        """
+        if not config.INCREMENTAL_COLLECT.is_enabled():
+            return None
+        try:
+            return BlockStructureFactory.create_from_store(self.root_block_usage_key, self.store)
+        except BlockStructureNotFound:
+            return None
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
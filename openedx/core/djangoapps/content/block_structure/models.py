@@ -4,6 +4,8 @@ Models used by the block structure framework.
 
 
 import errno
+import mmap
+import os
 from contextlib import contextmanager
 from datetime import datetime
 from logging import getLogger
@@ -207,6 +209,30 @@ class BlockStructureModel(TimeStampedModel):
         self._log(self, operation, serialized_data)
         return serialized_data
 
+    def get_serialized_data_buffer(self):
+        """
+        Returns the collected data for this instance as a read-only
+        buffer.  When the storage backend is on the local filesystem,
+        the file is memory-mapped rather than read into memory.
+        """
+        operation = 'Read'
+        with _storage_error_handling(self, operation, is_read_operation=True):
+            try:
+                path = self.data.path
+            except NotImplementedError:
+                # The storage backend isn't on the local filesystem.
+                serialized_data = self.data.read()
+            else:
+                with open(path, 'rb') as data_file:
+                    if os.fstat(data_file.fileno()).st_size:
+                        serialized_data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+                    else:
+                        # Empty files can't be memory-mapped.
+                        serialized_data = b''
+
+        self._log(self, operation, serialized_data)
+        return serialized_data
+
     @classmethod
     def get(cls, data_usage_key):
         """
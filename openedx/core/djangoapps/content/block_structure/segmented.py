@@ -0,0 +1,112 @@
+"""
+Module for the segmented serialization format of collected block structures.
+
+A block structure serialized as a single compressed pickle must be read and
+decompressed in full, even though most requests only use the data of a few of
+the transformers.  The segmented format instead stores a
+ColumnarBlockStructureBlockData as separately compressed segments:
+    * a core segment with the block relations, the collected xBlock fields
+      and the non-block-specific transformer data, and
+    * one segment per transformer with its block-specific data.
+
+The serialized data starts with a header that indexes the segments by offset
+and length, so segments are decompressed directly out of the serialized
+buffer (e.g. a memory-mapped file) without copying it.  A transformer's
+segment is only decompressed when its data is first accessed.
+
+Layout:
+    MAGIC | header length (4 bytes, big-endian) | header | segment | segment | ...
+"""
+# pylint: disable=protected-access
+
+
+import struct
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .columnar import ColumnarBlockStructureBlockData, _UnloadedFieldColumns
+
+# Prefix identifying data in the segmented format.  Data in the other
+# formats starts with a zlib header instead.
+MAGIC = b'BSSEG\x01'
+
+_HEADER_LENGTH = struct.Struct('>I')
+_DATA_START = len(MAGIC) + _HEADER_LENGTH.size
+
+
+def is_segmented(serialized_data):
+    """
+    Returns whether the given serialized data is in the segmented format.
+    """
+    return bytes(serialized_data[:len(MAGIC)]) == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Returns the given ColumnarBlockStructureBlockData serialized in the
+    segmented format.
+    """
+    block_structure._load_transformer_columns()
+    segments = [zpickle((
+        block_structure._index,
+        block_structure._keys,
+        block_structure._relations_index,
+        block_structure._parents,
+        block_structure._children,
+        block_structure._xblock_columns,
+        block_structure.transformer_data,
+    ))]
+    transformer_segments = {}
+    for name, field_columns in block_structure._transformer_columns.items():
+        transformer_segments[name] = len(segments)
+        segments.append(zpickle(field_columns))
+
+    offsets = []
+    offset = 0
+    for segment in segments:
+        offsets.append((offset, len(segment)))
+        offset += len(segment)
+
+    header = zpickle({
+        'core': offsets[0],
+        'transformers': {name: offsets[position] for name, position in transformer_segments.items()},
+    })
+    return b''.join([MAGIC, _HEADER_LENGTH.pack(len(header)), header] + segments)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Returns the ColumnarBlockStructureBlockData starting at
+    root_block_usage_key in the given data, serialized in the segmented
+    format.  The block-specific data of each transformer is loaded when
+    first accessed, so the given buffer must remain readable.
+    """
+    buffer = memoryview(serialized_data)
+    (header_length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+    segments_start = _DATA_START + header_length
+    header = zunpickle(buffer[_DATA_START:segments_start])
+
+    def read_segment(offset, length):
+        """
+        Returns the deserialized segment at the given offset.
+        """
+        start = segments_start + offset
+        return zunpickle(buffer[start:start + length])
+
+    block_structure = ColumnarBlockStructureBlockData.__new__(ColumnarBlockStructureBlockData)
+    block_structure.root_block_usage_key = root_block_usage_key
+    (
+        block_structure._index,
+        block_structure._keys,
+        block_structure._relations_index,
+        block_structure._parents,
+        block_structure._children,
+        block_structure._xblock_columns,
+        block_structure.transformer_data,
+    ) = read_segment(*header['core'])
+    block_structure._transformer_columns = {}
+    block_structure._unloaded_transformer_columns = {
+        name: _UnloadedFieldColumns(lambda offset=offset, length=length: read_segment(offset, length))
+        for name, (offset, length) in header['transformers'].items()
+    }
+    return block_structure
@@ -9,8 +9,9 @@ from logging import getLogger
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, segmented
 from .block_structure import BlockStructureBlockData
+from .columnar import ColumnarBlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .models import BlockStructureModel
@@ -140,7 +141,8 @@ class BlockStructureStore:
         data_size_in_bytes = len(serialized_data)
         data_size_in_mbs = round(data_size_in_bytes / total_bytes_in_one_mb, 2)
         if data_size_in_bytes < total_bytes_in_one_mb * 2:
-            self._cache.set(cache_key, serialized_data, timeout=config.cache_timeout_in_seconds())
+            # The data may be a memory-mapped file, which can't be pickled.
+            self._cache.set(cache_key, bytes(serialized_data), timeout=config.cache_timeout_in_seconds())
             logger.info("BlockStructure: Added to cache; %s, size: %.2fMB", bs_model, data_size_in_mbs)
         else:
             # .. custom_attribute_name: blockstorestructure_size_in_mbs
@@ -166,16 +168,32 @@ class BlockStructureStore:
     def _get_from_store(self, bs_model):
         """
         Returns the serialized data for the given BlockStructureModel
-        from storage.
+        from storage, as a read-only buffer.
         Raises:
              BlockStructureNotFound if not found.
         """
-        return bs_model.get_serialized_data()
+        return bs_model.get_serialized_data_buffer()
 
     def _serialize(self, block_structure):
         """
         Serializes the data for the given block_structure.
+
+        When the segmented storage switch is enabled, the block
+        structure is stored as a ColumnarBlockStructureBlockData in the
+        segmented format.  Otherwise, when the columnar storage switch is
+        enabled, it is stored as a pickled
+        ColumnarBlockStructureBlockData; and if neither is enabled, as a
+        tuple of its relations, transformer data and block data.
         """
+        if config.SEGMENTED_STORAGE.is_enabled():
+            if not isinstance(block_structure, ColumnarBlockStructureBlockData):
+                block_structure = ColumnarBlockStructureBlockData.from_block_structure(block_structure)
+            return segmented.serialize(block_structure)
+        if isinstance(block_structure, ColumnarBlockStructureBlockData):
+            return zpickle(block_structure)
+        if config.COLUMNAR_STORAGE.is_enabled():
+            return zpickle(ColumnarBlockStructureBlockData.from_block_structure(block_structure))
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -189,7 +207,13 @@ class BlockStructureStore:
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            if segmented.is_segmented(serialized_data):
+                return segmented.deserialize(serialized_data, root_block_usage_key)
+            data = zunpickle(serialized_data)
+            if isinstance(data, ColumnarBlockStructureBlockData):
+                data.root_block_usage_key = root_block_usage_key
+                return data
+            block_relations, transformer_data, block_data_map = data
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
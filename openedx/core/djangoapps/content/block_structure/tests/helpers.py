@@ -103,6 +103,25 @@ class MockModulestore:
             raise ItemNotFoundError
         return item
 
+    def get_block_tree(self, block_key):
+        """
+        Returns the children and content version of the given block
+        and of each of its descendants, without counting as getting
+        their items.  See SplitMongoModuleStore.get_block_tree.
+        """
+        block_tree = {}
+        stack = [block_key]
+        while stack:
+            item = self.blocks.get(stack.pop())
+            if not item:
+                raise ItemNotFoundError
+            if item.location in block_tree:
+                continue
+            version = item.field_map.get('source_version') or item.field_map.get('update_version')
+            block_tree[item.location] = (list(item.children), version)
+            stack.extend(item.children)
+        return block_tree
+
     @contextmanager
     def bulk_operations(self, ignore):  # pylint: disable=unused-argument
         """
@@ -0,0 +1,154 @@
+"""
+Tests for columnar.py
+"""
+
+
+import itertools
+import pickle
+# pylint: disable=protected-access
+from datetime import datetime
+from unittest import TestCase
+
+import ddt
+import pytest
+
+from ..block_structure import BlockStructureBlockData
+from ..columnar import ColumnarBlockStructureBlockData
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+def get_contents(block_structure):
+    """
+    Returns the relations and the block and transformer data of the
+    given block structure, as plain Python objects for comparison.
+    """
+    return {
+        'root': block_structure.root_block_usage_key,
+        'relations': {
+            block_key: (list(block_structure.get_parents(block_key)), list(block_structure.get_children(block_key)))
+            for block_key in block_structure
+        },
+        'block_data': {
+            block_key: (
+                dict(block_data.fields),
+                {name: dict(data.fields) for name, data in block_data.transformer_data.items()},
+            )
+            for block_key, block_data in block_structure.iteritems()
+        },
+        'transformer_data': {name: dict(data.fields) for name, data in block_structure.transformer_data.items()},
+    }
+
+
+@ddt.ddt
+class TestColumnarBlockStructureBlockData(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for ColumnarBlockStructureBlockData, verifying that it behaves
+    the same as BlockStructureBlockData.
+    """
+
+    def create_structures(self, children_map):
+        """
+        Returns a BlockStructureBlockData and a
+        ColumnarBlockStructureBlockData with the same blocks and data.
+        """
+        block_structures = [
+            self.create_block_structure(children_map, block_structure_cls)
+            for block_structure_cls in (BlockStructureBlockData, ColumnarBlockStructureBlockData)
+        ]
+        for block_structure in block_structures:
+            block_structure._add_transformer(MockTransformer)
+            for block_key in range(len(children_map)):
+                block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_key}')
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'value', block_key)
+        return block_structures
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_relations(self, children_map):
+        block_structure, columnar = self.create_structures(children_map)
+        self.assert_block_structure(columnar, children_map)
+        assert get_contents(columnar) == get_contents(block_structure)
+        assert (len(children_map) + 1) not in columnar
+
+    @ddt.data(
+        *itertools.product(
+            [True, False],
+            list(range(7)),
+            [
+                ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+                ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+                ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+            ],
+        )
+    )
+    @ddt.unpack
+    def test_remove_block(self, keep_descendants, block_to_remove, children_map):
+        if (block_to_remove >= len(children_map)) or (keep_descendants and block_to_remove == 0):
+            return
+
+        block_structures = self.create_structures(children_map)
+        for block_structure in block_structures:
+            block_structure.remove_block(block_to_remove, keep_descendants)
+        assert get_contents(block_structures[1]) == get_contents(block_structures[0])
+
+        for block_structure in block_structures:
+            block_structure._prune_unreachable()
+        assert get_contents(block_structures[1]) == get_contents(block_structures[0])
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_from_block_structure(self, children_map):
+        block_structure, _ = self.create_structures(children_map)
+        block_structure.remove_block(1, keep_descendants=False)
+        block_structure._prune_unreachable()
+
+        columnar = ColumnarBlockStructureBlockData.from_block_structure(block_structure)
+        assert get_contents(columnar) == get_contents(block_structure)
+
+    def test_pickle(self):
+        _, columnar = self.create_structures(self.DAG_CHILDREN_MAP)
+        assert get_contents(pickle.loads(pickle.dumps(columnar))) == get_contents(columnar)
+
+    def test_copy(self):
+        _, columnar = self.create_structures(self.LINEAR_CHILDREN_MAP)
+        new_copy = columnar.copy()
+        assert get_contents(new_copy) == get_contents(columnar)
+
+        columnar.remove_block(2, keep_descendants=True)
+        columnar.set_transformer_block_field(1, MockTransformer, 'value', 'edit')
+        self.assert_block_structure(columnar, [[1], [3], [], []], missing_blocks=[2])
+        self.assert_block_structure(new_copy, [[1], [2], [3], []])
+        assert new_copy.get_transformer_block_field(1, MockTransformer, 'value') == 1
+
+    def test_block_data_views(self):
+        _, columnar = self.create_structures(self.SIMPLE_CHILDREN_MAP)
+
+        block_data = columnar[1]
+        assert block_data.location == 1
+        assert block_data.display_name == 'Block 1'
+        block_data.due = datetime(2017, 3, 23)
+        assert columnar.get_xblock_field(1, 'due') == datetime(2017, 3, 23)
+        del block_data.due
+        assert columnar.get_xblock_field(1, 'due', 'default') == 'default'
+
+        transformer_data = block_data.transformer_data[MockTransformer]
+        assert transformer_data.value == 1
+        transformer_data.other = 'other'
+        assert columnar.get_transformer_block_field(1, MockTransformer, 'other') == 'other'
+        assert columnar.get_transformer_block_data(1, MockTransformer.name()).fields == {'value': 1, 'other': 'other'}
+
+        columnar.remove_transformer_block_field(1, MockTransformer, 'other')
+        assert columnar.get_transformer_block_field(1, MockTransformer, 'other') is None
+        assert 'unknown_transformer' not in block_data.transformer_data
+
+    def test_missing_block(self):
+        _, columnar = self.create_structures(self.SIMPLE_CHILDREN_MAP)
+        with pytest.raises(KeyError):
+            columnar[10]  # pylint: disable=pointless-statement
+        assert columnar.get_xblock_field(10, 'display_name', 'default') == 'default'
+        assert columnar.get_transformer_block_field(10, MockTransformer, 'value', 'default') == 'default'
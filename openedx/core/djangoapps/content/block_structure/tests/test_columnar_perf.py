@@ -0,0 +1,148 @@
+"""
+Performance test comparing the memory use and latency of
+ColumnarBlockStructureBlockData against BlockStructureBlockData.
+
+Run with::
+
+    pytest openedx/core/djangoapps/content/block_structure/tests/test_columnar_perf.py -s -p no:randomly
+
+after removing the ``unittest.skip`` decorator.
+"""
+
+
+import pickle
+import timeit
+import tracemalloc
+import unittest
+from datetime import datetime, timezone
+
+from ..block_structure import BlockStructureBlockData
+from ..columnar import ColumnarBlockStructureBlockData
+
+# 1,000 units of 4 problems each, plus the units themselves: ~5,000 blocks.
+NUM_UNITS = 1000
+PROBLEMS_PER_UNIT = 4
+
+# Number of times each operation is timed; the best run is reported.
+REPEAT = 5
+
+# Collected xBlock fields and transformer fields, similar to those of the LMS course blocks transformers.
+XBLOCK_FIELDS = {
+    'display_name': 'Problem',
+    'category': 'problem',
+    'start': datetime(2024, 1, 1, tzinfo=timezone.utc),
+    'due': None,
+    'graded': True,
+    'format': 'Homework',
+    'weight': 1.0,
+    'has_score': True,
+    'visible_to_staff_only': False,
+    'group_access': {},
+}
+TRANSFORMER_FIELDS = {
+    'visibility': {'merged_visible_to_staff_only': False},
+    'start_date': {'merged_start_date': datetime(2024, 1, 1, tzinfo=timezone.utc)},
+    'user_partitions': {'merged_group_access': None},
+    'grades': {'max_score': 1.0, 'explicit_graded': None},
+}
+
+
+def make_block_structure():
+    """
+    Returns a collected BlockStructureBlockData for a course with one
+    chapter, one sequential, and NUM_UNITS units of PROBLEMS_PER_UNIT
+    problems each.
+    """
+    block_structure = BlockStructureBlockData('course')
+    block_keys = ['course']
+    block_structure._add_relation('course', 'chapter')  # pylint: disable=protected-access
+    block_structure._add_relation('chapter', 'sequential')  # pylint: disable=protected-access
+    block_keys.extend(['chapter', 'sequential'])
+    for unit_idx in range(NUM_UNITS):
+        unit = f'unit_{unit_idx}'
+        block_structure._add_relation('sequential', unit)  # pylint: disable=protected-access
+        block_keys.append(unit)
+        for problem_idx in range(PROBLEMS_PER_UNIT):
+            problem = f'problem_{unit_idx}_{problem_idx}'
+            block_structure._add_relation(unit, problem)  # pylint: disable=protected-access
+            block_keys.append(problem)
+
+    for block_key in block_keys:
+        for field_name, value in XBLOCK_FIELDS.items():
+            block_structure.override_xblock_field(block_key, field_name, value)
+        for transformer_name, fields in TRANSFORMER_FIELDS.items():
+            for field_name, value in fields.items():
+                block_structure.set_transformer_block_field(block_key, transformer_name, field_name, value)
+    return block_structure
+
+
+def read_fields(block_structure):
+    """
+    Reads a few collected fields of every block, as the transform phase does.
+    """
+    for block_key in block_structure:
+        block_structure.get_xblock_field(block_key, 'display_name')
+        block_structure.get_xblock_field(block_key, 'start')
+        block_structure.get_transformer_block_field(block_key, 'visibility', 'merged_visible_to_staff_only')
+        block_structure.get_children(block_key)
+
+
+@unittest.skip("Performance test, run manually")
+class ColumnarBlockStructurePerfTest(unittest.TestCase):
+    """
+    Compares the memory taken by a deserialized ~5,000 block structure,
+    and the time taken to deserialize, copy, and read fields from it,
+    for both block structure implementations.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        block_structure = make_block_structure()
+        self.structures = {
+            'BlockStructureBlockData': block_structure,
+            'ColumnarBlockStructureBlockData': ColumnarBlockStructureBlockData.from_block_structure(block_structure),
+        }
+
+    def _best_time(self, func):
+        """
+        Return the fastest of REPEAT runs of ``func``, in milliseconds.
+        """
+        return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+    def _memory(self, data):
+        """
+        Return the memory allocated when unpickling ``data``, in KB.
+        """
+        tracemalloc.start()
+        try:
+            structure = pickle.loads(data)  # pylint: disable=unused-variable
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size / 1024
+
+    def test_memory_and_latency(self):
+        results = {}
+        for name, structure in self.structures.items():
+            data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+            results[name] = {
+                'pickled KB': len(data) / 1024,
+                'memory KB': self._memory(data),
+                'unpickle ms': self._best_time(lambda data=data: pickle.loads(data)),
+                'copy ms': self._best_time(structure.copy),
+                'read fields ms': self._best_time(lambda structure=structure: read_fields(structure)),
+            }
+
+        print(f"\nBlock structure with {len(self.structures['BlockStructureBlockData'])} blocks:")
+        columns = list(results['BlockStructureBlockData'])
+        print(f"  {'':<35}" + ''.join(f"{column:>16}" for column in columns))
+        for name, result in results.items():
+            print(f"  {name:<35}" + ''.join(f"{result[column]:16.2f}" for column in columns))
+
+        columnar = results['ColumnarBlockStructureBlockData']
+        legacy = results['BlockStructureBlockData']
+        assert columnar['memory KB'] < legacy['memory KB']
+        assert columnar['unpickle ms'] < legacy['unpickle ms']
@@ -45,6 +45,25 @@ class TestBlockStructureFactory(TestCase, ChildrenMapTestMixin):
                 modulestore=self.modulestore,
             )
 
+    def test_from_modulestore_lazily(self):
+        usage_key = CourseKey.from_string("course-v1:org+course+run").make_usage_key("html", "0")
+        changed_block_key = self.block_key_factory(3)
+        self.modulestore.blocks[changed_block_key].field_map['update_version'] = 'v2'
+        block_structure = BlockStructureFactory.create_from_modulestore_lazily(
+            root_block_usage_key=usage_key, modulestore=self.modulestore
+        )
+        self.assert_block_structure(block_structure, self.children_map)
+        assert block_structure.get_content_version(changed_block_key) == 'v2'
+        assert block_structure.get_content_version(usage_key) is None
+        assert self.modulestore.get_items_call_count == 0
+
+        assert block_structure.get_xblock(changed_block_key) is self.modulestore.blocks[changed_block_key]
+        assert self.modulestore.get_items_call_count == 1
+
+    def test_from_modulestore_lazily_unsupported(self):
+        usage_key = CourseKey.from_string("course-v1:org+course+run").make_usage_key("html", "0")
+        assert BlockStructureFactory.create_from_modulestore_lazily(usage_key, modulestore=object()) is None
+
     def test_from_cache(self):
         store = BlockStructureStore(MockCache())
         block_structure = self.create_block_structure(self.children_map)
@@ -6,10 +6,12 @@ import pytest
 import ddt
 from unittest.mock import MagicMock
 from django.test import TestCase
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from xmodule.modulestore import ModuleStoreEnum
 
 from ..block_structure import BlockStructureBlockData
+from ..config import INCREMENTAL_COLLECT
 from ..exceptions import UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -95,6 +97,22 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + str(block_key)
 
 
+class IncrementalTestTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection.
+    """
+    INCREMENTAL_COLLECT = True
+    collected_blocks = set()
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects block data for the block structure, recording its blocks.
+        """
+        super().collect(block_structure)
+        cls.collected_blocks = set(block_structure)
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -173,6 +191,29 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
             with pytest.raises(UsageKeyNotInBlockStructure):
                 self.bs_manager.get_transformed(self.transformers, starting_block_usage_key=100)
 
+    @ddt.data(True, False)
+    def test_update_collected_incrementally(self, incremental_collect):
+        self.registered_transformers = [IncrementalTestTransformer()]
+        for block in self.modulestore.blocks.values():
+            block.field_map['update_version'] = 'v1'
+
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=incremental_collect):
+            self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+            self.modulestore.blocks[self.block_key_factory(3)].field_map['update_version'] = 'v2'
+            self.modulestore.get_items_call_count = 0
+            with mock_registered_transformers(self.registered_transformers):
+                block_structure = self.bs_manager._update_collected()  # pylint: disable=protected-access
+
+        self.assert_block_structure(block_structure, self.children_map)
+        IncrementalTestTransformer.assert_collected(block_structure)
+        if incremental_collect:
+            # Only the changed block and its ancestors were loaded.
+            assert IncrementalTestTransformer.collected_blocks == {self.block_key_factory(key) for key in (0, 1, 3)}
+            assert self.modulestore.get_items_call_count == 3
+        else:
+            assert len(IncrementalTestTransformer.collected_blocks) == len(self.children_map)
+            assert self.modulestore.get_items_call_count == len(self.children_map)
+
     def test_get_collected_cached(self):
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.collect_and_verify(expect_modulestore_called=False, expect_cache_updated=False)
@@ -104,6 +104,18 @@ class BlockStructureModelTestCase(TestCase):
         # old files not pruned
         self._assert_file_count_equal(2)
 
+    def test_get_serialized_data_buffer(self):
+        bsm, _ = BlockStructureModel.update_or_create('test data', **self.params)
+        assert bytes(bsm.get_serialized_data_buffer()) == b'test data'
+
+        # Storage backends that aren't on the local filesystem are read into memory.
+        with patch.object(type(bsm.data.storage), 'path', side_effect=NotImplementedError):
+            assert bsm.get_serialized_data_buffer() == b'test data'
+
+    def test_get_serialized_data_buffer_empty(self):
+        bsm, _ = BlockStructureModel.update_or_create('', **self.params)
+        assert bytes(bsm.get_serialized_data_buffer()) == b''
+
     @patch('openedx.core.djangoapps.content.block_structure.config.num_versions_to_keep', Mock(return_value=1))
     def test_prune_files(self):
         self._verify_update_or_create_call('test data', expect_created=True)
@@ -0,0 +1,120 @@
+"""
+Tests for segmented.py
+"""
+
+
+import mmap
+import pickle
+# pylint: disable=protected-access
+from tempfile import TemporaryFile
+from unittest import TestCase
+
+import ddt
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import segmented
+from ..block_structure import BlockStructureBlockData
+from ..columnar import ColumnarBlockStructureBlockData
+from .helpers import ChildrenMapTestMixin, MockFilteringTransformer, MockTransformer
+from .test_columnar import get_contents
+
+
+@ddt.ddt
+class TestSegmented(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for serializing block structures in the segmented format.
+    """
+
+    def create_structure(self, children_map):
+        """
+        Returns a ColumnarBlockStructureBlockData for the given
+        children_map, with data for two transformers.
+        """
+        block_structure = self.create_block_structure(children_map, ColumnarBlockStructureBlockData)
+        for transformer in (MockTransformer, MockFilteringTransformer):
+            block_structure._add_transformer(transformer)
+            for block_key in range(len(children_map)):
+                block_structure.set_transformer_block_field(block_key, transformer, 'value', block_key)
+        for block_key in range(len(children_map)):
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_key}')
+        return block_structure
+
+    def round_trip(self, block_structure):
+        """
+        Returns the given block structure after serializing and
+        deserializing it in the segmented format.
+        """
+        serialized_data = segmented.serialize(block_structure)
+        assert segmented.is_segmented(serialized_data)
+        return segmented.deserialize(serialized_data, block_structure.root_block_usage_key)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_structure(children_map)
+        deserialized = self.round_trip(block_structure)
+        self.assert_block_structure(deserialized, children_map)
+        assert get_contents(deserialized) == get_contents(block_structure)
+
+    def test_is_segmented(self):
+        block_structure = self.create_structure(self.SIMPLE_CHILDREN_MAP)
+        assert not segmented.is_segmented(zpickle(block_structure))
+        assert not segmented.is_segmented(b'')
+
+    def test_lazy_loading(self):
+        deserialized = self.round_trip(self.create_structure(self.SIMPLE_CHILDREN_MAP))
+        assert set(deserialized._unloaded_transformer_columns) == {'MockTransformer', 'MockFilteringTransformer'}
+
+        assert deserialized.get_xblock_field(1, 'display_name') == 'Block 1'
+        assert deserialized.get_transformer_data(MockTransformer, '_version') == 1
+        assert deserialized.get_transformer_block_field(1, MockTransformer, 'value') == 1
+        assert set(deserialized._unloaded_transformer_columns) == {'MockFilteringTransformer'}
+        assert set(deserialized._transformer_columns) == {'MockTransformer'}
+
+    def test_remove_block_before_loading(self):
+        block_structure = self.create_structure(self.DAG_CHILDREN_MAP)
+        deserialized = self.round_trip(block_structure)
+        for structure in (block_structure, deserialized):
+            structure.remove_block(3, keep_descendants=False)
+            structure._prune_unreachable()
+        assert deserialized.get_transformer_block_field(3, MockTransformer, 'value') is None
+        assert get_contents(deserialized) == get_contents(block_structure)
+
+    def test_copy_before_loading(self):
+        deserialized = self.round_trip(self.create_structure(self.LINEAR_CHILDREN_MAP))
+        new_copy = deserialized.copy()
+        new_copy.remove_block(3, keep_descendants=False)
+        new_copy.set_transformer_block_field(1, MockTransformer, 'value', 'edit')
+
+        assert deserialized.get_transformer_block_field(1, MockTransformer, 'value') == 1
+        assert deserialized.get_transformer_block_field(3, MockFilteringTransformer, 'value') == 3
+        assert new_copy.get_transformer_block_field(1, MockTransformer, 'value') == 'edit'
+        assert new_copy.get_transformer_block_field(3, MockFilteringTransformer, 'value') is None
+
+    def test_pickle_before_loading(self):
+        block_structure = self.create_structure(self.DAG_CHILDREN_MAP)
+        deserialized = self.round_trip(block_structure)
+        unpickled = pickle.loads(pickle.dumps(deserialized))
+        assert not unpickled._unloaded_transformer_columns
+        assert get_contents(unpickled) == get_contents(block_structure)
+
+    def test_memory_mapped(self):
+        block_structure = self.create_structure(self.DAG_CHILDREN_MAP)
+        with TemporaryFile() as data_file:
+            data_file.write(segmented.serialize(block_structure))
+            data_file.flush()
+            serialized_data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert segmented.is_segmented(serialized_data)
+        deserialized = segmented.deserialize(serialized_data, block_structure.root_block_usage_key)
+        assert get_contents(deserialized) == get_contents(block_structure)
+
+    def test_from_block_structure(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP, BlockStructureBlockData)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_block_field(2, MockTransformer, 'value', 2)
+        deserialized = self.round_trip(ColumnarBlockStructureBlockData.from_block_structure(block_structure))
+        assert get_contents(deserialized) == get_contents(block_structure)
@@ -4,9 +4,12 @@ Tests for block_structure/cache.py
 
 import pytest
 import ddt
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
+from ..columnar import ColumnarBlockStructureBlockData
+from ..config import COLUMNAR_STORAGE, SEGMENTED_STORAGE
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -54,6 +57,39 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert stored_value is not None
         self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_columnar_storage(self, columnar_storage):
+        with override_waffle_switch(COLUMNAR_STORAGE, active=columnar_storage):
+            self.store.add(self.block_structure)
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        assert isinstance(stored_value, ColumnarBlockStructureBlockData) == columnar_storage
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test',
+        ) == f'{MockTransformer.name()} val'
+
+        # Data stored in either format remains readable after the switch is toggled.
+        with override_waffle_switch(COLUMNAR_STORAGE, active=not columnar_storage):
+            self.mock_cache.map.clear()
+            self.assert_block_structure(self.store.get(self.block_structure.root_block_usage_key), self.children_map)
+
+    @ddt.data(True, False)
+    def test_segmented_storage(self, cached):
+        with override_waffle_switch(SEGMENTED_STORAGE, active=True):
+            self.store.add(self.block_structure)
+        if not cached:
+            self.mock_cache.map.clear()
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        assert isinstance(stored_value, ColumnarBlockStructureBlockData)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test',
+        ) == f'{MockTransformer.name()} val'
+
+        # Data stored in the segmented format remains readable after the switch is toggled.
+        self.mock_cache.map.clear()
+        self.assert_block_structure(self.store.get(self.block_structure.root_block_usage_key), self.children_map)
+
     def test_delete(self):
         self.store.add(self.block_structure)
         self.store.delete(self.block_structure.root_block_usage_key)
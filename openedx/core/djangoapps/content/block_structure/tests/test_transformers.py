@@ -5,11 +5,63 @@ from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.test import override_settings
 
 from ..block_structure import BlockStructureModulestoreData
+from ..columnar import ColumnarBlockStructureBlockData
 from ..exceptions import TransformerDataIncompatible, TransformerException
+from ..factory import BlockStructureFactory
 from ..transformers import BlockStructureTransformers
-from .helpers import ChildrenMapTestMixin, MockFilteringTransformer, MockTransformer, mock_registered_transformers
+from .helpers import (
+    ChildrenMapTestMixin,
+    MockFilteringTransformer,
+    MockModulestoreFactory,
+    MockTransformer,
+    MockXBlock,
+    mock_registered_transformers
+)
+
+
+class MockIncrementalTransformer(MockTransformer):
+    """
+    A mock transformer that supports incremental collection, and
+    percolates the values of its blocks' 'value' field down to their
+    descendants.
+    """
+    INCREMENTAL_COLLECT = True
+    collected_blocks = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('value')
+        for block_key in block_structure.topological_traversal():
+            cls.collected_blocks.append(block_key)
+            merged_values = {block_structure.get_xblock(block_key).value}
+            for parent_key in block_structure.get_parents(block_key):
+                merged_values |= block_structure.get_transformer_block_field(parent_key, cls, 'merged_values')
+            block_structure.set_transformer_block_field(block_key, cls, 'merged_values', merged_values)
+        block_structure.set_transformer_data(cls, 'root_value', block_structure.get_xblock(0).value)
+
+    @classmethod
+    def post_collect(cls, block_structure):
+        block_structure.set_transformer_data(cls, 'num_blocks', len(block_structure))
+
+
+def get_collected_data(block_structure):
+    """
+    Returns the collected data of the given block structure, as plain
+    Python objects for comparison.
+    """
+    return {
+        'block_data': {
+            block_key: (
+                dict(block_structure[block_key].fields),
+                {name: dict(data.fields) for name, data in block_structure[block_key].transformer_data.items()},
+            )
+            for block_key in block_structure
+        },
+        'transformer_data': {name: dict(data.fields) for name, data in block_structure.transformer_data.items()},
+    }
 
 
 class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
@@ -75,3 +127,138 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             assert self.transformers.verify_versions(block_structure)
+
+
+class TestCollectIncrementally(ChildrenMapTestMixin, TestCase):
+    """
+    Test class for BlockStructureTransformers.collect_incrementally.
+    """
+    def setUp(self):
+        super().setUp()
+        MockIncrementalTransformer.collected_blocks = []
+
+    def create_modulestore_block_structure(self, children_map, changed_blocks=()):
+        """
+        Returns a block structure for the given children_map, with an
+        xBlock for each block.  The content of the given changed_blocks
+        differs from that of the other blocks.
+        """
+        block_structure = self.create_block_structure(children_map, BlockStructureModulestoreData)
+        for block_key in range(len(children_map)):
+            version = 'v2' if block_key in changed_blocks else 'v1'
+            block_structure._add_xblock(  # pylint: disable=protected-access
+                block_key,
+                MockXBlock(block_key, {'update_version': version, 'value': f'{block_key}.{version}'}),
+            )
+        return block_structure
+
+    def collect_previous(self, children_map, transformers):
+        """
+        Returns a block structure for the given children_map, fully
+        collected with the given transformers.
+        """
+        block_structure = self.create_modulestore_block_structure(children_map)
+        with mock_registered_transformers(transformers):
+            BlockStructureTransformers.collect(block_structure)
+        MockIncrementalTransformer.collected_blocks = []
+        return block_structure
+
+    def test_changed_block(self):
+        previous_block_structure = self.collect_previous(self.DAG_CHILDREN_MAP, [MockIncrementalTransformer])
+        for previous in (previous_block_structure, ColumnarBlockStructureBlockData.from_block_structure(
+            previous_block_structure
+        )):
+            MockIncrementalTransformer.collected_blocks = []
+            block_structure = self.create_modulestore_block_structure(self.DAG_CHILDREN_MAP, changed_blocks=[2])
+            with mock_registered_transformers([MockIncrementalTransformer]):
+                assert BlockStructureTransformers.collect_incrementally(block_structure, previous)
+
+            # Block 2, its descendants and their ancestors were collected.
+            assert set(MockIncrementalTransformer.collected_blocks) == {0, 1, 2, 3, 4, 5, 6}
+            assert MockIncrementalTransformer.collected_blocks.count(1) == 1
+            assert block_structure.get_transformer_block_field(5, MockIncrementalTransformer, 'merged_values') == {
+                '0.v1', '1.v1', '2.v2', '3.v1', '5.v1',
+            }
+
+            expected_block_structure = self.create_modulestore_block_structure(
+                self.DAG_CHILDREN_MAP, changed_blocks=[2],
+            )
+            with mock_registered_transformers([MockIncrementalTransformer]):
+                BlockStructureTransformers.collect(expected_block_structure)
+            assert get_collected_data(block_structure) == get_collected_data(expected_block_structure)
+
+    def test_unchanged_blocks_carried_over(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+        previous_block_structure.set_transformer_block_field(2, MockIncrementalTransformer, 'carried_over', True)
+
+        block_structure = self.create_modulestore_block_structure(self.SIMPLE_CHILDREN_MAP, changed_blocks=[3])
+        with mock_registered_transformers([MockIncrementalTransformer]):
+            assert BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+
+        assert MockIncrementalTransformer.collected_blocks == [0, 1, 3]
+        assert block_structure.get_transformer_block_field(2, MockIncrementalTransformer, 'carried_over')
+        assert block_structure.get_xblock_field(3, 'value') == '3.v2'
+        assert block_structure.get_xblock_field(4, 'value') == '4.v1'
+        assert block_structure.get_transformer_data(MockIncrementalTransformer, 'root_value') == '0.v1'
+        assert block_structure.get_transformer_data(MockIncrementalTransformer, 'num_blocks') == 5
+
+    def test_lazy_block_structure(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+        modulestore = MockModulestoreFactory.create(self.SIMPLE_CHILDREN_MAP, lambda block_key: block_key)
+        for block_key, xblock in modulestore.blocks.items():
+            xblock.field_map.update(update_version='v2' if block_key == 3 else 'v1', value=f'{block_key}.v1')
+
+        block_structure = BlockStructureFactory.create_from_modulestore_lazily(0, modulestore)
+        with mock_registered_transformers([MockIncrementalTransformer]):
+            assert BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+
+        # Only the xBlocks of the changed block and its ancestors were loaded.
+        assert modulestore.get_items_call_count == 3
+        assert MockIncrementalTransformer.collected_blocks == [0, 1, 3]
+        assert block_structure.get_xblock_field(4, 'value') == '4.v1'
+        assert block_structure.get_transformer_data(MockIncrementalTransformer, 'num_blocks') == 5
+
+    def test_changed_relations(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+
+        # Block 4 is moved from block 1 to block 2, and block 5 is added to block 2.
+        block_structure = self.create_modulestore_block_structure([[1, 2], [3], [4, 5], [], [], []])
+        with mock_registered_transformers([MockIncrementalTransformer]):
+            assert BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+
+        assert set(MockIncrementalTransformer.collected_blocks) == {0, 1, 2, 3, 4, 5}
+        assert block_structure.get_transformer_block_field(4, MockIncrementalTransformer, 'merged_values') == {
+            '0.v1', '2.v1', '4.v1',
+        }
+
+    def test_changed_root(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+        block_structure = self.create_modulestore_block_structure(self.SIMPLE_CHILDREN_MAP, changed_blocks=[0])
+        with mock_registered_transformers([MockIncrementalTransformer]):
+            assert not BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+        assert not MockIncrementalTransformer.collected_blocks
+
+    def test_unknown_version(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+        block_structure = self.create_modulestore_block_structure(self.SIMPLE_CHILDREN_MAP)
+        del block_structure.get_xblock(2).field_map['update_version']
+        with mock_registered_transformers([MockIncrementalTransformer]):
+            assert BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+        assert MockIncrementalTransformer.collected_blocks == [0, 2]
+
+    def test_unsupported_transformer(self):
+        transformers = [MockIncrementalTransformer, MockTransformer]
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, transformers)
+        block_structure = self.create_modulestore_block_structure(self.SIMPLE_CHILDREN_MAP, changed_blocks=[3])
+        with mock_registered_transformers(transformers):
+            assert not BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+
+            with override_settings(BLOCK_STRUCTURES_SETTINGS={'INCREMENTAL_COLLECT_TRANSFORMERS': ['MockTransformer']}):
+                assert BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+
+    def test_outdated_transformer_data(self):
+        previous_block_structure = self.collect_previous(self.SIMPLE_CHILDREN_MAP, [MockIncrementalTransformer])
+        block_structure = self.create_modulestore_block_structure(self.SIMPLE_CHILDREN_MAP, changed_blocks=[3])
+        with patch.object(MockIncrementalTransformer, 'WRITE_VERSION', 2):
+            with mock_registered_transformers([MockIncrementalTransformer]):
+                assert not BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
@@ -58,6 +58,22 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method supports incremental
+    # collection, where only the blocks that changed since the
+    # previous collection, and their descendants, are re-collected
+    # and the previously collected data of all other blocks is kept.
+    # See BlockStructureTransformers.collect_incrementally.
+    #
+    # This requires that the data collected for each block depends
+    # only on the block itself and its ancestors, as is the case when
+    # ancestors' data is percolated down to their descendants, and
+    # that any non-block-specific data depends only on the root block.
+    # During an incremental collection, the collect method is given
+    # a block structure with only the blocks to re-collect and their
+    # ancestors.  Data that depends on other blocks, or on anything
+    # outside of the blocks, should be computed in post_collect.
+    INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -107,6 +123,25 @@ class BlockStructureTransformer:
                 data to be cached for the transformer.
         """
 
+    @classmethod
+    def post_collect(cls, block_structure):
+        """
+        Collects and stores any data that depends on all of the blocks
+        of the block_structure, once the collect phase of all
+        transformers is done.  For example, course-wide data.
+
+        Unlike collect, this is always given the whole block structure,
+        including when its data is collected incrementally.  It may
+        only use the data collected for the blocks, since their xBlocks
+        may not be loaded.
+
+        Arguments:
+            block_structure (BlockStructureBlockData) - A mutable
+                block structure with the collected data of all of its
+                blocks, that is to be modified with collected data to
+                be cached for the transformer.
+        """
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
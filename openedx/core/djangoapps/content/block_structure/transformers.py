@@ -3,12 +3,22 @@ Module for a collection of BlockStructureTransformers.
 """
 from logging import getLogger
 
+from . import config
+from .block_structure import BlockStructureModulestoreData, LazyBlockStructureModulestoreData
 from .exceptions import TransformerDataIncompatible, TransformerException
 from .transformer import FilteringTransformerMixin, combine_filters
 from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
+# xBlock fields identifying the version of a block's content, collected
+# for all blocks so that later collections can tell which blocks changed.
+# In the published branch of a split modulestore course, source_version
+# is the version of the draft block that was published, which stays the
+# same when an unchanged block is published again.  It is None for blocks
+# that were edited directly, in which case update_version is used.
+CONTENT_VERSION_FIELDS = ('source_version', 'update_version')
+
 
 class BlockStructureTransformers:
     """
@@ -73,13 +83,113 @@ class BlockStructureTransformers:
         """
         Collects data for each registered transformer.
         """
+        cls._collect_blocks(block_structure)
+        cls._post_collect(block_structure)
+
+    @classmethod
+    def _collect_blocks(cls, block_structure):
+        """
+        Runs the collect method of each registered transformer on the
+        given block structure, and collects the xBlock fields they
+        requested.
+        """
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
+        block_structure.request_xblock_fields(*CONTENT_VERSION_FIELDS)
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def _post_collect(cls, block_structure):
+        """
+        Runs the post_collect method of each registered transformer on
+        the given block structure, once the data of all of its blocks
+        is collected.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            transformer.post_collect(block_structure)
+
+    @classmethod
+    def collect_incrementally(cls, block_structure, previous_block_structure):
+        """
+        Collects data for each registered transformer, like collect, but
+        only for the blocks that changed since the given previously
+        collected block structure of the same root, and their
+        descendants, which may have inherited data from them.  The
+        collected data of all other blocks is carried over from the
+        previous block structure.  The post_collect method of each
+        transformer is then run on the whole block structure.
+
+        If the given block structure is a
+        LazyBlockStructureModulestoreData, only the xBlocks of the
+        blocks to collect and their ancestors are loaded.
+
+        A block is considered changed if its content version (see
+        CONTENT_VERSION_FIELDS) is unknown or differs from the
+        previously collected one, or if its children or parents
+        changed.
+
+        Returns whether the data was collected.  Nothing is collected if
+        any registered transformer doesn't support incremental
+        collection (see BlockStructureTransformer.INCREMENTAL_COLLECT
+        and BLOCK_STRUCTURES_SETTINGS['INCREMENTAL_COLLECT_TRANSFORMERS'])
+        or its data in the previous block structure was written by a
+        different version of it, or if the root block changed.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The newly
+                created block structure whose data is to be collected.
+                Its data isn't modified unless this returns True.
+
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            if not (
+                transformer.INCREMENTAL_COLLECT or transformer.name() in config.incremental_collect_transformers()
+            ):
+                return False
+            get_data_version = previous_block_structure._get_transformer_data_version  # pylint: disable=protected-access
+            if transformer.WRITE_VERSION != get_data_version(transformer):
+                return False
+
+        changed_blocks = _get_changed_blocks(block_structure, previous_block_structure)
+        blocks_to_collect = set()
+        for block_key in block_structure.topological_traversal():
+            if block_key in changed_blocks or any(
+                parent_key in blocks_to_collect for parent_key in block_structure.get_parents(block_key)
+            ):
+                blocks_to_collect.add(block_key)
+        if block_structure.root_block_usage_key in blocks_to_collect:
+            return False
+
+        partial_block_structure = _PartialBlockStructureModulestoreData(block_structure, blocks_to_collect)
+        cls._collect_blocks(partial_block_structure)
+
+        for transformer_name, transformer_data in previous_block_structure.transformer_data.items():
+            for key, value in transformer_data.fields.items():
+                block_structure.set_transformer_data(transformer_name, key, value)
+        for transformer_name, transformer_data in partial_block_structure.transformer_data.items():
+            for key, value in transformer_data.fields.items():
+                block_structure.set_transformer_data(transformer_name, key, value)
+
+        for block_key in block_structure:
+            if block_key in blocks_to_collect:
+                _copy_block_data(partial_block_structure, block_structure, block_key)
+            else:
+                _copy_block_data(previous_block_structure, block_structure, block_key)
+        cls._post_collect(block_structure)
+
+        logger.info(
+            'Incrementally collected %d of %d blocks of the block structure %s.',
+            len(blocks_to_collect),
+            len(block_structure),
+            block_structure.root_block_usage_key,
+        )
+        return True
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -138,3 +248,102 @@ class BlockStructureTransformers:
         """
         for transformer in self._transformers['no_filter']:
             transformer.transform(self.usage_info, block_structure)
+
+
+class _PartialBlockStructureModulestoreData(BlockStructureModulestoreData):
+    """
+    A block structure with a subset of the blocks of another
+    BlockStructureModulestoreData, along with all of their ancestors,
+    used for collecting the data of only those blocks.
+    """
+    def __init__(self, block_structure, block_keys):
+        super().__init__(block_structure.root_block_usage_key)
+        self._full_block_structure = block_structure
+
+        blocks_to_add = set(block_keys)
+        stack = list(block_keys)
+        while stack:
+            for parent_key in block_structure.get_parents(stack.pop()):
+                if parent_key not in blocks_to_add:
+                    blocks_to_add.add(parent_key)
+                    stack.append(parent_key)
+
+        for block_key in block_structure.topological_traversal():
+            if block_key not in blocks_to_add:
+                continue
+            self._add_xblock(block_key, block_structure.get_xblock(block_key))
+            for child_key in block_structure.get_children(block_key):
+                if child_key in blocks_to_add:
+                    self._add_relation(block_key, child_key)
+
+    def get_xblock(self, usage_key):
+        """
+        Returns the instantiated xBlock for the given usage key, which
+        may be outside of this block structure, e.g. if a transformer
+        looks up the children of a block.
+        """
+        try:
+            return super().get_xblock(usage_key)
+        except KeyError:
+            return self._full_block_structure.get_xblock(usage_key)
+
+
+def _get_content_version(block_structure, block_key):
+    """
+    Returns the version of the content of the given block in the given
+    collected block structure, or None if unknown.
+    """
+    for field_name in CONTENT_VERSION_FIELDS:
+        version = block_structure.get_xblock_field(block_key, field_name)
+        if version is not None:
+            return version
+    return None
+
+
+def _get_xblock_content_version(block_structure, block_key):
+    """
+    Returns the version of the content of the given block's xBlock in
+    the given block structure, or None if unknown.  The xBlock isn't
+    loaded if the block structure already knows its version.
+    """
+    if isinstance(block_structure, LazyBlockStructureModulestoreData):
+        return block_structure.get_content_version(block_key)
+
+    xblock = block_structure.get_xblock(block_key)
+    for field_name in CONTENT_VERSION_FIELDS:
+        version = getattr(xblock, field_name, None)
+        if version is not None:
+            return version
+    return None
+
+
+def _get_changed_blocks(block_structure, previous_block_structure):
+    """
+    Returns the set of keys of the blocks in the given block structure
+    that changed since the given previously collected block structure.
+    """
+    changed_blocks = set()
+    for block_key in block_structure:
+        version = _get_xblock_content_version(block_structure, block_key)
+        if (
+            version is None or
+            block_key not in previous_block_structure or
+            version != _get_content_version(previous_block_structure, block_key) or
+            list(block_structure.get_children(block_key)) != list(previous_block_structure.get_children(block_key)) or
+            set(block_structure.get_parents(block_key)) != set(previous_block_structure.get_parents(block_key))
+        ):
+            changed_blocks.add(block_key)
+    return changed_blocks
+
+
+def _copy_block_data(source_block_structure, block_structure, block_key):
+    """
+    Copies the collected xBlock fields and transformer data of the given
+    block from the source block structure to the given block structure.
+    """
+    block_data = source_block_structure[block_key]
+    for field_name, value in block_data.fields.items():
+        block_structure.override_xblock_field(block_key, field_name, value)
+    for transformer_name, transformer_block_data in block_data.transformer_data.items():
+        for key, value in transformer_block_data.fields.items():
+            block_structure.set_transformer_block_field(block_key, transformer_name, key, value)
@@ -1,11 +1,13 @@
 """
 Helper functions for caching course assets.
 """
+from uuid import uuid4
+
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -29,9 +31,81 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(str(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+class ContentMetadata(StaticContent):
+    """
+    The metadata of a piece of content, without its data.
+
+    The metadata of every piece of content served is cached, whatever its size, so that requests
+    which can be answered without the data, such as conditional requests, don't have to open the
+    content in the contentstore.
+    """
+
+    @classmethod
+    def from_content(cls, content):
+        """
+        Returns the metadata of the given piece of content.
+        """
+        return cls(
+            content.location, content.name, content.content_type, None,
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked,
+            content_digest=content.content_digest,
+        )
+
+
+def _metadata_cache_key(location):
+    """
+    Returns the key of the cached metadata of the content at the given location.
+    """
+    return f"metadata:{location}".encode("utf-8")
+
+
+def set_cached_content_metadata(content):
+    """
+    Stores the metadata of the given piece of content in the cache, using its location as the key.
+    """
+    CONTENT_CACHE.set(
+        _metadata_cache_key(content.location), ContentMetadata.from_content(content), version=STATIC_CONTENT_VERSION
+    )
+
+
+def get_cached_content_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location if cached.
+    """
+    return CONTENT_CACHE.get(_metadata_cache_key(location), version=STATIC_CONTENT_VERSION)
+
+
+def _assets_version_cache_key(course_key):
+    """
+    Returns the key of the cached version of the assets of the given course.
+    """
+    return f"assets_version:{course_key}"
+
+
+def get_course_assets_version(course_key):
+    """
+    Returns the current version of the assets of the given course, or None if it can't be determined.
+
+    The version is deleted, and so changes, whenever an asset of the course is added, changed or
+    deleted, see del_cached_content. Values computed from the assets of a course can be cached along
+    with the version read *before* computing them, and are only valid as long as it is current.
+    """
+    version_key = _assets_version_cache_key(course_key)
+    assets_version = CONTENT_CACHE.get(version_key, version=STATIC_CONTENT_VERSION)
+    if assets_version is None:
+        assets_version = uuid4().hex
+        if not CONTENT_CACHE.add(version_key, assets_version, timeout=None, version=STATIC_CONTENT_VERSION):
+            assets_version = CONTENT_CACHE.get(version_key, version=STATIC_CONTENT_VERSION)
+    return assets_version
+
+
 def del_cached_content(location):
     """
-    Delete content for the given location, as well versions of the content without a run.
+    Delete content and its metadata for the given location, as well versions of the content without a run.
+
+    The version of the assets of the course is deleted too, so that values cached along with it
+    (see get_course_assets_version) are no longer used.
 
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
@@ -40,11 +114,13 @@ def del_cached_content(location):
         """Force the location to a Unicode string."""
         return str(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    keys = [location_str(loc) for loc in locations] + [_metadata_cache_key(loc) for loc in locations]
+    keys.append(_assets_version_cache_key(location.course_key))
+    CONTENT_CACHE.delete_many(keys, version=STATIC_CONTENT_VERSION)
@@ -0,0 +1,201 @@
+"""
+A local disk cache of course assets, from which they are served without going through Python.
+
+Assets are stored in the directory set by the ``COURSE_ASSETS_DISK_CACHE_DIR`` setting, under
+their content digest, when they are first served. Since the digest changes with the content of
+an asset, cached files never go stale, and assets with the same content share a file. The least
+recently served files are evicted when the cache grows over ``COURSE_ASSETS_DISK_CACHE_MAX_SIZE``.
+
+Cached files are handed off to the web server to send, with ``X-Accel-Redirect`` (nginx) or
+``X-Sendfile`` (Apache, lighttpd) when configured, or else sent with a ``FileResponse``, which
+uses ``sendfile`` under most WSGI servers.
+"""
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+from xmodule.assetstore.assetmgr import AssetManager
+
+log = logging.getLogger(__name__)
+
+# Content digests are MD5 hex digests, and are used as file names.
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Once over the maximum size, files are evicted until the cache is down to this share of it, so
+# that eviction doesn't happen on every new file.
+EVICTION_TARGET_RATIO = 0.9
+
+# The size of the files in the cache, as last known by this process, see _add_to_size.
+_cache_size = None
+_cache_size_lock = threading.Lock()
+
+
+def is_enabled():
+    """
+    Returns whether the disk cache of course assets is configured.
+    """
+    return bool(getattr(settings, 'COURSE_ASSETS_DISK_CACHE_DIR', None))
+
+
+def get_cached_file_path(content):
+    """
+    Returns the path to the file holding the given content in the disk cache, adding it to the
+    cache first if it isn't yet.
+
+    Returns None if the content can't be cached, because it has no digest or is larger than the
+    cache, or if the file couldn't be written.
+    """
+    digest = getattr(content, 'content_digest', None)
+    if not digest or not _DIGEST_PATTERN.match(digest):
+        return None
+
+    path = _get_path(digest)
+    try:
+        # Mark the file as recently used, by its access time, which is set explicitly since file
+        # systems are often mounted without access time updates.
+        os.utime(path, (time.time(), os.stat(path).st_mtime))
+        return path
+    except FileNotFoundError:
+        pass
+
+    if content.length is None or content.length > settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE:
+        return None
+    try:
+        # The content is read again from the contentstore, so that the stream of the content being
+        # served is left as it is.
+        _write_file(path, AssetManager.find(content.location, as_stream=True))
+    except OSError:
+        log.exception("Failed to add the asset %s to the disk cache", content.location)
+        return None
+    _add_to_size(content.length)
+    return path
+
+
+def is_handed_off_to_web_server():
+    """
+    Returns whether cached files are sent by the web server, which then also handles the Range
+    header of the request.
+    """
+    return bool(
+        getattr(settings, 'COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION', None) or
+        getattr(settings, 'COURSE_ASSETS_X_SENDFILE', False)
+    )
+
+
+def make_file_response(path):
+    """
+    Returns the response sending the cached file at ``path``, or None if it no longer exists.
+
+    The Content-Type of the response is left to the caller to set.
+    """
+    x_accel_redirect_location = getattr(settings, 'COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION', None)
+    if x_accel_redirect_location:
+        response = HttpResponse()
+        relative_path = os.path.relpath(path, settings.COURSE_ASSETS_DISK_CACHE_DIR)
+        response['X-Accel-Redirect'] = x_accel_redirect_location.rstrip('/') + '/' + relative_path
+        return response
+
+    if getattr(settings, 'COURSE_ASSETS_X_SENDFILE', False):
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+
+    try:
+        cached_file = open(path, 'rb')  # pylint: disable=consider-using-with
+    except FileNotFoundError:
+        # The file was evicted since it was looked up.
+        return None
+    return FileResponse(cached_file)
+
+
+def _get_path(digest):
+    """
+    Returns the path of the file holding the content with the given digest.
+
+    Files are spread over subdirectories named after the first characters of their digest, so
+    that directories stay small.
+    """
+    return os.path.join(settings.COURSE_ASSETS_DISK_CACHE_DIR, digest[:2], digest)
+
+
+def _write_file(path, content):
+    """
+    Writes the content to the file at ``path``.
+
+    The content is written to a temporary file which is then renamed, so that other processes
+    never see a partially written file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    finally:
+        content.close()
+
+
+def _add_to_size(length):
+    """
+    Adds the length of a new file to the size of the cache, evicting the least recently used
+    files if the cache is over its maximum size.
+
+    The size of the cache is only computed from the files in it when this process first adds a
+    file, and when it evicts files, since other processes add files too.
+    """
+    global _cache_size  # pylint: disable=global-statement
+    with _cache_size_lock:
+        if _cache_size is None:
+            _cache_size = sum(size for __, __, size in _list_files())
+        else:
+            _cache_size += length
+        if _cache_size > settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE:
+            _cache_size = _evict()
+
+
+def _evict():
+    """
+    Deletes the least recently used files until the cache is down to its eviction target.
+
+    Returns the size of the files left in the cache.
+    """
+    files = sorted(_list_files())
+    size = sum(size for __, __, size in files)
+    target_size = settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE * EVICTION_TARGET_RATIO
+    for __, path, file_size in files:
+        if size <= target_size:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            # Another process evicted it.
+            pass
+        size -= file_size
+    return size
+
+
+def _list_files():
+    """
+    Yields the ``(last_used, path, size)`` of every file in the cache.
+    """
+    for directory, __, file_names in os.walk(settings.COURSE_ASSETS_DISK_CACHE_DIR):
+        for file_name in file_names:
+            if not _DIGEST_PATTERN.match(file_name):
+                continue
+            path = os.path.join(directory, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield stat.st_atime, path, stat.st_size
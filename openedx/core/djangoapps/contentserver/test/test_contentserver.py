@@ -5,7 +5,12 @@ Tests for content server.
 
 import copy
 import datetime
+import hashlib
+import io
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 from uuid import uuid4
@@ -20,14 +25,15 @@ from opaque_keys import InvalidKeyError
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import AdminFactory, UserFactory
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent
+from xmodule.contentstore.content import VERSIONED_ASSETS_PREFIX, StaticContent, StaticContentStream
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
-from .. import views
+from .. import disk_cache, views
+from ..caching import ContentMetadata
 
 log = logging.getLogger(__name__)
 
@@ -335,6 +341,53 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert 'Content-Range' not in resp
         assert resp['Content-Length'] == str(self.length_unlocked)
 
+    def test_range_request_multiple_ranges_multipart(self):
+        """
+        Test that multiple ranges in request outputs the ranges in a multipart/byteranges response.
+        """
+        data = AssetManager.find(self.unlocked_asset).data
+        ranges = [(0, 9), (self.length_unlocked // 2, self.length_unlocked - 1)]
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-{last}, {length}-'.format(
+            first=ranges[1][0], last=ranges[1][1], length=self.length_unlocked))
+
+        assert resp.status_code == 206
+        assert 'Content-Range' not in resp
+        assert resp['Content-Type'].startswith('multipart/byteranges; boundary=')
+        boundary = resp['Content-Type'].split('boundary=')[1]
+        body = b''.join(resp.streaming_content)
+        assert resp['Content-Length'] == str(len(body))
+
+        # The range which can't be satisfied is left out.
+        parts = body.split(f'--{boundary}'.encode())
+        assert parts[0] == b''
+        assert parts[-1] == b'--\r\n'
+        assert len(parts[1:-1]) == len(ranges)
+        for part, (first, last) in zip(parts[1:-1], ranges):
+            headers, part_data = part.split(b'\r\n\r\n', 1)
+            assert f'Content-Range: bytes {first}-{last}/{self.length_unlocked}'.encode() in headers
+            assert part_data == data[first:last + 1] + b'\r\n'
+
+    def test_range_request_overlapping_ranges(self):
+        """
+        Test that overlapping and adjacent ranges are merged into one.
+        """
+        data = AssetManager.find(self.unlocked_asset).data
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-19, 0-14, 20-29')
+
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 0-29/{self.length_unlocked}'
+        assert resp.content == data[0:30]
+
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a range request for too many ranges outputs the full content.
+        """
+        header_value = 'bytes=' + ', '.join(f'{i}-{i}' for i in range(views.MAX_BYTE_RANGES + 1))
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE=header_value)
+
+        assert resp.status_code == 200
+        assert resp['Content-Length'] == str(self.length_unlocked)
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
@@ -366,6 +419,92 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}'.format(
             first=(self.length_unlocked), last=(self.length_unlocked)))
         assert resp.status_code == 416
+        assert resp['Content-Range'] == f'bytes */{self.length_unlocked}'
+
+    def test_etag(self):
+        """
+        Test that the ETag of assets is their digest.
+        """
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        assert resp['ETag'] == '"{}"'.format(AssetManager.find(self.unlocked_asset).content_digest)
+
+    @ddt.data(
+        ('{etag}', 304),
+        ('W/{etag}', 304),
+        ('"ffffffffffffffffffffffffffffffff", {etag}', 304),
+        ('*', 304),
+        ('"ffffffffffffffffffffffffffffffff"', 200),
+    )
+    @ddt.unpack
+    def test_if_none_match(self, header_value, status_code):
+        """
+        Test that the asset isn't sent back when the client has its current ETag.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=header_value.format(etag=etag))
+        assert resp.status_code == status_code
+        assert resp['ETag'] == etag
+
+    def test_if_none_match_takes_precedence(self):
+        """
+        Test that If-Modified-Since is ignored when If-None-Match is sent.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_IF_NONE_MATCH='"ffffffffffffffffffffffffffffffff"',
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        assert resp.status_code == 200
+
+    @ddt.data(
+        (datetime.timedelta(0), 304),
+        (datetime.timedelta(days=1), 304),
+        (datetime.timedelta(days=-1), 200),
+    )
+    @ddt.unpack
+    def test_if_modified_since(self, offset, status_code):
+        """
+        Test that the asset isn't sent back when it wasn't modified since the given date.
+        """
+        last_modified = datetime.datetime.strptime(
+            self.client.get(self.url_unlocked)['Last-Modified'], views.HTTP_DATE_FORMAT
+        )
+        if_modified_since = (last_modified + offset).strftime(views.HTTP_DATE_FORMAT)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        assert resp.status_code == status_code
+
+    @ddt.data(
+        ('etag', 206),
+        ('last_modified', 206),
+        ('"ffffffffffffffffffffffffffffffff"', 200),
+        ('Thu, 01 Jan 1970 00:00:00 GMT', 200),
+    )
+    @ddt.unpack
+    def test_if_range(self, header_value, status_code):
+        """
+        Test that the range is only sent back when If-Range matches the current version of the asset.
+        """
+        first_resp = self.client.get(self.url_unlocked)
+        header_value = {
+            'etag': first_resp['ETag'],
+            'last_modified': first_resp['Last-Modified'],
+        }.get(header_value, header_value)
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-0', HTTP_IF_RANGE=header_value)
+        assert resp.status_code == status_code
+
+    def test_not_modified_from_cached_metadata(self):
+        """
+        Test that conditional requests are answered from the cached metadata of assets,
+        without opening them in the contentstore.
+        """
+        metadata = ContentMetadata.from_content(AssetManager.find(self.unlocked_asset, as_stream=True))
+        with patch.object(views, 'get_cached_content_metadata', return_value=metadata):
+            with patch.object(views.AssetManager, 'find') as mock_find:
+                resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"{metadata.content_digest}"')
+        assert resp.status_code == 304
+        mock_find.assert_not_called()
 
     def test_vary_header_sent(self):
         """
@@ -376,6 +515,70 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert resp.status_code == 200
         assert 'Origin' == resp['Vary']
 
+    def _override_disk_cache_settings(self, **kwargs):
+        """
+        Enables the disk cache of course assets in a temporary directory, and returns the directory.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        settings_override = override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir, **kwargs)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return cache_dir
+
+    def test_disk_cache_file_response(self):
+        """
+        Test that assets are added to the disk cache when first served, and then served from it.
+        """
+        cache_dir = self._override_disk_cache_settings()
+        content = AssetManager.find(self.unlocked_asset)
+        cached_file_path = os.path.join(cache_dir, content.content_digest[:2], content.content_digest)
+
+        for __ in range(2):
+            resp = self.client.get(self.url_unlocked)
+            assert resp.status_code == 200
+            assert resp.streaming
+            assert b''.join(resp.streaming_content) == content.data
+            assert resp['Content-Length'] == str(self.length_unlocked)
+            assert resp['Content-Type'] == content.content_type
+            resp.close()
+            with open(cached_file_path, 'rb') as cached_file:
+                assert cached_file.read() == content.data
+
+    def test_disk_cache_range_request(self):
+        """
+        Test that range requests are served by Python when the file isn't handed off to the web server.
+        """
+        self._override_disk_cache_settings()
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-0')
+        assert resp.status_code == 206
+        assert resp['Content-Length'] == '1'
+
+    def test_disk_cache_x_accel_redirect(self):
+        """
+        Test that assets in the disk cache, even requested with a range, are handed off to nginx.
+        """
+        self._override_disk_cache_settings(COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION='/course-assets-cache/')
+        digest = AssetManager.find(self.unlocked_asset).content_digest
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-0')
+        assert resp.status_code == 200
+        assert resp['X-Accel-Redirect'] == f'/course-assets-cache/{digest[:2]}/{digest}'
+        assert resp.content == b''
+
+    def test_disk_cache_locked_asset_not_logged_in(self):
+        """
+        Test that the access to assets is checked before they are served from the disk cache.
+        """
+        cache_dir = self._override_disk_cache_settings(COURSE_ASSETS_X_SENDFILE=True)
+        self.client.logout()
+
+        resp = self.client.get(self.url_locked)
+        assert resp.status_code == 403
+        assert 'X-Sendfile' not in resp
+        assert not os.listdir(cache_dir)
+
     @patch('openedx.core.djangoapps.contentserver.models.CourseAssetCacheTtlConfig.get_cache_ttl')
     def test_cache_headers_with_ttl_unlocked(self, mock_get_cache_ttl):
         """
@@ -485,6 +688,61 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert is_from_cdn is True
 
 
+class DiskCacheEvictionTestCase(unittest.TestCase):
+    """
+    Tests for the eviction of assets from the disk cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        settings_override = override_settings(
+            COURSE_ASSETS_DISK_CACHE_DIR=self.cache_dir,
+            COURSE_ASSETS_DISK_CACHE_MAX_SIZE=250,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = patch.object(disk_cache, '_cache_size', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache(self, data, last_used):
+        """
+        Adds an asset with the given data to the cache, as last served at ``last_used``.
+        """
+        content = StaticContentStream(
+            None, 'asset.txt', 'text/plain', io.BytesIO(data), length=len(data),
+            content_digest=hashlib.md5(data).hexdigest(),
+        )
+        with patch.object(AssetManager, 'find', return_value=content):
+            path = disk_cache.get_cached_file_path(content)
+        os.utime(path, (last_used, last_used))
+        return path
+
+    def test_least_recently_used_evicted(self):
+        served = self._cache(b'a' * 40, last_used=500)
+        oldest = self._cache(b'b' * 100, last_used=1000)
+        newest = self._cache(b'c' * 100, last_used=3000)
+
+        # Serving an asset again marks it as recently used.
+        data = b'a' * 40
+        content = StaticContent(None, 'asset.txt', 'text/plain', data, content_digest=hashlib.md5(data).hexdigest())
+        assert disk_cache.get_cached_file_path(content) == served
+
+        # Going over the maximum size evicts the least recently used assets, down to 90% of it.
+        added = self._cache(b'd' * 60, last_used=4000)
+        assert not os.path.exists(oldest)
+        assert os.path.exists(served)
+        assert os.path.exists(newest)
+        assert os.path.exists(added)
+
+    def test_too_large_not_cached(self):
+        content = StaticContent(None, 'asset.txt', 'text/plain', b'a' * 300, length=300, content_digest='f' * 32)
+        assert disk_cache.get_cached_file_path(content) is None
+        assert not os.listdir(self.cache_dir)
+
+
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
     """
@@ -513,6 +771,16 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         assert len(ranges) == excepted_ranges_length
         assert ranges == expected_ranges
 
+    @ddt.data(
+        ([(100, 199)], [(100, 199)]),
+        ([(200, 299), (100, 199)], [(100, 299)]),
+        ([(100, 249), (200, 299), (400, 499)], [(100, 299), (400, 499)]),
+        ([(100, 999), (200, 299)], [(100, 999)]),
+    )
+    @ddt.unpack
+    def test_merge_byte_ranges(self, ranges, expected_ranges):
+        assert views.merge_byte_ranges(ranges) == expected_ranges
+
     @ddt.data(
         ('bytes=one-20', ValueError, 'invalid literal for int()'),
         ('bytes=-one', ValueError, 'invalid literal for int()'),
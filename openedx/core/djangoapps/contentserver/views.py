@@ -5,8 +5,10 @@ For historical reasons, this is just one view that matches to three different UR
 re-parse the URL to determine which pattern is in effect. We should probably
 have 3 views as entry points.
 """
+import calendar
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
     HttpResponse,
@@ -14,8 +16,10 @@ from django.http import (
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
+from django.utils.http import parse_http_date_safe
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
 from opaque_keys import InvalidKeyError
@@ -26,13 +30,20 @@ from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.sandboxing import course_code_library_asset_name
 
-from .caching import get_cached_content, set_cached_content
+from . import disk_cache
+from .caching import (
+    ContentMetadata,
+    get_cached_content,
+    get_cached_content_metadata,
+    set_cached_content,
+    set_cached_content_metadata
+)
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 
@@ -51,6 +62,10 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# The most byte ranges served in one multipart/byteranges response. The full content is sent
+# to requests for more ranges.
+MAX_BYTE_RANGES = 20
+
 
 def is_asset_request(request):
     """Determines whether the given request is an asset request"""
@@ -85,11 +100,11 @@ def process_request(request):
         except (InvalidLocationError, InvalidKeyError):
             return HttpResponseBadRequest()
 
-        # Attempt to load the asset to make sure it exists, and grab the asset digest
-        # if we're able to load it.
+        # Attempt to load the asset, or only its metadata when cached, to make sure it
+        # exists, and grab the asset digest if we're able to load it.
         actual_digest = None
         try:
-            content = load_asset_from_location(loc)
+            content = load_asset_metadata_from_location(loc)
             actual_digest = getattr(content, "content_digest", None)
         except (ItemNotFoundError, NotFoundError):
             return HttpResponseNotFound()
@@ -125,24 +140,31 @@ def process_request(request):
 
         # Figure out if the client sent us a conditional request, and let them know
         # if this asset has changed since then.
-        last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-        if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-            if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-            if if_modified_since == last_modified_at_str:
-                return HttpResponseNotModified()
-
-        # *** File streaming within a byte range ***
+        if is_not_modified(request, content):
+            set_custom_attribute('contentserver.not_modified', True)
+            response = HttpResponseNotModified()
+            set_caching_headers(content, loc, response)
+            return response
+
+        # Serve the asset from the disk cache when it's enabled, handing it off to the web server
+        # if configured to, in which case the web server also takes care of any Range requested.
+        response = None
+        if disk_cache.is_enabled() and (
+            disk_cache.is_handed_off_to_web_server() or not request.META.get('HTTP_RANGE')
+        ):
+            cached_file_path = disk_cache.get_cached_file_path(content)
+            if cached_file_path:
+                response = disk_cache.make_file_response(cached_file_path)
+            set_custom_attribute('contentserver.from_disk_cache', response is not None)
+
+        # *** File streaming within byte ranges ***
         # If a Range is provided, parse Range attribute of the request
         # Add Content-Range in the response if Range is structurally correct
-        # Request -> Range attribute structure: "Range: bytes=first-[last]"
-        # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
-        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
-        response = None
-        if request.META.get('HTTP_RANGE'):
-            # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-            if isinstance(content, StaticContent):
-                content = AssetManager.find(loc, as_stream=True)
-
+        # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]...]"
+        # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength",
+        # in the response for a single range, or in each part of a multipart/byteranges response.
+        # https://www.rfc-editor.org/rfc/rfc9110#name-range-requests
+        if response is None and request.META.get('HTTP_RANGE') and is_if_range_satisfied(request, content):
             header_value = request.META['HTTP_RANGE']
             try:
                 unit, ranges = parse_range_header(header_value, content.length)
@@ -156,35 +178,52 @@ def process_request(request):
                 if unit != 'bytes':
                     # Only accept ranges in bytes
                     log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                elif len(ranges) > 1:
-                    # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                    # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                    # But we send back the full content.
+                elif len(ranges) > MAX_BYTE_RANGES:
+                    # Many ranges are costly to serve, and clients are allowed to be sent the full content instead.
                     log.warning(
-                        "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
+                        "More than %s ranges in Range header: %s for content: %s",
+                        MAX_BYTE_RANGES, header_value, str(loc)
                     )
                 else:
-                    first, last = ranges[0]
-
-                    if 0 <= first <= last < content.length:
-                        # If the byte range is satisfiable
+                    # The ranges which can't be satisfied are left out, as long as one can.
+                    ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                    if not ranges:
+                        log.warning(
+                            "Cannot satisfy ranges in Range header: %s for content: %s",
+                            header_value, str(loc)
+                        )
+                        response = HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        response['Content-Range'] = f'bytes */{content.length}'
+                        return response
+
+                    # Overlapping and adjacent ranges are served as one.
+                    ranges = merge_byte_ranges(ranges)
+
+                    # Can't manipulate the bytes of a StaticContent, so get a StaticContentStream,
+                    # unless the asset was just loaded as one.
+                    if not isinstance(content, StaticContentStream):
+                        content = AssetManager.find(loc, as_stream=True)
+                    if len(ranges) == 1:
+                        first, last = ranges[0]
                         response = HttpResponse(content.stream_data_in_range(first, last))
+                        content.close()
                         response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                             first=first, last=last, length=content.length
                         )
                         response['Content-Length'] = str(last - first + 1)
-                        response.status_code = 206  # Partial Content
-
-                        set_custom_attribute('contentserver.ranged', True)
                     else:
-                        log.warning(
-                            "Cannot satisfy ranges in Range header: %s for content: %s",
-                            header_value, str(loc)
-                        )
-                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        response = make_multipart_byteranges_response(content, ranges)
+                    response.status_code = 206  # Partial Content
+
+                    set_custom_attribute('contentserver.ranged', True)
 
         # If Range header is absent or syntactically invalid return a full content response.
         if response is None:
+            if isinstance(content, ContentMetadata):
+                try:
+                    content = load_asset_from_location(loc)
+                except (ItemNotFoundError, NotFoundError):
+                    return HttpResponseNotFound()
             response = HttpResponse(content.stream_data())
             response['Content-Length'] = content.length
 
@@ -193,7 +232,8 @@ def process_request(request):
 
         # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
         response['Accept-Ranges'] = 'bytes'
-        response['Content-Type'] = content.content_type
+        if not response.get('Content-Type', '').startswith('multipart/byteranges'):
+            response['Content-Type'] = content.content_type
         response['X-Frame-Options'] = 'ALLOW'
 
         # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -233,6 +273,9 @@ def set_caching_headers(content, location, response):
         response['Cache-Control'] = "private, no-cache, no-store"
 
     response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+    etag = get_etag(content)
+    if etag:
+        response['ETag'] = etag
 
     # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
     # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -324,6 +367,141 @@ def is_user_authorized(request, content, location):
     return True
 
 
+def get_etag(content):
+    """
+    Returns the strong ETag of the given content, made of its digest, or None if it has no digest.
+    """
+    digest = getattr(content, "content_digest", None)
+    if not digest:
+        return None
+    return f'"{digest}"'
+
+
+def _get_last_modified_timestamp(content):
+    """
+    Returns the time the given content was last modified at, as a timestamp in whole seconds, as
+    it is sent in the Last-Modified header.
+    """
+    return calendar.timegm(content.last_modified_at.utctimetuple())
+
+
+def is_not_modified(request, content):
+    """
+    Returns whether the conditional headers of the request show that the client already has the
+    current version of the content.
+
+    If-None-Match takes precedence over If-Modified-Since, and is matched with the weak
+    comparison. See https://www.rfc-editor.org/rfc/rfc9110#name-conditional-requests
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etag = get_etag(content)
+        if if_none_match.strip() == '*':
+            return True
+        if etag is None:
+            return False
+        return any(
+            tag.strip().removeprefix('W/') == etag
+            for tag in if_none_match.split(',')
+        )
+
+    if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+    if if_modified_since:
+        if_modified_since_timestamp = parse_http_date_safe(if_modified_since)
+        if if_modified_since_timestamp is not None:
+            return _get_last_modified_timestamp(content) <= if_modified_since_timestamp
+
+    return False
+
+
+def is_if_range_satisfied(request, content):
+    """
+    Returns whether the Range header of the request should be applied, which is when it has no
+    If-Range header, or one which matches the current version of the content.
+
+    If-Range is matched with the strong comparison, against the ETag or the Last-Modified date
+    of the content.
+    """
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == get_etag(content)
+    if_range_timestamp = parse_http_date_safe(if_range)
+    return if_range_timestamp is not None and if_range_timestamp == _get_last_modified_timestamp(content)
+
+
+def merge_byte_ranges(ranges):
+    """
+    Returns the given (first, last) byte ranges in order, with the ranges which overlap or are
+    adjacent merged together.
+    """
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def make_multipart_byteranges_response(content, ranges):
+    """
+    Returns the multipart/byteranges response with the given byte ranges of the content, a
+    StaticContentStream, streamed in its parts. The stream is closed once all of them are sent.
+    The status of the response is left to the caller to set.
+
+    See https://www.rfc-editor.org/rfc/rfc9110#name-media-type-multipart-byteran
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        (
+            f'--{boundary}\r\n'
+            f'Content-Type: {content.content_type}\r\n'
+            f'Content-Range: bytes {first}-{last}/{content.length}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing_boundary = f'--{boundary}--\r\n'.encode('utf-8')
+
+    def stream_parts():
+        """
+        Yields the parts of the response, one range after another.
+        """
+        try:
+            for part_header, (first, last) in zip(part_headers, ranges):
+                yield part_header
+                yield from content.stream_data_in_range(first, last)
+                yield b'\r\n'
+            yield closing_boundary
+        finally:
+            content.close()
+
+    response = StreamingHttpResponse(stream_parts())
+    response['Content-Type'] = f'multipart/byteranges; boundary={boundary}'
+    response['Content-Length'] = str(
+        sum(len(part_header) + (last - first + 1) + 2 for part_header, (first, last) in zip(part_headers, ranges)) +
+        len(closing_boundary)
+    )
+    return response
+
+
+def load_asset_metadata_from_location(location):
+    """
+    Loads an asset based on its location, like load_asset_from_location, unless only the
+    metadata of the asset is cached, in which case that metadata is returned, as a
+    ContentMetadata, without opening the asset in the contentstore.
+    """
+    content = get_cached_content(location)
+    if content is None:
+        content = get_cached_content_metadata(location)
+    if content is None:
+        content = _load_asset_from_contentstore(location)
+    return content
+
+
 def load_asset_from_location(location):
     """
     Loads an asset based on its location, either retrieving it from a cache
@@ -333,15 +511,26 @@ def load_asset_from_location(location):
     # See if we can load this item from cache.
     content = get_cached_content(location)
     if content is None:
-        # Not in cache, so just try and load it from the asset manager.
-        content = AssetManager.find(location, as_stream=True)
-
-        # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-        # because it's the default for memcached and also we don't want to do too much
-        # buffering in memory when we're serving an actual request.
-        if content.length is not None and content.length < 1048576:
-            content = content.copy_to_in_mem()
-            set_cached_content(content)
+        content = _load_asset_from_contentstore(location)
+
+    return content
+
+
+def _load_asset_from_contentstore(location):
+    """
+    Loads an asset from the contentstore, and caches it, or only its metadata if it's too large.
+    """
+    content = AssetManager.find(location, as_stream=True)
+    set_cached_content_metadata(content)
+
+    # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
+    # because it's the default for memcached and also we don't want to do too much
+    # buffering in memory when we're serving an actual request.
+    if content.length is not None and content.length < 1048576:
+        stream = content
+        content = stream.copy_to_in_mem()
+        stream.close()
+        set_cached_content(content)
 
     return content
 
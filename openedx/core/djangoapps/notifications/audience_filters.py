@@ -49,6 +49,14 @@ class NotificationAudienceFilterBase:
     def filter(self, values):
         pass
 
+    def filter_users(self, values, user_ids):
+        """
+        Returns those of the given users who are in the audience for the given values.
+
+        Subclasses override this to only query the given users rather than the whole audience.
+        """
+        return set(self.filter(values)) & set(user_ids)
+
 
 class ForumRoleAudienceFilter(NotificationAudienceFilterBase):
     """
@@ -70,6 +78,18 @@ class ForumRoleAudienceFilter(NotificationAudienceFilterBase):
             raise ValueError(f'Invalid roles {roles} passed to RoleAudienceFilter')
         return [user.id for user in get_users_with_roles(roles, self.course_key)]
 
+    def filter_users(self, roles, user_ids):
+        """
+        Returns those of the given users who have one of the roles
+        """
+        if not self.is_valid_filter(roles):
+            raise ValueError(f'Invalid roles {roles} passed to RoleAudienceFilter')
+        return set(Role.objects.filter(
+            name__in=roles,
+            course_id=self.course_key,
+            users__id__in=user_ids,
+        ).values_list('users__id', flat=True))
+
 
 class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
     """
@@ -100,6 +120,18 @@ class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
 
         return user_ids
 
+    def filter_users(self, course_roles, user_ids):
+        """
+        Returns those of the given users who have one of the course roles
+        """
+        if not self.is_valid_filter(course_roles):
+            raise ValueError(f'Invalid roles {course_roles} passed to CourseRoleAudienceFilter')
+        return set(CourseAccessRole.objects.filter(
+            user_id__in=user_ids,
+            course_id=self.course_key,
+            role__in=course_roles,
+        ).values_list('user_id', flat=True))
+
 
 class EnrollmentAudienceFilter(NotificationAudienceFilterBase):
     """
@@ -119,6 +151,14 @@ class EnrollmentAudienceFilter(NotificationAudienceFilterBase):
             is_active=True,
         ).values_list('user_id', flat=True)
 
+    def filter_users(self, enrollment_modes, user_ids):
+        """
+        Returns those of the given users who are enrolled in one of the modes
+        """
+        if not self.is_valid_filter(enrollment_modes):
+            raise ValueError(f'Invalid enrollment modes {enrollment_modes} passed to EnrollmentAudienceFilter')
+        return set(self.filter(enrollment_modes).filter(user_id__in=user_ids))
+
 
 class TeamAudienceFilter(NotificationAudienceFilterBase):
     """
@@ -140,6 +180,16 @@ class TeamAudienceFilter(NotificationAudienceFilterBase):
 
         return user_ids
 
+    def filter_users(self, team_ids, user_ids):
+        """
+        Returns those of the given users who are members of one of the teams
+        """
+        return set(CourseTeam.objects.filter(
+            team_id__in=team_ids,
+            course_id=self.course_key,
+            users__id__in=user_ids,
+        ).values_list('users__id', flat=True))
+
 
 class CohortAudienceFilter(NotificationAudienceFilterBase):
     """
@@ -155,6 +205,16 @@ class CohortAudienceFilter(NotificationAudienceFilterBase):
         ).values_list('users__id', flat=True)
         return users_in_cohort
 
+    def filter_users(self, group_ids, user_ids):
+        """
+        Returns those of the given users who are in one of the cohorts
+        """
+        return set(CourseUserGroup.objects.filter(
+            course_id=self.course_key,
+            id__in=group_ids,
+            users__id__in=user_ids,
+        ).values_list('users__id', flat=True))
+
 
 class NotificationFilter:
     """
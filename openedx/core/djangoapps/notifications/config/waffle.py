@@ -38,3 +38,18 @@ ENABLE_EMAIL_NOTIFICATIONS = WaffleFlag(f'{WAFFLE_NAMESPACE}.enable_email_notifi
 # .. toggle_target_removal_date: 2026-05-27
 # .. toggle_warning: When the flag is ON, Notifications will go through ace push channels.
 ENABLE_PUSH_NOTIFICATIONS = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.enable_push_notifications', __name__)
+
+# .. toggle_name: notifications.enable_fan_out_on_read
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag to store course-wide notifications once for their whole audience, instead of
+#   one notification per user, for the notification types which aren't sent by email or push by default. The users
+#   whose preferences send them by email or push get theirs when they are sent, and each of the others gets theirs when
+#   they next check their notifications, if they are in the audience then and enrolled before the notification.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-17
+# .. toggle_target_removal_date: 2027-04-17
+# .. toggle_warning: When the flag is ON, course-wide notifications are not grouped for the web, their audience filters
+#   are evaluated when each user checks their notifications, and the notification generated event of the users who only
+#   get them on the web is emitted then.
+ENABLE_FAN_OUT_ON_READ = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.enable_fan_out_on_read', __name__)
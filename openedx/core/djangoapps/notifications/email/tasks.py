@@ -1,14 +1,19 @@
 """
 Celery tasks for sending email notifications
 """
+import time
+from collections import defaultdict
+from datetime import datetime
+
 from bs4 import BeautifulSoup
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _, override as translation_override
 from edx_ace import ace
 from edx_ace.recipient import Recipient
-from edx_django_utils.monitoring import set_code_owner_attribute
+from edx_django_utils.monitoring import set_code_owner_attribute, set_custom_attribute
 
 from openedx.core.djangoapps.notifications.email_notifications import EmailCadence
 from openedx.core.djangoapps.notifications.models import (
@@ -24,6 +29,7 @@ from .utils import (
     create_email_template_context,
     filter_email_enabled_notifications,
     get_course_info,
+    get_courses_info,
     get_language_preference_for_users,
     get_start_end_date,
     get_text_for_notification_type,
@@ -51,12 +57,17 @@ def get_audience_for_cadence_email(cadence_type):
     return users
 
 
-def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None):
+def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None,
+                              notifications=None, preferences=None):
     """
     Send [cadence_type] email to user.
     Cadence Type can be EmailCadence.DAILY or EmailCadence.WEEKLY
     start_date: Datetime object
     end_date: Datetime object
+    notifications: The user's email notifications between start_date and end_date, if already loaded
+    preferences: The user's NotificationPreferences, if already loaded
+
+    Returns True if the email was sent.
     """
     if cadence_type not in [EmailCadence.DAILY, EmailCadence.WEEKLY]:
         raise ValueError('Invalid cadence_type')
@@ -67,14 +78,16 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
     if not is_email_notification_flag_enabled(user):
         logger.info(f'<Email Cadence> Flag disabled for {user.username} ==Temp Log==')
         return
-    notifications = Notification.objects.filter(user=user, email=True,
-                                                created__gte=start_date, created__lte=end_date)
+    if notifications is None:
+        notifications = Notification.objects.filter(user=user, email=True,
+                                                    created__gte=start_date, created__lte=end_date)
     if not notifications:
         logger.info(f'<Email Cadence> No notification for {user.username} ==Temp Log==')
         return
 
     with translation_override(user_language):
-        preferences = NotificationPreference.objects.filter(user=user)
+        if preferences is None:
+            preferences = NotificationPreference.objects.filter(user=user)
         notifications = filter_email_enabled_notifications(notifications, preferences, user,
                                                            cadence_type=cadence_type)
 
@@ -93,6 +106,7 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
         ace.send(message)
         send_user_email_digest_sent_event(user, cadence_type, notifications, message_context)
         logger.info(f'<Email Cadence> Email sent to {user.username} ==Temp Log==')
+        return True
 
 
 @shared_task(ignore_result=True)
@@ -100,17 +114,102 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
 def send_digest_email_to_all_users(cadence_type):
     """
     Send email digest to all eligible users
+
+    The audience is split into partitions of consecutive user ids, each sent by its own
+    send_digest_email_to_partition task.
     """
     logger.info(f'<Email Cadence> Sending cadence email of type {cadence_type}')
     users = get_audience_for_cadence_email(cadence_type)
-    language_prefs = get_language_preference_for_users([user.id for user in users])
-    courses_data = {}
+    user_ids = sorted(users.values_list('id', flat=True))
     start_date, end_date = get_start_end_date(cadence_type)
-    logger.info(f'<Email Cadence> Email Cadence Audience {len(users)}')
-    for user in users:
-        user_language = language_prefs.get(user.id, 'en')
-        send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language=user_language,
-                                  courses_data=courses_data)
+    partition_size = settings.NOTIFICATION_DIGEST_PARTITION_SIZE
+    partitions = [user_ids[index:index + partition_size] for index in range(0, len(user_ids), partition_size)]
+    logger.info(f'<Email Cadence> Email Cadence Audience {len(user_ids)} in {len(partitions)} partitions')
+    for partition_index, partition_user_ids in enumerate(partitions):
+        send_digest_email_to_partition.delay(
+            cadence_type,
+            partition_user_ids[0],
+            partition_user_ids[-1],
+            start_date.isoformat(),
+            end_date.isoformat(),
+            partition=f'{partition_index + 1}/{len(partitions)}',
+        )
+
+
+@shared_task(ignore_result=True)
+@set_code_owner_attribute
+def send_digest_email_to_partition(cadence_type, first_user_id, last_user_id, start_date, end_date, partition=''):
+    """
+    Send email digest to the eligible users whose ids are between first_user_id and last_user_id, inclusive.
+
+    The notifications, preferences and language preferences of all the users in the partition are
+    loaded together, and the course info used to render their emails is shared between them.
+    start_date, end_date: ISO 8601 strings
+    partition: Description of the partition for logs, e.g. "3/10"
+    """
+    task_start = time.time()
+    start_date = datetime.fromisoformat(start_date)
+    end_date = datetime.fromisoformat(end_date)
+
+    notifications_by_user = defaultdict(list)
+    for notification in Notification.objects.filter(
+        user_id__gte=first_user_id,
+        user_id__lte=last_user_id,
+        email=True,
+        created__gte=start_date,
+        created__lte=end_date,
+    ):
+        notifications_by_user[notification.user_id].append(notification)
+    user_ids = list(notifications_by_user)
+
+    preferences_by_user = defaultdict(list)
+    for preference in NotificationPreference.objects.filter(user_id__in=user_ids):
+        preferences_by_user[preference.user_id].append(preference)
+    language_prefs = get_language_preference_for_users(user_ids)
+    courses_data = get_courses_info({
+        notification.course_id
+        for notifications in notifications_by_user.values()
+        for notification in notifications
+    })
+
+    emails_sent = 0
+    failures = 0
+    for user in User.objects.filter(id__in=user_ids).iterator(chunk_size=100):
+        try:
+            sent = send_digest_email_to_user(
+                user, cadence_type, start_date, end_date,
+                user_language=language_prefs.get(user.id, 'en'),
+                courses_data=courses_data,
+                notifications=notifications_by_user[user.id],
+                preferences=preferences_by_user[user.id],
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f'<Email Cadence> Failed to send email to user {user.id}')
+            failures += 1
+            continue
+        if sent:
+            emails_sent += 1
+
+    duration = time.time() - task_start
+    # .. custom_attribute_name: notifications.digest.partition
+    # .. custom_attribute_description: The partition of the digest audience sent by the task, e.g. "3/10".
+    set_custom_attribute('notifications.digest.partition', partition)
+    # .. custom_attribute_name: notifications.digest.users
+    # .. custom_attribute_description: The number of users with email notifications in the partition.
+    set_custom_attribute('notifications.digest.users', len(user_ids))
+    # .. custom_attribute_name: notifications.digest.emails_sent
+    # .. custom_attribute_description: The number of digest emails sent for the partition.
+    set_custom_attribute('notifications.digest.emails_sent', emails_sent)
+    # .. custom_attribute_name: notifications.digest.failures
+    # .. custom_attribute_description: The number of users of the partition whose digest email failed.
+    set_custom_attribute('notifications.digest.failures', failures)
+    # .. custom_attribute_name: notifications.digest.users_per_second
+    # .. custom_attribute_description: The number of users of the partition processed per second.
+    set_custom_attribute('notifications.digest.users_per_second', round(len(user_ids) / duration, 2) if duration else 0)
+    logger.info(
+        f'<Email Cadence> Partition {partition} of {cadence_type} digest: users {first_user_id}-{last_user_id}, '
+        f'{len(user_ids)} users, {emails_sent} emails sent, {failures} failures in {duration:.2f} seconds'
+    )
 
 
 def send_immediate_cadence_email(email_notification_mapping, course_key):
@@ -6,6 +6,7 @@ import ddt
 
 from unittest.mock import patch
 
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.tests.factories import UserFactory
@@ -17,6 +18,7 @@ from openedx.core.djangoapps.notifications.email_notifications import EmailCaden
 from openedx.core.djangoapps.notifications.email.tasks import (
     get_audience_for_cadence_email,
     send_digest_email_to_all_users,
+    send_digest_email_to_partition,
     send_digest_email_to_user
 )
 from openedx.core.djangoapps.notifications.email.utils import get_start_end_date
@@ -301,6 +303,47 @@ class TestEmailDigestAudience(ModuleStoreTestCase):
             assert mock_func.called is email_value
 
 
+    @override_settings(NOTIFICATION_DIGEST_PARTITION_SIZE=2)
+    @patch('openedx.core.djangoapps.notifications.email.tasks.send_digest_email_to_partition')
+    def test_audience_is_partitioned(self, mock_task):
+        """
+        Tests the audience is split into partitions of consecutive user ids
+        """
+        users = [self.user] + [UserFactory() for __ in range(2)]
+        created_date = datetime.datetime.now() - datetime.timedelta(hours=1)
+        for user in users:
+            create_notification(user, self.course.id, created=created_date)
+        send_digest_email_to_all_users(EmailCadence.DAILY)
+
+        partitions = [call_args[0][1:3] for call_args in mock_task.delay.call_args_list]
+        assert partitions == [(users[0].id, users[1].id), (users[2].id, users[2].id)]
+        assert [call_args[1]['partition'] for call_args in mock_task.delay.call_args_list] == ['1/2', '2/2']
+
+    @patch('openedx.core.djangoapps.notifications.email.tasks.send_digest_email_to_user')
+    def test_partition_loads_users_data_together(self, mock_func):
+        """
+        Tests the notifications and preferences of the users of a partition are loaded together
+        """
+        other_user = UserFactory()
+        created_date = datetime.datetime.now() - datetime.timedelta(hours=1)
+        notifications = {
+            user.id: create_notification(user, self.course.id, created=created_date)
+            for user in (self.user, other_user)
+        }
+        start_date, end_date = get_start_end_date(EmailCadence.DAILY)
+
+        with self.assertNumQueries(5):
+            send_digest_email_to_partition(
+                EmailCadence.DAILY, self.user.id, other_user.id, start_date.isoformat(), end_date.isoformat()
+            )
+
+        assert mock_func.call_count == 2
+        for call_args in mock_func.call_args_list:
+            user = call_args[0][0]
+            assert call_args[1]['notifications'] == [notifications[user.id]]
+            assert {preference.user_id for preference in call_args[1]['preferences']} == {user.id}
+
+
 @ddt.ddt
 class TestPreferences(ModuleStoreTestCase):
     """
@@ -14,6 +14,7 @@ from waffle import get_waffle_flag_model  # pylint: disable=invalid-django-waffl
 
 from lms.djangoapps.branding.api import get_logo_url_for_email
 from lms.djangoapps.discussion.notification_prefs.views import UsernameCipher, UsernameDecryptionException
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
 from openedx.core.djangoapps.notifications.base_notification import COURSE_NOTIFICATION_APPS, COURSE_NOTIFICATION_TYPES
 from openedx.core.djangoapps.notifications.config.waffle import ENABLE_EMAIL_NOTIFICATIONS
@@ -202,6 +203,15 @@ def get_course_info(course_key):
     return {'name': course.display_name}
 
 
+def get_courses_info(course_keys):
+    """
+    Returns course info for each of the course_keys, keyed by the course key string, in the
+    format of get_course_info and the courses_data of add_additional_attributes_to_notifications
+    """
+    course_overviews = CourseOverview.objects.filter(id__in=course_keys).values_list('id', 'display_name')
+    return {str(course_key): {'name': display_name} for course_key, display_name in course_overviews}
+
+
 def get_time_ago(datetime_obj):
     """
     Returns time_ago for datetime instance
@@ -0,0 +1,174 @@
+"""
+Fan-out on read of course-wide notifications.
+
+Course-wide notifications sent with fan-out on read are stored once, as a CourseNotification
+holding the audience filters of the notification, instead of as one Notification per user in
+the audience. Each user's Notification is created when they next list or count their
+notifications, from the course-wide notifications of each of their courses which were created
+after their watermark for the course or, without one, after they enrolled in it. Their read and
+seen state is then kept on their Notification as usual.
+"""
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from zoneinfo import ZoneInfo
+
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
+from openedx.core.djangoapps.notifications.audience_filters import NotificationFilter
+from openedx.core.djangoapps.notifications.events import notification_generated_event
+from openedx.core.djangoapps.notifications.handlers import AUDIENCE_FILTER_CLASSES
+from openedx.core.djangoapps.notifications.models import (
+    CourseNotification,
+    Notification,
+    NotificationPreference,
+    NotificationWatermark
+)
+from openedx.core.djangoapps.notifications.tasks import create_account_notification_pref_if_not_exists
+
+
+def materialize_course_notifications(user):
+    """
+    Creates the user's notifications for the course-wide notifications sent to them since their
+    watermarks, and moves the watermark of each of their courses up to the latest of these.
+
+    Returns the number of notifications created.
+    """
+    expiry_date = datetime.now(ZoneInfo("UTC")) - timedelta(days=settings.NOTIFICATIONS_EXPIRY)
+    pending_since = dict(
+        _get_pending_course_notifications(user, expiry_date).values_list('course_id', 'since').distinct()
+    )
+    if not pending_since:
+        return 0
+
+    with transaction.atomic():
+        # Lock the watermarks, so that concurrent requests don't create the same notifications.
+        for course_id in sorted(pending_since, key=str):
+            NotificationWatermark.objects.select_for_update().get_or_create(
+                user=user,
+                course_id=course_id,
+                defaults={'materialized_until': pending_since[course_id]},
+            )
+        course_notifications = list(_get_pending_course_notifications(user, expiry_date).order_by('created'))
+        if not course_notifications:
+            return 0
+
+        notifications = _get_user_notifications(user, course_notifications)
+        Notification.objects.bulk_create(notifications)
+        materialized_until = {
+            course_notification.course_id: course_notification.created
+            for course_notification in course_notifications
+        }
+        for course_id, created in materialized_until.items():
+            NotificationWatermark.objects.filter(user=user, course_id=course_id).update(materialized_until=created)
+
+    for notification in notifications:
+        notification_generated_event(
+            [user.id], notification.app_name, notification.notification_type, notification.course_id,
+            notification.content_url, notification.content, sender_id=notification.course_notification.sender_id,
+        )
+    return len(notifications)
+
+
+def _get_pending_course_notifications(user, expiry_date):
+    """
+    Returns the course-wide notifications of the user's courses created after their watermark for
+    the course or, without one, after they enrolled in it, annotated with that time as ``since``.
+    """
+    watermarks = NotificationWatermark.objects.filter(user=user, course_id=OuterRef('course_id'))
+    enrollments = CourseEnrollment.objects.filter(user=user, course_id=OuterRef('course_id'))
+    enrolled_course_ids = CourseEnrollment.objects.filter(user=user, is_active=True).values('course_id')
+    role_course_ids = CourseAccessRole.objects.filter(user=user).values('course_id')
+    return CourseNotification.objects.filter(
+        Q(course_id__in=enrolled_course_ids) | Q(course_id__in=role_course_ids),
+        created__gt=expiry_date,
+    ).annotate(
+        since=Coalesce(
+            Subquery(watermarks.values('materialized_until')[:1]),
+            Subquery(enrollments.values('created')[:1]),
+            Value(expiry_date),
+            output_field=DateTimeField(),
+        ),
+    ).filter(
+        created__gt=F('since'),
+    ).exclude(sender_id=user.id)
+
+
+def _get_user_notifications(user, course_notifications):
+    """
+    Returns the user's unsaved notifications for the course-wide notifications whose audience
+    they are in and which they get on the web.
+
+    Notifications already created for the user when the course-wide notification was sent, for
+    the users who get it by email or push, are skipped.
+    """
+    already_created = set(
+        Notification.objects.filter(
+            user=user,
+            course_notification__in=course_notifications,
+        ).values_list('course_notification_id', flat=True)
+    )
+    preferences = {preference.type: preference for preference in NotificationPreference.objects.filter(user=user)}
+    in_audience = {}
+    not_filtered = {}
+
+    notifications = []
+    for course_notification in course_notifications:
+        notification_type = course_notification.notification_type
+        if course_notification.id in already_created:
+            continue
+
+        if notification_type not in preferences:
+            # Like when notifications are sent, the preference is created with the defaults of the notification type.
+            [preferences[notification_type]] = create_account_notification_pref_if_not_exists(
+                [user.id], [], notification_type
+            )
+        if not preferences[notification_type].web:
+            continue
+
+        audience_key = (course_notification.course_id, json.dumps(course_notification.audience_filters, sort_keys=True))
+        if audience_key not in in_audience:
+            in_audience[audience_key] = _is_in_audience(
+                user.id, course_notification.course_id, course_notification.audience_filters
+            )
+        filter_key = (course_notification.course_id, notification_type)
+        if filter_key not in not_filtered:
+            not_filtered[filter_key] = bool(
+                NotificationFilter().apply_filters([user.id], course_notification.course_id, notification_type)
+            )
+        if not (in_audience[audience_key] and not_filtered[filter_key]):
+            continue
+
+        notifications.append(Notification(
+            user=user,
+            course_id=course_notification.course_id,
+            app_name=course_notification.app_name,
+            notification_type=notification_type,
+            content_context=course_notification.content_context,
+            content_url=course_notification.content_url,
+            web=True,
+            group_by_id=course_notification.group_by_id,
+            course_notification=course_notification,
+            created=course_notification.created,
+        ))
+    return notifications
+
+
+def _is_in_audience(user_id, course_key, audience_filters):
+    """
+    Returns whether the user is in the audience of a course-wide notification, see
+    ``calculate_course_wide_notification_audience``.
+    """
+    if not audience_filters:
+        return CourseEnrollment.objects.filter(user_id=user_id, course_id=course_key, is_active=True).exists()
+
+    for filter_type, filter_values in audience_filters.items():
+        filter_class = AUDIENCE_FILTER_CLASSES.get(filter_type)
+        if filter_class is None:
+            raise ValueError(f"Invalid audience filter type: {filter_type}")
+        if filter_class(course_key).filter_users(filter_values, [user_id]):
+            return True
+    return False
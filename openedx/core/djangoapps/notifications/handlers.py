@@ -117,6 +117,7 @@ def generate_course_notifications(signal, sender, course_notification_data, meta
         'app_name': course_notification_data.get('app_name'),
         'notification_type': course_notification_data.get('notification_type'),
         'content_url': course_notification_data.get('content_url'),
+        'audience_filters': course_notification_data.get('audience_filters') or {},
     }
 
     send_notifications.delay(**notification_data)
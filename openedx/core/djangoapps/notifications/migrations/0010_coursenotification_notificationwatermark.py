@@ -0,0 +1,55 @@
+# Generated by Django 4.2.18 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0009_notification_push'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('app_name', models.CharField(max_length=64)),
+                ('notification_type', models.CharField(max_length=64)),
+                ('content_context', models.JSONField(default=dict)),
+                ('content_url', models.URLField(blank=True, null=True)),
+                ('group_by_id', models.CharField(default='', max_length=255)),
+                ('audience_filters', models.JSONField(default=dict)),
+                ('sender_id', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course_id', 'created'], name='course_notif_created_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('materialized_until', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'course_id')},
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='course_notification',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='notifications.coursenotification'),
+        ),
+    ]
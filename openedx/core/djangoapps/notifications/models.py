@@ -151,6 +151,10 @@ class Notification(TimeStampedModel):
     last_read = models.DateTimeField(null=True, blank=True)
     last_seen = models.DateTimeField(null=True, blank=True)
     group_by_id = models.CharField(max_length=255, db_index=True, null=False, default="")
+    # The course-wide notification this notification was created for, if it was sent with fan-out on read.
+    course_notification = models.ForeignKey(
+        'CourseNotification', null=True, blank=True, related_name='+', on_delete=models.CASCADE
+    )
 
     def __str__(self):
         return f'{self.user.username} - {self.course_id} - {self.app_name} - {self.notification_type}'
@@ -163,6 +167,52 @@ class Notification(TimeStampedModel):
         return get_notification_content(self.notification_type, self.content_context)
 
 
+class CourseNotification(TimeStampedModel):
+    """
+    Model to store a course-wide notification once for its whole audience
+
+    The audience is described by the same audience filters as the COURSE_NOTIFICATION_REQUESTED
+    signal, and each user's Notification for it is only created when they next check their
+    notifications, see :func:`~openedx.core.djangoapps.notifications.fan_out.materialize_course_notifications`.
+
+    .. no_pii:
+    """
+    course_id = CourseKeyField(max_length=255)
+    app_name = models.CharField(max_length=64)
+    notification_type = models.CharField(max_length=64)
+    content_context = models.JSONField(default=dict)
+    content_url = models.URLField(null=True, blank=True)
+    group_by_id = models.CharField(max_length=255, null=False, default="")
+    audience_filters = models.JSONField(default=dict)
+    # The user who caused the notification, who isn't part of its audience.
+    sender_id = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['course_id', 'created'], name='course_notif_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.course_id} - {self.app_name} - {self.notification_type}'
+
+
+class NotificationWatermark(models.Model):
+    """
+    Model to store the creation time of the latest course-wide notification of a course created for a user
+
+    .. no_pii:
+    """
+    class Meta:
+        unique_together = ('user', 'course_id')
+
+    user = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    course_id = CourseKeyField(max_length=255)
+    materialized_until = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.user_id} - {self.course_id} - {self.materialized_until}'
+
+
 class NotificationPreference(TimeStampedModel):
     """
     Model to store notification preferences for users at account level
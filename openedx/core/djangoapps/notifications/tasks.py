@@ -8,6 +8,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from edx_django_utils.monitoring import set_code_owner_attribute
 from opaque_keys.edx.keys import CourseKey
 from zoneinfo import ZoneInfo
@@ -22,6 +23,7 @@ from openedx.core.djangoapps.notifications.base_notification import (
 
 from openedx.core.djangoapps.notifications.email.tasks import send_immediate_cadence_email
 from openedx.core.djangoapps.notifications.config.waffle import (
+    ENABLE_FAN_OUT_ON_READ,
     ENABLE_NOTIFICATIONS,
     ENABLE_PUSH_NOTIFICATIONS
 )
@@ -33,6 +35,7 @@ from openedx.core.djangoapps.notifications.grouping_notifications import (
     group_user_notifications
 )
 from openedx.core.djangoapps.notifications.models import (
+    CourseNotification,
     Notification,
     NotificationPreference,
 )
@@ -91,6 +94,8 @@ def delete_expired_notifications():
         delete_count, _ = delete_queryset.delete()
         total_deleted += delete_count
         time_elapsed = datetime.now() - batch_start_time
+    # There is one course-wide notification for each notification sent with fan-out on read.
+    CourseNotification.objects.filter(created__lte=expiry_date).delete()
     time_elapsed = datetime.now() - start_time
     logger.info(f'{total_deleted} Notifications deleted in {time_elapsed} seconds.')
 
@@ -98,9 +103,16 @@ def delete_expired_notifications():
 # pylint: disable=too-many-statements
 @shared_task
 @set_code_owner_attribute
-def send_notifications(user_ids, course_key: str, app_name, notification_type, context, content_url):
+def send_notifications(user_ids, course_key: str, app_name, notification_type, context, content_url,
+                       audience_filters=None):
     """
     Send notifications to the users.
+
+    ``audience_filters`` are given for course-wide notifications. When fan-out on read is enabled
+    for the course, and the notification type isn't sent by email or push by default, these are
+    stored once for their whole audience as a CourseNotification. Only the users whose preferences
+    send it by email or push get their notification here: each of the others gets theirs when they
+    next check their notifications, see materialize_course_notifications.
     """
     # pylint: disable=too-many-statements
     course_key = CourseKey.from_string(course_key)
@@ -117,7 +129,24 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
     grouping_enabled = group_by_id and grouping_function is not None
     generated_notification = None
     sender_id = context.pop('sender_id', None)
-    default_web_config = get_default_values_of_preference(app_name, notification_type).get('web', False)
+    course_notification = None
+    default_preference = get_default_values_of_preference(app_name, notification_type)
+    if (
+        audience_filters is not None and
+        ENABLE_FAN_OUT_ON_READ.is_enabled(course_key) and
+        not (default_preference.get('email') or default_preference.get('push'))
+    ):
+        course_notification = CourseNotification.objects.create(
+            course_id=course_key,
+            app_name=app_name,
+            notification_type=notification_type,
+            content_context=context,
+            content_url=content_url,
+            group_by_id=group_by_id,
+            audience_filters=audience_filters,
+            sender_id=sender_id,
+        )
+    default_web_config = default_preference.get('web', False)
     generated_notification_audience = []
     email_notification_mapping = {}
     push_notification_audience = []
@@ -125,6 +154,12 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
 
     for batch_user_ids in get_list_in_batches(user_ids, batch_size):
         logger.debug(f'Sending notifications to {len(batch_user_ids)} users in {course_key}')
+        if course_notification:
+            # Only the users whose preferences send the notification by email or push get it now. The
+            # users without a preference don't, since the notification type isn't sent so by default.
+            batch_user_ids = list(NotificationPreference.objects.filter(
+                Q(email=True) | Q(push=True), user_id__in=batch_user_ids, app=app_name, type=notification_type,
+            ).values_list('user_id', flat=True))
         batch_user_ids = NotificationFilter().apply_filters(batch_user_ids, course_key, notification_type)
         logger.info(f'After applying filters, sending notifications to {len(batch_user_ids)} users in {course_key}')
 
@@ -173,6 +208,7 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
                     email=email_enabled,
                     push=push_notification,
                     group_by_id=group_by_id,
+                    course_notification=course_notification,
                 )
                 if email_enabled and (email_cadence == EmailCadence.IMMEDIATELY):
                     email_notification_mapping[user_id] = new_notification
@@ -0,0 +1,168 @@
+"""
+Tests for the fan-out on read of course-wide notifications.
+"""
+from unittest.mock import patch
+
+from edx_toggles.toggles.testutils import override_waffle_flag
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+from ..config.waffle import ENABLE_FAN_OUT_ON_READ, ENABLE_NOTIFICATIONS
+from ..fan_out import materialize_course_notifications
+from ..models import CourseNotification, Notification, NotificationPreference, NotificationWatermark
+from ..tasks import send_notifications
+
+
+@override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
+@override_waffle_flag(ENABLE_FAN_OUT_ON_READ, active=True)
+class FanOutOnReadTest(ModuleStoreTestCase):
+    """
+    Tests for course-wide notifications sent with fan-out on read.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.learners = [UserFactory() for __ in range(3)]
+        for learner in self.learners:
+            CourseEnrollment.enroll(learner, self.course.id)
+        self.context = {'course_update_content': 'Course update'}
+
+    def _send(self, course_key=None, audience_filters=None):
+        """
+        Send a course-wide course update notification to the learners.
+        """
+        course_key = self.course.id if course_key is None else course_key
+        send_notifications(
+            [learner.id for learner in self.learners], str(course_key), 'updates', 'course_updates',
+            dict(self.context), 'https://example.com/', audience_filters=audience_filters or {},
+        )
+
+    def test_stored_once(self):
+        self._send()
+
+        assert CourseNotification.objects.count() == 1
+        assert not Notification.objects.exists()
+        assert not NotificationWatermark.objects.exists()
+
+    def test_materialized_on_read(self):
+        self._send()
+        learner = self.learners[0]
+
+        assert materialize_course_notifications(learner) == 1
+        notification = Notification.objects.get(user=learner)
+        course_notification = CourseNotification.objects.get()
+        assert notification.course_notification == course_notification
+        assert notification.created == course_notification.created
+        assert notification.content_context == self.context
+        assert notification.web
+        watermark = NotificationWatermark.objects.get(user=learner, course_id=self.course.id)
+        assert watermark.materialized_until == course_notification.created
+
+        # The notification isn't created again.
+        assert materialize_course_notifications(learner) == 0
+        assert Notification.objects.filter(user=learner).count() == 1
+        assert not Notification.objects.exclude(user=learner).exists()
+
+    def test_late_enrollment(self):
+        """
+        The users who enroll in the course after the notification was sent don't get it.
+        """
+        self._send()
+        late_learner = UserFactory()
+        CourseEnrollment.enroll(late_learner, self.course.id)
+
+        assert materialize_course_notifications(late_learner) == 0
+        assert not NotificationWatermark.objects.filter(user=late_learner).exists()
+
+    def test_not_in_audience(self):
+        self._send(audience_filters={'enrollments': ['verified']})
+
+        assert materialize_course_notifications(self.learners[0]) == 0
+        assert not Notification.objects.exists()
+        # The notification isn't considered again.
+        watermark = NotificationWatermark.objects.get(user=self.learners[0], course_id=self.course.id)
+        assert watermark.materialized_until == CourseNotification.objects.get().created
+
+    def test_watermark_per_course(self):
+        """
+        The notifications of each course are created from the user's watermark for the course.
+        """
+        learner = self.learners[0]
+        other_course = CourseFactory.create()
+        CourseEnrollment.enroll(learner, other_course.id)
+        self._send()
+        assert materialize_course_notifications(learner) == 1
+        self._send(course_key=other_course.id)
+        self._send()
+
+        assert materialize_course_notifications(learner) == 2
+        assert Notification.objects.filter(user=learner).count() == 3
+        for course_key in (self.course.id, other_course.id):
+            watermark = NotificationWatermark.objects.get(user=learner, course_id=course_key)
+            assert watermark.materialized_until == CourseNotification.objects.filter(
+                course_id=course_key,
+            ).latest('created').created
+
+    def test_web_preference_disabled(self):
+        learner = self.learners[0]
+        NotificationPreference.objects.filter(user=learner, type='course_updates').update(web=False)
+        self._send()
+
+        assert materialize_course_notifications(learner) == 0
+
+    def test_default_preferences(self):
+        """
+        The users without a preference for the notification type get it according to its defaults.
+        """
+        learner = self.learners[0]
+        NotificationPreference.objects.filter(user=learner).delete()
+        self._send()
+
+        assert not NotificationPreference.objects.filter(user=learner).exists()
+        assert materialize_course_notifications(learner) == 1
+        assert NotificationPreference.objects.filter(user=learner, type='course_updates').exists()
+
+    @patch('openedx.core.djangoapps.notifications.fan_out.notification_generated_event')
+    @patch('openedx.core.djangoapps.notifications.tasks.notification_generated_event')
+    def test_generated_event(self, mock_send_event, mock_read_event):
+        """
+        The event of the users who only get the notification on the web is emitted when it is created.
+        """
+        learner = self.learners[0]
+        self._send()
+        mock_send_event.assert_not_called()
+
+        materialize_course_notifications(learner)
+
+        mock_read_event.assert_called_once()
+        assert mock_read_event.call_args.args[:4] == ([learner.id], 'updates', 'course_updates', self.course.id)
+
+    def test_email_notifications_sent(self):
+        learner = self.learners[0]
+        NotificationPreference.objects.filter(user=learner, type='course_updates').update(email=True)
+        self._send()
+
+        notification = Notification.objects.get()
+        assert notification.user == learner
+        assert notification.email
+        assert notification.course_notification == CourseNotification.objects.get()
+        # The learner already has their notification.
+        assert materialize_course_notifications(learner) == 0
+        assert Notification.objects.filter(user=learner).count() == 1
+
+    def test_sent_by_email_by_default(self):
+        """
+        The notification types sent by email or push by default are sent to each user.
+        """
+        send_notifications(
+            [learner.id for learner in self.learners], str(self.course.id), 'discussion', 'content_reported',
+            {'username': 'Learner', 'content_type': 'post', 'content': 'Title'}, 'https://example.com/',
+            audience_filters={},
+        )
+
+        assert not CourseNotification.objects.exists()
+        assert Notification.objects.count() == len(self.learners)
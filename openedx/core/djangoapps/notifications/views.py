@@ -27,6 +27,7 @@ from .events import (
     notification_tray_opened_event,
     notifications_app_all_read_event
 )
+from .fan_out import materialize_course_notifications
 from .models import Notification
 from .serializers import (
     NotificationSerializer,
@@ -82,6 +83,7 @@ class NotificationListAPIView(generics.ListAPIView):
         """
         expiry_date = datetime.now(ZoneInfo("UTC")) - timedelta(days=settings.NOTIFICATIONS_EXPIRY)
         app_name = self.request.query_params.get('app_name')
+        materialize_course_notifications(self.request.user)
 
         if self.request.query_params.get('tray_opened'):
             unseen_count = Notification.objects.filter(user_id=self.request.user, last_seen__isnull=True).count()
@@ -123,6 +125,7 @@ class NotificationCountView(APIView):
         **Response Error Codes**:
         - 403: The requester cannot access resource.
         """
+        materialize_course_notifications(request.user)
         # Get the unseen notifications count for each app name.
         count_by_app_name = (
             Notification.objects
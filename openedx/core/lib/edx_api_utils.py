@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from urllib.parse import urljoin
 
 from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
@@ -15,6 +16,28 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
+class _DefaultTimeoutAdapter(HTTPAdapter):
+    """HTTP adapter which applies a timeout to the requests made without one"""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):  # pylint: disable=arguments-differ
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+def set_default_timeout(api_client, timeout):
+    """
+    Make the requests of the API client (a requests.Session) time out after ``timeout``, either a number
+    of seconds or a (connect, read) tuple, unless they are given a timeout of their own.
+    """
+    adapter = _DefaultTimeoutAdapter(timeout)
+    api_client.mount('http://', adapter)
+    api_client.mount('https://', adapter)
+    return api_client
+
+
 def get_fields(fields, response):
     """Extracts desired fields from the API response"""
     results = {}
@@ -6,7 +6,9 @@ from unittest import mock
 from urllib.parse import urljoin
 
 import httpretty
+import requests
 from django.core.cache import cache
+from django.test import TestCase
 
 from common.djangoapps.student.tests.factories import UserFactory
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
@@ -14,7 +16,7 @@ from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
 from openedx.core.djangoapps.catalog.utils import get_catalog_api_client
 from openedx.core.djangoapps.credentials.tests.mixins import CredentialsApiConfigMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
-from openedx.core.lib.edx_api_utils import get_api_data
+from openedx.core.lib.edx_api_utils import get_api_data, set_default_timeout
 
 UTILITY_MODULE = "openedx.core.lib.edx_api_utils"
 TEST_API_URL = "http://www-internal.example.com/api"
@@ -485,3 +487,20 @@ class TestGetEdxApiData(
                 many=False,
                 raise_on_error=True,
             )
+
+
+class TestSetDefaultTimeout(TestCase):
+    """
+    Tests for the default timeout of the requests of API clients.
+    """
+
+    @mock.patch("requests.adapters.HTTPAdapter.send")
+    def test_default_timeout(self, mock_send):
+        mock_send.return_value = requests.Response()
+        api_client = set_default_timeout(requests.Session(), (1, 2))
+
+        api_client.get(TEST_API_URL)
+        assert mock_send.call_args.kwargs["timeout"] == (1, 2)
+
+        api_client.get(TEST_API_URL, timeout=10)
+        assert mock_send.call_args.kwargs["timeout"] == 10
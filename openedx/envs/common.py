@@ -1063,6 +1063,71 @@ XQUEUE_INTERFACE = {
 
 ########################### Cache Configuration ############################
 
+# .. setting_name: SPLIT_MONGO_LOCAL_STRUCTURE_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: Size, in (estimated) bytes, of the process-local LRU cache of split modulestore
+#   course structures which sits in front of the 'course_structure_cache'. Structures never change once
+#   written, so each worker can keep the structures of its hottest courses in memory and skip fetching and
+#   decoding them on every request. 0 disables the local cache.
+SPLIT_MONGO_LOCAL_STRUCTURE_CACHE_SIZE = 0
+
+# .. setting_name: SPLIT_MONGO_DEFINITION_QUERY_WORKERS
+# .. setting_default: 4
+# .. setting_description: The number of threads each process uses to run the chunked `$in` queries
+#   which load many split modulestore definitions at once (e.g. when prefetching the definitions of
+#   a subtree of a course).
+SPLIT_MONGO_DEFINITION_QUERY_WORKERS = 4
+
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_DIR
+# .. setting_default: None
+# .. setting_description: Directory of the local disk cache of course assets served by the contentserver.
+#   Assets are written to it, under their content digest, when first served, and then sent from disk instead
+#   of being read from the contentstore and streamed through Python. None disables the disk cache.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+# .. setting_default: 1073741824
+# .. setting_description: Size, in bytes, of the local disk cache of course assets. The least recently served
+#   assets are evicted when the cache grows over it.
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# .. setting_name: COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION
+# .. setting_default: None
+# .. setting_description: The internal nginx location aliased to COURSE_ASSETS_DISK_CACHE_DIR, e.g.
+#   '/course-assets-cache/'. When set, course assets in the disk cache are handed off to nginx to send with an
+#   X-Accel-Redirect header.
+COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION = None
+
+# .. setting_name: COURSE_ASSETS_X_SENDFILE
+# .. setting_default: False
+# .. setting_description: Whether course assets in the disk cache are handed off to the web server to send with
+#   an X-Sendfile header (Apache mod_xsendfile, lighttpd). They are otherwise sent with a FileResponse, unless
+#   COURSE_ASSETS_X_ACCEL_REDIRECT_LOCATION is set.
+COURSE_ASSETS_X_SENDFILE = False
+
+# .. setting_name: STATIC_REPLACE_ASSET_URL_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: The maximum number of resolved course asset urls each process keeps when replacing
+#   /static/ urls in course content, which saves looking them up in the static files storage and contentstore on
+#   every render. 0 disables the cache.
+STATIC_REPLACE_ASSET_URL_CACHE_SIZE = 0
+
+# .. setting_name: STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: The number of seconds resolved course asset urls are kept for, see
+#   STATIC_REPLACE_ASSET_URL_CACHE_SIZE. Changes to the lock status of assets, or to the asset base url, take up to
+#   this long to show in rendered content.
+STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT = 60
+
+# .. setting_name: STATIC_REPLACE_REPLACED_URLS_CACHE_TIMEOUT
+# .. setting_default: 0
+# .. setting_description: The number of seconds the content of blocks which render the same for every learner,
+#   such as html blocks, with its static, course and jump-to-id urls replaced is cached for, in the "replaced_urls"
+#   cache, keyed by the version of their definition. Cached content is no longer used once an asset of the course
+#   is added, changed or deleted. Changes to the asset base url take up to this long to show in rendered content.
+#   0, or leaving the "replaced_urls" cache out of CACHES, disables the cache.
+STATIC_REPLACE_REPLACED_URLS_CACHE_TIMEOUT = 0
+
 CACHES = {
     'course_structure_cache': {
         'KEY_PREFIX': 'course_structure',
@@ -1128,6 +1193,45 @@ CACHES = {
             'connect_timeout': 0.5
         }
     },
+    'safe_exec': {
+        'KEY_PREFIX': 'safe_exec',
+        'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'TIMEOUT': '86400',  # 1 day
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'OPTIONS': {
+            'no_delay': True,
+            'ignore_exc': True,
+            'use_pooling': True,
+            'connect_timeout': 0.5
+        }
+    },
+    'replaced_urls': {
+        'KEY_PREFIX': 'replaced_urls',
+        'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'TIMEOUT': '86400',  # 1 day
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'OPTIONS': {
+            'no_delay': True,
+            'ignore_exc': True,
+            'use_pooling': True,
+            'connect_timeout': 0.5
+        }
+    },
+    'video_transcripts': {
+        'KEY_PREFIX': 'video_transcripts',
+        'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'TIMEOUT': '604800',  # 1 week
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'OPTIONS': {
+            'no_delay': True,
+            'ignore_exc': True,
+            'use_pooling': True,
+            'connect_timeout': 0.5
+        }
+    },
     'configuration': {
         'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
         'LOCATION': ['localhost:11211'],
@@ -1259,6 +1363,14 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     #   For more information, check https://github.com/openedx/edx-platform/pull/13388 and
     #   https://github.com/openedx/edx-platform/pull/14571.
     TASK_MAX_RETRIES=5,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['INCREMENTAL_COLLECT_TRANSFORMERS']
+    # .. setting_default: []
+    # .. setting_description: Names of registered block structure transformers, typically from other
+    #   packages, whose collect phase is known to support incremental collection even though they don't
+    #   declare it with INCREMENTAL_COLLECT. Incremental collection is only used when every registered
+    #   transformer supports it. See the block_structure.incremental_collect waffle switch.
+    INCREMENTAL_COLLECT_TRANSFORMERS=[],
 )
 
 ################################ Bulk Email ################################
@@ -1837,6 +1949,28 @@ CODE_JAIL_REST_SERVICE_CONNECT_TIMEOUT = 0.5  # time in seconds
 #   codejail remote service endpoint.
 CODE_JAIL_REST_SERVICE_READ_TIMEOUT = 3.5  # time in seconds
 
+# .. setting_name: SAFE_EXEC_LOCAL_RESULT_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: Size, in bytes of serialized results, of the process-local LRU cache of
+#   safe_exec results, which sits in front of the shared 'safe_exec' cache (or the cache given by the
+#   caller if that isn't configured). 0 disables the local cache.
+SAFE_EXEC_LOCAL_RESULT_CACHE_SIZE = 0
+
+# .. setting_name: SAFE_EXEC_RESULT_CACHE_MAX_ENTRY_SIZE
+# .. setting_default: 1000000
+# .. setting_description: Maximum size, in bytes of serialized result, of the safe_exec results which
+#   are cached. Larger results are recomputed every time, rather than taking the place of many smaller
+#   ones (or going over memcached's item size limit).
+SAFE_EXEC_RESULT_CACHE_MAX_ENTRY_SIZE = 1000 * 1000
+
+# .. setting_name: CAPA_PROBLEM_TEMPLATE_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: Number of parsed capa problem templates kept in the process-local cache used
+#   when constructing LoncapaProblem instances. The parsed and compatibility-translated XML of a problem
+#   does not depend on the learner, so it is parsed once per distinct problem XML and copied for each
+#   learner. Problems with <include> tags are never cached. 0 disables the cache.
+CAPA_PROBLEM_TEMPLATE_CACHE_SIZE = 0
+
 ####################### Locale/Internationalization ########################
 
 # Locale/Internationalization
@@ -1959,6 +2093,12 @@ DEFAULT_MOBILE_AVAILABLE = False
 COURSE_CATALOG_URL_ROOT = 'http://localhost:8008'
 COURSE_CATALOG_API_URL = f'{COURSE_CATALOG_URL_ROOT}/api/v1'
 
+# .. setting_name: CATALOG_API_CLIENT_TIMEOUT
+# .. setting_default: (3.05, 5)
+# .. setting_description: The (connect, read) timeouts, in seconds, of the requests made to the
+#   catalog service API by the clients returned by get_catalog_api_client.
+CATALOG_API_CLIENT_TIMEOUT = (3.05, 5)
+
 ################################## Search ##################################
 
 # Use None for the default search engine
@@ -2022,6 +2162,12 @@ INTEGRATED_CHANNELS_API_CHUNK_TRANSMISSION_LIMIT = {}
 ENTERPRISE_SERVICE_WORKER_USERNAME = 'enterprise_worker'
 ENTERPRISE_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+# .. setting_name: ENTERPRISE_API_CLIENT_TIMEOUT
+# .. setting_default: (3.05, 5)
+# .. setting_description: The (connect, read) timeouts, in seconds, of the requests made to the
+#   enterprise service API by EnterpriseApiClient.
+ENTERPRISE_API_CLIENT_TIMEOUT = (3.05, 5)
+
 BASE_COOKIE_DOMAIN = 'localhost'
 
 ENTERPRISE_MARKETING_FOOTER_QUERY_PARAMS = {}
@@ -2237,6 +2383,12 @@ NOTIFICATION_CREATION_BATCH_SIZE = 76
 NOTIFICATIONS_DEFAULT_FROM_EMAIL = "no-reply@example.com"
 NOTIFICATION_DIGEST_LOGO = DEFAULT_EMAIL_LOGO_URL
 
+# .. setting_name: NOTIFICATION_DIGEST_PARTITION_SIZE
+# .. setting_default: 1000
+# .. setting_description: The number of users whose email digest is sent by each task. The audience of a digest is
+#   split into partitions of consecutive user ids of this size, which are sent by parallel tasks.
+NOTIFICATION_DIGEST_PARTITION_SIZE = 1000
+
 ############################# AI Translations ##############################
 
 AI_TRANSLATIONS_API_URL = 'http://localhost:18760/api/v1'
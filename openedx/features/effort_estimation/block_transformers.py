@@ -31,9 +31,14 @@ class EffortEstimationTransformer(BlockStructureTransformer):
 
     This transformer requires data gathered during the collection phase (from a course publish), so it won't work
     on a course until the next publish.
+
+    Video durations come from the video pipeline rather than the blocks, and whether estimation is disabled depends
+    on all of the blocks, so these are computed for the whole course in post_collect, even when only the changed
+    blocks are collected.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     # Public xblock field names
     EFFORT_ACTIVITIES = 'effort_activities'
@@ -44,8 +49,8 @@ class EffortEstimationTransformer(BlockStructureTransformer):
     HTML_WORD_COUNT = 'html_word_count'
     VIDEO_CLIP_DURATION = 'video_clip_duration'
     VIDEO_DURATION = 'video_duration'
+    VIDEO_ID = 'video_id'
 
-    CACHE_VIDEO_DURATIONS = 'video.durations'
     DEFAULT_WPM = 265  # words per minute
 
     class MissingEstimationData(Exception):
@@ -67,51 +72,79 @@ class EffortEstimationTransformer(BlockStructureTransformer):
         block_structure.request_xblock_fields('category')
         block_structure.request_xblock_fields('global_speed', 'only_on_web')  # video fields
 
-        collection_cache = {}  # collection methods can stuff some temporary data here
-
         collections = {
             'html': cls._collect_html_effort,
             'video': cls._collect_video_effort,
         }
 
-        try:
-            for block_key in block_structure.topological_traversal():
-                xblock = block_structure.get_xblock(block_key)
+        for block_key in block_structure.topological_traversal():
+            xblock = block_structure.get_xblock(block_key)
 
-                if xblock.category in collections:
-                    collections[xblock.category](block_structure, block_key, xblock, collection_cache)
+            if xblock.category in collections:
+                collections[xblock.category](block_structure, block_key, xblock)
+
+    @classmethod
+    def post_collect(cls, block_structure):
+        """
+        Looks up the durations of the course's videos, and whether any required data is missing.
+        """
+        try:
+            cls._collect_video_durations(block_structure)
+            for block_key in block_structure:
+                if block_structure.get_xblock_field(block_key, 'category') != 'html':
+                    continue
+                # No word count was recorded if the html couldn't be parsed.
+                if block_structure.get_transformer_block_field(block_key, cls, cls.HTML_WORD_COUNT) is None:
+                    raise cls.MissingEstimationData()
 
         except cls.MissingEstimationData:
             # Some bit of required data is missing. Likely some duration info is missing from the video pipeline.
             # Rather than attempt to work around it, just set a note for ourselves to not show durations for this
             # course at all. Better no estimate than a misleading estimate.
             block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, True)
+        else:
+            # Overwrite any note carried over from a previous collection.
+            block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, False)
 
     @classmethod
-    def _collect_html_effort(cls, block_structure, block_key, xblock, _cache):
+    def _collect_video_durations(cls, block_structure):
+        """Records a duration for each video for later viewing speed calculations."""
+        video_keys = [
+            block_key for block_key in block_structure
+            if block_structure.get_xblock_field(block_key, 'category') == 'video'
+        ]
+        if not video_keys:
+            return
+
+        # Lookup all course video metadata at once rather than piecemeal, for performance reasons
+        all_videos, _ = get_videos_for_course(str(block_structure.root_block_usage_key.course_key))
+        durations = {v['edx_video_id']: v['duration'] for v in all_videos}
+
+        for block_key in video_keys:
+            # Check if we have a duration. If not, raise an exception that will stop this transformer from affecting
+            # this course.
+            video_id = block_structure.get_transformer_block_field(block_key, cls, cls.VIDEO_ID)
+            duration = durations.get(video_id, 0)
+            if duration <= 0:
+                raise cls.MissingEstimationData()
+
+            block_structure.set_transformer_block_field(block_key, cls, cls.VIDEO_DURATION, duration)
+
+    @classmethod
+    def _collect_html_effort(cls, block_structure, block_key, xblock):
         """Records a word count for later reading speed calculations."""
         try:
             text = lxml.html.fromstring(xblock.data).text_content() if xblock.data else ''
-        except Exception as exc:  # pylint: disable=broad-except
-            raise cls.MissingEstimationData() from exc
+        except Exception:  # pylint: disable=broad-except
+            # post_collect disables estimation for the course, as no word count is recorded.
+            return
 
         block_structure.set_transformer_block_field(block_key, cls, cls.HTML_WORD_COUNT, len(text.split()))
 
     @classmethod
-    def _collect_video_effort(cls, block_structure, block_key, xblock, cache):
-        """Records a duration for later viewing speed calculations."""
-        # Lookup all course video metadata at once rather than piecemeal, for performance reasons
-        if cls.CACHE_VIDEO_DURATIONS not in cache:
-            all_videos, _ = get_videos_for_course(str(block_structure.root_block_usage_key.course_key))
-            cache[cls.CACHE_VIDEO_DURATIONS] = {v['edx_video_id']: v['duration'] for v in all_videos}
-
-        # Check if we have a duration. If not, raise an exception that will stop this transformer from affecting
-        # this course.
-        duration = cache[cls.CACHE_VIDEO_DURATIONS].get(xblock.edx_video_id, 0)
-        if duration <= 0:
-            raise cls.MissingEstimationData()
-
-        block_structure.set_transformer_block_field(block_key, cls, cls.VIDEO_DURATION, duration)
+    def _collect_video_effort(cls, block_structure, block_key, xblock):
+        """Records the video's id, for post_collect to look up its duration, and its clip duration."""
+        block_structure.set_transformer_block_field(block_key, cls, cls.VIDEO_ID, xblock.edx_video_id)
 
         # Some videos will suggest specific start & end times, rather than the whole video. Note that this is only
         # supported in some clients (other clients - like the mobile app - will play the whole video anyway). So we
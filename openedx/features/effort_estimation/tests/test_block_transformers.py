@@ -90,6 +90,7 @@ class TestEffortEstimationTransformer(ModuleStoreTestCase):
     def collect(self):
         EffortEstimationTransformer.collect(self.block_structure)
         self.block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
+        EffortEstimationTransformer.post_collect(self.block_structure)
 
     def transform(self):
         EffortEstimationTransformer().transform(None, self.block_structure)
@@ -117,12 +118,23 @@ class TestEffortEstimationTransformer(ModuleStoreTestCase):
         assert self.get_collection_field(self.video_web_key, VIDEO_CLIP_DURATION) is None
         assert self.get_collection_field(self.html_key, HTML_WORD_COUNT) == 2
 
-        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is None
+        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is False
 
     def test_collection(self):
         self.collect()
         self.assert_collected()
 
+    def test_post_collect_refreshes_course_data(self):
+        """Ensure that course-wide data is computed again even if the blocks aren't collected again"""
+        self.collect()
+        self.block_structure.set_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION, True)
+        EffortEstimationTransformer.post_collect(self.block_structure)
+        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is False
+
+        remove_video_for_course(str(self.course_key), 'edxval3')
+        EffortEstimationTransformer.post_collect(self.block_structure)
+        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is True
+
     def test_incomplete_data_collection(self):
         """Ensure that missing video data prevents any estimates from being generated"""
         remove_video_for_course(str(self.course_key), 'edxval3')
@@ -27,6 +27,7 @@ from common.djangoapps.third_party_auth.provider import Registry
 from openedx.core.djangoapps.oauth_dispatch.jwt import create_jwt_for_user
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.djangolib.markup import HTML, Text
+from openedx.core.lib.edx_api_utils import set_default_timeout
 from openedx.features.enterprise_support.utils import get_data_consent_share_cache_key
 
 try:
@@ -162,7 +163,7 @@ class EnterpriseApiClient:
         self.user = user
         jwt = create_jwt_for_user(user)
         self.base_api_url = configuration_helpers.get_value('ENTERPRISE_API_URL', settings.ENTERPRISE_API_URL)
-        self.client = requests.Session()
+        self.client = set_default_timeout(requests.Session(), settings.ENTERPRISE_API_CLIENT_TIMEOUT)
         self.client.auth = SuppliedJwtAuth(jwt)
 
     def get_enterprise_customer(self, uuid):
@@ -14,9 +14,11 @@ This is used by capa_block.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -77,6 +79,83 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+
+class ProblemTemplateCache:
+    """
+    A process-local LRU cache of parsed problem XML trees, keyed by a hash of the problem XML.
+
+    Parsing the problem XML and applying the compatibility translations of
+    `LoncapaProblem.make_xml_compatible` does not depend on the learner or the seed,
+    so it is done once per distinct problem XML, and every `LoncapaProblem` gets a
+    copy of the cached tree. Everything after that (the script context, ids and
+    responders) depends on the seed and is still done per learner.
+
+    The cache is sized by the ``CAPA_PROBLEM_TEMPLATE_CACHE_SIZE`` setting, in number
+    of problems. A size of 0 disables it.
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        """
+        The maximum number of cached trees.
+        """
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'CAPA_PROBLEM_TEMPLATE_CACHE_SIZE', 0)
+
+    @staticmethod
+    def key(problem_text):
+        """
+        Return the cache key of the given (utf-8 encoded) problem XML.
+        """
+        return hashlib.sha1(problem_text).hexdigest()
+
+    def get(self, problem_text):
+        """
+        Return a copy of the tree cached for ``problem_text``, or None.
+        """
+        if not self.max_size:
+            return None
+
+        key = self.key(problem_text)
+        with self._lock:
+            tree = self._entries.get(key)
+            if tree is not None:
+                self._entries.move_to_end(key)
+        return deepcopy(tree) if tree is not None else None
+
+    def set(self, problem_text, tree):
+        """
+        Store a copy of ``tree`` for ``problem_text``, evicting the least recently
+        used trees beyond the maximum size.
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+
+        key = self.key(problem_text)
+        tree = deepcopy(tree)
+        with self._lock:
+            self._entries[key] = tree
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all the cached trees.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+problem_template_cache = ProblemTemplateCache()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -193,22 +272,30 @@ class LoncapaProblem(object):
         if isinstance(problem_text, str):
             # etree chokes on Unicode XML with an encoding declaration
             problem_text = problem_text.encode('utf-8')
-        self.tree = XML(problem_text)
+        self.tree = problem_template_cache.get(problem_text)
 
-        try:
-            self.make_xml_compatible(self.tree)
-        except Exception:
-            capa_block = self.capa_block
-            log.exception(
-                "CAPAProblemError: %s, id:%s, data: %s",
-                capa_block.display_name,
-                self.problem_id,
-                capa_block.data
-            )
-            raise
+        if self.tree is None:
+            self.tree = XML(problem_text)
+
+            try:
+                self.make_xml_compatible(self.tree)
+            except Exception:
+                capa_block = self.capa_block
+                log.exception(
+                    "CAPAProblemError: %s, id:%s, data: %s",
+                    capa_block.display_name,
+                    self.problem_id,
+                    capa_block.data
+                )
+                raise
+
+            # Included files are read from the course's resources, which may change
+            # without the problem XML changing, so only cache problems without them.
+            if not self.tree.findall('.//include'):
+                problem_template_cache.set(problem_text, self.tree)
 
-        # handle any <include file="foo"> tags
-        self._process_includes()
+            # handle any <include file="foo"> tags
+            self._process_includes()
 
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
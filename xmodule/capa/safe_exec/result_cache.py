@@ -0,0 +1,179 @@
+"""
+Two-tier cache of safe_exec results.
+
+The result of running code with safe_exec only depends on the code, the globals
+and the random seed, which is what its cache keys are computed from.  Problems
+randomized with a small number of seeds run the same code with the same inputs
+over and over, so their results are kept:
+
+* in a process-local LRU cache, bounded by the size of the serialized results
+  in bytes, so that the hottest results don't even need a cache round trip, and
+* in the shared 'safe_exec' cache, if it is configured, whose timeout and
+  memory limit bound how long and how many results are kept there, or else in
+  the cache given to safe_exec by the caller.
+
+Hits, misses and lookup times are reported as custom monitoring attributes
+along with the problem's slug.
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+from time import time
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from edx_django_utils import monitoring
+
+log = logging.getLogger(__name__)
+
+SHARED_CACHE_NAME = 'safe_exec'
+
+
+class LocalResultCache:
+    """
+    A process-local, memory-bounded LRU cache of safe_exec results.
+
+    Results are an (error message, globals) pair of JSON-safe values.  They are
+    stored serialized to JSON, which gives their size, and so that each caller
+    gets its own copy of the globals to modify.
+
+    The cache is sized by the ``SAFE_EXEC_LOCAL_RESULT_CACHE_SIZE`` setting, in bytes
+    of serialized results.  A size of 0 disables it.
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_size = 0
+
+    @property
+    def max_size(self):
+        """
+        The maximum total size of the serialized results, in bytes.
+        """
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'SAFE_EXEC_LOCAL_RESULT_CACHE_SIZE', 0)
+
+    def get(self, key):
+        """
+        Return the result stored under ``key``, or None.
+        """
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            serialized = self._entries.get(key)
+            if serialized is None:
+                return None
+            self._entries.move_to_end(key)
+        return json.loads(serialized)
+
+    def set(self, key, serialized):
+        """
+        Store the ``serialized`` result under ``key``, evicting the least recently used
+        results until everything fits.
+        """
+        max_size = self.max_size
+        if not max_size or len(serialized) > max_size:
+            return
+
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_size -= len(previous)
+            self._entries[key] = serialized
+            self.current_size += len(serialized)
+            while self.current_size > max_size:
+                __, evicted_serialized = self._entries.popitem(last=False)
+                self.current_size -= len(evicted_serialized)
+                evicted += 1
+
+        if evicted:
+            monitoring.accumulate('safe_exec.result_cache.local_eviction', evicted)
+
+    def clear(self):
+        """
+        Remove every result from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+
+
+local_result_cache = LocalResultCache()
+
+
+def get_shared_cache(default):
+    """
+    Return the 'safe_exec' cache if it is configured, else ``default``.
+    """
+    try:
+        return caches[SHARED_CACHE_NAME]
+    except InvalidCacheBackendError:
+        return default
+
+
+class SafeExecResultCache:
+    """
+    The cache used by safe_exec: the process-local LRU cache in front of the shared cache.
+
+    `cache` is the cache given to safe_exec, an object with .get(key) and
+    .set(key, value) methods, which is used as the shared cache when the
+    'safe_exec' cache isn't configured.  `slug` identifies the code being run in
+    the reported metrics.
+    """
+
+    def __init__(self, cache, slug=None):
+        self.shared_cache = get_shared_cache(cache)
+        self.slug = slug
+
+    def get(self, key):
+        """
+        Return the result cached under ``key``, or None.
+        """
+        start = time()
+        result = local_result_cache.get(key)
+        status = 'local_hit'
+        if result is None:
+            result = self.shared_cache.get(key)
+            status = 'miss' if result is None else 'shared_hit'
+            if result is not None:
+                local_result_cache.set(key, json.dumps(result))
+
+        self._report(status, time() - start)
+        return result
+
+    def set(self, key, result):
+        """
+        Cache ``result`` under ``key``.  Results larger than ``SAFE_EXEC_RESULT_CACHE_MAX_ENTRY_SIZE``
+        bytes are not cached, since they would take the place of many smaller ones.
+        """
+        serialized = json.dumps(result)
+        max_entry_size = getattr(settings, 'SAFE_EXEC_RESULT_CACHE_MAX_ENTRY_SIZE', None)
+        if max_entry_size and len(serialized) > max_entry_size:
+            log.info("Not caching the safe_exec result of %r: %d bytes.", self.slug, len(serialized))
+            monitoring.increment('safe_exec.result_cache.too_large')
+            return
+
+        local_result_cache.set(key, serialized)
+        self.shared_cache.set(key, result)
+
+    def _report(self, status, duration):
+        """
+        Report the outcome and duration of a lookup.
+        """
+        monitoring.increment(f'safe_exec.result_cache.{status}')
+        # .. custom_attribute_name: codejail.result_cache.status
+        # .. custom_attribute_description: Outcome of the last lookup of a safe_exec result
+        #   in the request: 'local_hit', 'shared_hit' or 'miss'. See codejail.slug for the code
+        #   that was looked up.
+        monitoring.set_custom_attribute('codejail.result_cache.status', status)
+        # .. custom_attribute_name: codejail.result_cache.lookup_ms
+        # .. custom_attribute_description: Time taken by the last lookup of a safe_exec result
+        #   in the request, in milliseconds.
+        monitoring.set_custom_attribute('codejail.result_cache.lookup_ms', round(duration * 1000, 3))
+        monitoring.set_custom_attribute('codejail.slug', self.slug)
@@ -6,6 +6,7 @@ import re
 from functools import lru_cache
 from typing import assert_type
 
+from codejail import jail_code
 from codejail.safe_exec import SafeExecException, json_safe
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import safe_exec as codejail_safe_exec
@@ -16,6 +17,7 @@ from edx_django_utils.monitoring import function_trace, record_exception, set_cu
 
 from . import lazymod
 from .remote_exec import get_remote_exec, is_codejail_in_darklaunch, is_codejail_rest_service_enabled
+from .result_cache import SafeExecResultCache
 
 log = logging.getLogger(__name__)
 
@@ -81,6 +83,73 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Runs a batch of jobs in a single sandbox, passed in the `jobs` global.  Each
+# job's code (including the prolog) is executed with its own globals, as if by a
+# separate safe_exec, so the sandbox startup is only paid for once.  Jobs may
+# belong to different learners, so each one runs in a forked process that has
+# dropped every other job and result first.  That process is limited to the CPU
+# and wall-clock time of a single execution, given in the `limits` global (0 for
+# no limit).  For each job, `results` gets the error message if the code raised
+# an exception or its process was killed, else None, and the globals that
+# codejail would return from a sandbox of its own.
+BATCH_CODE = """\
+import gc as _gc
+import json as _json
+import os as _os
+import resource as _resource
+import signal as _signal
+import traceback as _traceback
+
+def _jsonable(value):
+    if not isinstance(value, (type(None), int, float, bytes, str, list, tuple, dict)):
+        return False
+    try:
+        _json.dumps(value)
+    except Exception:
+        return False
+    return True
+
+def _run(job):
+    _globals = job['globals_dict']
+    try:
+        exec(compile(job['code'], 'jailed_code', 'exec'), _globals)
+    except BaseException:
+        return ["Couldn't execute jailed code: " + _traceback.format_exc(), {}]
+    return [None, {key: value for key, value in _globals.items() if key != '__builtins__' and _jsonable(value)}]
+
+results = []
+_jobs, jobs = jobs, None
+while _jobs:
+    _job = _jobs.pop(0)
+    _read, _write = _os.pipe()
+    _pid = _os.fork()
+    if _pid == 0:
+        _os.close(_read)
+        del _jobs[:], results[:]
+        _gc.collect()
+        if limits['CPU']:
+            _resource.setrlimit(_resource.RLIMIT_CPU, (limits['CPU'], limits['CPU']))
+        if limits['REALTIME']:
+            _signal.signal(_signal.SIGALRM, _signal.SIG_DFL)
+            _signal.setitimer(_signal.ITIMER_REAL, limits['REALTIME'])
+        with _os.fdopen(_write, 'w') as _out:
+            _json.dump(_run(_job), _out)
+        _os._exit(0)
+    _job = None
+    _os.close(_write)
+    with _os.fdopen(_read) as _in:
+        _output = _in.read()
+    _status = _os.waitstatus_to_exitcode(_os.waitpid(_pid, 0)[1])
+    try:
+        results.append(_json.loads(_output))
+    except ValueError:
+        if _status < 0:
+            results.append(["Couldn't execute jailed code: the job was killed by signal %d" % -_status, {}])
+        else:
+            results.append(["Couldn't execute jailed code: the job exited with status %d" % _status, {}])
+_jobs = _job = _output = None
+"""
+
 
 def update_hash(hasher, obj):
     """
@@ -105,6 +174,22 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj).encode())
 
 
+def _cache_key(code, globals_dict, random_seed, prefix="safe_exec"):
+    """
+    Return the key under which the execution of `code` with `globals_dict` and
+    `random_seed` is cached.
+
+    `prefix` namespaces the key: executions by `safe_exec_batch` are cached
+    apart from those by `safe_exec`, as their error messages are formatted
+    differently.
+    """
+    safe_globals = json_safe(globals_dict)
+    md5er = hashlib.md5()
+    md5er.update(repr(code).encode('utf-8'))
+    update_hash(md5er, safe_globals)
+    return "%s.%r.%s" % (prefix, random_seed, md5er.hexdigest())
+
+
 @function_trace('safe_exec')
 def safe_exec(
     code,
@@ -135,7 +220,9 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Results are looked up in the process-local result cache
+    first, and stored in the shared 'safe_exec' cache instead of `cache` if it is
+    configured (see `result_cache`).
 
     `limit_overrides_context` is an optional string to be used as a key on
     the `settings.CODE_JAIL['limit_overrides']` dictionary in order to apply
@@ -150,11 +237,8 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code).encode('utf-8'))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+        cache = SafeExecResultCache(cache, slug)
+        key = _cache_key(code, globals_dict, random_seed)
         cached = cache.get(key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
@@ -291,6 +375,168 @@ def safe_exec(
         raise exception
 
 
+@function_trace('safe_exec_batch')
+def safe_exec_batch(
+    jobs,
+    python_path=None,
+    extra_files=None,
+    cache=None,
+    limit_overrides_context=None,
+    slug=None,
+    unsafely=False,
+):
+    """
+    Execute a batch of python code jobs safely, running many of them in each sandbox.
+
+    `jobs` is a list of (code, globals_dict, random_seed) tuples.  Each job is
+    executed like `safe_exec(code, globals_dict, random_seed=random_seed, ...)`
+    with the other arguments, which are shared by all of the jobs, and which
+    have the same meaning as for `safe_exec`.  Changes made to each job's
+    globals are visible in its `globals_dict` when this function returns.
+
+    The jobs whose result isn't in `cache` are run in batches of
+    ``settings.CODE_JAIL_BATCH_SIZE`` jobs, each batch in a single sandbox,
+    with each job in a process of its own.  Each job's process gets the CPU and
+    time limits of a single execution, and the sandbox's time limit is
+    multiplied by the number of jobs in the batch.  If running a batch
+    fails as a whole, its jobs are run again one at a time.  The codejail
+    service only knows the limits of a single execution, so when it is
+    enabled the jobs are always run one at a time.
+
+    Results of batched jobs are cached apart from those of `safe_exec`, since
+    their error messages aren't formatted like codejail's.
+
+    Returns a list with, for each job, the `SafeExecException` raised by its
+    code, or None.
+    """
+    exceptions = [None] * len(jobs)
+    result_cache = SafeExecResultCache(cache, slug) if cache else None
+
+    # Check the cache for previous results, of this function or of safe_exec.
+    pending = []
+    for index, (code, globals_dict, random_seed) in enumerate(jobs):
+        key = None
+        if result_cache:
+            key = _cache_key(code, globals_dict, random_seed, prefix="safe_exec_batch")
+            cached = result_cache.get(key)
+            if cached is None:
+                cached = result_cache.get(_cache_key(code, globals_dict, random_seed))
+            if cached is not None:
+                emsg, cleaned_results = cached
+                globals_dict.update(cleaned_results)
+                if emsg:
+                    exceptions[index] = SafeExecException(emsg)
+                continue
+        pending.append((index, key))
+
+    # .. setting_name: CODE_JAIL_BATCH_SIZE
+    # .. setting_default: 20
+    # .. setting_description: Maximum number of code executions run in a single sandbox by
+    #   safe_exec_batch. Each execution keeps its own CPU and time limits, and the sandbox's time
+    #   limit is multiplied by the size of each batch.
+    batch_size = max(getattr(settings, 'CODE_JAIL_BATCH_SIZE', 20), 1)
+    exec_kwargs = {
+        'python_path': python_path,
+        'extra_files': extra_files,
+        'limit_overrides_context': limit_overrides_context,
+        'slug': slug,
+        'unsafely': unsafely,
+    }
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+
+        results = None
+        # Dark launch compares the local and remote results of each execution,
+        # so those are always run one at a time.
+        if len(batch) > 1 and not is_codejail_rest_service_enabled() and not is_codejail_in_darklaunch():
+            try:
+                results = _exec_batch([jobs[index] for index, _ in batch], **exec_kwargs)
+            except SafeExecException as e:
+                log.warning("Running a batch of %d jobs for %r failed, running them one at a time: %s",
+                            len(batch), slug, e)
+
+        if results is None:
+            for index, _ in batch:
+                code, globals_dict, random_seed = jobs[index]
+                try:
+                    safe_exec(code, globals_dict, random_seed=random_seed, cache=cache, **exec_kwargs)
+                except SafeExecException as e:
+                    exceptions[index] = e
+            continue
+
+        for (index, key), (emsg, cleaned_results) in zip(batch, results):
+            globals_dict = jobs[index][1]
+            globals_dict.update(cleaned_results)
+            if emsg:
+                exceptions[index] = SafeExecException(emsg)
+            if result_cache:
+                result_cache.set(key, (emsg, json_safe(globals_dict)))
+
+    return exceptions
+
+
+def _exec_batch(jobs, python_path, extra_files, limit_overrides_context, slug, unsafely):
+    """
+    Run the given (code, globals_dict, random_seed) jobs in a single sandbox, with BATCH_CODE.
+
+    Each job's process gets the CPU and time limits of `limit_overrides_context`,
+    unless `unsafely` is true, and the sandbox's time limit is multiplied by the
+    number of jobs.
+
+    Returns a list with, for each job, the error message raised by its code (or
+    None), and the globals to update its `globals_dict` with.  Raises
+    `SafeExecException` if the batch itself couldn't be run.
+    """
+    limits = {"CPU": 0, "REALTIME": 0}
+    if not unsafely:
+        effective_limits = jail_code.get_effective_limits(limit_overrides_context)
+        limits = {name: effective_limits.get(name) or 0 for name in limits}
+    globals_dict = {
+        'limits': limits,
+        'jobs': [
+            {
+                'code': CODE_PROLOG % random_seed + LAZY_IMPORTS + code,
+                'globals_dict': json_safe(job_globals),
+            }
+            for code, job_globals, random_seed in jobs
+        ],
+    }
+
+    exec_fn = codejail_not_safe_exec if unsafely else codejail_safe_exec
+    with function_trace('safe_exec_batch.local_exec'):
+        exec_fn(
+            BATCH_CODE,
+            globals_dict,
+            python_path=python_path,
+            extra_files=extra_files,
+            limit_overrides_context=_batch_limit_overrides_context(limit_overrides_context, len(jobs)),
+            slug=slug,
+        )
+
+    results = globals_dict.get('results')
+    if not isinstance(results, list) or len(results) != len(jobs):
+        raise SafeExecException("Couldn't execute jailed code: the batch returned no results")
+    return results
+
+
+def _batch_limit_overrides_context(limit_overrides_context, batch_size):
+    """
+    Return a limit overrides context for running `batch_size` jobs in one sandbox.
+
+    The context has the limits of `limit_overrides_context`, except for its time
+    limit, which is multiplied by `batch_size`; a limit of 0 (no limit) is kept
+    as is.  The CPU limit is unchanged, since it applies to each process, and
+    each job runs in a process of its own.
+    """
+    batch_context = "{}:batch-of-{}".format(limit_overrides_context or "", batch_size)
+    for name, value in jail_code.get_effective_limits(limit_overrides_context).items():
+        if name == "REALTIME" and value:
+            value *= batch_size
+        jail_code.override_limit(name, value, batch_context)
+    return batch_context
+
+
 def _compile_normalizers(normalizer_setting):
     """
     Compile emsg normalizer search/replace pairs into regex.
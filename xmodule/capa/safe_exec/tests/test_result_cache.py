@@ -0,0 +1,128 @@
+"""
+Tests for the two-tier cache of safe_exec results.
+"""
+import json
+import unittest
+from unittest.mock import call, patch
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from xmodule.capa.safe_exec import safe_exec
+from xmodule.capa.safe_exec.result_cache import LocalResultCache, SafeExecResultCache, local_result_cache
+from xmodule.capa.safe_exec.tests.test_safe_exec import DictCache
+from xmodule.capa.tests.test_util import use_unsafe_codejail
+
+CACHES_WITH_SAFE_EXEC = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'safe_exec': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'safe_exec'},
+}
+
+
+class TestLocalResultCache(unittest.TestCase):
+    """
+    Tests for the process-local LRU cache of safe_exec results.
+    """
+
+    def test_lru_eviction(self):
+        cache = LocalResultCache(max_size=40)
+        results = {key: json.dumps([None, {'a': key}]) for key in ('k1', 'k2', 'k3')}
+        cache.set('k1', results['k1'])
+        cache.set('k2', results['k2'])
+        assert cache.get('k1') == [None, {'a': 'k1'}]
+        cache.set('k3', results['k3'])
+
+        assert cache.get('k2') is None
+        assert cache.get('k1') == [None, {'a': 'k1'}]
+        assert cache.get('k3') == [None, {'a': 'k3'}]
+        assert cache.current_size == len(results['k1']) + len(results['k3'])
+
+    def test_copies(self):
+        cache = LocalResultCache(max_size=1000)
+        cache.set('key', json.dumps([None, {'a': [1, 2]}]))
+        cache.get('key')[1]['a'].append(3)
+        assert cache.get('key') == [None, {'a': [1, 2]}]
+
+    def test_too_large_or_disabled(self):
+        cache = LocalResultCache(max_size=10)
+        cache.set('key', json.dumps([None, {'a': 'a long value'}]))
+        assert cache.get('key') is None
+
+        cache = LocalResultCache(max_size=0)
+        cache.set('key', json.dumps([None, {}]))
+        assert cache.get('key') is None
+
+
+class TestSafeExecResultCache(unittest.TestCase):
+    """
+    Tests for the two tiers of the safe_exec result cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch('xmodule.capa.safe_exec.result_cache.local_result_cache', LocalResultCache(max_size=1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tiers(self):
+        shared = {}
+        cache = SafeExecResultCache(DictCache(shared), slug='problem')
+        with patch('xmodule.capa.safe_exec.result_cache.monitoring') as mock_monitoring:
+            assert cache.get('key') is None
+            cache.set('key', (None, {'a': 1}))
+            assert shared == {'key': (None, {'a': 1})}
+            assert cache.get('key') == [None, {'a': 1}]
+
+            shared['other'] = (None, {'b': 2})
+            assert SafeExecResultCache(DictCache(shared)).get('other') == (None, {'b': 2})
+            assert cache.get('other') == [None, {'b': 2}]
+
+        assert mock_monitoring.increment.call_args_list == [
+            call('safe_exec.result_cache.miss'),
+            call('safe_exec.result_cache.local_hit'),
+            call('safe_exec.result_cache.shared_hit'),
+            call('safe_exec.result_cache.local_hit'),
+        ]
+        mock_monitoring.set_custom_attribute.assert_any_call('codejail.slug', 'problem')
+
+    @override_settings(SAFE_EXEC_RESULT_CACHE_MAX_ENTRY_SIZE=20)
+    def test_max_entry_size(self):
+        shared = {}
+        cache = SafeExecResultCache(DictCache(shared))
+        cache.set('small', (None, {}))
+        cache.set('large', (None, {'a': 'a long value'}))
+        assert list(shared) == ['small']
+        assert cache.get('large') is None
+
+    @override_settings(CACHES=CACHES_WITH_SAFE_EXEC)
+    def test_shared_cache(self):
+        shared = {}
+        cache = SafeExecResultCache(DictCache(shared))
+        cache.set('key', (None, {'a': 1}))
+        assert not shared
+        assert caches['safe_exec'].get('key') == (None, {'a': 1})
+
+
+@use_unsafe_codejail()
+class TestSafeExecWithResultCache(unittest.TestCase):
+    """
+    Tests that safe_exec uses the local result cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        local_result_cache.clear()
+        self.addCleanup(local_result_cache.clear)
+
+    @override_settings(SAFE_EXEC_LOCAL_RESULT_CACHE_SIZE=1000)
+    def test_local_hit(self):
+        shared = {}
+        g = {}
+        safe_exec("a = [random.randint(0, 999)]", g, random_seed=1, cache=DictCache(shared))
+        shared.clear()
+
+        with patch('xmodule.capa.safe_exec.safe_exec.codejail_safe_exec') as mock_exec:
+            cached_g = {}
+            safe_exec("a = [random.randint(0, 999)]", cached_g, random_seed=1, cache=DictCache(shared))
+        mock_exec.assert_not_called()
+        assert cached_g == g
@@ -14,6 +14,7 @@ import random2 as random
 from codejail import jail_code
 from codejail.django_integration import ConfigureCodeJailMiddleware
 from codejail.safe_exec import SafeExecException
+from codejail.safe_exec import safe_exec as codejail_safe_exec
 from django.conf import settings
 from django.core.exceptions import MiddlewareNotUsed
 from django.test import override_settings
@@ -21,7 +22,7 @@ from six import unichr
 from six.moves import range
 
 from openedx.core.djangolib.testing.utils import skip_unless_lms
-from xmodule.capa.safe_exec import safe_exec, update_hash
+from xmodule.capa.safe_exec import safe_exec, safe_exec_batch, update_hash
 from xmodule.capa.safe_exec.remote_exec import is_codejail_in_darklaunch, is_codejail_rest_service_enabled
 from xmodule.capa.safe_exec.safe_exec import emsg_normalizers, normalize_error_message
 from xmodule.capa.tests.test_util import use_unsafe_codejail
@@ -603,6 +604,117 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+@use_unsafe_codejail()
+class TestSafeExecBatch(unittest.TestCase):
+    """Test running batches of code with safe_exec_batch."""
+
+    CODE = "a = random.randint(0, 999) + x"
+
+    def make_jobs(self, seeds):
+        return [(self.CODE, {'x': seed}, seed) for seed in seeds]
+
+    def test_same_results_as_safe_exec(self):
+        jobs = self.make_jobs(range(5)) + [("1/0", {'x': 5}, 5), ("b = x * 2", {'x': 6}, 6)]
+        with patch('xmodule.capa.safe_exec.safe_exec.codejail_safe_exec', wraps=codejail_safe_exec) as mock_exec:
+            exceptions = safe_exec_batch(jobs)
+        assert mock_exec.call_count == 1
+
+        for (code, globals_dict, seed), exception in zip(jobs, exceptions):
+            g = {'x': seed}
+            try:
+                safe_exec(code, g, random_seed=seed)
+            except SafeExecException:
+                assert 'ZeroDivisionError' in str(exception)
+            else:
+                assert exception is None
+            assert globals_dict == g
+
+    @override_settings(CODE_JAIL_BATCH_SIZE=2)
+    def test_batch_size(self):
+        jobs = self.make_jobs(range(5))
+        with patch('xmodule.capa.safe_exec.safe_exec.codejail_safe_exec', wraps=codejail_safe_exec) as mock_exec:
+            assert safe_exec_batch(jobs) == [None] * 5
+        assert mock_exec.call_count == 3
+        assert all('a' in globals_dict for _, globals_dict, _ in jobs)
+
+    def test_cache(self):
+        cache = {}
+        safe_exec(self.CODE, {'x': 1}, random_seed=1, cache=DictCache(cache))
+        assert len(cache) == 1
+        cache[list(cache.keys())[0]] = (None, {'a': -1})
+
+        jobs = self.make_jobs([1, 2]) + [("1/0", {}, 3)]
+        safe_exec_batch(jobs, cache=DictCache(cache))
+        assert jobs[0][1]['a'] == -1
+        assert len(cache) == 3
+
+        jobs = self.make_jobs([1, 2]) + [("1/0", {}, 3)]
+        with patch('xmodule.capa.safe_exec.safe_exec.codejail_safe_exec') as mock_exec:
+            exceptions = safe_exec_batch(jobs, cache=DictCache(cache))
+        mock_exec.assert_not_called()
+        assert jobs[1][1]['a'] == random.Random(2).randint(0, 999) + 2
+        assert 'ZeroDivisionError' in str(exceptions[2])
+
+    def test_jobs_are_isolated(self):
+        # The runner's globals are reachable from the job's frames, but hold no other jobs or results.
+        code = textwrap.dedent("""\
+            import sys
+            runner_globals = sys._getframe(1).f_globals
+            others = len(runner_globals['_jobs']) + len(runner_globals['results'])
+            """)
+        jobs = [(code, {'secret': seed}, seed) for seed in range(3)]
+        assert safe_exec_batch(jobs) == [None] * 3
+        assert [globals_dict['others'] for _, globals_dict, _ in jobs] == [0, 0, 0]
+
+    def test_limits_scale_with_batch_size(self):
+        jobs = self.make_jobs(range(3))
+        with patch('xmodule.capa.safe_exec.safe_exec.codejail_safe_exec', wraps=codejail_safe_exec) as mock_exec:
+            safe_exec_batch(jobs, limit_overrides_context='course-v1:a+b+c')
+        limits = jail_code.get_effective_limits(mock_exec.call_args.kwargs['limit_overrides_context'])
+        course_limits = jail_code.get_effective_limits('course-v1:a+b+c')
+        assert limits['REALTIME'] == course_limits['REALTIME'] * 3
+        assert limits['CPU'] == course_limits['CPU']
+        assert limits['VMEM'] == course_limits['VMEM']
+
+    def test_job_over_cpu_limit_fails(self):
+        # Each job gets the CPU time of a single execution, which this one runs out of.
+        jail_code.override_limit('CPU', 1, 'course-v1:cpu+limit+test')
+        jobs = self.make_jobs([1]) + [("while True: pass", {}, 2)] + self.make_jobs([3])
+        exceptions = safe_exec_batch(jobs, limit_overrides_context='course-v1:cpu+limit+test')
+        assert exceptions[0] is None
+        assert 'killed by signal' in str(exceptions[1])
+        assert exceptions[2] is None
+
+    def test_job_over_time_limit_fails(self):
+        jail_code.override_limit('REALTIME', 1, 'course-v1:time+limit+test')
+        jobs = self.make_jobs([1]) + [("import time; time.sleep(10)", {}, 2)] + self.make_jobs([3])
+        exceptions = safe_exec_batch(jobs, limit_overrides_context='course-v1:time+limit+test')
+        assert exceptions[0] is None
+        assert 'killed by signal' in str(exceptions[1])
+        assert exceptions[2] is None
+
+    def test_remote_service_runs_jobs_one_at_a_time(self):
+        jobs = self.make_jobs(range(3))
+        with patch(
+            'xmodule.capa.safe_exec.safe_exec.is_codejail_rest_service_enabled', return_value=True
+        ), patch('xmodule.capa.safe_exec.safe_exec.get_remote_exec', return_value=(None, None)) as mock_remote, patch(
+            'xmodule.capa.safe_exec.safe_exec._exec_batch'
+        ) as mock_batch:
+            assert safe_exec_batch(jobs) == [None] * 3
+        mock_batch.assert_not_called()
+        assert mock_remote.call_count == 3
+
+    def test_failed_batch_runs_jobs_one_at_a_time(self):
+        jobs = self.make_jobs(range(3))
+        with patch(
+            'xmodule.capa.safe_exec.safe_exec._exec_batch', side_effect=SafeExecException("Out of time")
+        ) as mock_batch:
+            assert safe_exec_batch(jobs) == [None] * 3
+        mock_batch.assert_called_once()
+        for seed, (_, globals_dict, _) in enumerate(jobs):
+            assert globals_dict['a'] == random.Random(seed).randint(0, 999) + seed
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
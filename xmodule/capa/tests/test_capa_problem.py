@@ -12,11 +12,13 @@ import ddt
 from lxml import etree
 from markupsafe import Markup
 
+from xmodule.capa.capa_problem import ProblemTemplateCache
 from xmodule.capa.correctmap import CorrectMap
 from xmodule.capa.responsetypes import LoncapaProblemError
 from xmodule.capa.tests.helpers import new_loncapa_problem
 from xmodule.capa.tests.test_util import use_unsafe_codejail
 from openedx.core.djangolib.markup import HTML
+from openedx.core.lib.safe_lxml.xmlparser import XML
 
 
 FEATURES_WITH_GRADING_METHOD_IN_PROBLEMS = settings.FEATURES.copy()
@@ -843,3 +845,74 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             with self.assertRaises(Exception):
                 problem.get_grade_from_current_answers(None, correct_map)
             responder_mock.evaluate_answers.assert_not_called()
+
+
+@use_unsafe_codejail()
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """
+    Tests for constructing problems from the cache of parsed problem templates.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+        answer = str(random.randint(0, 1000))
+            </script>
+            <stringresponse answer="$answer">
+                <additional_answer>other</additional_answer>
+                <textline/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ProblemTemplateCache(max_size=2)
+        patcher = patch('xmodule.capa.capa_problem.problem_template_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parses_once(self):
+        with patch('xmodule.capa.capa_problem.XML', wraps=XML) as mock_xml:
+            first = new_loncapa_problem(self.xml, seed=1)
+            second = new_loncapa_problem(self.xml, problem_id='2', seed=2)
+        assert mock_xml.call_count == 1
+        assert first.tree is not second.tree
+        assert second.tree.xpath('//additional_answer/@answer') == ['other']
+        assert second.tree.xpath('//textline/@id') == ['2_2_1']
+
+        with patch('xmodule.capa.capa_problem.problem_template_cache', ProblemTemplateCache(max_size=0)):
+            uncached = new_loncapa_problem(self.xml, problem_id='2', seed=2)
+        assert second.get_html() == uncached.get_html()
+        assert second.context['answer'] == uncached.context['answer']
+
+    def test_cached_tree_is_not_modified(self):
+        problem = new_loncapa_problem(self.xml)
+        problem.tree.append(etree.Element('solution'))
+        problem.tree.find('.//stringresponse').set('answer', 'modified')
+        cached_problem = new_loncapa_problem(self.xml)
+        assert not cached_problem.tree.findall('solution')
+        assert cached_problem.tree.find('.//stringresponse').get('answer') == '$answer'
+
+    def test_lru_eviction(self):
+        xmls = [self.xml.replace('other', f'other{index}') for index in range(3)]
+        for xml in xmls:
+            new_loncapa_problem(xml)
+        with patch('xmodule.capa.capa_problem.XML', wraps=XML) as mock_xml:
+            new_loncapa_problem(xmls[2])
+            new_loncapa_problem(xmls[0])
+        assert mock_xml.call_count == 1
+
+    def test_includes_not_cached(self):
+        xml = '<problem><include file="missing.xml"/></problem>'
+        with patch('xmodule.capa.capa_problem.XML', wraps=XML) as mock_xml:
+            new_loncapa_problem(xml)
+            new_loncapa_problem(xml)
+        assert mock_xml.call_count == 2
+
+    def test_disabled(self):
+        self.cache = ProblemTemplateCache(max_size=0)
+        with patch('xmodule.capa.capa_problem.problem_template_cache', self.cache):
+            with patch('xmodule.capa.capa_problem.XML', wraps=XML) as mock_xml:
+                new_loncapa_problem(self.xml)
+                new_loncapa_problem(self.xml)
+        assert mock_xml.call_count == 2
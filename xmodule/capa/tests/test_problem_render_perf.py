@@ -0,0 +1,99 @@
+"""
+Performance test for rendering and submitting capa problems, with and without
+the cache of parsed problem templates.
+
+Each learner viewing or submitting a problem constructs a new LoncapaProblem
+from the same problem XML, so this measures constructing a problem for many
+seeds, then rendering it or grading an answer. Run with::
+
+    pytest xmodule/capa/tests/test_problem_render_perf.py -s -p no:randomly
+
+after removing the ``unittest.skip`` decorator.
+"""
+
+
+import timeit
+import unittest
+from unittest.mock import patch
+
+from xmodule.capa.capa_problem import ProblemTemplateCache
+from xmodule.capa.tests.helpers import new_loncapa_problem
+from xmodule.capa.tests.response_xml_factory import (
+    ChoiceResponseXMLFactory,
+    MultipleChoiceResponseXMLFactory,
+    OptionResponseXMLFactory,
+    StringResponseXMLFactory
+)
+
+# Number of learners for which the problem is constructed.
+NUM_LEARNERS = 200
+
+# Number of questions of each type in the problem.
+NUM_QUESTIONS = 5
+
+
+def make_problem_xml():
+    """
+    Return the XML of a problem with several questions of the common response types.
+    """
+    factories = [
+        (ChoiceResponseXMLFactory(), {'choice_type': 'checkbox', 'choices': [True, False, True, False]}),
+        (MultipleChoiceResponseXMLFactory(), {'choices': [False, True, False, False]}),
+        (OptionResponseXMLFactory(), {'options': ['red', 'green', 'blue'], 'correct_option': 'green'}),
+        (StringResponseXMLFactory(), {'answer': 'Michigan', 'additional_answers': ['MI']}),
+    ]
+    questions = []
+    for factory, kwargs in factories:
+        xml = factory.build_xml(num_responses=NUM_QUESTIONS, explanation_text='Explanation', **kwargs)
+        questions.append(xml[xml.index('<problem>') + len('<problem>'):xml.rindex('</problem>')])
+    return '<problem>{}</problem>'.format(''.join(questions))
+
+
+@unittest.skip("Performance test, run manually")
+class ProblemRenderPerfTest(unittest.TestCase):
+    """
+    Compares the latency of rendering and submitting a problem with and without the
+    parsed problem template cache.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.xml = make_problem_xml()
+
+    def _render(self):
+        """
+        Construct and render the problem for every learner.
+        """
+        for seed in range(NUM_LEARNERS):
+            new_loncapa_problem(self.xml, seed=seed).get_html()
+
+    def _submit(self):
+        """
+        Construct the problem for every learner and grade the correct answers to its questions.
+        """
+        for seed in range(NUM_LEARNERS):
+            problem = new_loncapa_problem(self.xml, seed=seed)
+            problem.grade_answers(problem.get_question_answers())
+
+    def _time(self, func, max_size):
+        """
+        Return the time taken per learner by ``func``, in milliseconds, with a
+        template cache of the given size.
+        """
+        with patch('xmodule.capa.capa_problem.problem_template_cache', ProblemTemplateCache(max_size=max_size)):
+            return timeit.timeit(func, number=1) * 1000 / NUM_LEARNERS
+
+    def test_render_and_submit_timings(self):
+        timings = {}
+        for name, func in (('render', self._render), ('submit', self._submit)):
+            timings[f'{name}, uncached'] = self._time(func, 0)
+            timings[f'{name}, cached template'] = self._time(func, 1)
+
+        print(f"\nPer learner, for a problem of {NUM_QUESTIONS * 4} questions:")
+        for name, millis in timings.items():
+            print(f"  {name:<25} {millis:10.3f} ms")
+
+        assert timings['render, cached template'] < timings['render, uncached']
@@ -123,6 +123,14 @@ class HtmlBlockMixin(  # lint-amnesty, pylint: disable=abstract-method
                 'message': f'To enable, set FEATURES["{self.ENABLE_HTML_XBLOCK_STUDENT_VIEW_DATA}"]'
             }
 
+    @property
+    def has_learner_invariant_content(self):
+        """
+        Whether the block renders the same html for every learner, which it does unless its data
+        holds the id of the user.
+        """
+        return '%%USER_ID%%' not in (self.data or '')
+
     def get_html(self):
         """ Returns html required for rendering the block. """
         if self.data:
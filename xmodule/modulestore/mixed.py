@@ -256,6 +256,27 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(usage_key.course_key)
         return store.get_item(usage_key, depth, **kwargs)
 
+    def get_block_tree(self, usage_key, **kwargs):
+        """
+        Returns the children and content version of the given block and of each of its
+        descendants, without loading them, or None if the block's modulestore doesn't
+        support it.  See SplitMongoModuleStore.get_block_tree.
+        """
+        store = self._get_modulestore_for_courselike(usage_key.course_key)
+        if not hasattr(store, 'get_block_tree'):
+            return None
+
+        def strip(key):
+            """
+            Strips the version and branch information from the given usage key, like strip_key.
+            """
+            return key.version_agnostic().for_branch(None)
+
+        return {
+            strip(block_key): ([strip(child_key) for child_key in children], version)
+            for block_key, (children, version) in store.get_block_tree(usage_key, **kwargs).items()
+        }
+
     @strip_key
     def get_items(self, course_key, **kwargs):  # lint-amnesty, pylint: disable=arguments-differ
         """
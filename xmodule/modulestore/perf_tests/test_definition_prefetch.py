@@ -0,0 +1,76 @@
+"""
+Performance test for loading many split modulestore definitions at once.
+
+Mongo round trips are simulated with a fixed per-query latency, so that the
+effect of splitting a large `$in` query into concurrent chunks can be measured
+without a database. Run with::
+
+    pytest xmodule/modulestore/perf_tests/test_definition_prefetch.py -s -p no:randomly
+
+after removing the ``unittest.skip`` decorator.
+"""
+
+
+import time
+import timeit
+import unittest
+from unittest.mock import Mock, patch
+
+from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+
+# Number of definitions needed to render a large sequence, e.g. 20 units of 10 problems.
+NUM_DEFINITIONS = 2000
+
+# Simulated latency of one query, plus the time taken to transfer each returned definition.
+QUERY_LATENCY = 0.005
+PER_DEFINITION_LATENCY = 0.00005
+
+
+def slow_find(query):
+    """
+    Stand-in for ``Collection.find`` which takes time proportional to the number of results.
+    """
+    ids = query['_id']['$in']
+    time.sleep(QUERY_LATENCY + PER_DEFINITION_LATENCY * len(ids))
+    return [{'_id': _id, 'block_type': 'problem', 'fields': {}} for _id in ids]
+
+
+@unittest.skip("Performance test, run manually")
+class DefinitionPrefetchPerfTest(unittest.TestCase):
+    """
+    Compares fetching definitions one at a time (as DefinitionLazyLoader does when
+    nothing was prefetched), in a single `$in` query, and in concurrent chunks.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.backend = MongoPersistenceBackend.__new__(MongoPersistenceBackend)
+        self.backend.definitions = Mock(name='definitions')
+        self.backend.definitions.find.side_effect = slow_find
+        self.backend.definitions.find_one.side_effect = lambda query: slow_find({'_id': {'$in': [query['_id']]}})[0]
+        self.ids = list(range(NUM_DEFINITIONS))
+
+    def _time(self, func):
+        """
+        Return the time taken by one call of ``func``, in milliseconds.
+        """
+        return timeit.timeit(func, number=1) * 1000
+
+    def test_get_definitions_timings(self):
+        timings = {
+            'one query per definition': self._time(
+                lambda: [self.backend.get_definition(_id) for _id in self.ids]
+            ),
+        }
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.DEFINITION_QUERY_CHUNK_SIZE', NUM_DEFINITIONS):
+            timings['single $in query'] = self._time(lambda: self.backend.get_definitions(self.ids))
+        timings['concurrent chunked $in queries'] = self._time(lambda: self.backend.get_definitions(self.ids))
+
+        print(f"\nFetching {NUM_DEFINITIONS} definitions:")
+        for name, millis in timings.items():
+            print(f"  {name:<35} {millis:10.2f} ms")
+
+        assert timings['concurrent chunked $in queries'] < timings['single $in query']
@@ -0,0 +1,92 @@
+"""
+Performance test for the compact course structure encoding used by CourseStructureCache.
+
+Run with::
+
+    pytest xmodule/modulestore/perf_tests/test_structure_cache_codec.py -s -p no:randomly
+
+after removing the ``unittest.skip`` decorator.
+"""
+
+
+import copy
+import pickle
+import timeit
+import unittest
+import zlib
+
+from xmodule.modulestore.split_mongo import structure_codec
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+from xmodule.modulestore.tests.test_split_structure_codec import make_structure_doc
+
+# 1,000 units of 4 problems each, plus the units themselves: ~5,000 blocks.
+NUM_UNITS = 1000
+PROBLEMS_PER_UNIT = 4
+
+# Number of times each decoding strategy is timed; the best run is reported.
+REPEAT = 5
+
+
+@unittest.skip("Performance test, run manually")
+class StructureCacheCodecPerfTest(unittest.TestCase):
+    """
+    Compares decoding a ~5,000 block course structure from the compact format against
+    the alternatives: unpickling the raw Mongo document and converting it with
+    ``structure_from_mongo``, and unpickling the already converted structure (the
+    format CourseStructureCache used before).
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super().setUp()
+        self.doc = make_structure_doc(NUM_UNITS, PROBLEMS_PER_UNIT)
+        self.structure = structure_from_mongo(copy.deepcopy(self.doc))
+
+    def _best_time(self, func):
+        """
+        Return the fastest of REPEAT runs of ``func``, in milliseconds.
+        """
+        return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+    def test_decode_timings(self):
+        raw_pickle = zlib.compress(pickle.dumps(self.doc, 4), 1)
+        legacy_pickle = zlib.compress(pickle.dumps(self.structure, 4), 1)
+        encoded = structure_codec.encode_structure(self.structure).parts()[0]
+        assert structure_codec.decode_structure(encoded) == self.structure
+
+        def decode_all(structure):
+            """
+            Force every (lazily decoded) block of ``structure`` to be built.
+            """
+            list(structure['blocks'].values())
+            return structure
+
+        timings = {
+            'pickle.loads + structure_from_mongo': self._best_time(
+                lambda: decode_all(structure_from_mongo(pickle.loads(zlib.decompress(raw_pickle))))
+            ),
+            'pickle.loads (legacy cache entry)': self._best_time(
+                lambda: pickle.loads(zlib.decompress(legacy_pickle))
+            ),
+            'structure_codec.decode_structure': self._best_time(
+                lambda: decode_all(structure_codec.decode_structure(encoded))
+            ),
+        }
+        single_block = self._best_time(
+            lambda: structure_codec.decode_structure(encoded)['blocks'][self.structure['root']]
+        )
+        sizes = {
+            'pickle.loads + structure_from_mongo': len(raw_pickle),
+            'pickle.loads (legacy cache entry)': len(legacy_pickle),
+            'structure_codec.decode_structure': len(encoded),
+        }
+
+        print(f"\nDecoding a structure with {len(self.structure['blocks'])} blocks:")
+        for name, millis in timings.items():
+            print(f"  {name:<40} {millis:8.2f} ms {sizes[name]:>10} bytes")
+        print(f"  {'decode_structure, root block only':<40} {single_block:8.2f} ms")
+
+        assert timings['structure_codec.decode_structure'] < timings['pickle.loads + structure_from_mongo']
+        assert sizes['structure_codec.decode_structure'] < sizes['pickle.loads (legacy cache entry)']
@@ -2,9 +2,88 @@
 General utilities
 """
 from collections import namedtuple
+from collections.abc import MutableMapping
 
 # We import BlockKey here for backwards compatibility with modulestore code.
 # Feel free to remove this and fix the imports if you have time.
 from xmodule.util.keys import BlockKey
 
 CourseEnvelope = namedtuple('CourseEnvelope', 'course_key structure')
+
+
+class LazyBlockMap(MutableMapping):
+    """
+    A ``{BlockKey: BlockData}`` map whose values are only decoded when first accessed.
+
+    Structures can hold many thousands of blocks, while most requests only touch a
+    handful of them. This keeps an index of ``BlockKey -> offset`` into the undecoded
+    block data, and calls ``decode(offset)`` the first time each block is read.
+
+    Decoding must not modify the undecoded data, because a structure (and so this map)
+    may be shared between threads through the process-local structure cache: if two
+    threads race to decode the same block, the first result to be stored wins.
+
+    Copying or pickling the map produces a plain dict with every block decoded.
+    """
+
+    def __init__(self, index, decode, sizeof=None):
+        """
+        Arguments:
+            index (dict): Maps each ``BlockKey`` to the offset passed to ``decode``, in block order.
+            decode (callable): Returns the ``BlockData`` for a given offset.
+            sizeof (callable): (optional) Returns a rough estimate, in bytes, of the memory
+                used by the undecoded data at a given offset.
+        """
+        self._index = index
+        self._decode = decode
+        self._sizeof = sizeof
+        self._decoded = {}
+
+    def __getitem__(self, block_key):
+        try:
+            return self._decoded[block_key]
+        except KeyError:
+            offset = self._index[block_key]
+            return self._decoded.setdefault(block_key, self._decode(offset))
+
+    def __setitem__(self, block_key, block_data):
+        self._decoded[block_key] = block_data
+        if block_key not in self._index:
+            self._index[block_key] = None
+
+    def __delitem__(self, block_key):
+        del self._index[block_key]
+        self._decoded.pop(block_key, None)
+
+    def __contains__(self, block_key):
+        return block_key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __reduce__(self):
+        return dict, (list(self.items()),)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} blocks, {len(self._decoded)} decoded)'
+
+    @property
+    def decoded_count(self):
+        """
+        The number of blocks which have been decoded so far.
+        """
+        return len(self._decoded)
+
+    def estimate_undecoded_size(self):
+        """
+        Return a rough estimate, in bytes, of the memory used by the undecoded data of the
+        blocks, without decoding any of them, or None if no ``sizeof`` was given.
+
+        Blocks set on the map after it was created have no undecoded data, and aren't counted.
+        """
+        if self._sizeof is None:
+            return None
+        return sum(self._sizeof(offset) for offset in self._index.values() if offset is not None)
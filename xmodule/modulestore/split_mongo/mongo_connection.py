@@ -8,11 +8,16 @@ import logging
 import math
 import pickle
 import re
+import sys
+import threading
 import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from time import time
 
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
@@ -25,7 +30,7 @@ from edx_django_utils.cache import RequestCache
 from common.djangoapps.split_modulestore_django.models import SplitModulestoreCourseIndex
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
-from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import BlockKey, LazyBlockMap, structure_codec
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from openedx.core.lib.cache_utils import request_cached
 
@@ -141,6 +146,20 @@ class QueryTimer:
 TIMER = QueryTimer(__name__, 0.01)
 
 
+def block_from_mongo(block):
+    """
+    Return the BlockData for a single block document from a structure's 'blocks' list,
+    converting its 'fields.children' from [[block_type, block_id]] to [BlockKey].
+
+    ``block`` itself is left unmodified.
+    """
+    block_data = BlockData(**block)
+    fields = block_data.fields
+    if 'children' in fields:
+        block_data.fields = dict(fields, children=[BlockKey(*child) for child in fields['children']])
+    return block_data
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -149,6 +168,9 @@ def structure_from_mongo(structure, course_context=None):
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    The blocks map is a :class:`~xmodule.modulestore.split_mongo.LazyBlockMap`: only the
+    BlockKey index is built here, and each block is converted the first time it is read.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -158,12 +180,16 @@ def structure_from_mongo(structure, course_context=None):
         tagger.measure('blocks', len(structure['blocks']))
 
         structure['root'] = BlockKey(*structure['root'])
-        new_blocks = {}
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-        structure['blocks'] = new_blocks
+        raw_blocks = structure['blocks']
+        index = {
+            BlockKey(block['block_type'], block['block_id']): offset
+            for offset, block in enumerate(raw_blocks)
+        }
+        structure['blocks'] = LazyBlockMap(
+            index,
+            lambda offset: block_from_mongo(raw_blocks[offset]),
+            lambda offset: _estimate_raw_block_size(raw_blocks[offset]),
+        )
 
         return structure
 
@@ -194,12 +220,16 @@ def structure_to_mongo(structure, course_context=None):
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
-    The course structures are pickled and compressed when cached.
+    The course structures are stored in the compact format from :mod:`.structure_codec`,
+    split across several cache keys when they are larger than ``CHUNK_SIZE``.
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
 
+    # Stay below memcached's default 1MB item size limit, leaving room for the key and header.
+    CHUNK_SIZE = 1000 * 1000
+
     def __init__(self):
         self.cache = None
         try:
@@ -207,27 +237,49 @@ class CourseStructureCache:
         except InvalidCacheBackendError:
             pass
 
+    @staticmethod
+    def _chunk_key(key, index):
+        """
+        Return the cache key of the ``index``'th chunk of the structure stored under ``key``.
+        """
+        return f'{key}.{index}'
+
     def get(self, key, course_context=None):
-        """Pull the compressed, pickled struct data from cache and deserialize."""
+        """Pull the encoded struct data (and any further chunks) from cache and deserialize."""
         if self.cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             try:
-                compressed_pickled_data = self.cache.get(key)
-                tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+                data = self.cache.get(key)
+                tagger.tag(from_cache=str(data is not None).lower())
 
-                if compressed_pickled_data is None:
+                if data is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
                     return None
 
-                tagger.measure('compressed_size', len(compressed_pickled_data))
-
-                pickled_data = zlib.decompress(compressed_pickled_data)
-                tagger.measure('uncompressed_size', len(pickled_data))
+                if not structure_codec.is_encoded(data):
+                    # Entries written before the compact format existed are compressed pickles.
+                    tagger.measure('compressed_size', len(data))
+                    pickled_data = zlib.decompress(data)
+                    tagger.measure('uncompressed_size', len(pickled_data))
+                    return pickle.loads(pickled_data, encoding='latin-1')
+
+                codec, num_chunks, length, crc, payload = structure_codec.read_header(data)
+                tagger.measure('compressed_size', length)
+                tagger.measure('chunks', num_chunks)
+                if num_chunks > 1:
+                    chunk_keys = [self._chunk_key(key, index) for index in range(1, num_chunks)]
+                    chunks = self.cache.get_many(chunk_keys)
+                    if len(chunks) != len(chunk_keys):
+                        # One of the chunks was evicted; treat the whole structure as missing.
+                        tagger.sample_rate = 1
+                        tagger.tag(missing_chunks='true')
+                        return None
+                    payload = b''.join([payload] + [chunks[chunk_key] for chunk_key in chunk_keys])
 
-                return pickle.loads(pickled_data, encoding='latin-1')
+                return structure_codec.decode_payload(codec, payload, length, crc)
             except Exception:  # lint-amnesty, pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
@@ -235,31 +287,195 @@ class CourseStructureCache:
                 return None
 
     def set(self, key, structure, course_context=None):
-        """Given a structure, will pickle, compress, and write to cache."""
+        """Given a structure, will encode, compress, and write it to cache in one or more chunks."""
         if self.cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
-            pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
-            tagger.measure('uncompressed_size', len(pickled_data))
-
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
-            data_size = len(compressed_pickled_data)
+            encoded = structure_codec.encode_structure(structure, chunk_size=self.CHUNK_SIZE)
+            data_size = len(encoded.payload)
             tagger.measure('compressed_size', data_size)
+            tagger.measure('chunks', len(encoded.chunks))
 
             # We rely on the course structure cache default timeout, which should be
             # high by default (~ a few days).
-            total_bytes_in_one_mb = 1024 * 1024
-            if data_size < total_bytes_in_one_mb * 2:  # Only data with a size smaller than 2MB will be cached
-                self.cache.set(key, compressed_pickled_data)
+            parts = encoded.parts()
+            if len(parts) == 1:
+                self.cache.set(key, parts[0])
+            else:
+                # .. custom_attribute_name: split_mongo_structure_cache_chunks
+                # .. custom_attribute_description: The number of cache keys a course structure
+                #   was split across because its encoded size exceeded CourseStructureCache.CHUNK_SIZE.
+                monitoring.set_custom_attribute('split_mongo_structure_cache_chunks', len(parts))
+
+                # Write the trailing chunks first, so that a reader who sees the header
+                # under ``key`` can expect to find them.
+                self.cache.set_many({
+                    self._chunk_key(key, index): chunk
+                    for index, chunk in enumerate(parts[1:], start=1)
+                })
+                self.cache.set(key, parts[0])
+
+
+def _estimate_raw_block_size(raw_block):
+    """
+    Return a rough estimate, in bytes, of the memory used by a block as read from mongo,
+    measured the same way as decoded blocks are by ``estimate_structure_size``.
+    """
+    getsizeof = sys.getsizeof
+    size = getsizeof(raw_block) + getsizeof(raw_block['block_id']) + getsizeof(raw_block.get('edit_info'))
+    for field_dict in (raw_block.get('fields', {}), raw_block.get('defaults', {})):
+        size += getsizeof(field_dict)
+        size += sum(getsizeof(value) for value in field_dict.values())
+    return size
+
+
+def estimate_structure_size(structure):
+    """
+    Return a rough estimate, in bytes, of the memory used by a structure returned by
+    ``structure_from_mongo``.
+
+    Only containers and their immediate values are measured, which is enough to
+    keep the relative sizes of courses right without walking every nested value.
+    Blocks which haven't been decoded yet are measured from their undecoded data,
+    so that estimating the size doesn't decode them.
+    """
+    getsizeof = sys.getsizeof
+    blocks = structure['blocks']
+    size = getsizeof(structure) + getsizeof(blocks)
+    if isinstance(blocks, LazyBlockMap):
+        undecoded_size = blocks.estimate_undecoded_size()
+        if undecoded_size is not None:
+            return size + undecoded_size
+    for block_key, block in blocks.items():
+        size += getsizeof(block_key) + getsizeof(block_key.id) + getsizeof(block.__dict__)
+        size += getsizeof(block.edit_info.__dict__)
+        for field_dict in (block.fields, block.defaults):
+            size += getsizeof(field_dict)
+            size += sum(getsizeof(value) for value in field_dict.values())
+    return size
+
+
+class LocalStructureCache:
+    """
+    A process-local, memory-bounded LRU cache of course structures, keyed by structure id.
+
+    Structures are immutable once written, so an entry never needs to be invalidated:
+    it is only ever evicted to make room. This sits in front of
+    :class:`CourseStructureCache`, and saves both the round trip to the shared cache
+    and the cost of decoding the structure for the hottest courses on each worker.
+
+    Callers must treat structures returned from here as read-only, since the same
+    objects are handed out to every request in the process.
+
+    The cache is sized by the ``SPLIT_MONGO_LOCAL_STRUCTURE_CACHE_SIZE`` setting, in
+    bytes (as estimated by :func:`estimate_structure_size`). A size of 0 disables it.
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self):
+        """
+        The maximum total estimated size of the cached structures, in bytes.
+        """
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'SPLIT_MONGO_LOCAL_STRUCTURE_CACHE_SIZE', 0)
+
+    def get(self, key):
+        """
+        Return the structure stored under ``key``, or None.
+        """
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
             else:
-                chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        monitoring.increment(f'split_mongo.local_structure_cache.{"hit" if entry else "miss"}')
+        return entry[0] if entry else None
+
+    def set(self, key, structure):
+        """
+        Store ``structure`` under ``key``, evicting the least recently used structures
+        until everything fits. Structures larger than the whole cache are not stored.
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+
+        size = estimate_structure_size(structure)
+        if size > max_size:
+            return
+
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_size -= previous[1]
+            self._entries[key] = (structure, size)
+            self.current_size += size
+            while self.current_size > max_size:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.current_size -= evicted_size
+                evicted += 1
+            self.evictions += evicted
+
+        if evicted:
+            monitoring.accumulate('split_mongo.local_structure_cache.eviction', evicted)
+
+    def clear(self):
+        """
+        Remove every structure from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
 
-                # .. custom_attribute_name: split_mongo_compressed_size_in_mbs
-                # .. custom_attribute_description: contains the data chunk size in MBs. The size on which
-                #   the memcached client failed to store value in course structure cache.
-                monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', chunk_size_in_mbs)
+# Shared by every modulestore instance in the process.
+LOCAL_STRUCTURE_CACHE = LocalStructureCache()
+
+
+# The maximum number of definition ids requested in a single `$in` query.
+DEFINITION_QUERY_CHUNK_SIZE = 500
+
+_DEFINITION_QUERY_EXECUTOR = None
+_DEFINITION_QUERY_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_definition_query_executor():
+    """
+    Return the thread pool used to run chunked definition queries concurrently.
+
+    It is shared by every modulestore in the process, so the number of concurrent
+    queries per process is bounded by the ``SPLIT_MONGO_DEFINITION_QUERY_WORKERS`` setting.
+    """
+    global _DEFINITION_QUERY_EXECUTOR  # pylint: disable=global-statement
+    if _DEFINITION_QUERY_EXECUTOR is None:
+        with _DEFINITION_QUERY_EXECUTOR_LOCK:
+            if _DEFINITION_QUERY_EXECUTOR is None:
+                _DEFINITION_QUERY_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SPLIT_MONGO_DEFINITION_QUERY_WORKERS', 4),
+                    thread_name_prefix='split-definitions',
+                )
+    return _DEFINITION_QUERY_EXECUTOR
 
 
 class MongoPersistenceBackend:
@@ -340,6 +556,11 @@ class MongoPersistenceBackend:
         This method will use a cached version of the structure if it is available.
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+            structure = LOCAL_STRUCTURE_CACHE.get(key)
+            tagger_get_structure.tag(from_local_cache=str(bool(structure)).lower())
+            if structure:
+                return structure
+
             cache = CourseStructureCache()
 
             structure = cache.get(key, course_context)
@@ -362,6 +583,7 @@ class MongoPersistenceBackend:
 
                 cache.set(key, structure, course_context)
 
+            LOCAL_STRUCTURE_CACHE.set(key, structure)
             return structure
 
     def find_structures_by_id(self, ids, course_context=None):
@@ -550,11 +772,30 @@ class MongoPersistenceBackend:
     def get_definitions(self, definitions, course_context=None):
         """
         Retrieve all definitions listed in `definitions`.
+
+        Large requests are split into `$in` queries of at most ``DEFINITION_QUERY_CHUNK_SIZE``
+        ids, which are run concurrently on a shared, bounded thread pool.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            chunks = [
+                definitions[start:start + DEFINITION_QUERY_CHUNK_SIZE]
+                for start in range(0, len(definitions), DEFINITION_QUERY_CHUNK_SIZE)
+            ]
+            tagger.measure('queries', len(chunks))
+            monitoring.accumulate('split_mongo.get_definitions.queries', len(chunks))
+
+            if len(chunks) <= 1:
+                return list(self.definitions.find({'_id': {'$in': definitions}}))
+
+            results = get_definition_query_executor().map(self._find_definitions, chunks)
+            return [definition for chunk in results for definition in chunk]
+
+    def _find_definitions(self, definition_ids):
+        """
+        Return a list of the definitions with the given ids, in one query.
+        """
+        return list(self.definitions.find({'_id': {'$in': definition_ids}}))
 
     def insert_definition(self, definition, course_context=None):
         """
@@ -605,6 +846,7 @@ class MongoPersistenceBackend:
         If connections is True, then close the connection to the database as well.
         """
         RequestCache(namespace="course_index_cache").clear()
+        LOCAL_STRUCTURE_CACHE.clear()
 
         self.ensure_connection()
         connection = self.database.client
@@ -63,6 +63,7 @@ from importlib import import_module
 
 from bson.objectid import ObjectId
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from edx_django_utils import monitoring
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import (
     BlockUsageLocator,
@@ -436,15 +437,15 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             # Only query for the definitions that aren't already cached.
-            for definition in bulk_write_record.definitions.values():
-                definition_id = definition.get('_id')
-                if definition_id in ids:
+            for definition_id in list(ids):
+                definition = bulk_write_record.definitions.get(definition_id)
+                if definition is not None:
                     ids.remove(definition_id)
                     definitions.append(definition)
 
         if len(ids):  # lint-amnesty, pylint: disable=len-as-condition
             # Query the db for the definitions.
-            defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
+            defs_from_db = self.db_connection.get_definitions(list(ids), course_key)
             defs_dict = {d.get('_id'): d for d in defs_from_db}
             # Add the retrieved definitions to the cache.
             bulk_write_record.definitions_in_db.update(defs_dict.keys())
@@ -452,6 +453,34 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             definitions.extend(defs_from_db)
         return definitions
 
+    def prefetch_definitions(self, course_key, definition_ids):
+        """
+        Load the given definitions into the active bulk operation's definition cache, so
+        that lazily loaded blocks (see :class:`.DefinitionLazyLoader`) find them there
+        instead of each making their own query.
+
+        Does nothing unless a bulk operation is active on ``course_key``, since there
+        would be nowhere to keep the definitions.
+
+        Arguments:
+            course_key (:class:`.CourseKey`): The course the definitions are being loaded for.
+            definition_ids (iterable): The ids of the definitions to load.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if not bulk_write_record.active:
+            return
+
+        missing_ids = {
+            definition_id for definition_id in definition_ids
+            if definition_id not in bulk_write_record.definitions and not isinstance(definition_id, LocalId)
+        }
+        # .. custom_attribute_name: split_mongo.prefetch_definitions.fetched
+        # .. custom_attribute_description: The number of definitions loaded into a bulk operation's
+        #   cache ahead of time by prefetch_definitions, summed over the request.
+        monitoring.accumulate('split_mongo.prefetch_definitions.fetched', len(missing_ids))
+        if missing_ids:
+            self.get_definitions(course_key, missing_ids)
+
     def update_definition(self, course_key, definition):
         """
         Update a definition, respecting the current bulk operation status
@@ -721,6 +750,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             depth: how deep below these to prefetch
             lazy: whether to load definitions now or later
         """
+        # Definitions prefetched into the bulk operation's cache only outlive this method
+        # if the caller is already in a bulk operation.
+        in_outer_bulk_operation = self._is_in_bulk_operation(course_key)
         with self.bulk_operations(course_key, emit_signals=False):
             new_block_data = {}
             for block_id in base_block_ids:
@@ -733,7 +765,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
             # This method supports lazy loading, where the descendent definitions aren't loaded
             # until they're actually needed.
-            if not lazy:
+            if lazy:
+                # When a subtree is requested, its definitions are almost always all needed, so
+                # fetch them in bulk now rather than one query per block when first accessed.
+                if in_outer_bulk_operation and depth != 0:
+                    self.prefetch_definitions(
+                        course_key,
+                        [block.definition for block in new_block_data.values()],
+                    )
+            else:
                 # Non-lazy loading: Load all descendants by id.
                 descendent_definitions = self.get_definitions(
                     course_key,
@@ -746,11 +786,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in new_block_data.values():
+                for block_key, block in new_block_data.items():
                     if block.definition in definitions:
                         definition = definitions[block.definition]
+                        # Update a copy, because the structure's blocks may be shared with other
+                        # requests through the process-local structure cache.
+                        block = new_block_data[block_key] = copy.copy(block)
                         # convert_fields gets done later in the runtime's xblock_from_json
-                        block.fields.update(definition.get('fields'))
+                        block.fields = {**block.fields, **definition.get('fields')}
                         block.definition_loaded = True
 
             system.module_data.update(new_block_data)
@@ -1183,6 +1226,46 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 log.debug(f"Found more than one item for '{usage_key}'")
             return items[0]
 
+    def get_block_tree(self, usage_key, **kwargs):  # pylint: disable=unused-argument
+        """
+        Returns the children and content version of the given block and of
+        each of its descendants, read from the course structure without
+        loading any of the blocks.
+
+        Returns a dict mapping each block's usage key to a (children, version)
+        tuple, where children is the list of usage keys of the block's
+        children, and version is the block's source_version, or its
+        update_version if it has none.
+
+        raises ItemNotFoundError if the block is not found
+        """
+        if not isinstance(usage_key, BlockUsageLocator) or usage_key.deprecated:
+            # The supplied UsageKey is of the wrong type, so it can't possibly be stored in this modulestore.
+            raise ItemNotFoundError(usage_key)
+
+        with self.bulk_operations(usage_key.course_key):
+            blocks = self._lookup_course(usage_key.course_key).structure['blocks']
+            root_block_key = BlockKey.from_usage_key(usage_key)
+            if root_block_key not in blocks:
+                raise ItemNotFoundError(usage_key)
+
+            make_usage_key = lambda block_key: usage_key.course_key.make_usage_key(block_key.type, block_key.id)
+            block_tree = {}
+            visited = {root_block_key}
+            stack = [root_block_key]
+            while stack:
+                block_key = stack.pop()
+                block_data = blocks[block_key]
+                # Skip children that point to missing blocks, as get_children does.
+                children = [child for child in block_data.fields.get('children', []) if child in blocks]
+                block_tree[make_usage_key(block_key)] = (
+                    [make_usage_key(child) for child in children],
+                    block_data.edit_info.source_version or block_data.edit_info.update_version,
+                )
+                stack.extend(child for child in children if child not in visited)
+                visited.update(children)
+            return block_tree
+
     def get_items(self, course_locator, settings=None, content=None, qualifiers=None, include_orphans=True, **kwargs):  # lint-amnesty, pylint: disable=arguments-differ
         """
         Returns:
@@ -282,6 +282,14 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         usage_key = self._map_revision_to_branch(usage_key, revision=revision)
         return super().get_item(usage_key, depth=depth, **kwargs)
 
+    def get_block_tree(self, usage_key, revision=None, **kwargs):
+        """
+        Returns the children and content version of the given block and of each of its
+        descendants, for the given revision.  See SplitMongoModuleStore.get_block_tree.
+        """
+        usage_key = self._map_revision_to_branch(usage_key, revision=revision)
+        return super().get_block_tree(usage_key, **kwargs)
+
     def get_items(self, course_locator, revision=None, **kwargs):  # lint-amnesty, pylint: disable=arguments-differ
         """
         Returns a list of XModuleDescriptor instances for the matching items within the course with
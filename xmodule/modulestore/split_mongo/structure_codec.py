@@ -0,0 +1,297 @@
+"""
+Compact, versioned binary encoding of split modulestore course structures.
+
+Course structures are cached (see :class:`~.mongo_connection.CourseStructureCache`)
+after they have been converted by ``structure_from_mongo``, i.e. with ``blocks``
+being a map of ``{BlockKey: BlockData}``. Pickling that map directly stores one
+``BlockKey`` tuple, one ``BlockData`` and one ``EditInfo`` object per block, and
+repeats every block type string and every child key.
+
+This module stores the same information column by column instead:
+
+* every ``BlockKey`` appearing in the structure (as a block or as a child) is
+  interned once, and children are stored as integer offsets into that table;
+* block type strings are interned once and referenced by offset;
+* each ``BlockData`` / ``EditInfo`` attribute is stored as its own list.
+
+The encoded payload is a short fixed header followed by a zlib-compressed pickle
+of those columns. Because the header records the payload length and checksum, the
+payload can be split into chunks and stored across several cache keys.
+"""
+
+import pickle
+import struct
+import sys
+import zlib
+from collections.abc import Mapping
+
+from xmodule.modulestore import BlockData, EditInfo
+from xmodule.modulestore.split_mongo import BlockKey, LazyBlockMap
+
+# Identifies data written by this module. Legacy cache entries are bare zlib streams,
+# which never start with a NUL byte, so the two formats can't be confused.
+MAGIC = b'\x00SCS'
+
+# Bump this whenever the layout of the encoded columns changes. Entries written with
+# any other version are treated as cache misses.
+FORMAT_VERSION = 1
+
+# How the payload was produced.
+CODEC_PICKLE = 0  # Arbitrary picklable value
+CODEC_COLUMNAR = 1  # A structure whose blocks are a {BlockKey: BlockData} map
+
+# magic, format version, codec, number of chunks, payload length, payload crc32
+HEADER = struct.Struct('>4sBBIII')
+
+# The EditInfo attributes which are persisted, in the order they are stored.
+EDIT_INFO_FIELDS = (
+    'previous_version',
+    'update_version',
+    'source_version',
+    'edited_on',
+    'edited_by',
+    'original_usage',
+    'original_usage_version',
+)
+
+
+class StructureCodecError(Exception):
+    """
+    Raised when encoded structure data is malformed or was written by an unknown format version.
+    """
+
+
+class EncodedStructure:
+    """
+    The result of encoding a structure: a header followed by the (possibly chunked) payload.
+    """
+
+    def __init__(self, codec, payload, chunk_size=None):
+        self.codec = codec
+        self.payload = payload
+        if chunk_size:
+            self.chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)] or [b'']
+        else:
+            self.chunks = [payload]
+
+    @property
+    def header(self):
+        """
+        The packed header describing the payload.
+        """
+        return HEADER.pack(
+            MAGIC, FORMAT_VERSION, self.codec, len(self.chunks), len(self.payload), zlib.crc32(self.payload)
+        )
+
+    def parts(self):
+        """
+        Return the values to store: the header prepended to the first chunk, followed by
+        the remaining chunks.
+        """
+        return [self.header + self.chunks[0]] + self.chunks[1:]
+
+
+def is_encoded(data):
+    """
+    Return True if ``data`` was produced by this module (as opposed to a legacy cache entry).
+    """
+    return data[:len(MAGIC)] == MAGIC
+
+
+def read_header(data):
+    """
+    Parse the header at the start of ``data``.
+
+    Returns:
+        (codec, num_chunks, payload_length, crc, first_chunk)
+    """
+    if len(data) < HEADER.size:
+        raise StructureCodecError("Encoded structure is too short to contain a header")
+    magic, version, codec, num_chunks, length, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise StructureCodecError("Encoded structure has an unknown magic number")
+    if version != FORMAT_VERSION:
+        raise StructureCodecError(f"Unsupported structure encoding version {version}")
+    return codec, num_chunks, length, crc, data[HEADER.size:]
+
+
+def _is_columnar_structure(structure):
+    """
+    Return True if ``structure`` has the shape produced by ``structure_from_mongo``.
+    """
+    if not isinstance(structure, dict) or not isinstance(structure.get('blocks'), Mapping):
+        return False
+    return all(
+        isinstance(key, BlockKey) and isinstance(block, BlockData)
+        for key, block in structure['blocks'].items()
+    )
+
+
+def _to_columns(structure):
+    """
+    Convert a structure into a tuple of interned tables and per-attribute columns.
+    """
+    type_index = {}
+    types = []
+    key_index = {}
+    key_types = []
+    key_ids = []
+
+    def intern_type(block_type):
+        idx = type_index.get(block_type)
+        if idx is None:
+            idx = type_index[block_type] = len(types)
+            types.append(block_type)
+        return idx
+
+    def intern_key(block_key):
+        idx = key_index.get(block_key)
+        if idx is None:
+            idx = key_index[block_key] = len(key_ids)
+            key_types.append(intern_type(block_key.type))
+            key_ids.append(block_key.id)
+        return idx
+
+    blocks = structure['blocks']
+    for block_key in blocks:
+        intern_key(block_key)
+
+    block_types = []
+    definitions = []
+    fields = []
+    children = []
+    defaults = []
+    asides = []
+    edit_info = tuple([] for __ in EDIT_INFO_FIELDS)
+
+    for block in blocks.values():
+        block_fields = block.fields
+        if 'children' in block_fields:
+            block_fields = dict(block_fields)
+            children.append([intern_key(BlockKey(*child)) for child in block_fields.pop('children')])
+        else:
+            children.append(None)
+        fields.append(block_fields)
+        block_types.append(intern_type(block.block_type))
+        definitions.append(block.definition)
+        defaults.append(block.defaults)
+        asides.append(block.get_asides())
+        for column, attr in zip(edit_info, EDIT_INFO_FIELDS):
+            column.append(getattr(block.edit_info, attr, None))
+
+    root = structure.get('root')
+    root = intern_key(BlockKey(*root)) if root is not None else None
+
+    meta = {key: value for key, value in structure.items() if key not in ('blocks', 'root')}
+    return (
+        meta, root, types, key_types, key_ids, len(blocks),
+        block_types, definitions, fields, children, defaults, asides, edit_info,
+    )
+
+
+def _from_columns(columns):
+    """
+    Rebuild a structure (as returned by ``structure_from_mongo``) from ``_to_columns`` output.
+
+    As with ``structure_from_mongo``, blocks are only turned into ``BlockData`` objects
+    when they are first read.
+    """
+    (
+        meta, root, types, key_types, key_ids, num_blocks,
+        block_types, definitions, fields, children, defaults, asides, edit_info,
+    ) = columns
+
+    keys = [BlockKey(types[type_idx], block_id) for type_idx, block_id in zip(key_types, key_ids)]
+    edit_info_rows = list(zip(*edit_info))
+
+    def decode_block(offset):
+        """
+        Build the BlockData stored in row ``offset`` of the columns.
+        """
+        block_fields = fields[offset]
+        if children[offset] is not None:
+            block_fields = dict(block_fields, children=[keys[idx] for idx in children[offset]])
+
+        # Bypass __init__/from_storable: the columns already hold exactly the attributes
+        # those methods would set, and skipping them is most of the decoding speedup.
+        block_edit_info = EditInfo.__new__(EditInfo)
+        block_edit_info.__dict__ = dict(
+            zip(EDIT_INFO_FIELDS, edit_info_rows[offset]),
+            _subtree_edited_on=None,
+            _subtree_edited_by=None,
+        )
+
+        block = BlockData.__new__(BlockData)
+        block.__dict__ = {
+            'definition_loaded': False,
+            'fields': block_fields,
+            'block_type': types[block_types[offset]],
+            'definition': definitions[offset],
+            'defaults': defaults[offset],
+            'asides': asides[offset],
+            'edit_info': block_edit_info,
+        }
+        return block
+
+    def sizeof_block(offset):
+        """
+        Estimate the memory used by row ``offset`` of the columns, without building its BlockData.
+        """
+        getsizeof = sys.getsizeof
+        size = getsizeof(keys[offset]) + getsizeof(keys[offset].id) + getsizeof(edit_info_rows[offset])
+        for field_dict in (fields[offset], defaults[offset]):
+            size += getsizeof(field_dict)
+            size += sum(getsizeof(value) for value in field_dict.values())
+        return size
+
+    structure = dict(meta)
+    if root is not None:
+        structure['root'] = keys[root]
+    structure['blocks'] = LazyBlockMap(
+        {keys[offset]: offset for offset in range(num_blocks)}, decode_block, sizeof_block
+    )
+    return structure
+
+
+def encode_structure(structure, chunk_size=None):
+    """
+    Encode ``structure`` into an :class:`EncodedStructure`.
+
+    Structures in the ``structure_from_mongo`` shape are stored in the compact columnar
+    format; any other value is pickled, so that callers don't need to special-case it.
+
+    Arguments:
+        structure: The structure (or other picklable value) to encode.
+        chunk_size (int): If given, split the payload into chunks of at most this many bytes.
+    """
+    if _is_columnar_structure(structure):
+        codec, value = CODEC_COLUMNAR, _to_columns(structure)
+    else:
+        codec, value = CODEC_PICKLE, structure
+    # 1 = Fastest (slightly larger results)
+    payload = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 1)
+    return EncodedStructure(codec, payload, chunk_size)
+
+
+def decode_payload(codec, payload, length, crc):
+    """
+    Decode a complete (re-assembled) payload described by a header.
+    """
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise StructureCodecError("Encoded structure payload is incomplete or corrupt")
+    value = pickle.loads(zlib.decompress(payload))
+    if codec == CODEC_COLUMNAR:
+        return _from_columns(value)
+    if codec == CODEC_PICKLE:
+        return value
+    raise StructureCodecError(f"Unknown structure codec {codec}")
+
+
+def decode_structure(data):
+    """
+    Decode a single, unchunked value produced by ``encode_structure(...).parts()``.
+    """
+    codec, num_chunks, length, crc, payload = read_header(data)
+    if num_chunks != 1:
+        raise StructureCodecError("Encoded structure is chunked; use decode_payload with all chunks")
+    return decode_payload(codec, payload, length, crc)
@@ -499,6 +499,21 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             blocks = self.store.get_items(course_locn.course_key, qualifiers={'category': 'problem'})
         assert len(blocks) == 6
 
+    @ddt.data(ModuleStoreEnum.Type.split)
+    def test_get_block_tree(self, default_ms):
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+
+        course_locn = self.course_locations[self.MONGO_COURSEID]
+        block_tree = self.store.get_block_tree(course_locn)
+
+        assert self.problem_x1a_1 in block_tree  # lint-amnesty, pylint: disable=no-member
+        for location in (course_locn, self.vertical_x1a):  # lint-amnesty, pylint: disable=no-member
+            block = self.store.get_item(location)
+            children, version = block_tree[location]
+            assert children == block.children
+            assert version == (block.source_version or block.update_version)
+
         # verify that an error is raised when the revision is not valid
         with pytest.raises(UnsupportedRevisionError):
             self.store.get_items(
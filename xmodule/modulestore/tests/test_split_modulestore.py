@@ -5,9 +5,11 @@
 
 import datetime
 import os
+import pickle
 import random
 import re
 import unittest
+import zlib
 from importlib import import_module
 from unittest.mock import patch
 
@@ -15,6 +17,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 
@@ -34,7 +37,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import LOCAL_STRUCTURE_CACHE, CourseStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -841,29 +844,44 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         # now make sure that you get the same structure
         assert cached_structure == not_cached_structure
 
+    def test_local_structure_cache(self):
+        self.addCleanup(LOCAL_STRUCTURE_CACHE.clear)
+        with override_settings(SPLIT_MONGO_LOCAL_STRUCTURE_CACHE_SIZE=10 ** 8):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # Even though the test is using the dummy cache, the structure is kept in process
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+        assert cached_structure is not_cached_structure
+
     @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring.set_custom_attribute')
-    @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
-    def test_course_structure_cache_with_data_chunk_greater_than_two_mb(self, mock_get_cache, mock_set_cache,
-                                                                        mock_set_custom_attribute):
+    def test_course_structure_cache_with_data_chunk_greater_than_chunk_size(self, mock_get_cache,
+                                                                            mock_set_custom_attribute):
         enabled_cache = caches['default']
         mock_get_cache.return_value = enabled_cache
 
         course_cache = CourseStructureCache()
 
-        size = 3000000000
-        # this data_chunk will be compressed before being cached
-        data_chunk = b'\x00' * size
+        # random data doesn't compress, so this has to be split across several keys
+        data_chunk = os.urandom(CourseStructureCache.CHUNK_SIZE * 3)
 
         course_cache.set('my_data_chunk', data_chunk)
-        mock_set_cache.assert_not_called()
-        mock_set_custom_attribute.assert_called()
+        mock_set_custom_attribute.assert_called_with('split_mongo_structure_cache_chunks', 4)
+        assert course_cache.get('my_data_chunk') == data_chunk
+
+        # if any one chunk is evicted, the whole value is a cache miss
+        enabled_cache.delete('my_data_chunk.2')
+        assert course_cache.get('my_data_chunk') is None
 
     @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring.set_custom_attribute')
+    @patch('django.core.cache.cache.set_many')
     @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
-    def test_course_structure_cache_with_data_chunk_lesser_than_two_mb(self, mock_get_cache, mock_set_cache,
-                                                                       mock_set_custom_attribute):
+    def test_course_structure_cache_with_data_chunk_lesser_than_chunk_size(self, mock_get_cache, mock_set_cache,
+                                                                           mock_set_many, mock_set_custom_attribute):
         enabled_cache = caches['default']
         mock_get_cache.return_value = enabled_cache
         course_cache = CourseStructureCache()
@@ -871,9 +889,20 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         data_chunk = b'\x00' * size
 
         course_cache.set('my_data_chunk', data_chunk)
-        mock_set_cache.assert_called()
+        mock_set_cache.assert_called_once()
+        mock_set_many.assert_not_called()
         mock_set_custom_attribute.assert_not_called()
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_reads_legacy_entries(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        structure = self._get_structure(self.new_course)
+
+        # entries written before the compact format are compressed pickles
+        enabled_cache.set('legacy', zlib.compress(pickle.dumps(structure, 4), 1))
+        assert CourseStructureCache().get('legacy') == structure
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -6,7 +6,7 @@ Tests for bulk operations in Split Modulestore.
 
 import copy
 import unittest
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
 import ddt
 from bson.objectid import ObjectId
@@ -477,6 +477,52 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         self.bulk._end_bulk_operation(self.course_key)
         assert not self.conn.insert_definition.called
 
+    def test_prefetch_definitions_without_bulk_operation(self):
+        self.bulk.prefetch_definitions(self.course_key, [1, 2])
+        assert not self.conn.get_definitions.called
+
+    def test_prefetch_definitions(self):
+        db_definitions = [{'db': 'definition', '_id': _id} for _id in (2, 3)]
+        self.conn.get_definitions.return_value = db_definitions
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.bulk.update_definition(self.course_key, {'active': 'definition', '_id': 1})
+
+        self.bulk.prefetch_definitions(self.course_key, [1, 2, 3, 3])
+        self.conn.get_definitions.assert_called_once_with([2, 3], self.course_key)
+
+        # The prefetched definitions are served from the bulk operation's cache
+        assert self.bulk.get_definition(self.course_key, 2) == db_definitions[0]
+        assert self.bulk.get_definition(self.course_key, 3) == db_definitions[1]
+        assert not self.conn.get_definition.called
+
+        # ...and aren't fetched again
+        self.bulk.prefetch_definitions(self.course_key, [2, 3])
+        assert self.conn.get_definitions.call_count == 1
+
+
+class TestMongoGetDefinitions(unittest.TestCase):
+    """
+    Tests of MongoPersistenceBackend.get_definitions, which splits large requests into several queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.backend = MongoPersistenceBackend.__new__(MongoPersistenceBackend)
+        self.backend.definitions = Mock(name='definitions')
+        self.backend.definitions.find.side_effect = lambda query: [{'_id': _id} for _id in query['_id']['$in']]
+
+    def test_single_query(self):
+        ids = list(range(10))
+        assert self.backend.get_definitions(ids) == [{'_id': _id} for _id in ids]
+        self.backend.definitions.find.assert_called_once_with({'_id': {'$in': ids}})
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.DEFINITION_QUERY_CHUNK_SIZE', 3)
+    def test_chunked_queries(self):
+        ids = list(range(10))
+        assert self.backend.get_definitions(ids) == [{'_id': _id} for _id in ids]
+        assert self.backend.definitions.find.call_count == 4
+        self.backend.definitions.find.assert_any_call({'_id': {'$in': [9]}})
+
 
 @ddt.ddt
 class TestBulkWriteMixinOpen(TestBulkWriteMixin):
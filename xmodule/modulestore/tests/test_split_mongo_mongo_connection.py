@@ -1,6 +1,8 @@
 """ Test the behavior of split_mongo/MongoPersistenceBackend """
 
 
+import copy
+import pickle
 import unittest
 from unittest.mock import patch
 
@@ -8,7 +10,15 @@ import pytest
 from pymongo.errors import ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey, LazyBlockMap, structure_codec
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    LocalStructureCache,
+    MongoPersistenceBackend,
+    estimate_structure_size,
+    structure_from_mongo
+)
+from xmodule.modulestore.tests.test_split_structure_codec import make_structure_doc
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -23,3 +33,115 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
         with pytest.raises(HeartbeatFailure):
             useless_conn.heartbeat()
+
+
+def make_structure(num_blocks):
+    """
+    Return a minimal structure with ``num_blocks`` html blocks.
+    """
+    return {
+        'blocks': {
+            BlockKey('html', f'block_{idx}'): BlockData(block_type='html', fields={'display_name': f'{idx}'})
+            for idx in range(num_blocks)
+        },
+    }
+
+
+class TestLocalStructureCache(unittest.TestCase):
+    """ Tests for the process-local LRU cache of course structures """
+
+    def test_disabled(self):
+        cache = LocalStructureCache(max_size=0)
+        cache.set('key', make_structure(1))
+        assert cache.get('key') is None
+        assert len(cache) == 0
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring')
+    def test_hits_and_misses(self, mock_monitoring):
+        cache = LocalStructureCache(max_size=10 ** 6)
+        structure = make_structure(3)
+
+        assert cache.get('key') is None
+        cache.set('key', structure)
+        assert cache.get('key') is structure
+
+        assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+        mock_monitoring.increment.assert_any_call('split_mongo.local_structure_cache.hit')
+        mock_monitoring.increment.assert_any_call('split_mongo.local_structure_cache.miss')
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring')
+    def test_evicts_least_recently_used(self, mock_monitoring):
+        structures = {key: make_structure(10) for key in ('a', 'b', 'c')}
+        size = estimate_structure_size(structures['a'])
+        cache = LocalStructureCache(max_size=size * 2)
+
+        cache.set('a', structures['a'])
+        cache.set('b', structures['b'])
+        # touch 'a', so that 'b' is the least recently used
+        assert cache.get('a') is structures['a']
+        cache.set('c', structures['c'])
+
+        assert cache.get('b') is None
+        assert cache.get('a') is structures['a']
+        assert cache.get('c') is structures['c']
+        assert cache.evictions == 1
+        assert cache.current_size == size * 2
+        mock_monitoring.accumulate.assert_called_once_with('split_mongo.local_structure_cache.eviction', 1)
+
+    def test_structure_larger_than_cache(self):
+        structure = make_structure(10)
+        cache = LocalStructureCache(max_size=estimate_structure_size(structure) - 1)
+        cache.set('key', structure)
+        assert len(cache) == 0
+
+
+class TestStructureFromMongo(unittest.TestCase):
+    """ Tests for the lazy decoding of blocks by structure_from_mongo """
+
+    def test_blocks_are_decoded_on_access(self):
+        doc = make_structure_doc()
+        structure = structure_from_mongo(copy.deepcopy(doc))
+        blocks = structure['blocks']
+
+        assert isinstance(blocks, LazyBlockMap)
+        assert len(blocks) == len(doc['blocks'])
+        assert BlockKey('vertical', 'unit_0') in blocks
+        assert blocks.decoded_count == 0
+
+        unit = blocks[BlockKey('vertical', 'unit_0')]
+        assert unit.block_type == 'vertical'
+        assert unit.fields['children'] == [BlockKey('problem', 'problem_0_0'), BlockKey('problem', 'problem_0_1')]
+        assert blocks[BlockKey('vertical', 'unit_0')] is unit
+        assert blocks.decoded_count == 1
+        assert structure['root'] == BlockKey('course', 'course')
+
+    def test_block_order(self):
+        doc = make_structure_doc()
+        structure = structure_from_mongo(copy.deepcopy(doc))
+        expected_keys = [BlockKey(block['block_type'], block['block_id']) for block in doc['blocks']]
+        assert list(structure['blocks']) == expected_keys
+
+    def test_mutation(self):
+        blocks = structure_from_mongo(make_structure_doc())['blocks']
+        new_key = BlockKey('html', 'new')
+        new_block = BlockData(block_type='html')
+        blocks[new_key] = new_block
+        del blocks[BlockKey('problem', 'problem_0_0')]
+
+        assert blocks[new_key] is new_block
+        assert list(blocks)[-1] == new_key
+        assert BlockKey('problem', 'problem_0_0') not in blocks
+        assert blocks.get(BlockKey('problem', 'problem_0_0')) is None
+
+    def test_estimate_size_does_not_decode(self):
+        structure = structure_from_mongo(make_structure_doc())
+        encoded = structure_codec.encode_structure(structure).parts()[0]
+        for lazy_structure in (structure, structure_codec.decode_structure(encoded)):
+            assert estimate_structure_size(lazy_structure) > estimate_structure_size({'blocks': {}})
+            assert lazy_structure['blocks'].decoded_count == 0
+
+    def test_copies_are_plain_dicts(self):
+        structure = structure_from_mongo(make_structure_doc())
+        for copied in (copy.deepcopy(structure), pickle.loads(pickle.dumps(structure))):
+            assert isinstance(copied['blocks'], dict)
+            assert copied == structure
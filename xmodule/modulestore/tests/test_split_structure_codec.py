@@ -0,0 +1,121 @@
+"""
+Tests for the compact course structure encoding used by the split modulestore structure cache.
+"""
+
+import datetime
+import unittest
+
+import ddt
+import pytest
+from bson.objectid import ObjectId
+
+from xmodule.modulestore.split_mongo import structure_codec
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+
+
+def make_structure_doc(num_units=3, problems_per_unit=2):
+    """
+    Return a structure document, as stored in Mongo, for a small course with one chapter,
+    one sequential, and ``num_units`` verticals containing ``problems_per_unit`` problems each.
+    """
+    version = ObjectId()
+    edited_on = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def block(block_type, block_id, children=None, **fields):
+        if children is not None:
+            fields['children'] = [[child_type, child_id] for child_type, child_id in children]
+        return {
+            'block_type': block_type,
+            'block_id': block_id,
+            'definition': ObjectId(),
+            'fields': fields,
+            'defaults': {},
+            'asides': {},
+            'edit_info': {
+                'previous_version': None,
+                'update_version': version,
+                'source_version': None,
+                'edited_on': edited_on,
+                'edited_by': 42,
+                'original_usage': None,
+                'original_usage_version': None,
+            },
+        }
+
+    blocks = []
+    units = []
+    for unit_idx in range(num_units):
+        problems = [('problem', f'problem_{unit_idx}_{idx}') for idx in range(problems_per_unit)]
+        blocks.extend(block(*problem, display_name=problem[1], weight=1.0) for problem in problems)
+        units.append(('vertical', f'unit_{unit_idx}'))
+        blocks.append(block('vertical', f'unit_{unit_idx}', problems, display_name=f'Unit {unit_idx}'))
+    blocks.append(block('sequential', 'seq', units, display_name='Sequence', graded=True))
+    blocks.append(block('chapter', 'chapter', [('sequential', 'seq')], display_name='Chapter'))
+    blocks.append(block('course', 'course', [('chapter', 'chapter')], display_name='Course', start=edited_on))
+
+    return {
+        '_id': version,
+        'root': ['course', 'course'],
+        'previous_version': None,
+        'original_version': version,
+        'edited_by': 42,
+        'edited_on': edited_on,
+        'schema_version': 1,
+        'blocks': blocks,
+    }
+
+
+@ddt.ddt
+class TestStructureCodec(unittest.TestCase):
+    """
+    Tests for encoding and decoding course structures.
+    """
+
+    @ddt.data(None, 64, 1000000)
+    def test_round_trip(self, chunk_size):
+        structure = structure_from_mongo(make_structure_doc())
+        encoded = structure_codec.encode_structure(structure, chunk_size=chunk_size)
+        assert encoded.codec == structure_codec.CODEC_COLUMNAR
+
+        parts = encoded.parts()
+        codec, num_chunks, length, crc, payload = structure_codec.read_header(parts[0])
+        assert num_chunks == len(parts)
+        decoded = structure_codec.decode_payload(codec, b''.join([payload] + parts[1:]), length, crc)
+
+        assert decoded == structure
+        assert decoded['root'] == structure['root']
+        assert list(decoded['blocks']) == list(structure['blocks'])
+
+    def test_children_are_interned(self):
+        structure = structure_from_mongo(make_structure_doc())
+        decoded = structure_codec.decode_structure(structure_codec.encode_structure(structure).parts()[0])
+
+        # every reference to a block shares a single BlockKey object
+        block_keys = {key: key for key in decoded['blocks']}
+        for block in decoded['blocks'].values():
+            for child in block.fields.get('children', []):
+                assert child is block_keys[child]
+            assert not block.definition_loaded
+
+    def test_encoding_does_not_mutate_structure(self):
+        structure = structure_from_mongo(make_structure_doc())
+        structure_codec.encode_structure(structure)
+        for block_key, block in structure['blocks'].items():
+            assert ('children' in block.fields) == (block_key.type != 'problem')
+
+    def test_other_values_are_pickled(self):
+        encoded = structure_codec.encode_structure({'not': 'a structure'})
+        assert encoded.codec == structure_codec.CODEC_PICKLE
+        assert structure_codec.decode_structure(encoded.parts()[0]) == {'not': 'a structure'}
+
+    def test_corrupt_payload(self):
+        data = structure_codec.encode_structure(structure_from_mongo(make_structure_doc())).parts()[0]
+        assert structure_codec.is_encoded(data)
+        with pytest.raises(structure_codec.StructureCodecError):
+            structure_codec.decode_structure(data[:-1])
+
+    def test_unknown_version(self):
+        data = bytearray(structure_codec.encode_structure({}).parts()[0])
+        data[len(structure_codec.MAGIC)] = structure_codec.FORMAT_VERSION + 1
+        with pytest.raises(structure_codec.StructureCodecError):
+            structure_codec.decode_structure(bytes(data))
@@ -5,6 +5,7 @@ Utility functions for transcripts.
 
 
 import copy
+import hashlib
 import html
 import logging
 import os
@@ -15,8 +16,10 @@ from functools import wraps
 import requests
 import simplejson as json
 from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import get_language_info
+from edx_django_utils import monitoring
 from lxml import etree
 from opaque_keys.edx.keys import UsageKeyV2
 from pysrt import SubRipFile, SubRipItem, SubRipTime
@@ -40,6 +43,9 @@ log = logging.getLogger(__name__)
 
 NON_EXISTENT_TRANSCRIPT = 'non_existent_dummy_file_name'
 
+# The cache of converted transcripts, shared by every worker, which is only used if it is configured.
+CONVERTED_TRANSCRIPTS_CACHE_NAME = 'video_transcripts'
+
 
 class TranscriptException(Exception):
     pass
@@ -682,7 +688,7 @@ def convert_video_transcript(file_name, content, output_format):
     name_and_extension = os.path.splitext(file_name)
     basename, input_format = name_and_extension[0], name_and_extension[1][1:]
     filename = f'{basename}.{output_format}'
-    converted_transcript = Transcript.convert(content, input_format=input_format, output_format=output_format)
+    converted_transcript = convert_transcript(content, input_format=input_format, output_format=output_format)
 
     return dict(filename=filename, content=converted_transcript)
 
@@ -821,6 +827,73 @@ class Transcript:
         return StaticContent.compute_location(location.course_key, filename)
 
 
+def get_converted_transcripts_cache():
+    """
+    Return the cache of converted transcripts, or None if it isn't configured.
+    """
+    try:
+        return caches[CONVERTED_TRANSCRIPTS_CACHE_NAME]
+    except InvalidCacheBackendError:
+        return None
+
+
+def _converted_transcript_cache_key(content, input_format, output_format, speed):
+    """
+    Return the key of the cached conversion of ``content``, which is made from its digest, so that
+    a transcript is converted once for every video and language it is used for.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    return f'converted:{digest}:{input_format}:{output_format}:{speed}'
+
+
+def convert_transcript(content, input_format, output_format, speed=None):
+    """
+    Convert transcript `content` from `input_format` to `output_format` like `Transcript.convert`,
+    and then scale it from speed 1.0 to `speed` if one is given, for `sjson` output.
+
+    The result is cached in the converted transcripts cache, when it is configured.
+
+    Raises:
+        TranscriptsGenerationException: On parsing the invalid srt content during conversion from srt to sjson.
+    """
+    cache = get_converted_transcripts_cache()
+    if cache is not None:
+        cache_key = _converted_transcript_cache_key(content, input_format, output_format, speed)
+        converted = cache.get(cache_key)
+        monitoring.increment(f'video.converted_transcripts_cache.{"miss" if converted is None else "hit"}')
+        if converted is not None:
+            return converted
+
+    converted = Transcript.convert(content, input_format=input_format, output_format=output_format)
+    if speed is not None and converted.strip():
+        converted = json.dumps(generate_subs(speed, 1, json.loads(converted)))
+
+    if cache is not None:
+        cache.set(cache_key, converted)
+    return converted
+
+
+def precompute_converted_transcripts(content, input_format, speeds=()):
+    """
+    Convert transcript `content` to every output format, and to every speed in `speeds` in `sjson`,
+    so that requests for the transcript find it in the converted transcripts cache.
+
+    Does nothing if the cache isn't configured.
+
+    Raises:
+        TranscriptsGenerationException: On parsing the invalid srt content during conversion from srt to sjson.
+    """
+    if get_converted_transcripts_cache() is None:
+        return
+
+    for output_format in (Transcript.SJSON, Transcript.SRT, Transcript.TXT):
+        convert_transcript(content, input_format=input_format, output_format=output_format)
+    for speed in speeds:
+        convert_transcript(content, input_format=input_format, output_format=Transcript.SJSON, speed=speed)
+
+
 class VideoTranscriptsMixin:
     """Mixin class for transcript functionality.
 
@@ -1045,16 +1118,13 @@ def get_transcript_from_contentstore(video, language, output_format, transcripts
     # add language prefix to transcript file only if language is not None
     language_prefix = f'{language}_' if language else ''
     transcript_name = f'{language_prefix}{base_name}.{output_format}'
-    transcript_content = Transcript.convert(transcript_content, input_format=input_format, output_format=output_format)
+    speed = youtube_speed_dict(video).get(youtube_id, 1) if youtube_id else None
+    transcript_content = convert_transcript(
+        transcript_content, input_format=input_format, output_format=output_format, speed=speed
+    )
     if not transcript_content.strip():
         raise NotFoundError('No transcript content')
 
-    if youtube_id:
-        youtube_ids = youtube_speed_dict(video)
-        transcript_content = json.dumps(
-            generate_subs(youtube_ids.get(youtube_id, 1), 1, json.loads(transcript_content))
-        )
-
     return transcript_content, transcript_name, Transcript.mime_types[output_format]
 
 
@@ -1154,7 +1224,7 @@ def get_transcript_from_learning_core(video_block, language, output_format, tran
 
     # Now convert the transcript data to the requested format:
     output_filename = f'{file_path.stem}.{output_format}'
-    output_transcript = Transcript.convert(
+    output_transcript = convert_transcript(
         data.decode('utf-8'),
         input_format=Transcript.SRT,
         output_format=output_format,